@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+LLM Load Test
+
+Runs the healthcare benchmark suite as load at several concurrency levels
+and reports p50/p95/p99 latency, time to first token (with --stream),
+tokens/sec and error rate per level.
+
+Usage:
+    # Against the in-process stub model
+    python scripts/bench_llm_load.py --stub
+
+    # Against a registered provider, streaming, at 5 requests/sec
+    python scripts/bench_llm_load.py --provider ollama-llama --stream --rate 5 \\
+        --concurrency 1 4 16 --json run.json --csv run.csv
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from aegis.llm.benchmark import LLMBenchmark
+
+
+def print_report(report):
+    print(f"{report.model_id} @ {report.run_at.isoformat()}")
+    print(
+        f"{'conc':>5}{'reqs':>6}{'err %':>7}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'ttft p95':>10}{'tok/s':>9}"
+    )
+    for level in report.levels:
+        ttft = f"{level.ttft_p95_ms:.1f}" if level.ttft_p95_ms is not None else "-"
+        print(
+            f"{level.concurrency:>5}{level.requests:>6}{level.error_rate * 100:>7.1f}"
+            f"{level.throughput_rps:>8.1f}{level.latency_p50_ms:>9.1f}{level.latency_p95_ms:>9.1f}"
+            f"{level.latency_p99_ms:>9.1f}{ttft:>10}{level.tokens_per_second:>9.0f}"
+        )
+
+
+async def run(args):
+    if args.stub:
+        benchmark = LLMBenchmark.with_stub(latency_s=args.stub_latency)
+        model_id = "stub"
+    else:
+        benchmark = LLMBenchmark.for_registry()
+        model_id = args.provider
+
+    report = await benchmark.run_load_test(
+        model_id,
+        concurrency_levels=args.concurrency,
+        requests_per_level=args.requests,
+        request_rate=args.rate,
+        stream=args.stream,
+    )
+    print_report(report)
+    if args.json:
+        report.to_json(args.json)
+    if args.csv:
+        report.to_csv(args.csv)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test an LLM provider with the healthcare suite")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--provider", help="Registered LLM provider name")
+    target.add_argument("--stub", action="store_true", help="Use the in-process stub model")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per concurrency level")
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop arrival rate (requests/sec)")
+    parser.add_argument("--stream", action="store_true", help="Stream responses and record TTFT")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Stub response time (seconds)")
+    parser.add_argument("--json", help="Write the report as JSON")
+    parser.add_argument("--csv", help="Write the report as CSV")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
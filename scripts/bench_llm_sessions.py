@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+LLM Session Pooling Benchmark
+
+Measures the per-call latency of the Ollama provider against a local stub
+server, comparing a fresh aiohttp session per call (the old behavior) with
+the provider's pooled keep-alive session.
+
+Usage:
+    python scripts/bench_llm_sessions.py
+
+    # Or with options
+    python scripts/bench_llm_sessions.py --calls 2000 --concurrency 16
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from aegis.llm.ollama import OllamaProvider
+from aegis.llm.providers import LLMConfig
+
+
+async def start_stub_server() -> tuple:
+    """Minimal /api/generate that answers immediately, so only client overhead is measured."""
+    async def generate(request: web.Request) -> web.Response:
+        await request.json()
+        return web.json_response({
+            "response": "ok",
+            "done": True,
+            "prompt_eval_count": 3,
+            "eval_count": 1,
+        })
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def unpooled_call(base_url: str):
+    """The previous pattern: a new ClientSession (and connection) per completion."""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(
+            f"{base_url}/api/generate",
+            json={"model": "stub", "prompt": "hi", "stream": False},
+        ) as response:
+            await response.json()
+
+
+async def measure(call, calls: int, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[timed() for _ in range(calls)])
+    return latencies
+
+
+def report(name: str, latencies: list, elapsed: float):
+    ms = np.asarray(latencies) * 1000
+    print(
+        f"{name:<22}{np.percentile(ms, 50):>10.2f}{np.percentile(ms, 99):>10.2f}"
+        f"{len(ms) / elapsed:>12.0f}"
+    )
+
+
+async def run(calls: int, concurrency: int):
+    runner, base_url = await start_stub_server()
+    provider = OllamaProvider(LLMConfig(provider="ollama", model="stub", api_base=base_url))
+    try:
+        # Warm up both paths
+        await unpooled_call(base_url)
+        await provider.generate("hi")
+
+        print(f"{calls} calls, concurrency {concurrency}")
+        print(f"{'mode':<22}{'p50 ms':>10}{'p99 ms':>10}{'calls/sec':>12}")
+
+        start = time.perf_counter()
+        latencies = await measure(lambda: unpooled_call(base_url), calls, concurrency)
+        report("session per call", latencies, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        latencies = await measure(lambda: provider.generate("hi"), calls, concurrency)
+        report("pooled session", latencies, time.perf_counter() - start)
+    finally:
+        await provider.close()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call LLM HTTP sessions")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        asyncio.run(run(args.calls, concurrency))
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Metrics Update Benchmark
+
+Measures the cost of one metric update (ns/op) for pre-bound label
+children and for the ``labels=`` dict form, and the time to render a
+Prometheus scrape. Child updates are checked against a sub-microsecond
+target; the exit status is 1 if any update misses its target.
+
+Usage:
+    python scripts/bench_metrics.py
+
+    # Or with options
+    python scripts/bench_metrics.py --ops 500000 --series 1000 --threads 4
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from aegis.observability.metrics import Counter, Gauge, Histogram, MetricsCollector
+
+# ns/op targets per update
+TARGETS = {
+    "counter child inc": 1000,
+    "gauge child set": 1000,
+    "histogram child observe": 1000,
+    "counter inc (no labels)": 1000,
+}
+
+
+def ns_per_op(fn, ops: int, repeat: int) -> float:
+    """Best of ``repeat`` runs of ``fn`` called ``ops`` times, minus loop overhead."""
+    def run(target):
+        start = time.perf_counter()
+        for _ in range(ops):
+            target()
+        return time.perf_counter() - start
+
+    overhead = min(run(lambda: None) for _ in range(repeat))
+    best = min(run(fn) for _ in range(repeat))
+    return max(best - overhead, 0.0) / ops * 1e9
+
+
+def threaded_ns_per_op(fn, ops: int, threads: int) -> float:
+    """Wall time per update with ``threads`` threads updating the same series."""
+    def work():
+        for _ in range(ops):
+            fn()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (ops * threads) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metric update cost")
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--series", type=int, default=500, help="Label sets per metric for the scrape")
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    labels = {"provider": "bedrock", "model": "claude"}
+    counter = Counter("bench_total")
+    gauge = Gauge("bench_level")
+    histogram = Histogram("bench_seconds")
+    counter_child = counter.labels(**labels)
+    gauge_child = gauge.labels(**labels)
+    histogram_child = histogram.labels(**labels)
+
+    modes = {
+        "counter child inc": counter_child.inc,
+        "gauge child set": lambda: gauge_child.set(3.0),
+        "histogram child observe": lambda: histogram_child.observe(0.3),
+        "counter inc (no labels)": counter.inc,
+        "counter inc (labels=)": lambda: counter.inc(labels=labels),
+        "histogram observe (labels=)": lambda: histogram.observe(0.3, labels),
+    }
+
+    print(f"{'mode':<30}{'ns/op':>10}{'target':>8}")
+    missed = []
+    for name, fn in modes.items():
+        cost = ns_per_op(fn, args.ops, args.repeat)
+        target = TARGETS.get(name)
+        status = "" if target is None else ("  ok" if cost <= target else "  MISS")
+        if target is not None and cost > target:
+            missed.append(name)
+        print(f"{name:<30}{cost:>10.0f}{target if target is not None else '-':>8}{status}")
+
+    shared = Counter("bench_threads_total").labels(**labels)
+    cost = threaded_ns_per_op(shared.inc, args.ops, args.threads)
+    print(f"{f'counter child inc x{args.threads} threads':<30}{cost:>10.0f}{'-':>8}")
+    assert shared.get() == args.ops * args.threads, "lost updates"
+
+    collector = MetricsCollector()
+    for i in range(args.series):
+        series = {"route": f"/r/{i}", "status": "200"}
+        collector.api_requests.inc(labels=series)
+        collector.api_latency.observe(0.01 * (i % 100), labels=series)
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in collector.iter_prometheus())
+    elapsed = time.perf_counter() - start
+    print(f"scrape: {args.series * 2} series, {size / 1e3:.0f} kB in {elapsed * 1000:.1f} ms")
+
+    sys.exit(1 if missed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+PHI Scanning Benchmark
+
+Measures PHIDetector throughput in MB/s on synthetic clinical notes
+(discharge summaries, progress notes, radiology reports, portal messages),
+a share of them de-identified, against the baseline of running every PHI
+pattern over the text with ``finditer``. Each mode is checked against a
+single-core throughput target; the exit status is 1 if any misses it.
+
+Usage:
+    python scripts/bench_phi_scan.py
+
+    # Or with options
+    python scripts/bench_phi_scan.py --notes 5000 --phi-share 0.3 --repeat 5
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import structlog
+
+from aegis.security.phi import PHIDetector
+
+# Single-core MB/s targets per mode
+TARGETS = {
+    "detect": 1.5,
+    "detect_batch": 1.5,
+    "get_phi_types": 1.5,
+    "contains_phi": 3.0,
+}
+
+FIRST = ["John", "Mary", "Robert", "Linda", "Carlos", "Aisha", "Wei", "Fatima"]
+LAST = ["Smith", "Johnson", "Garcia", "Nguyen", "Okafor", "Patel", "Kowalski", "Lee"]
+STREETS = ["Beacon Street", "Elm Ave", "Harbor Road", "Maple Drive", "Mission Blvd"]
+MONTHS = ["January", "March", "May", "August", "October", "December"]
+
+HPI = [
+    "{age} year old with history of type 2 diabetes mellitus, hypertension and hyperlipidemia "
+    "who presented with chest pain radiating to the left arm. Troponin 0.04 ng/mL, BP 142/88, "
+    "HR 92, SpO2 97% on room air. EKG showed normal sinus rhythm without ST changes.",
+    "{age} year old with COPD on 2 L home oxygen admitted for worsening dyspnea and productive "
+    "cough. CXR with hyperinflation, no focal consolidation. WBC 11.2, lactate 1.4. Started on "
+    "prednisone 40 mg daily and azithromycin 500 mg x1 then 250 mg daily for 4 days.",
+    "{age} year old s/p right total knee arthroplasty on POD 2, pain controlled on oxycodone "
+    "5 mg q4h PRN. Hgb 10.1 from 12.4 pre-op. Ambulating 150 ft with walker and PT.",
+]
+PLAN = [
+    "Continue aspirin 81 mg daily, atorvastatin 40 mg and metoprolol 25 mg twice daily. "
+    "Follow up with cardiology in 2 weeks. Labs: Na 138, K 4.1, Cr 1.0, glucose 156, A1c 7.8%.",
+    "Taper steroids over 5 days, resume tiotropium, smoking cessation counseling provided. "
+    "Return precautions reviewed; follow up with pulmonology in 4 to 6 weeks.",
+    "Enoxaparin 40 mg SC daily for 14 days, continue PT 3x weekly, wound check in 10 days. "
+    "INR 1.1, platelets 212, no signs of infection at the incision site.",
+]
+
+
+def identifiers(rng: random.Random) -> dict:
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    return {
+        "name": f"{first} {last}",
+        "last": last,
+        "mrn": f"{rng.choice(['AB', 'MG', 'XK'])}{rng.randint(100000, 99999999)}",
+        "dob": f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/19{rng.randint(30, 99)}",
+        "admit": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "seen": f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, 2024",
+        "phone": f"({rng.randint(200, 989)}) 555-{rng.randint(1000, 9999)}",
+        "ssn": f"{rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}",
+        "email": f"{first.lower()}.{last.lower()}@example.org",
+        "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+        "zip": f"{rng.randint(1000, 99999):05d}",
+        "member": f"{rng.randint(10_000_000, 99_999_999)}",
+        "age": rng.randint(19, 89),
+    }
+
+
+def deidentified(rng: random.Random) -> dict:
+    """The same slots filled the way a de-identified extract fills them."""
+    return {
+        "name": "[NAME]", "last": "[NAME]", "mrn": "[MRN]", "dob": "[DATE]",
+        "admit": "[DATE]", "seen": "[DATE]", "phone": "[PHONE]", "ssn": "[SSN]",
+        "email": "[EMAIL]", "address": "[ADDRESS]", "zip": "[ZIP]",
+        "member": "[ID]", "age": rng.randint(19, 89),
+    }
+
+
+def make_note(rng: random.Random, with_phi: bool) -> str:
+    ids = identifiers(rng) if with_phi else deidentified(rng)
+    hpi = rng.choice(HPI).format(age=ids["age"])
+    plan = rng.choice(PLAN)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return (
+            f"DISCHARGE SUMMARY\nPatient Name: {ids['name']}\nMRN: {ids['mrn']}\n"
+            f"DOB: {ids['dob']}\nAdmit date {ids['admit']}.\n\nHPI: Mr. {ids['last']} is a {hpi}\n\n"
+            f"Hospital course: {' '.join(rng.sample(HPI, 2)).format(age=ids['age'])}\n\n"
+            f"Plan: {plan}\nContact phone {ids['phone']}; email {ids['email']}.\n"
+            f"Lives at {ids['address']}, Boston MA {ids['zip']}.\n"
+        )
+    if kind == 1:
+        return (
+            f"PROGRESS NOTE ({ids['seen']})\nS: Patient reports improved symptoms. {hpi}\n"
+            f"O: Afebrile, vitals stable. Lungs clear bilaterally, RRR, no edema.\n"
+            f"A/P: {plan} {rng.choice(PLAN)}\n"
+        )
+    if kind == 2:
+        return (
+            f"RADIOLOGY REPORT\nPatient ID: {ids['mrn']}  DOB: {ids['dob']}\n"
+            "EXAM: CT chest with contrast. COMPARISON: Prior study 6 months ago.\n"
+            "FINDINGS: 4 mm nodule in the right upper lobe, unchanged. No pleural effusion. "
+            "Mild degenerative changes of the thoracic spine. Heart size normal.\n"
+            "IMPRESSION: Stable pulmonary nodule; no acute cardiopulmonary process.\n"
+        )
+    return (
+        f"Portal message from {ids['name']} (member {ids['member']}): my SSN {ids['ssn']} "
+        f"was requested for billing, please call me at {ids['phone']} or write to "
+        f"{ids['email']}. {plan}\n"
+    )
+
+
+def make_corpus(count: int, phi_share: float, seed: int) -> list:
+    rng = random.Random(seed)
+    return [make_note(rng, rng.random() < phi_share) for _ in range(count)]
+
+
+def per_pattern_baseline(detector: PHIDetector, notes: list):
+    """Every pattern over every note with finditer (regex work only, no match objects)."""
+    patterns = [p for type_patterns in detector._compiled_patterns.values() for p in type_patterns]
+    for note in notes:
+        for pattern in patterns:
+            for _ in pattern.finditer(note):
+                pass
+
+
+def best_seconds(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PHI scanning throughput")
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--phi-share", type=float, default=0.5, help="Share of notes with identifiers")
+    parser.add_argument("--sensitivity", default="high", choices=["low", "medium", "high"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Per-call debug logging isn't part of what's measured
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.INFO))
+
+    notes = make_corpus(args.notes, args.phi_share, args.seed)
+    megabytes = sum(len(note.encode()) for note in notes) / 1e6
+    detector = PHIDetector(sensitivity=args.sensitivity)
+    matches = sum(len(m) for m in detector.detect_batch(notes))
+    print(f"{len(notes):,} notes, {megabytes:.2f} MB, {matches:,} PHI matches ({args.sensitivity})")
+
+    modes = {
+        "per-pattern finditer": lambda: per_pattern_baseline(detector, notes),
+        "detect": lambda: [detector.detect(note) for note in notes],
+        "detect_batch": lambda: detector.detect_batch(notes),
+        "get_phi_types": lambda: [detector.get_phi_types(note) for note in notes],
+        "contains_phi": lambda: [detector.contains_phi(note) for note in notes],
+    }
+
+    print(f"{'mode':<22}{'MB/s':>8}{'target':>8}")
+    missed = []
+    for name, fn in modes.items():
+        rate = megabytes / best_seconds(fn, args.repeat)
+        target = TARGETS.get(name)
+        status = "" if target is None else ("  ok" if rate >= target else "  MISS")
+        if target is not None and rate < target:
+            missed.append(name)
+        print(f"{name:<22}{rate:>8.2f}{target if target is not None else '-':>8}{status}")
+
+    sys.exit(1 if missed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Vector Index Benchmark
+
+Compares exact brute-force search (the InMemoryVectorStore matrix path)
+against the IVF-flat index on synthetic clustered embeddings and reports
+recall@k and p50/p99 query latency.
+
+Usage:
+    python scripts/bench_vector_index.py
+
+    # Or with options
+    python scripts/bench_vector_index.py --sizes 10000 100000 1000000 --dims 384 --nprobe 4 8 16
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from aegis.rag.ann import IVFFlatIndex
+
+
+def make_corpus(n: int, dims: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Gaussian mixture so the data has the cluster structure real embeddings have."""
+    centers = rng.standard_normal((clusters, dims), dtype=np.float32)
+    labels = rng.integers(0, clusters, n)
+    vectors = centers[labels] + 0.35 * rng.standard_normal((n, dims), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix @ query
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part])]
+
+
+def percentile_ms(samples, pct: float) -> float:
+    return float(np.percentile(np.asarray(samples) * 1000, pct))
+
+
+def run(size: int, dims: int, queries: int, k: int, nprobes, seed: int):
+    rng = np.random.default_rng(seed)
+    corpus = make_corpus(size, dims, clusters=max(16, size // 2000), rng=rng)
+    # Queries are perturbed corpus points, like paraphrases of indexed text
+    query_set = corpus[rng.choice(size, queries)] + 0.05 * rng.standard_normal((queries, dims))
+    query_set = (query_set / np.linalg.norm(query_set, axis=1, keepdims=True)).astype(np.float32)
+    ids = [str(i) for i in range(size)]
+
+    # Exact baseline
+    truth, exact_latency = [], []
+    for q in query_set:
+        start = time.perf_counter()
+        rows = exact_top_k(corpus, q, k)
+        exact_latency.append(time.perf_counter() - start)
+        truth.append({ids[r] for r in rows})
+
+    # IVF build (train once over the full corpus, as a bulk load would)
+    index = IVFFlatIndex(dims, train_threshold=size)
+    start = time.perf_counter()
+    index.add_batch(ids, corpus)
+    build_s = time.perf_counter() - start
+
+    print(f"\n== {size:,} vectors x {dims} dims ({len(index._lists)} lists, build {build_s:.1f}s) ==")
+    print(f"{'mode':<14}{'recall@' + str(k):>10}{'p50 ms':>10}{'p99 ms':>10}")
+    print(
+        f"{'exact':<14}{1.0:>10.3f}"
+        f"{percentile_ms(exact_latency, 50):>10.2f}{percentile_ms(exact_latency, 99):>10.2f}"
+    )
+
+    for nprobe in nprobes:
+        latency, hits = [], 0
+        for q, expected in zip(query_set, truth):
+            start = time.perf_counter()
+            result = index.search(q, k, nprobe=nprobe)
+            latency.append(time.perf_counter() - start)
+            hits += len(expected & {doc_id for doc_id, _ in result})
+        print(
+            f"{'ivf nprobe=' + str(nprobe):<14}{hits / (k * len(truth)):>10.3f}"
+            f"{percentile_ms(latency, 50):>10.2f}{percentile_ms(latency, 99):>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact vs IVF vector search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dims", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.dims, args.queries, args.k, args.nprobe, args.seed)
+
+
+if __name__ == "__main__":
+    main()
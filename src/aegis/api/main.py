@@ -64,6 +64,11 @@ logger = structlog.get_logger(__name__)
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup/shutdown events."""
     from aegis.db import init_db_clients, close_db_clients
+    from aegis.llm.registry import close_llm_registry
+    from aegis.security.immutable_audit import close_immutable_audit_logger
+    from aegis.security.audit_verification import shutdown_verification_executors
+    from aegis.rag.pipeline import close_rag_pipeline
+    from aegis.security.redaction import shutdown_redaction_executors
     
     settings = get_settings()
     
@@ -94,6 +99,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     # Shutdown
     logger.info("Shutting down VeritOS API")
+    await close_llm_registry()
+    await close_immutable_audit_logger()
+    shutdown_verification_executors()
+    close_rag_pipeline()
+    shutdown_redaction_executors()
     await close_db_clients()
 
 
@@ -40,6 +40,9 @@ class IntegrityVerificationResponse(BaseModel):
     total_records: int
     tampered_records: List[dict]
     last_chain_hash: Optional[str]
+    verified_from_sequence: Optional[int] = None
+    checkpoint_sequence: Optional[int] = None
+    records_per_second: Optional[int] = None
     error: Optional[str] = None
 
 
@@ -125,12 +128,14 @@ async def get_audit_events(
 async def verify_audit_integrity(
     start_sequence: Optional[int] = Query(None, description="Start sequence number"),
     end_sequence: Optional[int] = Query(None, description="End sequence number"),
+    full: bool = Query(False, description="Re-verify from the first record instead of the last checkpoint"),
     current_user: User = Depends(get_current_user),
 ):
     """
     Verify integrity of immutable audit log hash chain.
     
     Checks for tampering by validating hash chain. Only admins can verify.
+    By default only records added since the last signed checkpoint are checked.
     """
     # Check permissions
     user_roles = current_user.roles if hasattr(current_user, 'roles') else []
@@ -155,6 +160,7 @@ async def verify_audit_integrity(
         result = await immutable_logger.verify_integrity(
             start_sequence=start_sequence,
             end_sequence=end_sequence,
+            incremental=not full,
         )
         
         return IntegrityVerificationResponse(**result)
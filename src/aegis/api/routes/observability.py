@@ -12,6 +12,7 @@ Endpoints for:
 from typing import List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from aegis.observability import (
@@ -58,7 +59,10 @@ async def get_metrics(format: str = Query("json", enum=["json", "prometheus"])):
     collector = get_metrics_collector()
     
     if format == "prometheus":
-        return collector.to_prometheus()
+        return StreamingResponse(
+            collector.iter_prometheus(),
+            media_type="text/plain; version=0.0.4",
+        )
     
     return collector.to_json()
 
@@ -85,6 +85,50 @@ async def ingest_file(
     }
 
 
+@router.post("/ingest/batch")
+async def ingest_batch(
+    files: List[UploadFile] = File(...),
+    metadata: Optional[str] = None,
+):
+    """
+    Ingest several document files in one request.
+    
+    Files are loaded and chunked in parallel worker processes; the response
+    lists a result per file plus overall throughput.
+    """
+    pipeline = get_rag_pipeline()
+    
+    meta = None
+    if metadata:
+        import json
+        try:
+            meta = json.loads(metadata)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="metadata must be valid JSON")
+    
+    uploads = [(file.filename, await file.read()) for file in files]
+    result = await pipeline.ingest_bytes_batch(uploads, meta)
+    
+    return {
+        "succeeded": result.succeeded,
+        "failed": result.failed,
+        "total_chunks": result.total_chunks,
+        "elapsed_ms": result.elapsed_ms,
+        "docs_per_second": result.docs_per_second,
+        "files": [
+            {
+                "filename": r.filename,
+                "document_id": r.document_id,
+                "success": r.success,
+                "chunks_created": r.chunk_count,
+                "ingestion_time_ms": r.ingestion_time_ms,
+                "error": r.error,
+            }
+            for r in result.files
+        ],
+    }
+
+
 @router.post("/ingest/text")
 async def ingest_text(request: IngestTextRequest):
     """Ingest raw text directly."""
@@ -0,0 +1,160 @@
+"""
+Bedrock Async Bridge
+
+boto3 is synchronous: ``invoke_model`` blocks until the response arrives and
+the event stream returned by ``invoke_model_with_response_stream`` blocks on
+every ``next()``. The bridge keeps those calls off the event loop:
+
+- ``call`` runs a blocking call on the bridge's bounded thread pool
+- ``stream`` iterates a blocking event stream in a worker thread that feeds
+  a bounded asyncio queue. A slow consumer blocks the worker (backpressure);
+  a consumer that goes away (client disconnect, task cancelled, generator
+  closed) stops the worker and closes the underlying stream.
+
+Shared by the Bedrock LLM provider, the Bedrock embeddings and the simple
+Bedrock client so all Bedrock traffic draws from one pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, AsyncIterator, Callable, Iterable
+import asyncio
+import functools
+import threading
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# How often a worker blocked on a full queue re-checks for cancellation
+_CANCEL_POLL_SECONDS = 0.1
+
+_END = object()
+
+
+class _StreamError:
+    """Carries an exception raised in the worker thread to the consumer."""
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class BedrockBridge:
+    """
+    Run blocking boto3 calls and event streams without blocking the loop.
+    
+    Every active stream occupies one pool thread until it finishes or is
+    cancelled, so ``max_workers`` also bounds concurrent streams.
+    """
+    
+    def __init__(self, max_workers: int = 32, queue_size: int = 64):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="bedrock",
+        )
+        self.active_streams = 0
+    
+    async def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the bridge pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(fn, *args, **kwargs)
+        )
+    
+    async def stream(
+        self,
+        open_stream: Callable[[], Iterable],
+        queue_size: int = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the events of a blocking stream as they arrive.
+        
+        ``open_stream`` is called in the worker thread, so the request that
+        opens the stream does not block the loop either. If the returned
+        iterable has a ``close()`` method it is called when the consumer
+        stops early, which unblocks a worker waiting on the network.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or self.queue_size)
+        stop = threading.Event()
+        opened: dict = {}
+        
+        def put(item) -> bool:
+            """Blocking put from the worker; False once the consumer is gone."""
+            try:
+                future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            except RuntimeError:
+                # Event loop closed
+                return False
+            while True:
+                try:
+                    future.result(timeout=_CANCEL_POLL_SECONDS)
+                    return True
+                except FutureTimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        return False
+        
+        def pump():
+            try:
+                events = open_stream()
+                opened["events"] = events
+                for event in events:
+                    if stop.is_set() or not put(event):
+                        return
+                put(_END)
+            except BaseException as e:
+                if not stop.is_set():
+                    put(_StreamError(e))
+        
+        self.active_streams += 1
+        worker = loop.run_in_executor(self.executor, pump)
+        finished = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    finished = True
+                    return
+                if isinstance(item, _StreamError):
+                    finished = True
+                    raise item.error
+                yield item
+        finally:
+            self.active_streams -= 1
+            if not finished:
+                stop.set()
+                self._close_quietly(opened.get("events"))
+                logger.debug("Bedrock stream cancelled by consumer")
+            # The worker exits on its own; don't make the consumer wait for it
+            worker.add_done_callback(lambda f: f.cancelled() or f.exception())
+    
+    @staticmethod
+    def _close_quietly(events):
+        close = getattr(events, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Closing Bedrock stream failed: {e}")
+    
+    def get_stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "active_streams": self.active_streams,
+        }
+
+
+# Global bridge
+_bedrock_bridge: BedrockBridge = None
+
+
+def get_bedrock_bridge() -> BedrockBridge:
+    """Get the shared Bedrock bridge."""
+    global _bedrock_bridge
+    if _bedrock_bridge is None:
+        _bedrock_bridge = BedrockBridge()
+    return _bedrock_bridge
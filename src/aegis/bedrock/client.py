@@ -7,10 +7,11 @@ Supports switching between providers via configuration.
 
 import json
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator
 
 import structlog
 
+from aegis.bedrock.bridge import get_bedrock_bridge
 from aegis.config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -223,6 +224,7 @@ class BedrockLLMClient(BaseLLMClient):
         self.model_id = settings.bedrock_model_id
         self.max_tokens = settings.max_tokens
         self.temperature = settings.temperature
+        self.bridge = get_bedrock_bridge()
         
         logger.info(
             "Initialized Bedrock LLM client",
@@ -230,36 +232,69 @@ class BedrockLLMClient(BaseLLMClient):
             region=settings.aws_region,
         )
     
-    async def generate(
+    def _request_body(
         self,
         prompt: str,
-        system_prompt: str | None = None,
-        max_tokens: int | None = None,
-        temperature: float | None = None,
+        system_prompt: str | None,
+        max_tokens: int | None,
+        temperature: float | None,
     ) -> str:
-        """Generate a response using Bedrock."""
-        messages = [{"role": "user", "content": prompt}]
-        
         body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": max_tokens or self.max_tokens,
             "temperature": temperature or self.temperature,
-            "messages": messages,
+            "messages": [{"role": "user", "content": prompt}],
         }
         
         if system_prompt:
             body["system"] = system_prompt
         
+        return json.dumps(body)
+    
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Generate a response using Bedrock."""
+        body = self._request_body(prompt, system_prompt, max_tokens, temperature)
+        
         logger.debug("Bedrock generate", model=self.model_id, prompt_length=len(prompt))
         
-        response = self.client.invoke_model(
-            modelId=self.model_id,
-            body=json.dumps(body),
-        )
+        def invoke():
+            response = self.client.invoke_model(modelId=self.model_id, body=body)
+            return json.loads(response["body"].read())
         
-        result = json.loads(response["body"].read())
+        result = await self.bridge.call(invoke)
         return result["content"][0]["text"]
     
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream response text from Bedrock as it is generated."""
+        body = self._request_body(prompt, system_prompt, max_tokens, temperature)
+        
+        def open_stream():
+            return self.client.invoke_model_with_response_stream(
+                modelId=self.model_id,
+                body=body,
+            )["body"]
+        
+        events = self.bridge.stream(open_stream)
+        try:
+            async for event in events:
+                chunk = json.loads(event["chunk"]["bytes"])
+                if chunk["type"] == "content_block_delta" and chunk["delta"]["type"] == "text_delta":
+                    yield chunk["delta"]["text"]
+        finally:
+            await events.aclose()
+    
     async def generate_structured(
         self,
         prompt: str,
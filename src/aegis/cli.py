@@ -0,0 +1,126 @@
+"""
+AEGIS Command Line Interface
+
+Entry point for the ``veritos`` console script.
+
+Usage:
+    veritos ingest ./policies ./notes/discharge.pdf --workers 8
+    veritos ingest ./policies --metadata '{"tenant_id": "default"}' --json
+
+``ingest`` writes to the OpenSearch vector index from settings
+(``OPENSEARCH_*``); it refuses to run without one rather than ingesting
+into a store that is discarded on exit.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
+
+
+# =============================================================================
+# Commands
+# =============================================================================
+
+class StoreUnavailableError(RuntimeError):
+    """No persistent vector store is configured or reachable."""
+
+
+async def _ingest_into_opensearch(args: argparse.Namespace, metadata: Optional[dict]):
+    """Run a batch ingestion against the configured OpenSearch index."""
+    from aegis.config import get_settings
+    from aegis.db.clients import MockOpenSearch, init_opensearch
+    from aegis.rag.embeddings import EmbeddingModelFactory
+    from aegis.rag.pipeline import RAGConfig, RAGPipeline
+    from aegis.rag.vectorstore import OpenSearchVectorStore
+
+    settings = get_settings()
+    try:
+        client = await init_opensearch(settings)
+    except RuntimeError as e:
+        raise StoreUnavailableError(str(e)) from e
+    if isinstance(client, MockOpenSearch):
+        raise StoreUnavailableError(
+            f"OpenSearch is not reachable at {settings.opensearch.connection_url}"
+        )
+
+    try:
+        config = RAGConfig()
+        embedding_model = EmbeddingModelFactory.create(
+            config.embedding_provider, config.embedding_model
+        )
+        store = OpenSearchVectorStore(
+            index_name=settings.opensearch.vector_index,
+            dimensions=embedding_model.dimensions,
+            client=client,
+        )
+        await store.create_index()
+        pipeline = RAGPipeline(config, vector_store=store, embedding_model=embedding_model)
+        try:
+            return await pipeline.ingest_batch(
+                args.paths,
+                metadata=metadata,
+                recursive=not args.no_recursive,
+                max_workers=args.workers,
+            )
+        finally:
+            pipeline.shutdown()
+    finally:
+        await client.close()
+
+
+def _ingest(args: argparse.Namespace) -> int:
+    """Batch-ingest files and directories into the RAG pipeline."""
+    metadata = json.loads(args.metadata) if args.metadata else None
+    try:
+        result = asyncio.run(_ingest_into_opensearch(args, metadata))
+    except StoreUnavailableError as e:
+        print(f"veritos ingest: no persistent vector store: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(result.model_dump_json(indent=2))
+    else:
+        for file_result in result.files:
+            if file_result.success:
+                print(
+                    f"  ok    {file_result.filename}: {file_result.chunk_count} chunks "
+                    f"({file_result.ingestion_time_ms} ms)"
+                )
+            else:
+                print(f"  FAIL  {file_result.filename}: {file_result.error}")
+        print(
+            f"\n{result.succeeded} ingested, {result.failed} failed, "
+            f"{result.total_chunks} chunks in {result.elapsed_ms / 1000:.1f}s "
+            f"({result.docs_per_second} docs/sec)"
+        )
+    return 0 if result.failed == 0 else 1
+
+
+# =============================================================================
+# Entry Point
+# =============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="veritos", description="AEGIS platform CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Ingest documents into the RAG pipeline")
+    ingest.add_argument("paths", nargs="+", help="Files or directories to ingest")
+    ingest.add_argument("--workers", type=int, default=None, help="Load/chunk worker processes")
+    ingest.add_argument("--metadata", default=None, help="JSON metadata added to every chunk")
+    ingest.add_argument("--no-recursive", action="store_true", help="Don't descend into subdirectories")
+    ingest.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    ingest.set_defaults(func=_ingest)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
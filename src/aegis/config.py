@@ -51,6 +51,18 @@ class GraphDBSettings(BaseSettings):
     port: int = 8182
     use_ssl: bool = False
     
+    # Connection pool / query execution
+    pool_size: int = 8  # Websocket connections (= queries in flight)
+    query_timeout_seconds: float = 30.0  # Per-query timeout (client and server side)
+    
+    # Bulk writes
+    write_batch_size: int = 500  # Vertices/edges per batch traversal
+    write_concurrency: int = 4  # Batch traversals in flight at once
+    
+    # Read cache (patient 360 views)
+    read_cache_max_entries: int = 10_000
+    read_cache_ttl_seconds: float = 60.0  # Bounds staleness from writes in other processes
+    
     @property
     def connection_url(self) -> str:
         """Get the Gremlin connection URL."""
@@ -521,6 +521,8 @@ class VectorBackup:
         input_file: str,
         target_index: str | None = None,
         batch_size: int = 500,
+        max_concurrency: int = 4,
+        disable_refresh: bool = False,
     ) -> tuple[bool, int]:
         """
         Import an index from JSON file.
@@ -529,10 +531,14 @@ class VectorBackup:
             input_file: JSON file to import
             target_index: Target index name (default: original)
             batch_size: Documents per bulk request
+            max_concurrency: Bulk requests in flight at once
+            disable_refresh: Suspend index refresh during the load
         
         Returns:
             Tuple of (success, doc_count)
         """
+        from aegis.rag.vectorstore import OpenSearchBulkIndexer
+        
         client = await self._get_client()
         if not client:
             return False, 0
@@ -551,28 +557,26 @@ class VectorBackup:
                 documents=len(documents),
             )
             
-            # Bulk import
-            imported = 0
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i+batch_size]
-                
-                bulk_body = []
-                for doc in batch:
-                    bulk_body.append({"index": {"_index": index_name, "_id": doc["_id"]}})
-                    bulk_body.append(doc["_source"])
-                
-                response = await client.bulk(body=bulk_body)
-                
-                if not response.get("errors"):
-                    imported += len(batch)
-                else:
-                    # Count successful items
-                    for item in response.get("items", []):
-                        if "error" not in item.get("index", {}):
-                            imported += 1
-            
-            logger.info("Index import completed", imported=imported)
-            return True, imported
+            indexer = OpenSearchBulkIndexer(
+                client,
+                index_name,
+                max_batch_docs=batch_size,
+                max_concurrency=max_concurrency,
+            )
+            result = await indexer.index(
+                ((doc["_id"], doc["_source"]) for doc in documents),
+                disable_refresh=disable_refresh,
+            )
+            
+            if result.failed:
+                logger.warning(
+                    "Some documents failed to import",
+                    failed=result.failed,
+                    sample_errors=result.errors[:5],
+                )
+            
+            logger.info("Index import completed", imported=result.indexed)
+            return True, result.indexed
             
         except Exception as e:
             logger.error("Index import failed", error=str(e))
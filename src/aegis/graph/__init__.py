@@ -4,7 +4,8 @@ AEGIS Graph Module
 Graph database operations for Neptune/JanusGraph using Gremlin.
 """
 
+from aegis.graph.cache import GraphReadCache, get_graph_read_cache
 from aegis.graph.client import GraphClient
 from aegis.graph.queries import GraphQueries
 
-__all__ = ["GraphClient", "GraphQueries"]
+__all__ = ["GraphClient", "GraphQueries", "GraphReadCache", "get_graph_read_cache"]
@@ -0,0 +1,228 @@
+"""
+Graph Read Cache
+
+Read-through cache for per-patient graph views such as the patient 360 view:
+- Keyed by patient vertex ID, with TTL and LRU size eviction
+- Concurrent misses for the same patient share one graph query
+- Each cached view remembers the vertex IDs it was built from, so a write
+  to any of those vertices (or an edge added from one) drops the view
+- A view invalidated while it is still loading is returned to its waiters
+  but not stored
+
+The cache lives in the process. Writes made by other processes only show up
+once the TTL expires.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+import asyncio
+import time
+
+import structlog
+
+from aegis.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+
+def view_vertex_ids(value: Any) -> set[str]:
+    """Collect the vertex IDs of every ``valueMap(true)`` map nested in a view."""
+    found: set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, child in item.items():
+                # valueMap(true) keys the ID by T.id (an enum) or by "id"
+                if key == "id" or getattr(key, "name", None) == "id":
+                    vertex_id = child[0] if isinstance(child, list) and child else child
+                    if vertex_id is not None and not isinstance(vertex_id, (dict, list)):
+                        found.add(str(vertex_id))
+                else:
+                    stack.append(child)
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return found
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires_at: float
+    vertex_ids: frozenset
+
+
+class GraphReadCache:
+    """
+    TTL/LRU read-through cache of patient graph views.
+    
+    Cached views are shared between callers and must not be mutated.
+    
+    Args:
+        max_entries: Views kept (LRU beyond that)
+        ttl_seconds: Lifetime of a cached view
+    """
+    
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None):
+        settings = get_settings().graph_db
+        self.max_entries = max_entries or settings.read_cache_max_entries
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.read_cache_ttl_seconds
+        
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # vertex ID -> keys of the cached views built from it
+        self._owners: dict[str, set[str]] = {}
+        self._loading: dict[str, asyncio.Future] = {}
+        # Invalidations seen while loads were in flight: (sequence, vertex IDs)
+        self._sequence = 0
+        self._recent: list[tuple[int, frozenset]] = []
+        
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.evictions = 0
+    
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+    
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached view for ``key``, loading it with ``loader`` on a miss.
+        
+        Empty views (e.g. unknown patient) are returned but not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self._drop(key)
+        
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The loading caller was cancelled, not this one: load again
+                return await self.get_or_load(key, loader)
+        
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        started = self._sequence
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            self._finish(key)
+            future.cancel()
+            raise
+        except Exception as e:
+            self._finish(key)
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else waited on isn't logged
+            future.exception()
+            raise
+        
+        if value:
+            self._store(key, value, started)
+        self._finish(key)
+        future.set_result(value)
+        return value
+    
+    def _finish(self, key: str):
+        del self._loading[key]
+        if not self._loading:
+            self._recent.clear()
+    
+    def _store(self, key: str, value: Any, started: int):
+        vertex_ids = frozenset(view_vertex_ids(value) | {key})
+        for sequence, invalidated in self._recent:
+            if sequence > started and not vertex_ids.isdisjoint(invalidated):
+                logger.debug("Graph view changed while loading, not cached", key=key)
+                return
+        
+        self._drop(key)
+        self._entries[key] = _CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            vertex_ids=vertex_ids,
+        )
+        for vertex_id in vertex_ids:
+            self._owners.setdefault(vertex_id, set()).add(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def _drop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for vertex_id in entry.vertex_ids:
+            keys = self._owners.get(vertex_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._owners[vertex_id]
+        return True
+    
+    # =========================================================================
+    # Invalidation
+    # =========================================================================
+    
+    def invalidate_vertices(self, vertex_ids: Iterable[str]):
+        """Drop every view built from (or keyed by) any of ``vertex_ids``."""
+        ids = frozenset(str(v) for v in vertex_ids if v is not None)
+        if not ids:
+            return
+        if self._loading:
+            self._sequence += 1
+            self._recent.append((self._sequence, ids))
+        
+        keys = set()
+        for vertex_id in ids:
+            keys.update(self._owners.get(vertex_id, ()))
+            if vertex_id in self._entries:
+                keys.add(vertex_id)
+        for key in keys:
+            if self._drop(key):
+                self.invalidations += 1
+    
+    def clear(self):
+        self._entries.clear()
+        self._owners.clear()
+    
+    # =========================================================================
+    # Stats
+    # =========================================================================
+    
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "loading": len(self._loading),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+# Global cache
+_graph_read_cache: GraphReadCache | None = None
+
+
+def get_graph_read_cache() -> GraphReadCache:
+    """Get the shared graph read cache."""
+    global _graph_read_cache
+    if _graph_read_cache is None:
+        _graph_read_cache = GraphReadCache()
+    return _graph_read_cache
@@ -3,9 +3,17 @@ Graph Database Client
 
 Gremlin client for Neptune/JanusGraph with connection pooling and retry logic.
 Falls back to mock data when no database is available.
+
+Queries never block the event loop: submission happens on a small dedicated
+executor and results are awaited through gremlinpython's futures. At most
+``pool_size`` queries hold a websocket connection at once; the rest wait on
+an asyncio semaphore, not on a thread.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+import asyncio
+import time
 
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -38,12 +46,39 @@ class GraphClient:
             result = await client.execute("g.V().count()")
     """
     
-    def __init__(self):
+    def __init__(self, pool_size: int | None = None, query_timeout: float | None = None):
         self.settings = get_settings().graph_db
+        self.pool_size = pool_size or self.settings.pool_size
+        self.query_timeout = query_timeout or self.settings.query_timeout_seconds
         self._client = None
         self._g = None
         self._mock_mode = False
         self._mock_data = MockGraphData()
+        
+        # Pool slots are taken per attempt, so retries back off without one
+        self._slots: asyncio.Semaphore | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight = 0
+        
+        from aegis.observability.metrics import get_metrics_collector
+        metrics = get_metrics_collector()
+        self._in_flight_gauge = metrics.gauge(
+            "aegis_graph_queries_in_flight",
+            "Gremlin queries holding a pool connection",
+        )
+        self._waiting_gauge = metrics.gauge(
+            "aegis_graph_queries_waiting",
+            "Gremlin queries waiting for a pool connection",
+        )
+        self._duration_histogram = metrics.histogram(
+            "aegis_graph_query_duration_seconds",
+            "Gremlin query duration, excluding time waiting for a connection",
+        )
+        self._error_counter = metrics.counter(
+            "aegis_graph_query_errors_total",
+            "Failed Gremlin queries (including timeouts)",
+        )
+        self._waiting = 0
     
     @property
     def connection_url(self) -> str:
@@ -68,9 +103,11 @@ class GraphClient:
                 url=self.connection_url,
             )
             
+            self._init_pool()
             self._client = client.Client(
                 self.connection_url,
                 "g",
+                pool_size=self.pool_size,
                 message_serializer=serializer.GraphSONSerializersV3d0(),
             )
             
@@ -82,7 +119,7 @@ class GraphClient:
             self._g = traversal().withRemote(connection)
             
             # Test connection
-            self._client.submit("g.V().limit(1).count()").all().result()
+            await self._submit("g.V().limit(1).count()", {}, self.query_timeout)
             
             logger.info("Connected to graph database")
             
@@ -91,15 +128,29 @@ class GraphClient:
             self._mock_mode = True
             self._client = None
             self._g = None
+            self._shutdown_executor()
     
     async def disconnect(self) -> None:
         """Close the graph database connection."""
         if self._client:
-            self._client.close()
+            await asyncio.to_thread(self._client.close)
             self._client = None
             self._g = None
+            self._shutdown_executor()
             logger.info("Disconnected from graph database")
     
+    def _init_pool(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size,
+            thread_name_prefix="gremlin-submit",
+        )
+        self._slots = asyncio.Semaphore(self.pool_size)
+    
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
     async def __aenter__(self) -> "GraphClient":
         await self.connect()
         return self
@@ -118,14 +169,20 @@ class GraphClient:
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
     )
-    async def execute(self, query: str, bindings: dict[str, Any] | None = None) -> list[Any]:
+    async def execute(
+        self,
+        query: str,
+        bindings: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> list[Any]:
         """
         Execute a Gremlin query string.
         
         Args:
             query: Gremlin query string
             bindings: Optional parameter bindings
-            
+            timeout: Seconds before the query is abandoned (default from settings)
+        
         Returns:
             List of results
         """
@@ -139,13 +196,58 @@ class GraphClient:
         logger.debug("Executing Gremlin query", query=query[:100])
         
         try:
-            result_set = self._client.submit(query, bindings or {})
-            results = result_set.all().result()
-            return results
+            return await self._submit(query, bindings or {}, timeout or self.query_timeout)
         except Exception as e:
-            logger.error("Gremlin query failed", query=query[:100], error=str(e))
+            self._error_counter.inc()
+            logger.error("Gremlin query failed", query=query[:100], error=str(e) or type(e).__name__)
             raise
     
+    async def _submit(self, query: str, bindings: dict[str, Any], timeout: float) -> list[Any]:
+        """Run one query on a pool connection without blocking the event loop."""
+        # Gauges are process-wide, so clients add and remove their own share
+        self._waiting += 1
+        self._waiting_gauge.inc()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+            self._waiting_gauge.dec()
+        
+        self.in_flight += 1
+        self._in_flight_gauge.inc()
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self._run_query(query, bindings, timeout), timeout)
+        finally:
+            self._duration_histogram.observe(time.perf_counter() - start)
+            self.in_flight -= 1
+            self._in_flight_gauge.dec()
+            self._slots.release()
+    
+    async def _run_query(self, query: str, bindings: dict[str, Any], timeout: float) -> list[Any]:
+        loop = asyncio.get_running_loop()
+        # submit_async takes a pool connection with a blocking get, so it runs
+        # off the loop; the slot semaphore keeps that wait short
+        future = await loop.run_in_executor(
+            self._executor,
+            lambda: self._client.submit_async(
+                query,
+                bindings,
+                request_options={"evaluationTimeout": int(timeout * 1000)},
+            ),
+        )
+        result_set = await asyncio.wrap_future(future)
+        return await asyncio.wrap_future(result_set.all())
+    
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Pool size and current load."""
+        return {
+            "pool_size": self.pool_size,
+            "in_flight": self.in_flight,
+            "waiting": self._waiting,
+            "query_timeout_seconds": self.query_timeout,
+        }
+    
     async def health_check(self) -> bool:
         """Check if the graph database is healthy."""
         if self._mock_mode:
@@ -352,6 +454,18 @@ class MockGraphData:
         # Extract patient_id for queries that need it
         patient_id = self._extract_patient_id(query, bindings)
         
+        # Patient 360 - single traversal
+        if "project('patient','encounters','claims','medications')" in query_lower.replace(" ", ""):
+            for p in self.patients:
+                if p["id"][0] == patient_id:
+                    return [{
+                        "patient": p,
+                        "encounters": self.encounters.get(patient_id, []),
+                        "claims": self.claims.get(patient_id, []),
+                        "medications": self.medications.get(patient_id, []),
+                    }]
+            return []
+        
         # Patient list query
         if "haslabel('patient')" in query_lower and "valuemap" in query_lower:
             if patient_id != "patient-001" or "patient_id" in bindings:
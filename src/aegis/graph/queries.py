@@ -4,21 +4,52 @@ Graph Query Library
 Pre-built Gremlin queries for common healthcare graph operations.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 import structlog
 
+from aegis.graph.cache import GraphReadCache, get_graph_read_cache
 from aegis.graph.client import GraphClient
 
 logger = structlog.get_logger(__name__)
 
+# Patient 360 in one traversal. The patient's encounters are collected once
+# and reused for the encounter details and the claims billed for them.
+PATIENT_360_QUERY = """
+g.V(patient_id).hasLabel('Patient')
+    .project('patient', 'encounter_vertices', 'medications')
+        .by(valueMap(true))
+        .by(out('HAS_ENCOUNTER').fold())
+        .by(out('HAS_MEDICATION').valueMap(true).fold())
+    .project('patient', 'encounters', 'claims', 'medications')
+        .by(select('patient'))
+        .by(
+            select('encounter_vertices').unfold()
+                .project('encounter', 'diagnoses', 'procedures')
+                .by(valueMap(true))
+                .by(out('HAS_DIAGNOSIS').valueMap(true).fold())
+                .by(out('HAS_PROCEDURE').valueMap(true).fold())
+                .fold()
+        )
+        .by(
+            select('encounter_vertices').unfold()
+                .out('BILLED_FOR')
+                .project('claim', 'denials')
+                .by(valueMap(true))
+                .by(out('HAS_DENIAL').valueMap(true).fold())
+                .fold()
+        )
+        .by(select('medications'))
+"""
+
 
 @dataclass
 class GraphQueries:
     """Collection of common graph queries for healthcare data."""
     
     client: GraphClient
+    cache: GraphReadCache = field(default_factory=get_graph_read_cache)
     
     # =========================================================================
     # Patient Queries
@@ -93,7 +124,7 @@ class GraphQueries:
         
         return await self.client.execute(query, bindings)
     
-    async def get_patient_360_view(self, patient_id: str) -> dict:
+    async def get_patient_360_view(self, patient_id: str, use_cache: bool = True) -> dict:
         """
         Get a comprehensive 360-degree view of a patient.
         
@@ -104,59 +135,29 @@ class GraphQueries:
         - Claims
         - Medications
         
+        The view is fetched in a single traversal and served from the graph
+        read cache, which GraphWriter invalidates on writes to the patient's
+        subgraph. Cached views are shared; don't mutate the result.
+        
         Args:
             patient_id: Patient vertex ID
+            use_cache: Read through the cache (False always queries the graph)
             
         Returns:
             Dictionary with patient and all related data
         """
-        # Get patient
-        patient = await self.get_patient_by_id(patient_id)
-        if not patient:
-            return {}
-        
-        # Get encounters with nested data
-        encounters_query = """
-        g.V(patient_id)
-            .out('HAS_ENCOUNTER')
-            .project('encounter', 'diagnoses', 'procedures')
-            .by(valueMap(true))
-            .by(out('HAS_DIAGNOSIS').valueMap(true).fold())
-            .by(out('HAS_PROCEDURE').valueMap(true).fold())
-        """
-        encounters = await self.client.execute(
-            encounters_query, 
-            {"patient_id": patient_id}
-        )
-        
-        # Get claims
-        claims_query = """
-        g.V(patient_id)
-            .out('HAS_ENCOUNTER')
-            .out('BILLED_FOR')
-            .project('claim', 'denials')
-            .by(valueMap(true))
-            .by(out('HAS_DENIAL').valueMap(true).fold())
-        """
-        claims = await self.client.execute(claims_query, {"patient_id": patient_id})
-        
-        # Get medications
-        medications_query = """
-        g.V(patient_id)
-            .out('HAS_MEDICATION')
-            .valueMap(true)
-        """
-        medications = await self.client.execute(
-            medications_query, 
-            {"patient_id": patient_id}
+        if not use_cache:
+            return await self._fetch_patient_360(patient_id)
+        return await self.cache.get_or_load(
+            str(patient_id),
+            lambda: self._fetch_patient_360(patient_id),
         )
-        
-        return {
-            "patient": patient,
-            "encounters": encounters,
-            "claims": claims,
-            "medications": medications,
-        }
+    
+    async def _fetch_patient_360(self, patient_id: str) -> dict:
+        results = await self.client.execute(PATIENT_360_QUERY, {"patient_id": patient_id})
+        if not results:
+            return {}
+        return results[0]
     
     # =========================================================================
     # Claim Queries
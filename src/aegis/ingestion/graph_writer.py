@@ -2,21 +2,95 @@
 Graph Writer Service
 
 Writes parsed healthcare data to the JanusGraph/Neptune knowledge graph.
+
+Entities can be written one upsert at a time, or in bulk: vertices grouped
+by label into ``inject(...).unfold()`` batch upserts and edges resolved from
+the source-id -> vertex-id map in batch traversals, so a bundle costs a few
+round-trips per label instead of one per entity and edge.
+
+Every write invalidates the graph read cache entries built from the vertices
+it touches, so cached patient views never outlive a write in this process.
 """
 
 from datetime import date, datetime
 from typing import Any
 from decimal import Decimal
+import asyncio
+import time
 
 import structlog
 
+from aegis.config import get_settings
 from aegis.models.core import Patient, Provider, Organization
 from aegis.models.clinical import Encounter, Diagnosis, Procedure, Observation, Medication
 from aegis.models.financial import Claim, Denial, Appeal
+from aegis.graph.cache import GraphReadCache, get_graph_read_cache
 from aegis.graph.client import GraphClient
 
 logger = structlog.get_logger(__name__)
 
+# Properties set by each vertex upsert (besides the tenant/source key and updated_at)
+VERTEX_PROPERTIES: dict[str, tuple[str, ...]] = {
+    "Patient": ("mrn", "given_name", "family_name", "birth_date", "gender"),
+    "Provider": ("npi", "given_name", "family_name"),
+    "Organization": ("name", "type"),
+    "Encounter": ("type", "encounter_class", "status", "admit_date"),
+    "Diagnosis": ("icd10_code", "description", "type", "rank"),
+    "Procedure": ("cpt_code", "description", "procedure_date", "status"),
+    "Observation": ("type", "value", "observation_date"),
+    "Claim": ("claim_number", "type", "status", "service_date_start", "billed_amount"),
+    "Denial": ("reason_code", "category", "description", "denied_amount", "denial_date"),
+}
+
+# parse_bundle() result key -> vertex label, in write order
+BUNDLE_VERTEX_LABELS: dict[str, str] = {
+    "patients": "Patient",
+    "providers": "Provider",
+    "organizations": "Organization",
+    "encounters": "Encounter",
+    "diagnoses": "Diagnosis",
+    "procedures": "Procedure",
+    "observations": "Observation",
+    "claims": "Claim",
+}
+
+# Upsert a batch of same-label vertices. Candidates are narrowed with indexed
+# has() steps before matching each row on source_id. Bindings must not be
+# named after T tokens (label, id, key, value): the server's script engine
+# static-imports T.*, which would shadow them.
+BULK_UPSERT_VERTICES = """
+g.inject(rows).unfold().as('row')
+    .coalesce(
+        V().has(vertex_label, 'tenant_id', tenant_id)
+            .has('source_system', source_system)
+            .has('source_id', within(source_ids))
+            .where(eq('row')).by('source_id').by(select('source_id')),
+        addV(vertex_label)
+            .property('tenant_id', tenant_id)
+            .property('source_system', source_system)
+            .property('source_id', select('row').select('source_id'))
+    ).as('v')
+    .sideEffect(
+        select('row').select('props').unfold().as('kv')
+            .select('v').property(select('kv').by(keys), select('kv').by(values))
+    )
+    .project('source_id', 'id')
+        .by(select('row').select('source_id'))
+        .by(id())
+"""
+
+# Create a batch of same-label edges (idempotently) from vertex-id pairs
+BULK_CREATE_EDGES = """
+g.inject(rows).unfold().as('e')
+    .V(from_ids).where(eq('e')).by(T.id).by(select('from'))
+    .coalesce(
+        outE(edge_label).where(inV().where(eq('e')).by(T.id).by(select('to'))),
+        addE(edge_label).to(V(to_ids).where(eq('e')).by(T.id).by(select('to')))
+            .property('created_at', created_at)
+    )
+    .count()
+"""
+
 
 class GraphWriter:
     """
@@ -31,16 +105,32 @@ class GraphWriter:
             await writer.create_edge(patient_id, "HAS_ENCOUNTER", encounter_id)
     """
     
-    def __init__(self, graph_client: GraphClient | None = None):
+    def __init__(
+        self,
+        graph_client: GraphClient | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        read_cache: GraphReadCache | None = None,
+    ):
         """
         Initialize the graph writer.
         
         Args:
             graph_client: Optional GraphClient instance. If not provided,
                          a new one will be created.
+            batch_size: Vertices/edges per bulk batch traversal
+            max_concurrency: Bulk batch traversals in flight at once, across
+                             all labels this writer is writing
+            read_cache: Read cache to invalidate on writes (default: the
+                        shared graph read cache)
         """
+        settings = get_settings().graph_db
         self._client = graph_client
         self._owns_client = graph_client is None
+        self.batch_size = batch_size or settings.write_batch_size
+        self.max_concurrency = max_concurrency or settings.write_concurrency
+        self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        self.read_cache = read_cache or get_graph_read_cache()
     
     async def __aenter__(self) -> "GraphWriter":
         if self._owns_client:
@@ -85,6 +175,21 @@ class GraphWriter:
         
         return props
     
+    def _upsert_bindings(self, label: str, props: dict[str, Any]) -> dict[str, Any]:
+        """
+        Bindings for a per-vertex upsert. Every property the script sets is
+        bound; unset ones are None, which removes a stale stored value
+        (TinkerPop >= 3.5 drops a property set to null), as the bulk path does.
+        """
+        bindings = {key: None for key in VERTEX_PROPERTIES[label]}
+        bindings.update(props)
+        bindings["updated_at"] = datetime.now().isoformat()
+        return bindings
+    
+    def _invalidate(self, *vertex_ids: str) -> None:
+        """Drop cached views built from any of these vertices."""
+        self.read_cache.invalidate_vertices(vertex_ids)
+    
     # =========================================================================
     # Vertex Writers
     # =========================================================================
@@ -130,10 +235,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Patient", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Patient vertex", vertex_id=vertex_id, mrn=patient.mrn)
         return vertex_id
@@ -162,10 +266,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Provider", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Provider vertex", vertex_id=vertex_id, npi=provider.npi)
         return vertex_id
@@ -193,10 +296,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Organization", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Organization vertex", vertex_id=vertex_id, name=org.name)
         return vertex_id
@@ -226,10 +328,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Encounter", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Encounter vertex", vertex_id=vertex_id, source_id=encounter.source_id)
         return vertex_id
@@ -259,10 +360,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Diagnosis", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Diagnosis vertex", vertex_id=vertex_id, icd10=diagnosis.icd10_code)
         return vertex_id
@@ -292,10 +392,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Procedure", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Procedure vertex", vertex_id=vertex_id, cpt=procedure.cpt_code)
         return vertex_id
@@ -324,10 +423,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Observation", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Observation vertex", vertex_id=vertex_id, source_id=observation.source_id)
         return vertex_id
@@ -358,10 +456,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Claim", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Claim vertex", vertex_id=vertex_id, claim_number=claim.claim_number)
         return vertex_id
@@ -392,10 +489,9 @@ class GraphWriter:
             .id()
         """
         
-        props["updated_at"] = datetime.now().isoformat()
-        
-        result = await self.client.execute(query, props)
+        result = await self.client.execute(query, self._upsert_bindings("Denial", props))
         vertex_id = result[0] if result else None
+        self._invalidate(vertex_id)
         
         logger.debug("Wrote Denial vertex", vertex_id=vertex_id, reason=denial.reason_code)
         return vertex_id
@@ -443,6 +539,7 @@ class GraphWriter:
         }
         
         await self.client.execute(query, bindings)
+        self._invalidate(from_vertex_id, to_vertex_id)
         
         logger.debug(
             "Created edge",
@@ -452,20 +549,117 @@ class GraphWriter:
         )
         return True
     
+    # =========================================================================
+    # Batch Writers
+    # =========================================================================
+    
+    def _vertex_row(self, label: str, model: Any, updated_at: str) -> dict[str, Any]:
+        """
+        Row for a bulk upsert: the source key plus the label's properties.
+        Unset properties are sent as None so the upsert clears them, exactly
+        as the per-vertex writers do.
+        """
+        props = self._build_properties(model)
+        row_props = {key: props.get(key) for key in VERTEX_PROPERTIES[label]}
+        row_props["updated_at"] = updated_at
+        return {"source_id": model.source_id, "props": row_props}
+    
+    async def _run_batches(self, query: str, batches: list[dict[str, Any]]) -> list[Any]:
+        """
+        Submit batch traversals. The writer's semaphore is shared by every
+        call, so concurrent labels together stay within ``max_concurrency``.
+        """
+        async def run(bindings: dict[str, Any]) -> list[Any]:
+            async with self._semaphore:
+                return await self.client.execute(query, bindings)
+        
+        results = await asyncio.gather(*[run(bindings) for bindings in batches])
+        return [item for result in results for item in result]
+    
+    async def write_vertices_batch(self, label: str, models: list[Any]) -> dict[str, str]:
+        """
+        Upsert many vertices of one label.
+        
+        Rows are grouped by (tenant_id, source_system) and sent in chunks of
+        ``batch_size``; each chunk is one traversal (and one transaction).
+        
+        Returns:
+            Map of source_id -> vertex ID
+        """
+        updated_at = datetime.now().isoformat()
+        groups: dict[tuple[str, str], dict[str, dict[str, Any]]] = {}
+        for model in models:
+            # Keyed by source_id so duplicates in a bundle collapse to the last one
+            groups.setdefault((model.tenant_id, model.source_system), {})[model.source_id] = (
+                self._vertex_row(label, model, updated_at)
+            )
+        
+        batches = []
+        for (tenant_id, source_system), rows_by_id in groups.items():
+            rows = list(rows_by_id.values())
+            for start in range(0, len(rows), self.batch_size):
+                chunk = rows[start:start + self.batch_size]
+                batches.append({
+                    "rows": chunk,
+                    "source_ids": [row["source_id"] for row in chunk],
+                    "vertex_label": label,
+                    "tenant_id": tenant_id,
+                    "source_system": source_system,
+                })
+        
+        results = await self._run_batches(BULK_UPSERT_VERTICES, batches)
+        id_map = {item["source_id"]: item["id"] for item in results}
+        self._invalidate(*id_map.values())
+        return id_map
+    
+    async def create_edges_batch(self, edge_label: str, pairs: list[tuple[str, str]]) -> int:
+        """
+        Create many edges of one label from (from_vertex_id, to_vertex_id)
+        pairs. Existing edges are left as they are.
+        
+        Returns:
+            Number of edges created or already present
+        """
+        created_at = datetime.now().isoformat()
+        pairs = list(dict.fromkeys(pairs))
+        batches = []
+        for start in range(0, len(pairs), self.batch_size):
+            chunk = pairs[start:start + self.batch_size]
+            batches.append({
+                "rows": [{"from": from_id, "to": to_id} for from_id, to_id in chunk],
+                "from_ids": list(dict.fromkeys(from_id for from_id, _ in chunk)),
+                "to_ids": list(dict.fromkeys(to_id for _, to_id in chunk)),
+                "edge_label": edge_label,
+                "created_at": created_at,
+            })
+        
+        results = await self._run_batches(BULK_CREATE_EDGES, batches)
+        self._invalidate(*(vertex_id for pair in pairs for vertex_id in pair))
+        return int(sum(results))
+    
     # =========================================================================
     # Bulk Writers
     # =========================================================================
     
-    async def write_fhir_bundle_result(self, parsed_result: dict[str, list]) -> dict[str, int]:
+    async def write_fhir_bundle_result(
+        self,
+        parsed_result: dict[str, list],
+        bulk: bool = True,
+    ) -> dict[str, int]:
         """
         Write all entities from a parsed FHIR bundle to the graph.
         
         Args:
             parsed_result: Output from FHIRParser.parse_bundle()
-            
+            bulk: Write with batch traversals (default) instead of one
+                  upsert per entity and edge
+        
         Returns:
             Dictionary with counts of written entities
         """
+        if bulk:
+            return await self._write_bundle_bulk(parsed_result)
+        
         counts = {
             "patients": 0,
             "providers": 0,
@@ -592,3 +786,69 @@ class GraphWriter:
         
         logger.info("Wrote FHIR bundle to graph", **counts)
         return counts
+    
+    async def _write_bundle_bulk(self, parsed_result: dict[str, list]) -> dict[str, int]:
+        """
+        Bulk variant of ``write_fhir_bundle_result``.
+        
+        All vertex labels are upserted concurrently (within the concurrency
+        limit), then edges are resolved from the source_id -> vertex ID maps
+        and created per edge label.
+        """
+        start = time.perf_counter()
+        
+        keys = [key for key in BUNDLE_VERTEX_LABELS if parsed_result.get(key)]
+        id_maps = dict(zip(keys, await asyncio.gather(*[
+            self.write_vertices_batch(BUNDLE_VERTEX_LABELS[key], parsed_result[key])
+            for key in keys
+        ])))
+        vertex_time = time.perf_counter() - start
+        
+        patient_ids = id_maps.get("patients", {})
+        provider_ids = id_maps.get("providers", {})
+        encounter_ids = id_maps.get("encounters", {})
+        
+        edges: dict[str, list[tuple[str, str]]] = {}
+        for encounter in parsed_result.get("encounters", []):
+            vertex_id = encounter_ids.get(encounter.source_id)
+            if not vertex_id:
+                continue
+            if encounter.patient_id in patient_ids:
+                edges.setdefault("HAS_ENCOUNTER", []).append(
+                    (patient_ids[encounter.patient_id], vertex_id)
+                )
+            if encounter.attending_provider_id and encounter.attending_provider_id in provider_ids:
+                edges.setdefault("ATTENDED_BY", []).append(
+                    (vertex_id, provider_ids[encounter.attending_provider_id])
+                )
+        
+        for key, edge_label in (
+            ("diagnoses", "HAS_DIAGNOSIS"),
+            ("procedures", "HAS_PROCEDURE"),
+            ("observations", "HAS_OBSERVATION"),
+            ("claims", "BILLED_FOR"),
+        ):
+            vertex_ids = id_maps.get(key, {})
+            for entity in parsed_result.get(key, []):
+                vertex_id = vertex_ids.get(entity.source_id)
+                if vertex_id and entity.encounter_id and entity.encounter_id in encounter_ids:
+                    edges.setdefault(edge_label, []).append(
+                        (encounter_ids[entity.encounter_id], vertex_id)
+                    )
+        
+        edge_start = time.perf_counter()
+        edge_counts = await asyncio.gather(*[
+            self.create_edges_batch(edge_label, pairs) for edge_label, pairs in edges.items()
+        ])
+        edge_time = time.perf_counter() - edge_start
+        elapsed = time.perf_counter() - start
+        
+        counts = {key: len(id_maps.get(key, {})) for key in BUNDLE_VERTEX_LABELS}
+        counts["edges"] = sum(edge_counts)
+        vertices = sum(counts[key] for key in BUNDLE_VERTEX_LABELS)
+        counts["elapsed_ms"] = int(elapsed * 1000)
+        counts["vertices_per_second"] = int(vertices / vertex_time) if vertex_time > 0 else 0
+        counts["edges_per_second"] = int(counts["edges"] / edge_time) if edge_time > 0 else 0
+        
+        logger.info("Bulk wrote FHIR bundle to graph", **counts)
+        return counts
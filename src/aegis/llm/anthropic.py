@@ -16,7 +16,7 @@ from pydantic import BaseModel
 
 from aegis.llm.providers import (
     LLMProvider, LLMConfig, LLMResponse, Message, Role, 
-    ToolDefinition, TokenUsage
+    ToolDefinition, TokenUsage, MOCK_STREAM_TEXT
 )
 
 logger = structlog.get_logger(__name__)
@@ -57,6 +57,11 @@ class AnthropicProvider(LLMProvider):
             logger.warning(f"Failed to initialize Anthropic client: {e}")
             self.client = None
     
+    async def close(self):
+        """Close the SDK client's HTTP connection pool."""
+        if self.client is not None:
+            await self.client.close()
+    
     async def generate(
         self,
         prompt: str,
@@ -172,7 +177,7 @@ class AnthropicProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream generation."""
         if not self.client:
-            yield "Streaming not available in mock mode."
+            yield MOCK_STREAM_TEXT
             return
         
         formatted_messages = [
@@ -221,4 +226,5 @@ class AnthropicProvider(LLMProvider):
             ),
             latency_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000) + 75,
             finish_reason="stop",
+            is_mock=True,
         )
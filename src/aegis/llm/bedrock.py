@@ -11,14 +11,15 @@ Supports:
 from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 import json
-import asyncio
+import time
 
 import structlog
 from pydantic import BaseModel
 
+from aegis.bedrock.bridge import get_bedrock_bridge
 from aegis.llm.providers import (
     LLMProvider, LLMConfig, LLMResponse, Message, Role, 
-    ToolDefinition, TokenUsage
+    ToolDefinition, TokenUsage, MOCK_STREAM_TEXT
 )
 
 logger = structlog.get_logger(__name__)
@@ -45,7 +46,19 @@ class BedrockProvider(LLMProvider):
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = None
+        self.bridge = get_bedrock_bridge()
         self._init_client()
+        
+        from aegis.observability.metrics import get_metrics_collector
+        metrics = get_metrics_collector()
+        self._first_token_histogram = metrics.histogram(
+            "aegis_llm_stream_first_token_seconds",
+            "Time from stream request to first text token",
+        )
+        self._inter_token_histogram = metrics.histogram(
+            "aegis_llm_stream_inter_token_seconds",
+            "Time between consecutive streamed text tokens",
+        )
     
     def _init_client(self):
         """Initialize Bedrock client."""
@@ -114,7 +127,7 @@ class BedrockProvider(LLMProvider):
                 request_body["tools"] = self._format_tools(tools)
             
             # Invoke model
-            response = await asyncio.to_thread(
+            response = await self.bridge.call(
                 self.client.invoke_model,
                 modelId=self.config.model,
                 body=json.dumps(request_body),
@@ -169,9 +182,15 @@ class BedrockProvider(LLMProvider):
         messages: List[Message],
         **kwargs,
     ) -> AsyncIterator[str]:
-        """Stream generation."""
+        """
+        Stream generation.
+        
+        The botocore event stream is read in a bridge worker thread, so the
+        event loop never blocks between tokens. Closing this generator (e.g.
+        the HTTP client disconnects) stops the worker and closes the stream.
+        """
         if not self.client:
-            yield "Streaming not available in mock mode."
+            yield MOCK_STREAM_TEXT
             return
         
         formatted_messages = self._format_messages(messages)
@@ -183,22 +202,35 @@ class BedrockProvider(LLMProvider):
             "messages": formatted_messages,
         }
         
-        try:
-            response = await asyncio.to_thread(
-                self.client.invoke_model_with_response_stream,
+        def open_stream():
+            return self.client.invoke_model_with_response_stream(
                 modelId=self.config.model,
                 body=json.dumps(request_body),
-            )
-            
-            for event in response["body"]:
+            )["body"]
+        
+        first_token = self._first_token_histogram.labels(provider="bedrock", model=self.config.model)
+        inter_token = self._inter_token_histogram.labels(provider="bedrock", model=self.config.model)
+        start = time.perf_counter()
+        last_token = None
+        events = self.bridge.stream(open_stream)
+        try:
+            async for event in events:
                 chunk = json.loads(event["chunk"]["bytes"])
                 if chunk["type"] == "content_block_delta":
                     if chunk["delta"]["type"] == "text_delta":
+                        now = time.perf_counter()
+                        if last_token is None:
+                            first_token.observe(now - start)
+                        else:
+                            inter_token.observe(now - last_token)
+                        last_token = now
                         yield chunk["delta"]["text"]
-                        
+        
         except Exception as e:
             logger.error(f"Bedrock streaming error: {e}")
             yield f"Error: {str(e)}"
+        finally:
+            await events.aclose()
     
     def _format_messages(self, messages: List[Message]) -> List[dict]:
         """Format messages for Bedrock API."""
@@ -246,4 +278,5 @@ class BedrockProvider(LLMProvider):
             ),
             latency_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000) + 100,
             finish_reason="stop",
+            is_mock=True,
         )
@@ -6,13 +6,22 @@ Healthcare-specific benchmarks for evaluating LLM performance:
 - Medical coding
 - Clinical summarization
 - Medication safety
+
+Plus a load-testing mode that runs the suite at several concurrency levels
+(and optionally a fixed request rate) and reports tail latency, time to
+first token, tokens/sec and error rates, exportable as JSON or CSV.
 """
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime, timezone
-from typing import Any, Callable, Coroutine
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Coroutine
 from enum import Enum
 import asyncio
+import csv
+import io
 import json
+import math
+import random
 import time
 import structlog
 
@@ -66,6 +75,9 @@ class ModelBenchmarkSummary:
     average_latency_ms: float
     total_tokens: int
     by_category: dict[str, dict[str, float]] = field(default_factory=dict)
+    p50_latency_ms: float = 0.0
+    p95_latency_ms: float = 0.0
+    p99_latency_ms: float = 0.0
 
 
 @dataclass
@@ -79,6 +91,81 @@ class BenchmarkComparison:
     notes: str = ""
 
 
+@dataclass
+class LoadTestLevel:
+    """Load-test measurements at one concurrency level."""
+    model_id: str
+    concurrency: int
+    request_rate: float | None
+    streaming: bool
+    requests: int
+    errors: int
+    error_rate: float
+    duration_s: float
+    throughput_rps: float
+    latency_mean_ms: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    ttft_p50_ms: float | None
+    ttft_p95_ms: float | None
+    ttft_p99_ms: float | None
+    output_tokens: int
+    tokens_per_second: float
+
+
+@dataclass
+class LoadTestReport:
+    """Results of a load test across concurrency levels."""
+    model_id: str
+    run_at: datetime
+    levels: list[LoadTestLevel] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        return {
+            "model_id": self.model_id,
+            "run_at": self.run_at.isoformat(),
+            "levels": [asdict(level) for level in self.levels],
+        }
+    
+    def to_json(self, path: str | Path | None = None) -> str:
+        """Serialize as JSON, writing to ``path`` if given."""
+        data = json.dumps(self.to_dict(), indent=2)
+        if path:
+            Path(path).write_text(data)
+        return data
+    
+    def to_csv(self, path: str | Path | None = None) -> str:
+        """One row per concurrency level, writing to ``path`` if given."""
+        columns = ["run_at"] + [f.name for f in fields(LoadTestLevel)]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for level in self.levels:
+            writer.writerow({"run_at": self.run_at.isoformat(), **asdict(level)})
+        data = buffer.getvalue()
+        if path:
+            Path(path).write_text(data, newline="")
+        return data
+
+
+@dataclass
+class _Sample:
+    latency_s: float
+    ttft_s: float | None = None
+    output_tokens: int = 0
+    error: str | None = None
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percentile / 100.0 * len(ordered)) - 1)
+    return ordered[rank]
+
+
 # Healthcare benchmark tasks
 HEALTHCARE_BENCHMARKS: list[BenchmarkTask] = [
     # Clinical Reasoning
@@ -240,26 +327,106 @@ class LLMBenchmark:
     - Custom benchmark tasks
     - Multi-model comparison
     - Detailed scoring and analysis
+    - Load testing at configurable concurrency and request rate
     """
     
     def __init__(
         self,
         model_executor: Callable[[str, str], Coroutine[Any, Any, dict]] | None = None,
+        stream_executor: Callable[[str, str], AsyncIterator[str]] | None = None,
     ):
         """
         Initialize the benchmark runner.
         
         Args:
             model_executor: Async function(model_id, prompt) -> {"response": str, "usage": dict}
+            stream_executor: Function(model_id, prompt) -> async iterator of text
+                chunks, used by streaming load tests to measure time to first token
         """
         self.model_executor = model_executor
+        self.stream_executor = stream_executor
         self._results: list[BenchmarkResult] = []
     
+    @classmethod
+    def for_registry(cls, registry=None) -> "LLMBenchmark":
+        """
+        Benchmark providers of an LLMRegistry; model IDs are provider names.
+        
+        Calls bypass the response cache so every request reaches the provider.
+        Mock fallbacks and streamed ``Error:`` chunks count as failed requests,
+        so a backend that is down shows up in the error rate.
+        """
+        from aegis.llm.providers import MOCK_STREAM_TEXT, Message, Role
+        from aegis.llm.registry import get_llm_registry
+        
+        registry = registry or get_llm_registry()
+        
+        async def execute(model_id: str, prompt: str) -> dict:
+            response = await registry.generate(prompt, provider=model_id, use_cache=False)
+            if response.is_mock:
+                raise RuntimeError(f"{model_id} returned a mock fallback")
+            return {
+                "response": response.content,
+                "usage": {
+                    "input_tokens": response.usage.input_tokens,
+                    "output_tokens": response.usage.output_tokens,
+                },
+            }
+        
+        async def stream(model_id: str, prompt: str) -> AsyncIterator[str]:
+            provider = registry.get_provider(model_id)
+            # Providers report stream failures (and mock mode) as text chunks
+            async for chunk in provider.stream([Message(role=Role.USER, content=prompt)]):
+                if chunk.startswith("Error:") or chunk == MOCK_STREAM_TEXT:
+                    raise RuntimeError(f"{model_id} stream failed: {chunk}")
+                yield chunk
+        
+        return cls(model_executor=execute, stream_executor=stream)
+    
+    @classmethod
+    def with_stub(
+        cls,
+        latency_s: float = 0.05,
+        ttft_s: float = 0.01,
+        output_tokens: int = 50,
+        jitter: float = 0.2,
+        error_rate: float = 0.0,
+    ) -> "LLMBenchmark":
+        """
+        Benchmark against an in-process stub model (no network), useful for
+        measuring the harness itself and for reproducible comparisons.
+        """
+        def delay(base: float) -> float:
+            return base * (1 + random.uniform(-jitter, jitter))
+        
+        def maybe_fail():
+            if error_rate and random.random() < error_rate:
+                raise RuntimeError("stub error")
+        
+        async def execute(model_id: str, prompt: str) -> dict:
+            await asyncio.sleep(delay(latency_s))
+            maybe_fail()
+            return {
+                "response": "stub " * output_tokens,
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": output_tokens},
+            }
+        
+        async def stream(model_id: str, prompt: str) -> AsyncIterator[str]:
+            await asyncio.sleep(delay(ttft_s))
+            maybe_fail()
+            per_token = max(0.0, latency_s - ttft_s) / max(1, output_tokens)
+            for _ in range(output_tokens):
+                yield "stub "
+                await asyncio.sleep(per_token)
+        
+        return cls(model_executor=execute, stream_executor=stream)
+    
     async def run_benchmark(
         self,
         model_id: str,
         tasks: list[BenchmarkTask] | None = None,
         categories: list[BenchmarkCategory] | None = None,
+        concurrency: int = 1,
     ) -> ModelBenchmarkSummary:
         """
         Run benchmarks on a model.
@@ -268,6 +435,7 @@ class LLMBenchmark:
             model_id: Model to benchmark
             tasks: Specific tasks (default: healthcare suite)
             categories: Filter to specific categories
+            concurrency: Tasks in flight at once
         
         Returns:
             ModelBenchmarkSummary
@@ -281,30 +449,33 @@ class LLMBenchmark:
             "Starting benchmark",
             model=model_id,
             tasks=len(tasks),
+            concurrency=concurrency,
         )
         
-        results = []
-        
-        for task in tasks:
-            try:
-                result = await self._run_task(model_id, task)
-                results.append(result)
-                self._results.append(result)
-            except Exception as e:
-                logger.error(
-                    "Benchmark task failed",
-                    task_id=task.id,
-                    error=str(e),
-                )
-                results.append(BenchmarkResult(
-                    task_id=task.id,
-                    model_id=model_id,
-                    response="",
-                    latency_ms=0,
-                    input_tokens=0,
-                    output_tokens=0,
-                    error=str(e),
-                ))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_one(task: BenchmarkTask) -> BenchmarkResult:
+            async with semaphore:
+                try:
+                    return await self._run_task(model_id, task)
+                except Exception as e:
+                    logger.error(
+                        "Benchmark task failed",
+                        task_id=task.id,
+                        error=str(e),
+                    )
+                    return BenchmarkResult(
+                        task_id=task.id,
+                        model_id=model_id,
+                        response="",
+                        latency_ms=0,
+                        input_tokens=0,
+                        output_tokens=0,
+                        error=str(e),
+                    )
+        
+        results = await asyncio.gather(*[run_one(task) for task in tasks])
+        self._results.extend(r for r in results if r.error is None)
         
         # Calculate summary
         completed = [r for r in results if r.error is None]
@@ -321,9 +492,10 @@ class LLMBenchmark:
         total_tokens = sum(r.input_tokens + r.output_tokens for r in results)
         
         # By category
+        task_index = {t.id: t for t in tasks}
         by_category = {}
         for cat in BenchmarkCategory:
-            cat_results = [r for r in completed if self._get_task(r.task_id).category == cat]
+            cat_results = [r for r in completed if task_index[r.task_id].category == cat]
             if cat_results:
                 by_category[cat.value] = {
                     "count": len(cat_results),
@@ -340,6 +512,9 @@ class LLMBenchmark:
             average_latency_ms=avg_latency,
             total_tokens=total_tokens,
             by_category=by_category,
+            p50_latency_ms=_percentile([r.latency_ms for r in completed], 50),
+            p95_latency_ms=_percentile([r.latency_ms for r in completed], 95),
+            p99_latency_ms=_percentile([r.latency_ms for r in completed], 99),
         )
         
         logger.info(
@@ -351,20 +526,13 @@ class LLMBenchmark:
         
         return summary
     
-    def _get_task(self, task_id: str) -> BenchmarkTask:
-        """Get task by ID."""
-        for task in HEALTHCARE_BENCHMARKS:
-            if task.id == task_id:
-                return task
-        raise ValueError(f"Task not found: {task_id}")
-    
     async def _run_task(
         self,
         model_id: str,
         task: BenchmarkTask,
     ) -> BenchmarkResult:
         """Run a single benchmark task."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Execute model
         if self.model_executor:
@@ -379,7 +547,7 @@ class LLMBenchmark:
             response = f"[Mock response for {task.id}]"
             usage = {"input_tokens": 100, "output_tokens": 50}
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         latency_ms = (end_time - start_time) * 1000
         
         # Score the response
@@ -479,6 +647,159 @@ class LLMBenchmark:
             notes=f"Winner: {winner} with score {best_score:.2%}",
         )
     
+    # =========================================================================
+    # Load Testing
+    # =========================================================================
+    
+    async def run_load_test(
+        self,
+        model_id: str,
+        concurrency_levels: list[int] | tuple[int, ...] = (1, 4, 16),
+        requests_per_level: int = 50,
+        request_rate: float | None = None,
+        stream: bool = False,
+        tasks: list[BenchmarkTask] | None = None,
+    ) -> LoadTestReport:
+        """
+        Load-test a model at each concurrency level.
+        
+        Each level sends ``requests_per_level`` prompts, cycling through the
+        tasks. Without ``request_rate`` the level is closed-loop: exactly
+        ``concurrency`` requests are always in flight. With it, requests
+        arrive at that rate (open loop) whatever is in flight, and
+        ``concurrency`` caps how many are served at once. Latency is
+        measured from the scheduled arrival, so queueing for a slot shows
+        up as latency.
+        
+        ``stream=True`` uses the stream executor and records time to first
+        token; output tokens are then counted as streamed chunks.
+        """
+        if stream and self.stream_executor is None:
+            raise ValueError("Streaming load test needs a stream_executor")
+        tasks = tasks or HEALTHCARE_BENCHMARKS
+        report = LoadTestReport(model_id=model_id, run_at=datetime.now(timezone.utc))
+        
+        for concurrency in concurrency_levels:
+            prompts = [tasks[i % len(tasks)] for i in range(requests_per_level)]
+            level = await self._run_level(model_id, prompts, concurrency, request_rate, stream)
+            report.levels.append(level)
+            logger.info(
+                "Load test level completed",
+                model=model_id,
+                concurrency=concurrency,
+                p95_ms=level.latency_p95_ms,
+                throughput_rps=level.throughput_rps,
+                error_rate=level.error_rate,
+            )
+        
+        return report
+    
+    async def _run_level(
+        self,
+        model_id: str,
+        prompts: list[BenchmarkTask],
+        concurrency: int,
+        request_rate: float | None,
+        stream: bool,
+    ) -> LoadTestLevel:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_closed(task: BenchmarkTask) -> _Sample:
+            try:
+                return await self._timed_request(model_id, task, stream)
+            finally:
+                semaphore.release()
+        
+        async def run_open(task: BenchmarkTask, arrival: float) -> _Sample:
+            async with semaphore:
+                return await self._timed_request(model_id, task, stream, arrival)
+        
+        start = time.perf_counter()
+        in_flight = []
+        for i, task in enumerate(prompts):
+            if request_rate:
+                # Arrivals keep to the schedule; waiting for a slot counts as latency
+                arrival = start + i / request_rate
+                delay = arrival - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                in_flight.append(asyncio.create_task(run_open(task, arrival)))
+            else:
+                await semaphore.acquire()
+                in_flight.append(asyncio.create_task(run_closed(task)))
+        samples: list[_Sample] = await asyncio.gather(*in_flight)
+        duration = time.perf_counter() - start
+        
+        ok = [s for s in samples if s.error is None]
+        latencies = [s.latency_s * 1000 for s in ok]
+        ttfts = [s.ttft_s * 1000 for s in ok if s.ttft_s is not None]
+        output_tokens = sum(s.output_tokens for s in ok)
+        
+        return LoadTestLevel(
+            model_id=model_id,
+            concurrency=concurrency,
+            request_rate=request_rate,
+            streaming=stream,
+            requests=len(samples),
+            errors=len(samples) - len(ok),
+            error_rate=round((len(samples) - len(ok)) / len(samples), 4) if samples else 0.0,
+            duration_s=round(duration, 3),
+            throughput_rps=round(len(ok) / duration, 2) if duration > 0 else 0.0,
+            latency_mean_ms=round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            latency_p50_ms=round(_percentile(latencies, 50), 2),
+            latency_p95_ms=round(_percentile(latencies, 95), 2),
+            latency_p99_ms=round(_percentile(latencies, 99), 2),
+            ttft_p50_ms=round(_percentile(ttfts, 50), 2) if ttfts else None,
+            ttft_p95_ms=round(_percentile(ttfts, 95), 2) if ttfts else None,
+            ttft_p99_ms=round(_percentile(ttfts, 99), 2) if ttfts else None,
+            output_tokens=output_tokens,
+            tokens_per_second=round(output_tokens / duration, 2) if duration > 0 else 0.0,
+        )
+    
+    async def _timed_request(
+        self,
+        model_id: str,
+        task: BenchmarkTask,
+        stream: bool,
+        arrival: float | None = None,
+    ) -> _Sample:
+        """
+        Send one request, measuring latency (and time to first token when streaming).
+        
+        Both are measured from ``arrival`` (a ``perf_counter`` time) when
+        given, else from when the request is sent.
+        """
+        start = time.perf_counter() if arrival is None else arrival
+        try:
+            if stream:
+                sample = await asyncio.wait_for(
+                    self._consume_stream(model_id, task.prompt, start),
+                    timeout=task.timeout_seconds,
+                )
+            elif self.model_executor:
+                response = await asyncio.wait_for(
+                    self.model_executor(model_id, task.prompt),
+                    timeout=task.timeout_seconds,
+                )
+                sample = _Sample(
+                    latency_s=0.0,
+                    output_tokens=response.get("usage", {}).get("output_tokens", 0),
+                )
+            else:
+                raise ValueError("Load test needs a model_executor")
+        except Exception as e:
+            return _Sample(latency_s=time.perf_counter() - start, error=str(e) or type(e).__name__)
+        sample.latency_s = time.perf_counter() - start
+        return sample
+    
+    async def _consume_stream(self, model_id: str, prompt: str, start: float) -> _Sample:
+        sample = _Sample(latency_s=0.0)
+        async for _ in self.stream_executor(model_id, prompt):
+            if sample.ttft_s is None:
+                sample.ttft_s = time.perf_counter() - start
+            sample.output_tokens += 1
+        return sample
+    
     def get_healthcare_benchmark_suite(self) -> list[BenchmarkTask]:
         """Get the standard healthcare benchmark suite."""
         return HEALTHCARE_BENCHMARKS.copy()
@@ -0,0 +1,260 @@
+"""
+LLM Response Cache
+
+Cache tier in front of LLMRegistry for deterministic calls:
+- Exact layer keyed by (tenant, provider, model, normalized messages,
+  tools, decoding params)
+- Optional semantic layer: near-duplicate prompts within the same
+  (tenant, provider, model, tools, params) namespace are served from the
+  closest cached response above a cosine-similarity threshold
+- TTL and LRU size eviction
+- Per-tenant isolation: the tenant is part of every key and namespace
+
+Only calls whose effective temperature is at most ``max_temperature``
+(default 0) are cached; sampling at higher temperatures is meant to vary.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+import time
+
+import numpy as np
+import structlog
+
+from aegis.llm.providers import LLMResponse, Message, ToolDefinition
+
+logger = structlog.get_logger(__name__)
+
+# Decoding parameters that change the output; each defaults to the LLMConfig field of that name
+DECODING_PARAMS = ("temperature", "max_tokens", "top_p", "top_k", "stop_sequences", "json_mode")
+
+
+@dataclass
+class _CacheEntry:
+    response: LLMResponse
+    expires_at: float
+    namespace: str
+    tenant_id: Optional[str] = None
+    embedding: Optional[np.ndarray] = None
+
+
+class LLMResponseCache:
+    """
+    Two-tier (exact + semantic) LRU cache of LLM responses.
+    
+    Args:
+        max_entries: Responses kept across all tenants (LRU beyond that)
+        ttl_seconds: Lifetime of a cached response
+        embedding_model: EmbeddingModel for the semantic layer (None disables it)
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+        max_temperature: Highest temperature that is still cached
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        embedding_model=None,
+        similarity_threshold: float = 0.97,
+        max_temperature: float = 0.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.max_temperature = max_temperature
+        
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # namespace -> {key: normalized embedding}
+        self._semantic: Dict[str, Dict[str, np.ndarray]] = {}
+        
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_cost = 0.0
+        self.saved_latency_ms = 0
+    
+    # =========================================================================
+    # Keys
+    # =========================================================================
+    
+    def is_cacheable(self, params: Dict[str, Any]) -> bool:
+        temperature = params.get("temperature")
+        return temperature is not None and temperature <= self.max_temperature
+    
+    @staticmethod
+    def decoding_params(config, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Effective decoding parameters: call kwargs over provider config."""
+        return {name: kwargs.get(name, getattr(config, name, None)) for name in DECODING_PARAMS}
+    
+    @staticmethod
+    def _normalize(messages: List[Message]) -> List[dict]:
+        normalized = []
+        for message in messages:
+            data = message.model_dump(mode="json", exclude_none=True)
+            data["content"] = " ".join(message.content.split())
+            normalized.append(data)
+        return normalized
+    
+    def keys(
+        self,
+        tenant_id: Optional[str],
+        provider: str,
+        model: str,
+        messages: List[Message],
+        tools: Optional[List[ToolDefinition]],
+        params: Dict[str, Any],
+    ) -> Tuple[str, str]:
+        """Return (exact key, semantic namespace) for a call."""
+        namespace = json.dumps(
+            {
+                "tenant": tenant_id,
+                "provider": provider,
+                "model": model,
+                "tools": [t.model_dump(mode="json") for t in tools or []],
+                "params": params,
+            },
+            sort_keys=True,
+        )
+        payload = json.dumps(self._normalize(messages), sort_keys=True)
+        key = hashlib.sha256(f"{namespace}\x00{payload}".encode("utf-8")).hexdigest()
+        namespace = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:32]
+        return key, namespace
+    
+    # =========================================================================
+    # Lookup / Store
+    # =========================================================================
+    
+    async def get(
+        self,
+        key: str,
+        namespace: str,
+        messages: List[Message],
+    ) -> Tuple[Optional[LLMResponse], Optional[np.ndarray]]:
+        """
+        Look up a response.
+        
+        Returns the cached response (or None) and, when the semantic layer
+        is on, the prompt embedding so ``put`` doesn't compute it twice.
+        """
+        entry = self._live(key)
+        if entry is not None:
+            self.exact_hits += 1
+            return self._served(entry), None
+        
+        embedding = None
+        if self.embedding_model is not None:
+            embedding = await self._embed(messages)
+            if embedding is not None:
+                entry = self._nearest(namespace, embedding)
+                if entry is not None:
+                    self.semantic_hits += 1
+                    return self._served(entry), embedding
+        
+        self.misses += 1
+        return None, embedding
+    
+    def put(
+        self,
+        key: str,
+        namespace: str,
+        response: LLMResponse,
+        embedding: Optional[np.ndarray] = None,
+        tenant_id: Optional[str] = None,
+    ):
+        self._drop(key)
+        self._entries[key] = _CacheEntry(
+            response=response,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            namespace=namespace,
+            tenant_id=tenant_id,
+            embedding=embedding,
+        )
+        if embedding is not None:
+            self._semantic.setdefault(namespace, {})[key] = embedding
+        
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+    
+    def invalidate(self, tenant_id: Optional[str] = None):
+        """Drop one tenant's entries, or everything when tenant_id is None."""
+        if tenant_id is None:
+            self._entries.clear()
+            self._semantic.clear()
+            return
+        for key in [k for k, e in self._entries.items() if e.tenant_id == tenant_id]:
+            self._drop(key)
+    
+    def _live(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        vectors = self._semantic.get(entry.namespace)
+        if vectors is not None:
+            vectors.pop(key, None)
+            if not vectors:
+                del self._semantic[entry.namespace]
+    
+    def _served(self, entry: _CacheEntry) -> LLMResponse:
+        self.saved_cost += entry.response.usage.total_cost
+        self.saved_latency_ms += entry.response.latency_ms
+        return entry.response.model_copy(update={"latency_ms": 0}, deep=True)
+    
+    # =========================================================================
+    # Semantic Layer
+    # =========================================================================
+    
+    async def _embed(self, messages: List[Message]) -> Optional[np.ndarray]:
+        text = "\n".join(f"{m['role']}: {m['content']}" for m in self._normalize(messages))
+        try:
+            vector = np.asarray(await self.embedding_model.embed(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Response cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def _nearest(self, namespace: str, embedding: np.ndarray) -> Optional[_CacheEntry]:
+        vectors = self._semantic.get(namespace)
+        if not vectors:
+            return None
+        keys = list(vectors)
+        similarities = np.stack([vectors[k] for k in keys]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return self._live(keys[best])
+    
+    # =========================================================================
+    # Stats
+    # =========================================================================
+    
+    def get_stats(self) -> dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "saved_cost": round(self.saved_cost, 4),
+            "saved_latency_ms": self.saved_latency_ms,
+            "semantic_enabled": self.embedding_model is not None,
+        }
@@ -41,6 +41,54 @@ class OllamaProvider(LLMProvider):
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.base_url = config.api_base or "http://localhost:11434"
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Shared keep-alive session, created on first use.
+        
+        One connector per provider reuses TCP connections (and cached DNS)
+        across calls instead of handshaking per completion.
+        """
+        if self._session is None or self._session.closed or self._session_loop_closed():
+            self._discard_stale_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.config.connection_pool_size,
+                keepalive_timeout=self.config.keepalive_timeout_seconds,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.config.timeout_seconds,
+                    connect=self.config.connect_timeout_seconds,
+                ),
+            )
+        return self._session
+    
+    def _session_loop_closed(self) -> bool:
+        # A session is bound to the loop it was created on
+        loop = getattr(self._session, "_loop", None)
+        return loop is not None and (loop.is_closed() or loop is not asyncio.get_running_loop())
+    
+    def _discard_stale_session(self):
+        """
+        Release a session bound to another (or closed) loop. It can't be
+        awaited closed from this loop, so its connector is detached instead.
+        """
+        if self._session is not None and not self._session.closed:
+            logger.warning("Detaching Ollama session from a different event loop")
+            self._session.detach()
+        self._session = None
+    
+    async def close(self):
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            if self._session_loop_closed():
+                self._discard_stale_session()
+            else:
+                await self._session.close()
+        self._session = None
     
     async def generate(
         self,
@@ -52,49 +100,48 @@ class OllamaProvider(LLMProvider):
         start_time = datetime.utcnow()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                request_body = {
-                    "model": self.config.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": kwargs.get("temperature", self.config.temperature),
-                        "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
-                    },
-                }
+            session = self._get_session()
+            request_body = {
+                "model": self.config.model,
+                "prompt": prompt,
+                "stream": False,
+                "options": {
+                    "temperature": kwargs.get("temperature", self.config.temperature),
+                    "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
+                },
+            }
+            
+            if system_prompt:
+                request_body["system"] = system_prompt
+            
+            async with session.post(
+                f"{self.base_url}/api/generate",
+                json=request_body,
+            ) as response:
+                if response.status != 200:
+                    return self._mock_response([Message(role=Role.USER, content=prompt)], start_time)
                 
-                if system_prompt:
-                    request_body["system"] = system_prompt
+                data = await response.json()
+                
+                latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                
+                # Ollama provides token counts
+                usage = TokenUsage(
+                    input_tokens=data.get("prompt_eval_count", 0),
+                    output_tokens=data.get("eval_count", 0),
+                )
+                usage.total_tokens = usage.input_tokens + usage.output_tokens
+                
+                return LLMResponse(
+                    content=data.get("response", ""),
+                    model=self.config.model,
+                    provider="ollama",
+                    usage=usage,
+                    latency_ms=latency_ms,
+                    finish_reason="stop" if data.get("done") else "length",
+                    raw_response=data,
+                )
                 
-                async with session.post(
-                    f"{self.base_url}/api/generate",
-                    json=request_body,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
-                ) as response:
-                    if response.status != 200:
-                        return self._mock_response([Message(role=Role.USER, content=prompt)], start_time)
-                    
-                    data = await response.json()
-                    
-                    latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-                    
-                    # Ollama provides token counts
-                    usage = TokenUsage(
-                        input_tokens=data.get("prompt_eval_count", 0),
-                        output_tokens=data.get("eval_count", 0),
-                    )
-                    usage.total_tokens = usage.input_tokens + usage.output_tokens
-                    
-                    return LLMResponse(
-                        content=data.get("response", ""),
-                        model=self.config.model,
-                        provider="ollama",
-                        usage=usage,
-                        latency_ms=latency_ms,
-                        finish_reason="stop" if data.get("done") else "length",
-                        raw_response=data,
-                    )
-                    
         except Exception as e:
             logger.error(f"Ollama API error: {e}")
             return self._mock_response([Message(role=Role.USER, content=prompt)], start_time)
@@ -109,74 +156,73 @@ class OllamaProvider(LLMProvider):
         start_time = datetime.utcnow()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # Format messages
-                formatted_messages = [
-                    {"role": msg.role.value, "content": msg.content}
-                    for msg in messages
+            session = self._get_session()
+            # Format messages
+            formatted_messages = [
+                {"role": msg.role.value, "content": msg.content}
+                for msg in messages
+            ]
+            
+            request_body = {
+                "model": self.config.model,
+                "messages": formatted_messages,
+                "stream": False,
+                "options": {
+                    "temperature": kwargs.get("temperature", self.config.temperature),
+                    "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
+                },
+            }
+            
+            # Ollama supports tools in newer versions
+            if tools:
+                request_body["tools"] = [
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": tool.name,
+                            "description": tool.description,
+                            "parameters": tool.parameters,
+                        },
+                    }
+                    for tool in tools
                 ]
+            
+            async with session.post(
+                f"{self.base_url}/api/chat",
+                json=request_body,
+            ) as response:
+                if response.status != 200:
+                    return self._mock_response(messages, start_time)
                 
-                request_body = {
-                    "model": self.config.model,
-                    "messages": formatted_messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": kwargs.get("temperature", self.config.temperature),
-                        "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
-                    },
-                }
+                data = await response.json()
                 
-                # Ollama supports tools in newer versions
-                if tools:
-                    request_body["tools"] = [
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": tool.name,
-                                "description": tool.description,
-                                "parameters": tool.parameters,
-                            },
-                        }
-                        for tool in tools
-                    ]
+                latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                
+                # Extract content
+                content = data.get("message", {}).get("content", "")
+                
+                # Extract tool calls if present
+                tool_calls = None
+                if "tool_calls" in data.get("message", {}):
+                    tool_calls = data["message"]["tool_calls"]
+                
+                usage = TokenUsage(
+                    input_tokens=data.get("prompt_eval_count", 0),
+                    output_tokens=data.get("eval_count", 0),
+                )
+                usage.total_tokens = usage.input_tokens + usage.output_tokens
+                
+                return LLMResponse(
+                    content=content,
+                    model=self.config.model,
+                    provider="ollama",
+                    usage=usage,
+                    latency_ms=latency_ms,
+                    tool_calls=tool_calls,
+                    finish_reason="stop" if data.get("done") else "length",
+                    raw_response=data,
+                )
                 
-                async with session.post(
-                    f"{self.base_url}/api/chat",
-                    json=request_body,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
-                ) as response:
-                    if response.status != 200:
-                        return self._mock_response(messages, start_time)
-                    
-                    data = await response.json()
-                    
-                    latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-                    
-                    # Extract content
-                    content = data.get("message", {}).get("content", "")
-                    
-                    # Extract tool calls if present
-                    tool_calls = None
-                    if "tool_calls" in data.get("message", {}):
-                        tool_calls = data["message"]["tool_calls"]
-                    
-                    usage = TokenUsage(
-                        input_tokens=data.get("prompt_eval_count", 0),
-                        output_tokens=data.get("eval_count", 0),
-                    )
-                    usage.total_tokens = usage.input_tokens + usage.output_tokens
-                    
-                    return LLMResponse(
-                        content=content,
-                        model=self.config.model,
-                        provider="ollama",
-                        usage=usage,
-                        latency_ms=latency_ms,
-                        tool_calls=tool_calls,
-                        finish_reason="stop" if data.get("done") else "length",
-                        raw_response=data,
-                    )
-                    
         except Exception as e:
             logger.error(f"Ollama chat error: {e}")
             return self._mock_response(messages, start_time)
@@ -188,40 +234,39 @@ class OllamaProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream generation."""
         try:
-            async with aiohttp.ClientSession() as session:
-                formatted_messages = [
-                    {"role": msg.role.value, "content": msg.content}
-                    for msg in messages
-                ]
+            session = self._get_session()
+            formatted_messages = [
+                {"role": msg.role.value, "content": msg.content}
+                for msg in messages
+            ]
+            
+            request_body = {
+                "model": self.config.model,
+                "messages": formatted_messages,
+                "stream": True,
+                "options": {
+                    "temperature": kwargs.get("temperature", self.config.temperature),
+                    "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
+                },
+            }
+            
+            async with session.post(
+                f"{self.base_url}/api/chat",
+                json=request_body,
+            ) as response:
+                if response.status != 200:
+                    yield "Error: Ollama not available"
+                    return
                 
-                request_body = {
-                    "model": self.config.model,
-                    "messages": formatted_messages,
-                    "stream": True,
-                    "options": {
-                        "temperature": kwargs.get("temperature", self.config.temperature),
-                        "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
-                    },
-                }
-                
-                async with session.post(
-                    f"{self.base_url}/api/chat",
-                    json=request_body,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
-                ) as response:
-                    if response.status != 200:
-                        yield "Error: Ollama not available"
-                        return
-                    
-                    async for line in response.content:
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                if "message" in data and "content" in data["message"]:
-                                    yield data["message"]["content"]
-                            except json.JSONDecodeError:
-                                continue
-                                
+                async for line in response.content:
+                    if line:
+                        try:
+                            data = json.loads(line)
+                            if "message" in data and "content" in data["message"]:
+                                yield data["message"]["content"]
+                        except json.JSONDecodeError:
+                            continue
+                            
         except Exception as e:
             logger.error(f"Ollama streaming error: {e}")
             yield f"Error: {str(e)}"
@@ -229,11 +274,11 @@ class OllamaProvider(LLMProvider):
     async def list_models(self) -> List[str]:
         """List available Ollama models."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [m["name"] for m in data.get("models", [])]
+            session = self._get_session()
+            async with session.get(f"{self.base_url}/api/tags") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return [m["name"] for m in data.get("models", [])]
         except Exception as e:
             logger.error(f"Failed to list Ollama models: {e}")
         return []
@@ -241,13 +286,13 @@ class OllamaProvider(LLMProvider):
     async def pull_model(self, model_name: str) -> bool:
         """Pull a model from Ollama registry."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/pull",
-                    json={"name": model_name},
-                    timeout=aiohttp.ClientTimeout(total=3600),  # 1 hour for large models
-                ) as response:
-                    return response.status == 200
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/pull",
+                json={"name": model_name},
+                timeout=aiohttp.ClientTimeout(total=3600),  # 1 hour for large models
+            ) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"Failed to pull Ollama model: {e}")
         return False
@@ -255,12 +300,12 @@ class OllamaProvider(LLMProvider):
     async def health_check(self) -> bool:
         """Check if Ollama is running."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5),
-                ) as response:
-                    return response.status == 200
+            session = self._get_session()
+            async with session.get(
+                f"{self.base_url}/api/tags",
+                timeout=aiohttp.ClientTimeout(total=5),
+            ) as response:
+                return response.status == 200
         except:
             return False
     
@@ -280,4 +325,5 @@ class OllamaProvider(LLMProvider):
             ),
             latency_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000) + 200,
             finish_reason="stop",
+            is_mock=True,
         )
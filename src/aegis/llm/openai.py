@@ -17,7 +17,7 @@ from pydantic import BaseModel
 
 from aegis.llm.providers import (
     LLMProvider, LLMConfig, LLMResponse, Message, Role, 
-    ToolDefinition, TokenUsage
+    ToolDefinition, TokenUsage, MOCK_STREAM_TEXT
 )
 
 logger = structlog.get_logger(__name__)
@@ -63,6 +63,11 @@ class OpenAIProvider(LLMProvider):
             logger.warning(f"Failed to initialize OpenAI client: {e}")
             self.client = None
     
+    async def close(self):
+        """Close the SDK client's HTTP connection pool."""
+        if self.client is not None:
+            await self.client.close()
+    
     async def generate(
         self,
         prompt: str,
@@ -173,7 +178,7 @@ class OpenAIProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream generation."""
         if not self.client:
-            yield "Streaming not available in mock mode."
+            yield MOCK_STREAM_TEXT
             return
         
         formatted_messages = [
@@ -223,4 +228,5 @@ class OpenAIProvider(LLMProvider):
             ),
             latency_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000) + 50,
             finish_reason="stop",
+            is_mock=True,
         )
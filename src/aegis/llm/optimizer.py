@@ -1,12 +1,16 @@
 """
 AEGIS LLM Cost Optimizer
 
-Intelligent model selection and cost optimization.
+Intelligent model selection and cost optimization, plus latency-aware
+provider routing from rolling per-provider/model latency and error rates.
 """
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Any
 from enum import Enum
+import math
+import time
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -68,6 +72,9 @@ class CostReport:
 
 
 MODEL_COSTS = {
+    "anthropic.claude-3-opus": ModelCost("anthropic.claude-3-opus", "bedrock", 0.015, 0.075, 200000, 9),
+    "anthropic.claude-3-sonnet": ModelCost("anthropic.claude-3-sonnet", "bedrock", 0.003, 0.015, 200000, 8),
+    "anthropic.claude-3-haiku": ModelCost("anthropic.claude-3-haiku", "bedrock", 0.00025, 0.00125, 200000, 6),
     "gpt-4o": ModelCost("gpt-4o", "openai", 0.005, 0.015, 128000, 9),
     "gpt-4o-mini": ModelCost("gpt-4o-mini", "openai", 0.00015, 0.0006, 128000, 7),
     "claude-3-5-sonnet-20241022": ModelCost("claude-3-5-sonnet-20241022", "anthropic", 0.003, 0.015, 200000, 9),
@@ -77,6 +84,13 @@ MODEL_COSTS = {
     "llama3": ModelCost("llama3", "ollama", 0.0, 0.0, 8000, 6),
 }
 
+MIN_COMPLEXITY_RATING = {
+    TaskComplexity.SIMPLE: 3,
+    TaskComplexity.MEDIUM: 5,
+    TaskComplexity.COMPLEX: 7,
+    TaskComplexity.EXPERT: 9,
+}
+
 COMPLEXITY_INDICATORS = {
     TaskComplexity.SIMPLE: ["extract", "format", "list", "convert"],
     TaskComplexity.MEDIUM: ["summarize", "explain", "describe", "compare"],
@@ -85,6 +99,104 @@ COMPLEXITY_INDICATORS = {
 }
 
 
+@dataclass
+class RouteCandidate:
+    """A registered provider the router may send a request to."""
+    name: str
+    provider: str
+    model: str
+    
+    @property
+    def key(self) -> str:
+        return f"{self.provider}/{self.model}"
+
+
+class LatencyTracker:
+    """
+    Rolling latency and error rate per provider/model.
+    
+    Keeps the last ``window_size`` outcomes per key, ignoring those older
+    than ``max_age_seconds``, so a backend that degrades (or recovers) is
+    reflected within a few requests.
+    """
+    
+    def __init__(
+        self,
+        window_size: int = 256,
+        max_age_seconds: float = 300.0,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+    ):
+        self.window_size = window_size
+        self.max_age_seconds = max_age_seconds
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        # key -> deque of (monotonic time, latency seconds, succeeded)
+        self._samples: dict[str, deque] = {}
+    
+    def record(self, key: str, latency_seconds: float, success: bool = True) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window_size)
+        samples.append((time.monotonic(), latency_seconds, success))
+    
+    def _recent(self, key: str) -> list[tuple[float, float, bool]]:
+        samples = self._samples.get(key)
+        if not samples:
+            return []
+        cutoff = time.monotonic() - self.max_age_seconds
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+        return list(samples)
+    
+    def percentile(self, key: str, percentile: float) -> float | None:
+        """Latency percentile (seconds) of successful calls, None without data."""
+        latencies = sorted(latency for _, latency, ok in self._recent(key) if ok)
+        if not latencies:
+            return None
+        rank = max(0, math.ceil(percentile / 100.0 * len(latencies)) - 1)
+        return latencies[rank]
+    
+    def error_rate(self, key: str) -> float:
+        recent = self._recent(key)
+        if not recent:
+            return 0.0
+        return sum(1 for _, _, ok in recent if not ok) / len(recent)
+    
+    def is_healthy(self, key: str) -> bool:
+        recent = self._recent(key)
+        if len(recent) < self.min_samples:
+            return True
+        return self.error_rate(key) <= self.max_error_rate
+    
+    def hedge_delay(self, key: str, default: float = 2.0, floor: float = 0.05) -> float:
+        """How long to wait on a call before hedging: its p95, once known."""
+        if len(self._recent(key)) < self.min_samples:
+            return default
+        p95 = self.percentile(key, 95)
+        return default if p95 is None else max(floor, p95)
+    
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        stats = {}
+        for key in list(self._samples):
+            recent = self._recent(key)
+            if not recent:
+                continue
+            stats[key] = {
+                "samples": len(recent),
+                "p50_ms": _to_ms(self.percentile(key, 50)),
+                "p95_ms": _to_ms(self.percentile(key, 95)),
+                "p99_ms": _to_ms(self.percentile(key, 99)),
+                "error_rate": round(self.error_rate(key), 4),
+                "healthy": self.is_healthy(key),
+            }
+        return stats
+
+
+def _to_ms(seconds: float | None) -> int | None:
+    return None if seconds is None else int(seconds * 1000)
+
+
 class LLMOptimizer:
     """Optimizes LLM model selection and tracks costs."""
     
@@ -94,6 +206,7 @@ class LLMOptimizer:
         self._usage_records: list[UsageRecord] = []
         self._today_cost = 0.0
         self._today_date = datetime.now(timezone.utc).date()
+        self.latency = LatencyTracker()
     
     def analyze_complexity(self, prompt: str) -> TaskComplexity:
         """Analyze task complexity from prompt."""
@@ -125,12 +238,7 @@ class LLMOptimizer:
         provider: str | None = None,
     ) -> str:
         """Select optimal model for a task."""
-        min_rating = {
-            TaskComplexity.SIMPLE: 3,
-            TaskComplexity.MEDIUM: 5,
-            TaskComplexity.COMPLEX: 7,
-            TaskComplexity.EXPERT: 9,
-        }[complexity]
+        min_rating = MIN_COMPLEXITY_RATING[complexity]
         
         candidates = [(m, c) for m, c in MODEL_COSTS.items() if c.complexity_rating >= min_rating]
         
@@ -148,6 +256,51 @@ class LLMOptimizer:
         candidates.sort(key=lambda x: x[1].input_cost_per_1k + x[1].output_cost_per_1k)
         return candidates[0][0]
     
+    def record_latency(self, provider: str, model: str, latency_seconds: float, success: bool = True) -> None:
+        """Record the outcome of a provider call for routing."""
+        self.latency.record(f"{provider}/{model}", latency_seconds, success)
+    
+    def rank_providers(
+        self,
+        candidates: list[RouteCandidate],
+        complexity: TaskComplexity | None = None,
+        max_budget: float | None = None,
+        prompt: str = "",
+    ) -> list[RouteCandidate]:
+        """
+        Order providers for a request, best first.
+        
+        Candidates below the task's complexity rating or whose estimated
+        cost exceeds ``max_budget`` (or the daily budget) are dropped. The
+        rest are ordered healthy first, then those without recent failures
+        (mock fallbacks count as failures), then by rolling p50 latency,
+        then by cost. Providers with no samples yet sort first so they get
+        tried.
+        """
+        min_rating = MIN_COMPLEXITY_RATING[complexity] if complexity else 0
+        eligible = []
+        for candidate in candidates:
+            cost_info = MODEL_COSTS.get(candidate.model)
+            rating = cost_info.complexity_rating if cost_info else ModelCost.complexity_rating
+            if rating < min_rating:
+                continue
+            estimate = self.estimate_cost(candidate.model, prompt).estimated_cost
+            if max_budget is not None and estimate > max_budget:
+                continue
+            if not self.is_within_budget(estimate):
+                continue
+            p50 = self.latency.percentile(candidate.key, 50)
+            eligible.append((
+                not self.latency.is_healthy(candidate.key),
+                self.latency.error_rate(candidate.key) > 0,
+                p50 if p50 is not None else 0.0,
+                estimate,
+                candidate,
+            ))
+        
+        eligible.sort(key=lambda x: x[:4])
+        return [candidate for *_, candidate in eligible]
+    
     def estimate_cost(self, model_id: str, prompt: str, output_tokens: int = 500) -> CostEstimate:
         """Estimate request cost."""
         cost_info = MODEL_COSTS.get(model_id)
@@ -65,6 +65,11 @@ class LLMConfig(BaseModel):
     # Retry
     max_retries: int = 3
     timeout_seconds: int = 60
+    
+    # Connection pooling (HTTP providers)
+    connection_pool_size: int = 100
+    connect_timeout_seconds: float = 10.0
+    keepalive_timeout_seconds: float = 30.0
 
 
 class TokenUsage(BaseModel):
@@ -79,6 +84,10 @@ class TokenUsage(BaseModel):
     total_cost: float = 0.0
 
 
+# Streamed in place of tokens by providers without a client
+MOCK_STREAM_TEXT = "Streaming not available in mock mode."
+
+
 class LLMResponse(BaseModel):
     """LLM response."""
     content: str
@@ -101,6 +110,10 @@ class LLMResponse(BaseModel):
     
     # Raw response
     raw_response: Optional[dict] = None
+    
+    # Placeholder returned when there is no client or the call failed;
+    # never cached, and counted as a failure by routing
+    is_mock: bool = False
 
 
 # =============================================================================
@@ -167,3 +180,7 @@ class LLMProvider(ABC):
             return len(response.content) > 0
         except:
             return False
+    
+    async def close(self):
+        """Release pooled connections. Called on application shutdown."""
+        pass
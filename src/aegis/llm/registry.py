@@ -4,13 +4,17 @@ LLM Registry
 Central registry for managing multiple LLM providers.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+import asyncio
+import time
 
 import structlog
 from pydantic import BaseModel, Field
 
-from aegis.llm.providers import LLMProvider, LLMConfig, LLMResponse, Message
+from aegis.llm.cache import LLMResponseCache
+from aegis.llm.optimizer import LLMOptimizer, RouteCandidate, TaskComplexity, get_optimizer
+from aegis.llm.providers import LLMProvider, LLMConfig, LLMResponse, Message, Role
 from aegis.llm.bedrock import BedrockProvider
 from aegis.llm.openai import OpenAIProvider
 from aegis.llm.anthropic import AnthropicProvider
@@ -80,13 +84,21 @@ class LLMRegistry:
     - Fallback handling
     - Usage tracking
     - Cost aggregation
+    - Response cache for deterministic (temperature 0) calls
+    - Latency-aware routing (``provider="auto"``) and hedged requests
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        response_cache: Optional[LLMResponseCache] = None,
+        optimizer: Optional[LLMOptimizer] = None,
+    ):
         self._providers: Dict[str, LLMProvider] = {}
         self._default_provider: Optional[str] = None
         self._usage_history: List[dict] = []
         self._total_cost: float = 0.0
+        self.response_cache = response_cache if response_cache is not None else LLMResponseCache()
+        self.optimizer = optimizer if optimizer is not None else get_optimizer()
     
     def register_provider(
         self,
@@ -139,30 +151,208 @@ class LLMRegistry:
             for name, p in self._providers.items()
         ]
     
+    # =========================================================================
+    # Routing
+    # =========================================================================
+    
+    def route(
+        self,
+        prompt: str = "",
+        complexity: Optional[TaskComplexity] = None,
+        max_budget: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Rank registered providers for a request, best first.
+        
+        Uses the optimizer's rolling latency/error stats: the fastest healthy
+        provider whose model meets the complexity and budget comes first.
+        """
+        candidates = [
+            RouteCandidate(name=name, provider=p.config.provider, model=p.config.model)
+            for name, p in self._providers.items()
+        ]
+        if complexity is None and prompt:
+            complexity = self.optimizer.analyze_complexity(prompt)
+        ranked = self.optimizer.rank_providers(candidates, complexity, max_budget, prompt)
+        if not ranked:
+            raise ValueError(
+                f"No provider meets complexity={complexity} and budget={max_budget}"
+            )
+        return [candidate.name for candidate in ranked]
+    
+    def _select(
+        self,
+        provider: Optional[str],
+        hedge: bool,
+        prompt: str,
+        complexity: Optional[TaskComplexity],
+        max_budget: Optional[float],
+    ) -> List[LLMProvider]:
+        """Primary provider, plus the hedge partner when hedging."""
+        if provider == "auto":
+            names = self.route(prompt, complexity, max_budget)
+        else:
+            primary = provider or self._default_provider
+            self.get_provider(primary)
+            names = [primary]
+            if hedge:
+                try:
+                    ranked = self.route(prompt, complexity, max_budget)
+                except ValueError:
+                    ranked = []
+                names += [n for n in ranked if n != primary]
+        return [self._providers[name] for name in names[:2 if hedge else 1]]
+    
     async def generate(
         self,
         prompt: str,
         provider: str = None,
+        tenant_id: Optional[str] = None,
+        use_cache: bool = True,
+        hedge: bool = False,
+        complexity: Optional[TaskComplexity] = None,
+        max_budget: Optional[float] = None,
         **kwargs,
     ) -> LLMResponse:
-        """Generate using a provider."""
-        p = self.get_provider(provider)
-        response = await p.generate(prompt, **kwargs)
-        self._record_usage(p.name, response)
-        return response
+        """
+        Generate using a provider.
+        
+        ``provider="auto"`` routes to the fastest healthy provider meeting
+        ``complexity`` and ``max_budget``. ``hedge=True`` starts the next
+        best provider if the first hasn't answered within its p95 latency,
+        and returns whichever finishes first.
+        """
+        providers = self._select(provider, hedge, prompt, complexity, max_budget)
+        messages = [Message(role=Role.USER, content=prompt)]
+        if kwargs.get("system_prompt"):
+            messages.insert(0, Message(role=Role.SYSTEM, content=kwargs["system_prompt"]))
+        return await self._cached_call(
+            providers[0], messages, None, kwargs, tenant_id, use_cache,
+            lambda: self._dispatch(providers, lambda p: p.generate(prompt, **kwargs)),
+        )
     
     async def chat(
         self,
         messages: List[Message],
         provider: str = None,
+        tenant_id: Optional[str] = None,
+        use_cache: bool = True,
+        hedge: bool = False,
+        complexity: Optional[TaskComplexity] = None,
+        max_budget: Optional[float] = None,
         **kwargs,
     ) -> LLMResponse:
-        """Chat using a provider."""
-        p = self.get_provider(provider)
-        response = await p.chat(messages, **kwargs)
+        """Chat using a provider (routing and hedging as in ``generate``)."""
+        prompt = messages[-1].content if messages else ""
+        providers = self._select(provider, hedge, prompt, complexity, max_budget)
+        return await self._cached_call(
+            providers[0], messages, kwargs.get("tools"), kwargs, tenant_id, use_cache,
+            lambda: self._dispatch(providers, lambda p: p.chat(messages, **kwargs)),
+        )
+    
+    async def _dispatch(
+        self,
+        providers: List[LLMProvider],
+        call: Callable[[LLMProvider], Awaitable[LLMResponse]],
+    ) -> Tuple[LLMProvider, LLMResponse]:
+        """
+        Call the primary provider, hedging with the second one if given.
+        
+        Returns the provider that answered along with its response.
+        """
+        primary = providers[0]
+        if len(providers) < 2:
+            return primary, await self._timed(primary, call)
+        
+        backup = providers[1]
+        delay = self.optimizer.latency.hedge_delay(
+            f"{primary.config.provider}/{primary.config.model}"
+        )
+        first = asyncio.create_task(self._timed(primary, call))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done and _answered(first):
+            return primary, first.result()
+        
+        # Primary is slow (or already failed): race the backup against it
+        logger.info("Hedging LLM request", primary=primary.config.model, backup=backup.config.model)
+        second = asyncio.create_task(self._timed(backup, call))
+        pending = {second} if done else {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if _answered(task):
+                        return (primary if task is first else backup), task.result()
+            # Both failed: return the primary's mock if it has one, else the backup's error
+            if not first.cancelled() and not first.exception():
+                return primary, first.result()
+            return backup, second.result()
+        finally:
+            for task in (first, second):
+                task.cancel()
+    
+    async def _timed(
+        self,
+        p: LLMProvider,
+        call: Callable[[LLMProvider], Awaitable[LLMResponse]],
+    ) -> LLMResponse:
+        """Call a provider, feeding latency and errors to the router."""
+        start = time.perf_counter()
+        try:
+            response = await call(p)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.optimizer.record_latency(
+                p.config.provider, p.config.model, time.perf_counter() - start, success=False
+            )
+            raise
+        # Providers catch their own errors and answer with a mock: that's a failure
+        self.optimizer.record_latency(
+            p.config.provider, p.config.model, time.perf_counter() - start, success=not response.is_mock
+        )
         self._record_usage(p.name, response)
         return response
     
+    async def _cached_call(
+        self,
+        p: LLMProvider,
+        messages: List[Message],
+        tools: Optional[list],
+        kwargs: Dict[str, Any],
+        tenant_id: Optional[str],
+        use_cache: bool,
+        call: Callable[[], Awaitable[Tuple[LLMProvider, LLMResponse]]],
+    ) -> LLMResponse:
+        """
+        Serve deterministic calls from the response cache, else call the provider.
+        
+        Only real answers are stored, under the key of the provider that
+        gave them (the hedge backup may answer for ``p``).
+        """
+        cache = self.response_cache
+        params = cache.decoding_params(p.config, kwargs)
+        if not use_cache or not cache.is_cacheable(params):
+            return (await call())[1]
+        
+        key, namespace = cache.keys(tenant_id, p.name, p.config.model, messages, tools, params)
+        cached, embedding = await cache.get(key, namespace, messages)
+        if cached is not None:
+            return cached
+        
+        answered, response = await call()
+        if response.is_mock:
+            return response
+        if answered is not p:
+            params = cache.decoding_params(answered.config, kwargs)
+            if not cache.is_cacheable(params):
+                return response
+            key, namespace = cache.keys(
+                tenant_id, answered.name, answered.config.model, messages, tools, params
+            )
+        cache.put(key, namespace, response, embedding, tenant_id)
+        return response
+    
     def _record_usage(self, provider_name: str, response: LLMResponse):
         """Record usage for tracking."""
         self._usage_history.append({
@@ -207,6 +397,8 @@ class LLMRegistry:
             "total_cost": round(self._total_cost, 4),
             "by_provider": by_provider,
             "by_model": by_model,
+            "cache": self.response_cache.get_stats(),
+            "routing": self.optimizer.latency.snapshot(),
         }
     
     async def health_check(self) -> dict:
@@ -219,6 +411,19 @@ class LLMRegistry:
             except Exception as e:
                 results[name] = {"healthy": False, "error": str(e)}
         return results
+    
+    async def close(self):
+        """Close every provider's pooled connections."""
+        for name, provider in self._providers.items():
+            try:
+                await provider.close()
+            except Exception as e:
+                logger.warning(f"Failed to close LLM provider {name}: {e}")
+
+
+def _answered(task: asyncio.Task) -> bool:
+    """A finished provider call that produced a real (non-mock) response."""
+    return not task.exception() and not task.result().is_mock
 
 
 # =============================================================================
@@ -256,6 +461,12 @@ def get_llm_registry() -> LLMRegistry:
     return _registry
 
 
+async def close_llm_registry():
+    """Close the global registry's providers, if it was ever created."""
+    if _registry is not None:
+        await _registry.close()
+
+
 def get_provider_for_model(model: str) -> str:
     """Get provider name for a model."""
     return MODEL_PROVIDERS.get(model, "bedrock")
@@ -3,18 +3,24 @@ Metrics Collection
 
 Features:
 - Counters, Histograms, Gauges
-- Labels/dimensions
-- Prometheus-compatible
+- Labels/dimensions, with pre-bound label children (``metric.labels(...)``)
+- Prometheus-compatible, streamed
 - Real-time aggregation
+
+Updates are cheap enough for per-request and per-token paths:
+- A label set is looked up once; ``labels()`` returns a cached child that
+  hot paths keep and update directly
+- Counters and histograms accumulate per thread without a lock and are
+  merged when read or scraped; gauges lock per series, not per metric
+- Histogram buckets are found by bisection
 """
 
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
 from enum import Enum
-from collections import defaultdict
+from bisect import bisect_left
 import threading
 import time
-import json
 
 import structlog
 from pydantic import BaseModel, Field
@@ -43,11 +49,233 @@ class MetricValue(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+# =============================================================================
+# Series
+# =============================================================================
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Series:
+    """One label set of a metric."""
+    
+    __slots__ = ("labels", "label_text")
+    
+    def __init__(self, labels: Dict[str, str]):
+        self.labels = labels
+        # Prometheus label text, built once per series
+        self.label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    
+    def _sample(self, name: str, value: Any, extra: str = "") -> str:
+        labels = f"{self.label_text},{extra}" if self.label_text and extra else self.label_text or extra
+        return f"{name}{{{labels}}} {value}\n" if labels else f"{name} {value}\n"
+
+
+class _ThreadCells(_Series):
+    """
+    A series whose values are per-thread accumulators, summed when read.
+    
+    Each thread adds into its own cell (a list of ``size`` numbers), so
+    updates take no lock. The lock only guards registering a thread's
+    first cell and reading; cells of threads that have exited are folded
+    into ``_retired`` on read.
+    """
+    
+    __slots__ = ("_local", "_cells", "_retired", "_lock")
+    
+    def __init__(self, labels: Dict[str, str], size: int):
+        super().__init__(labels)
+        self._local = threading.local()
+        self._cells: List[tuple] = []  # (thread, cell)
+        self._retired = [0] * size
+        self._lock = threading.Lock()
+    
+    def _new_cell(self) -> list:
+        cell = [0] * len(self._retired)
+        with self._lock:
+            self._cells.append((threading.current_thread(), cell))
+        self._local.cell = cell
+        return cell
+    
+    def _totals(self) -> list:
+        with self._lock:
+            totals = list(self._retired)
+            live = []
+            for thread, cell in self._cells:
+                for i, value in enumerate(cell):
+                    totals[i] += value
+                if thread.is_alive():
+                    live.append((thread, cell))
+                else:
+                    # The thread can no longer write to it
+                    for i, value in enumerate(cell):
+                        self._retired[i] += value
+            self._cells = live
+        return totals
+
+
+class CounterChild(_ThreadCells):
+    """A counter bound to one label set."""
+    
+    __slots__ = ()
+    
+    def __init__(self, labels: Dict[str, str]):
+        super().__init__(labels, 1)
+    
+    def inc(self, value: float = 1.0):
+        """Increment the counter."""
+        try:
+            self._local.cell[0] += value
+        except AttributeError:
+            self._new_cell()[0] += value
+    
+    def get(self) -> float:
+        """Get current counter value."""
+        return float(self._totals()[0])
+
+
+class GaugeChild(_Series):
+    """A gauge bound to one label set."""
+    
+    __slots__ = ("_value", "_lock")
+    
+    def __init__(self, labels: Dict[str, str]):
+        super().__init__(labels)
+        self._value = 0.0
+        self._lock = threading.Lock()
+    
+    def set(self, value: float):
+        """Set the gauge value."""
+        with self._lock:
+            self._value = value
+    
+    def inc(self, value: float = 1.0):
+        """Increment the gauge."""
+        with self._lock:
+            self._value += value
+    
+    def dec(self, value: float = 1.0):
+        """Decrement the gauge."""
+        with self._lock:
+            self._value -= value
+    
+    def get(self) -> float:
+        """Get current gauge value."""
+        return self._value
+
+
+class HistogramChild(_ThreadCells):
+    """
+    A histogram bound to one label set.
+    
+    A cell holds the count of each bucket (not cumulative, the last one
+    being +Inf) followed by the sum of observations.
+    """
+    
+    __slots__ = ("_bounds",)
+    
+    def __init__(self, labels: Dict[str, str], bounds: List[float]):
+        super().__init__(labels, len(bounds) + 2)
+        self._bounds = bounds
+    
+    def observe(self, value: float):
+        """Observe a value."""
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        # First bucket whose upper bound is >= value
+        cell[bisect_left(self._bounds, value)] += 1
+        cell[-1] += value
+    
+    @property
+    def count(self) -> int:
+        return sum(self._totals()[:-1])
+    
+    @property
+    def sum(self) -> float:
+        return self._totals()[-1]
+
+
+# =============================================================================
+# Metric Base
+# =============================================================================
+
+_NO_LABELS = frozenset()
+
+
+class _Metric:
+    """Label-set children of a metric, created on first use."""
+    
+    type: MetricType
+    
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._children: Dict[frozenset, Any] = {}
+        self._lock = threading.Lock()
+    
+    def labels(self, **labels: str):
+        """
+        The child for a label set, to keep and update directly.
+        
+        Usage:
+            requests = counter.labels(method="GET", status="200")
+            requests.inc()
+        """
+        return self._child(labels)
+    
+    def _labels_key(self, labels: Dict[str, str] = None) -> frozenset:
+        """Create a key from labels."""
+        if not labels:
+            return _NO_LABELS
+        return frozenset(labels.items())
+    
+    def _child(self, labels: Dict[str, str] = None):
+        child = self._children.get(self._labels_key(labels))
+        if child is None:
+            with self._lock:
+                key = self._labels_key(labels)
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child(dict(labels or {}))
+        return child
+    
+    def _find(self, labels: Dict[str, str] = None):
+        """Existing child for a label set, without creating one."""
+        return self._children.get(self._labels_key(labels))
+    
+    def _new_child(self, labels: Dict[str, str]):
+        raise NotImplementedError
+    
+    def _series(self) -> list:
+        # Copy so scrapes don't race with new label sets
+        return list(self._children.values())
+    
+    def iter_prometheus(self) -> Iterator[str]:
+        """Prometheus exposition lines for this metric."""
+        yield f"# HELP {self.name} {self.description}\n"
+        yield f"# TYPE {self.name} {self.type.value}\n"
+        for child in self._series():
+            yield from self._samples(child)
+    
+    def _samples(self, child) -> Iterator[str]:
+        yield child._sample(self.name, child.get())
+    
+    def collect(self) -> List[MetricValue]:
+        """Collect all metric values."""
+        return [
+            MetricValue(name=self.name, type=self.type, value=child.get(), labels=child.labels)
+            for child in self._series()
+        ]
+
+
 # =============================================================================
 # Counter
 # =============================================================================
 
-class Counter:
+class Counter(_Metric):
     """
     A monotonically increasing counter.
     
@@ -55,50 +283,32 @@ class Counter:
         request_count = Counter("http_requests_total", "Total HTTP requests")
         request_count.inc()
         request_count.inc(labels={"method": "GET", "status": "200"})
+        
+        # Hot paths: bind the labels once
+        get_ok = request_count.labels(method="GET", status="200")
+        get_ok.inc()
     """
     
-    def __init__(self, name: str, description: str = ""):
-        self.name = name
-        self.description = description
-        self._values: Dict[str, float] = defaultdict(float)
-        self._lock = threading.Lock()
+    type = MetricType.COUNTER
     
     def inc(self, value: float = 1.0, labels: Dict[str, str] = None):
         """Increment the counter."""
-        key = self._labels_key(labels)
-        with self._lock:
-            self._values[key] += value
+        self._child(labels).inc(value)
     
     def get(self, labels: Dict[str, str] = None) -> float:
         """Get current counter value."""
-        key = self._labels_key(labels)
-        return self._values.get(key, 0.0)
+        child = self._find(labels)
+        return child.get() if child else 0.0
     
-    def _labels_key(self, labels: Dict[str, str] = None) -> str:
-        """Create a key from labels."""
-        if not labels:
-            return ""
-        return json.dumps(labels, sort_keys=True)
-    
-    def collect(self) -> List[MetricValue]:
-        """Collect all metric values."""
-        values = []
-        for key, value in self._values.items():
-            labels = json.loads(key) if key else {}
-            values.append(MetricValue(
-                name=self.name,
-                type=MetricType.COUNTER,
-                value=value,
-                labels=labels,
-            ))
-        return values
+    def _new_child(self, labels: Dict[str, str]) -> CounterChild:
+        return CounterChild(labels)
 
 
 # =============================================================================
 # Gauge
 # =============================================================================
 
-class Gauge:
+class Gauge(_Metric):
     """
     A metric that can go up and down.
     
@@ -109,59 +319,34 @@ class Gauge:
         temperature.dec(1.0)
     """
     
-    def __init__(self, name: str, description: str = ""):
-        self.name = name
-        self.description = description
-        self._values: Dict[str, float] = defaultdict(float)
-        self._lock = threading.Lock()
+    type = MetricType.GAUGE
     
     def set(self, value: float, labels: Dict[str, str] = None):
         """Set the gauge value."""
-        key = self._labels_key(labels)
-        with self._lock:
-            self._values[key] = value
+        self._child(labels).set(value)
     
     def inc(self, value: float = 1.0, labels: Dict[str, str] = None):
         """Increment the gauge."""
-        key = self._labels_key(labels)
-        with self._lock:
-            self._values[key] += value
+        self._child(labels).inc(value)
     
     def dec(self, value: float = 1.0, labels: Dict[str, str] = None):
         """Decrement the gauge."""
-        key = self._labels_key(labels)
-        with self._lock:
-            self._values[key] -= value
+        self._child(labels).dec(value)
     
     def get(self, labels: Dict[str, str] = None) -> float:
         """Get current gauge value."""
-        key = self._labels_key(labels)
-        return self._values.get(key, 0.0)
+        child = self._find(labels)
+        return child.get() if child else 0.0
     
-    def _labels_key(self, labels: Dict[str, str] = None) -> str:
-        if not labels:
-            return ""
-        return json.dumps(labels, sort_keys=True)
-    
-    def collect(self) -> List[MetricValue]:
-        """Collect all metric values."""
-        values = []
-        for key, value in self._values.items():
-            labels = json.loads(key) if key else {}
-            values.append(MetricValue(
-                name=self.name,
-                type=MetricType.GAUGE,
-                value=value,
-                labels=labels,
-            ))
-        return values
+    def _new_child(self, labels: Dict[str, str]) -> GaugeChild:
+        return GaugeChild(labels)
 
 
 # =============================================================================
 # Histogram
 # =============================================================================
 
-class Histogram:
+class Histogram(_Metric):
     """
     A metric that tracks value distributions.
     
@@ -174,6 +359,8 @@ class Histogram:
         request_duration.observe(0.25)
     """
     
+    type = MetricType.HISTOGRAM
+    
     DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
     
     def __init__(
@@ -182,76 +369,71 @@ class Histogram:
         description: str = "",
         buckets: List[float] = None,
     ):
-        self.name = name
-        self.description = description
+        super().__init__(name, description)
         self.buckets = sorted(buckets or self.DEFAULT_BUCKETS)
-        
-        self._lock = threading.Lock()
-        # Per-label histograms: label_key -> {bucket -> count, sum, count}
-        self._data: Dict[str, Dict] = defaultdict(lambda: {
-            "buckets": {b: 0 for b in self.buckets},
-            "sum": 0.0,
-            "count": 0,
-        })
+        self._le = [str(bucket) for bucket in self.buckets]
     
     def observe(self, value: float, labels: Dict[str, str] = None):
         """Observe a value."""
-        key = self._labels_key(labels)
-        with self._lock:
-            data = self._data[key]
-            data["sum"] += value
-            data["count"] += 1
-            for bucket in self.buckets:
-                if value <= bucket:
-                    data["buckets"][bucket] += 1
+        self._child(labels).observe(value)
     
     def get_percentile(self, percentile: float, labels: Dict[str, str] = None) -> float:
-        """Estimate a percentile from the histogram."""
-        key = self._labels_key(labels)
-        data = self._data.get(key)
-        if not data or data["count"] == 0:
+        """Estimate a percentile from the histogram (upper bound of its bucket)."""
+        child = self._find(labels)
+        if child is None:
+            return 0.0
+        counts = child._totals()[:-1]
+        total = sum(counts)
+        if total == 0:
             return 0.0
         
-        target = data["count"] * (percentile / 100.0)
+        target = total * (percentile / 100.0)
         cumulative = 0
-        prev_bucket = 0
-        
-        for bucket in self.buckets:
-            cumulative += data["buckets"][bucket]
+        for bucket, count in zip(self.buckets, counts):
+            cumulative += count
             if cumulative >= target:
-                # Linear interpolation within bucket
                 return bucket
-            prev_bucket = bucket
         
         return self.buckets[-1]
     
-    def _labels_key(self, labels: Dict[str, str] = None) -> str:
-        if not labels:
-            return ""
-        return json.dumps(labels, sort_keys=True)
+    def _new_child(self, labels: Dict[str, str]) -> HistogramChild:
+        return HistogramChild(labels, self.buckets)
+    
+    def _samples(self, child: HistogramChild) -> Iterator[str]:
+        totals = child._totals()
+        cumulative = 0
+        for le, count in zip(self._le, totals):
+            cumulative += count
+            yield child._sample(f"{self.name}_bucket", cumulative, f'le="{le}"')
+        count = cumulative + totals[-2]
+        yield child._sample(f"{self.name}_bucket", count, 'le="+Inf"')
+        yield child._sample(f"{self.name}_sum", totals[-1])
+        yield child._sample(f"{self.name}_count", count)
     
     def collect(self) -> List[MetricValue]:
         """Collect all metric values."""
         values = []
-        for key, data in self._data.items():
-            labels = json.loads(key) if key else {}
+        for child in self._series():
+            labels = child.labels
+            totals = child._totals()
             
             # Bucket values
             cumulative = 0
-            for bucket in self.buckets:
-                cumulative += data["buckets"][bucket]
+            for le, count in zip(self._le, totals):
+                cumulative += count
                 values.append(MetricValue(
                     name=f"{self.name}_bucket",
                     type=MetricType.HISTOGRAM,
                     value=cumulative,
-                    labels={**labels, "le": str(bucket)},
+                    labels={**labels, "le": le},
                 ))
+            count = cumulative + totals[-2]
             
             # +Inf bucket
             values.append(MetricValue(
                 name=f"{self.name}_bucket",
                 type=MetricType.HISTOGRAM,
-                value=data["count"],
+                value=count,
                 labels={**labels, "le": "+Inf"},
             ))
             
@@ -259,13 +441,13 @@ class Histogram:
             values.append(MetricValue(
                 name=f"{self.name}_sum",
                 type=MetricType.HISTOGRAM,
-                value=data["sum"],
+                value=totals[-1],
                 labels=labels,
             ))
             values.append(MetricValue(
                 name=f"{self.name}_count",
                 type=MetricType.HISTOGRAM,
-                value=data["count"],
+                value=count,
                 labels=labels,
             ))
         
@@ -380,34 +562,18 @@ class MetricsCollector:
     def collect_all(self) -> List[MetricValue]:
         """Collect all metrics."""
         values = []
-        for metric in self._metrics.values():
+        for metric in list(self._metrics.values()):
             values.extend(metric.collect())
         return values
     
+    def iter_prometheus(self) -> Iterator[str]:
+        """Stream metrics in Prometheus text format, a metric at a time."""
+        for metric in list(self._metrics.values()):
+            yield "".join(metric.iter_prometheus())
+    
     def to_prometheus(self) -> str:
         """Export metrics in Prometheus format."""
-        lines = []
-        
-        for name, metric in self._metrics.items():
-            # Add HELP and TYPE
-            lines.append(f"# HELP {name} {metric.description}")
-            
-            if isinstance(metric, Counter):
-                lines.append(f"# TYPE {name} counter")
-            elif isinstance(metric, Gauge):
-                lines.append(f"# TYPE {name} gauge")
-            elif isinstance(metric, Histogram):
-                lines.append(f"# TYPE {name} histogram")
-            
-            # Add values
-            for value in metric.collect():
-                if value.labels:
-                    labels_str = ",".join(f'{k}="{v}"' for k, v in value.labels.items())
-                    lines.append(f"{value.name}{{{labels_str}}} {value.value}")
-                else:
-                    lines.append(f"{value.name} {value.value}")
-        
-        return "\n".join(lines)
+        return "".join(self.iter_prometheus())
     
     def to_json(self) -> dict:
         """Export metrics as JSON."""
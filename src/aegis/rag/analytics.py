@@ -6,17 +6,168 @@ Track and analyze RAG query patterns:
 - Popular queries
 - Performance metrics
 - User feedback
+
+Reads are served from online aggregates rather than by scanning history:
+raw logs live in a fixed-size ring buffer, and each (tenant, hour) bucket
+keeps counters, a DDSketch of latencies and a Space-Saving summary of the
+most frequent queries. All three merge cheaply, so a dashboard read costs
+O(buckets in the window), independent of how many queries were logged.
 """
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Any
-from collections import Counter
+from collections import Counter, OrderedDict, deque
+import math
 import uuid
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+# =============================================================================
+# Sketches
+# =============================================================================
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+    
+    Values are counted in logarithmic bins of ratio ``gamma``; any quantile
+    is returned within ``relative_accuracy`` of the true value. Merging two
+    sketches adds their bin counts. Once ``max_bins`` is exceeded the lowest
+    bins are collapsed, trading accuracy at the bottom for bounded memory.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+    
+    def merge(self, other: "DDSketch"):
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+    
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def _collapse(self):
+        indices = sorted(self.bins)
+        excess = len(indices) - self.max_bins
+        target = indices[excess]
+        for index in indices[:excess]:
+            self.bins[target] += self.bins.pop(index)
+
+
+@dataclass
+class _QueryCounter:
+    """Space-Saving entry: estimated count plus aggregates over observed hits."""
+    query: str  # First-seen original casing, used for suggestions
+    count: int = 0
+    error: int = 0  # Count inherited from the evicted entry (overestimate bound)
+    observed: int = 0
+    latency_sum: float = 0.0
+    results_sum: int = 0
+    feedback_sum: int = 0
+    feedback_count: int = 0
+    last_seen: datetime | None = None
+
+
+class SpaceSaving:
+    """
+    Heavy-hitters sketch (Space-Saving) over normalized queries.
+    
+    Tracks at most ``capacity`` queries. A new query evicts the one with the
+    smallest count and inherits that count as its error bound, so any query
+    more frequent than total/capacity is guaranteed to be tracked.
+    """
+    
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.entries: dict[str, _QueryCounter] = {}
+    
+    def add(self, key: str, query: str, latency_ms: float, results: int, timestamp: datetime):
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.entries) >= self.capacity:
+                victim = min(self.entries, key=lambda k: self.entries[k].count)
+                floor = self.entries.pop(victim).count
+                entry = _QueryCounter(query=query, count=floor, error=floor)
+            else:
+                entry = _QueryCounter(query=query)
+            self.entries[key] = entry
+        entry.count += 1
+        entry.observed += 1
+        entry.latency_sum += latency_ms
+        entry.results_sum += results
+        entry.last_seen = timestamp
+    
+    def merge(self, other: "SpaceSaving"):
+        for key, theirs in other.entries.items():
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = entry = _QueryCounter(query=theirs.query)
+            entry.count += theirs.count
+            entry.error += theirs.error
+            entry.observed += theirs.observed
+            entry.latency_sum += theirs.latency_sum
+            entry.results_sum += theirs.results_sum
+            entry.feedback_sum += theirs.feedback_sum
+            entry.feedback_count += theirs.feedback_count
+            if entry.last_seen is None or (theirs.last_seen and theirs.last_seen > entry.last_seen):
+                entry.last_seen = theirs.last_seen
+
+
+@dataclass
+class _Bucket:
+    """Aggregates for one tenant (or all tenants) over one time bucket."""
+    count: int = 0
+    latency_sum: float = 0.0
+    results_sum: int = 0
+    feedback_sum: int = 0
+    feedback_count: int = 0
+    users: set[str] = field(default_factory=set)
+    latency: DDSketch = field(default_factory=DDSketch)
+    queries: SpaceSaving = field(default_factory=SpaceSaving)
+
+
 @dataclass
 class QueryLog:
     """Log entry for a RAG query."""
@@ -81,18 +232,38 @@ class RAGAnalytics:
     - Latency tracking
     - User feedback collection
     - Query suggestions
+    
+    Time windows are resolved at ``bucket_seconds`` granularity: a window
+    includes every bucket it overlaps.
     """
     
-    def __init__(self, max_history: int = 100000):
+    ALL_TENANTS = None
+    
+    def __init__(
+        self,
+        max_history: int = 100000,
+        bucket_seconds: int = 3600,
+        retention_days: int = 30,
+        top_queries_capacity: int = 200,
+    ):
         """
         Initialize analytics.
         
         Args:
-            max_history: Maximum query logs to keep in memory
+            max_history: Maximum raw query logs to keep in memory
+            bucket_seconds: Width of the aggregate time buckets
+            retention_days: How long aggregates are kept
+            top_queries_capacity: Queries tracked per bucket by the
+                heavy-hitters sketch
         """
         self.max_history = max_history
-        self._logs: list[QueryLog] = []
-        self._feedback: dict[str, dict] = {}  # query_id -> feedback
+        self.bucket_seconds = bucket_seconds
+        self.retention_days = retention_days
+        self.top_queries_capacity = top_queries_capacity
+        self._logs: deque[QueryLog] = deque(maxlen=max_history)
+        self._logs_by_id: dict[str, QueryLog] = {}
+        # tenant_id (None = all tenants) -> bucket start -> aggregates
+        self._buckets: dict[str | None, OrderedDict[int, _Bucket]] = {}
     
     def log_query(
         self,
@@ -132,11 +303,21 @@ class RAGAnalytics:
             filters=filters or {},
         )
         
+        # Ring buffer: the deque drops the oldest log once full
+        if len(self._logs) == self.max_history:
+            self._logs_by_id.pop(self._logs[0].id, None)
         self._logs.append(log)
-        
-        # Trim history if needed
-        if len(self._logs) > self.max_history:
-            self._logs = self._logs[-self.max_history:]
+        self._logs_by_id[log_id] = log
+        
+        normalized = self._normalize(query)
+        for bucket in self._buckets_for(tenant_id, log.timestamp):
+            bucket.count += 1
+            bucket.latency_sum += latency_ms
+            bucket.results_sum += results_count
+            if user_id:
+                bucket.users.add(user_id)
+            bucket.latency.add(latency_ms)
+            bucket.queries.add(normalized, query, latency_ms, results_count, log.timestamp)
         
         return log_id
     
@@ -157,14 +338,30 @@ class RAGAnalytics:
         Returns:
             True if feedback was recorded
         """
-        # Find and update the log
-        for log in self._logs:
-            if log.id == query_id:
-                log.feedback_rating = max(1, min(5, rating))
-                log.feedback_comment = comment
-                return True
-        
-        return False
+        log = self._logs_by_id.get(query_id)
+        if log is None:
+            return False
+        
+        rating = max(1, min(5, rating))
+        previous = log.feedback_rating
+        log.feedback_rating = rating
+        log.feedback_comment = comment
+        
+        normalized = self._normalize(log.query)
+        for bucket in self._buckets_for(log.tenant_id, log.timestamp, create=False):
+            entry = bucket.queries.entries.get(normalized)
+            if previous is None:
+                bucket.feedback_count += 1
+                bucket.feedback_sum += rating
+                if entry:
+                    entry.feedback_count += 1
+                    entry.feedback_sum += rating
+            else:
+                bucket.feedback_sum += rating - previous
+                if entry:
+                    entry.feedback_sum += rating - previous
+        
+        return True
     
     def get_popular_queries(
         self,
@@ -175,6 +372,10 @@ class RAGAnalytics:
         """
         Get most popular queries.
         
+        Counts come from the heavy-hitters sketch: exact for queries that
+        stayed tracked, otherwise an overestimate by at most the tracked
+        floor. Averages cover the hits observed while tracked.
+        
         Args:
             tenant_id: Filter by tenant
             limit: Number of results
@@ -183,42 +384,21 @@ class RAGAnalytics:
         Returns:
             List of QueryStats
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        # Filter logs
-        logs = [
-            log for log in self._logs
-            if log.timestamp >= cutoff
-            and (tenant_id is None or log.tenant_id == tenant_id)
-        ]
+        merged = self._merged_queries(tenant_id, timedelta(days=days))
         
-        # Group by normalized query
-        query_groups: dict[str, list[QueryLog]] = {}
-        for log in logs:
-            # Normalize query (lowercase, strip)
-            normalized = log.query.lower().strip()
-            if normalized not in query_groups:
-                query_groups[normalized] = []
-            query_groups[normalized].append(log)
-        
-        # Calculate stats
         stats = []
-        for pattern, group_logs in query_groups.items():
-            avg_latency = sum(l.latency_ms for l in group_logs) / len(group_logs)
-            avg_results = sum(l.results_count for l in group_logs) / len(group_logs)
-            
-            feedback_logs = [l for l in group_logs if l.feedback_rating is not None]
-            avg_feedback = None
-            if feedback_logs:
-                avg_feedback = sum(l.feedback_rating for l in feedback_logs) / len(feedback_logs)
-            
+        for pattern, entry in merged.entries.items():
+            observed = entry.observed or 1
             stats.append(QueryStats(
                 query_pattern=pattern,
-                count=len(group_logs),
-                avg_latency_ms=avg_latency,
-                avg_results=avg_results,
-                avg_feedback=avg_feedback,
-                last_seen=max(l.timestamp for l in group_logs),
+                count=entry.count,
+                avg_latency_ms=entry.latency_sum / observed,
+                avg_results=entry.results_sum / observed,
+                avg_feedback=(
+                    entry.feedback_sum / entry.feedback_count
+                    if entry.feedback_count else None
+                ),
+                last_seen=entry.last_seen,
             ))
         
         # Sort by count
@@ -234,6 +414,9 @@ class RAGAnalytics:
         """
         Get latency percentiles.
         
+        Percentiles come from merged DDSketches and are within 1% of the
+        exact value.
+        
         Args:
             tenant_id: Filter by tenant
             hours: Time window in hours
@@ -241,32 +424,21 @@ class RAGAnalytics:
         Returns:
             LatencyStats
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-        
-        latencies = [
-            log.latency_ms for log in self._logs
-            if log.timestamp >= cutoff
-            and (tenant_id is None or log.tenant_id == tenant_id)
-        ]
+        sketch = DDSketch()
+        for bucket in self._window(tenant_id, timedelta(hours=hours)):
+            sketch.merge(bucket.latency)
         
-        if not latencies:
+        if sketch.count == 0:
             return LatencyStats(0, 0, 0, 0, 0, 0, 0)
         
-        latencies.sort()
-        n = len(latencies)
-        
-        def percentile(p: float) -> float:
-            idx = int(n * p / 100)
-            return latencies[min(idx, n - 1)]
-        
         return LatencyStats(
-            p50_ms=percentile(50),
-            p90_ms=percentile(90),
-            p95_ms=percentile(95),
-            p99_ms=percentile(99),
-            avg_ms=sum(latencies) / n,
-            min_ms=min(latencies),
-            max_ms=max(latencies),
+            p50_ms=sketch.quantile(0.50),
+            p90_ms=sketch.quantile(0.90),
+            p95_ms=sketch.quantile(0.95),
+            p99_ms=sketch.quantile(0.99),
+            avg_ms=sketch.sum / sketch.count,
+            min_ms=sketch.min,
+            max_ms=sketch.max,
         )
     
     def get_query_suggestions(
@@ -278,6 +450,9 @@ class RAGAnalytics:
         """
         Get query suggestions based on prefix.
         
+        Suggestions are drawn from the tracked popular queries over the
+        retention period.
+        
         Args:
             prefix: Query prefix to match
             tenant_id: Filter by tenant
@@ -287,16 +462,13 @@ class RAGAnalytics:
             List of suggested queries
         """
         prefix_lower = prefix.lower().strip()
+        merged = self._merged_queries(tenant_id, timedelta(days=self.retention_days))
         
         # Find matching queries
         matching = Counter()
-        for log in self._logs:
-            if tenant_id and log.tenant_id != tenant_id:
-                continue
-            
-            query_lower = log.query.lower()
-            if query_lower.startswith(prefix_lower):
-                matching[log.query] += 1
+        for pattern, entry in merged.entries.items():
+            if pattern.startswith(prefix_lower):
+                matching[entry.query] += entry.count
         
         # Return most common matches
         return [query for query, _ in matching.most_common(limit)]
@@ -319,14 +491,21 @@ class RAGAnalytics:
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         now = datetime.now(timezone.utc)
         
-        # Filter logs
-        logs = [
-            log for log in self._logs
-            if log.timestamp >= cutoff
-            and (tenant_id is None or log.tenant_id == tenant_id)
-        ]
-        
-        if not logs:
+        total = 0
+        latency_sum = 0.0
+        results_sum = 0
+        feedback_sum = 0
+        feedback_count = 0
+        users: set[str] = set()
+        for bucket in self._window(tenant_id, timedelta(days=days)):
+            total += bucket.count
+            latency_sum += bucket.latency_sum
+            results_sum += bucket.results_sum
+            feedback_sum += bucket.feedback_sum
+            feedback_count += bucket.feedback_count
+            users |= bucket.users
+        
+        if not total:
             return AnalyticsSummary(
                 period_start=cutoff,
                 period_end=now,
@@ -340,21 +519,15 @@ class RAGAnalytics:
                 latency_stats=LatencyStats(0, 0, 0, 0, 0, 0, 0),
             )
         
-        unique_users = len(set(l.user_id for l in logs if l.user_id))
-        feedback_logs = [l for l in logs if l.feedback_rating is not None]
-        
         return AnalyticsSummary(
             period_start=cutoff,
             period_end=now,
-            total_queries=len(logs),
-            unique_users=unique_users,
-            avg_latency_ms=sum(l.latency_ms for l in logs) / len(logs),
-            avg_results_count=sum(l.results_count for l in logs) / len(logs),
-            feedback_count=len(feedback_logs),
-            avg_feedback_rating=(
-                sum(l.feedback_rating for l in feedback_logs) / len(feedback_logs)
-                if feedback_logs else None
-            ),
+            total_queries=total,
+            unique_users=len(users),
+            avg_latency_ms=latency_sum / total,
+            avg_results_count=results_sum / total,
+            feedback_count=feedback_count,
+            avg_feedback_rating=feedback_sum / feedback_count if feedback_count else None,
             top_queries=self.get_popular_queries(tenant_id, limit=10, days=days),
             latency_stats=self.get_latency_percentiles(tenant_id, hours=days * 24),
         )
@@ -407,6 +580,65 @@ class RAGAnalytics:
             }
             for log in logs
         ]
+    
+    # =========================================================================
+    # Buckets
+    # =========================================================================
+    
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return query.lower().strip()
+    
+    def _bucket_start(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp()) // self.bucket_seconds * self.bucket_seconds
+    
+    def _buckets_for(self, tenant_id: str, timestamp: datetime, create: bool = True) -> list[_Bucket]:
+        """The tenant's bucket and the all-tenants bucket for a timestamp."""
+        start = self._bucket_start(timestamp)
+        buckets = []
+        for key in (tenant_id, self.ALL_TENANTS):
+            series = self._buckets.get(key)
+            if series is None:
+                if not create:
+                    continue
+                series = self._buckets[key] = OrderedDict()
+            bucket = series.get(start)
+            if bucket is None:
+                if not create:
+                    continue
+                bucket = series[start] = _Bucket(
+                    queries=SpaceSaving(self.top_queries_capacity),
+                )
+                self._expire(series, start)
+            buckets.append(bucket)
+        return buckets
+    
+    def _expire(self, series: OrderedDict, newest: int):
+        oldest_kept = newest - self.retention_days * 86400
+        while series:
+            start = next(iter(series))
+            if start >= oldest_kept:
+                break
+            del series[start]
+    
+    def _window(self, tenant_id: str | None, span: timedelta) -> list[_Bucket]:
+        """Buckets of a tenant (or all tenants) overlapping the last ``span``."""
+        series = self._buckets.get(tenant_id)
+        if not series:
+            return []
+        first = self._bucket_start(datetime.now(timezone.utc) - span)
+        window = []
+        for start in reversed(series):
+            if start < first:
+                break
+            window.append(series[start])
+        return window
+    
+    def _merged_queries(self, tenant_id: str | None, span: timedelta) -> SpaceSaving:
+        merged = SpaceSaving(capacity=0)
+        for bucket in self._window(tenant_id, span):
+            merged.merge(bucket.queries)
+        return merged
 
 
 # Global instance
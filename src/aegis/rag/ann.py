@@ -0,0 +1,527 @@
+"""
+Approximate Nearest Neighbour Index
+
+IVF-flat index for local vector search:
+- Spherical k-means coarse quantizer (pure NumPy)
+- Exact cosine scoring inside the probed inverted lists
+- Incremental inserts and tombstone deletes
+- Disk persistence with memory-mapped vectors on load
+
+Recall/latency is tuned with ``nprobe``: more probed lists means higher
+recall and proportionally more scoring work.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+import json
+import math
+
+import numpy as np
+import structlog
+
+from aegis.rag.vectorstore import Document, InMemoryVectorStore, SearchResult
+
+logger = structlog.get_logger(__name__)
+
+
+# =============================================================================
+# Inverted List
+# =============================================================================
+
+class _InvertedList:
+    """Growable block of normalized vectors assigned to one centroid."""
+
+    __slots__ = ("vectors", "live", "ids", "size", "dead")
+
+    def __init__(self, dimensions: int, vectors: np.ndarray = None, ids: List[str] = None):
+        if vectors is None:
+            vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self.vectors = vectors
+        self.ids: List[Optional[str]] = list(ids or [])
+        self.size = len(self.ids)
+        self.live = np.ones(self.size, dtype=bool)
+        self.dead = 0
+
+    def append(self, doc_id: str, vector: np.ndarray) -> int:
+        if self.size == self.vectors.shape[0]:
+            self._grow()
+        pos = self.size
+        self.vectors[pos] = vector
+        self.live[pos] = True
+        self.ids.append(doc_id)
+        self.size += 1
+        return pos
+
+    def extend(self, doc_ids: List[str], vectors: np.ndarray) -> int:
+        """Append a block of vectors; returns the position of the first one."""
+        while self.size + len(doc_ids) > self.vectors.shape[0]:
+            self._grow()
+        start = self.size
+        self.vectors[start:start + len(doc_ids)] = vectors
+        self.live[start:start + len(doc_ids)] = True
+        self.ids.extend(doc_ids)
+        self.size += len(doc_ids)
+        return start
+
+    def remove(self, pos: int):
+        self.live[pos] = False
+        self.ids[pos] = None
+        self.dead += 1
+
+    def live_items(self) -> Tuple[List[str], np.ndarray]:
+        """Live IDs and a copy of their vectors."""
+        keep = np.flatnonzero(self.live[:self.size])
+        return [self.ids[p] for p in keep], np.array(self.vectors[keep], dtype=np.float32)
+
+    def _grow(self):
+        # Also turns a read-only memory-mapped block into a private in-memory copy
+        capacity = max(16, self.vectors.shape[0] * 2)
+        vectors = np.zeros((capacity, self.vectors.shape[1]), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        live = np.zeros(capacity, dtype=bool)
+        live[:self.size] = self.live[:self.size]
+        self.vectors = vectors
+        self.live = live
+
+
+# =============================================================================
+# IVF-Flat Index
+# =============================================================================
+
+class IVFFlatIndex:
+    """
+    Inverted-file index with flat scoring.
+
+    Below ``train_threshold`` vectors the index keeps a single list and is
+    exact. Once the threshold is reached a coarse quantizer with ``nlist``
+    centroids is trained (``nlist=None`` picks ~2*sqrt(n)) and vectors are
+    bucketed by nearest centroid. The quantizer is retrained automatically
+    when the index grows ``retrain_factor`` times past its training size.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        train_threshold: int = 10_000,
+        retrain_factor: float = 4.0,
+        kmeans_iterations: int = 10,
+        max_training_samples: int = 100_000,
+        seed: int = 0,
+    ):
+        self.dimensions = dimensions
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.retrain_factor = retrain_factor
+        self.kmeans_iterations = kmeans_iterations
+        self.max_training_samples = max_training_samples
+        self.seed = seed
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[_InvertedList] = [_InvertedList(dimensions)]
+        self._locations: Dict[str, Tuple[int, int]] = {}
+        self._trained_size = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._locations
+
+    # =========================================================================
+    # Mutation
+    # =========================================================================
+
+    def add(self, doc_id: str, embedding: List[float]) -> bool:
+        """Insert (or replace) a vector. Returns False on dimension mismatch."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dimensions,):
+            logger.warning(
+                f"Skipping embedding for {doc_id}: dimension {vector.shape[0]} "
+                f"does not match index dimension {self.dimensions}"
+            )
+            return False
+
+        if doc_id in self._locations:
+            self.remove(doc_id)
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+
+        list_id = self._assign(vector[None, :])[0] if self.is_trained else 0
+        pos = self._lists[list_id].append(doc_id, vector)
+        self._locations[doc_id] = (int(list_id), pos)
+
+        self._maybe_train()
+        return True
+
+    def add_batch(self, doc_ids: List[str], embeddings: Any) -> int:
+        """Vectorized bulk insert. Returns the number of vectors added."""
+        if not doc_ids:
+            return 0
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.shape != (len(doc_ids), self.dimensions):
+            logger.warning(
+                f"Skipping batch: shape {vectors.shape} does not match "
+                f"({len(doc_ids)}, {self.dimensions})"
+            )
+            return 0
+
+        for doc_id in doc_ids:
+            if doc_id in self._locations:
+                self.remove(doc_id)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        if self.is_trained:
+            assignments = self._assign(vectors)
+        else:
+            assignments = np.zeros(len(doc_ids), dtype=np.int64)
+
+        order = np.argsort(assignments, kind="stable")
+        list_ids, starts = np.unique(assignments[order], return_index=True)
+        bounds = list(starts) + [len(order)]
+        for i, list_id in enumerate(list_ids):
+            rows = order[bounds[i]:bounds[i + 1]]
+            block_ids = [doc_ids[row] for row in rows]
+            first = self._lists[list_id].extend(block_ids, vectors[rows])
+            for offset, doc_id in enumerate(block_ids):
+                self._locations[doc_id] = (int(list_id), first + offset)
+
+        self._maybe_train()
+        return len(doc_ids)
+
+    def remove(self, doc_id: str) -> bool:
+        """Tombstone a vector; compacts its list once mostly dead."""
+        location = self._locations.pop(doc_id, None)
+        if location is None:
+            return False
+        list_id, pos = location
+        inverted = self._lists[list_id]
+        inverted.remove(pos)
+        if inverted.dead * 2 > inverted.size:
+            self._compact_list(list_id)
+        return True
+
+    def train(self):
+        """(Re)train the coarse quantizer and redistribute all vectors."""
+        ids, vectors = self._all_live()
+        n = len(ids)
+        if n == 0:
+            return
+
+        nlist = self.nlist or int(2 * math.sqrt(n))
+        nlist = max(1, min(nlist, n))
+
+        # ~64 points per centroid is plenty for a stable quantizer
+        rng = np.random.default_rng(self.seed)
+        sample = vectors
+        sample_size = min(self.max_training_samples, 64 * nlist)
+        if n > sample_size:
+            sample = vectors[rng.choice(n, sample_size, replace=False)]
+
+        centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            assignments = self._nearest(sample, centroids)
+            counts = np.bincount(assignments, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            nonempty = counts > 0
+            sums = np.zeros_like(centroids)
+            sums[nonempty] = np.add.reduceat(
+                sample[np.argsort(assignments, kind="stable")], starts[nonempty], axis=0
+            )
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # Re-seed empty clusters from random samples
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+                norms[empty] = 1.0
+            centroids = sums / norms
+
+        self._centroids = centroids.astype(np.float32)
+        self._rebuild_lists(ids, vectors)
+        self._trained_size = n
+        logger.info(f"Trained IVF index: {n} vectors, {nlist} lists")
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        nprobe: Optional[int] = None,
+        predicate: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return up to top_k (doc_id, cosine score) pairs, best first."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if top_k <= 0 or query.shape != (self.dimensions,) or not self._locations:
+            return []
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        if self.is_trained:
+            probes = min(nprobe or self.nprobe, len(self._lists))
+            centroid_scores = self._centroids @ query
+            list_ids = np.argpartition(-centroid_scores, probes - 1)[:probes]
+        else:
+            list_ids = [0]
+
+        candidate_ids: List[str] = []
+        candidate_scores: List[np.ndarray] = []
+        for list_id in list_ids:
+            inverted = self._lists[list_id]
+            if inverted.size == 0:
+                continue
+            keep = inverted.live[:inverted.size]
+            if predicate is not None:
+                keep = keep & np.fromiter(
+                    (doc_id is not None and predicate(doc_id) for doc_id in inverted.ids),
+                    dtype=bool,
+                    count=inverted.size,
+                )
+            if inverted.dead == 0 and predicate is None:
+                positions = np.arange(inverted.size)
+                scores = inverted.vectors[:inverted.size] @ query
+            else:
+                positions = np.flatnonzero(keep)
+                if positions.size == 0:
+                    continue
+                scores = inverted.vectors[positions] @ query
+            if positions.size > top_k:
+                part = np.argpartition(-scores, top_k - 1)[:top_k]
+                positions, scores = positions[part], scores[part]
+            candidate_ids.extend(inverted.ids[p] for p in positions)
+            candidate_scores.append(scores)
+
+        if not candidate_ids:
+            return []
+        scores = np.concatenate(candidate_scores)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [(candidate_ids[i], float(scores[i])) for i in order]
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    def save(self, path: str):
+        """
+        Persist the index to a directory.
+
+        Live vectors are written list-by-list into one ``vectors.npy`` so
+        they can be memory-mapped back with per-list views.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        ids: List[str] = []
+        blocks: List[np.ndarray] = []
+        offsets = [0]
+        for inverted in self._lists:
+            list_ids, vectors = inverted.live_items()
+            ids.extend(list_ids)
+            blocks.append(vectors)
+            offsets.append(offsets[-1] + len(list_ids))
+
+        vectors = np.concatenate(blocks) if blocks else np.zeros((0, self.dimensions), np.float32)
+        np.save(directory / "vectors.npy", vectors)
+        np.save(directory / "offsets.npy", np.asarray(offsets, dtype=np.int64))
+        if self.is_trained:
+            np.save(directory / "centroids.npy", self._centroids)
+
+        meta = {
+            "dimensions": self.dimensions,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "train_threshold": self.train_threshold,
+            "retrain_factor": self.retrain_factor,
+            "kmeans_iterations": self.kmeans_iterations,
+            "max_training_samples": self.max_training_samples,
+            "seed": self.seed,
+            "trained_size": self._trained_size,
+        }
+        (directory / "meta.json").write_text(json.dumps(meta))
+        (directory / "ids.json").write_text(json.dumps(ids))
+        logger.info(f"Saved IVF index with {len(ids)} vectors to {directory}")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFFlatIndex":
+        """
+        Load an index saved with ``save``.
+
+        With ``mmap=True`` vectors stay on disk and are paged in on demand;
+        a list is copied into memory only when it receives new inserts.
+        """
+        directory = Path(path)
+        meta = json.loads((directory / "meta.json").read_text())
+        trained_size = meta.pop("trained_size")
+        index = cls(**meta)
+
+        ids = json.loads((directory / "ids.json").read_text())
+        vectors = np.load(directory / "vectors.npy", mmap_mode="r" if mmap else None)
+        offsets = np.load(directory / "offsets.npy")
+
+        centroids_path = directory / "centroids.npy"
+        if centroids_path.exists():
+            index._centroids = np.load(centroids_path)
+        index._trained_size = trained_size
+
+        index._lists = []
+        for list_id in range(len(offsets) - 1):
+            start, end = int(offsets[list_id]), int(offsets[list_id + 1])
+            index._lists.append(_InvertedList(index.dimensions, vectors[start:end], ids[start:end]))
+            for pos, doc_id in enumerate(ids[start:end]):
+                index._locations[doc_id] = (list_id, pos)
+
+        logger.info(f"Loaded IVF index with {len(ids)} vectors from {directory}")
+        return index
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _maybe_train(self):
+        size = len(self._locations)
+        if not self.is_trained and size >= self.train_threshold:
+            self.train()
+        elif self.is_trained and size >= self._trained_size * self.retrain_factor:
+            self.train()
+
+    def _all_live(self) -> Tuple[List[str], np.ndarray]:
+        ids: List[str] = []
+        blocks: List[np.ndarray] = []
+        for inverted in self._lists:
+            list_ids, vectors = inverted.live_items()
+            ids.extend(list_ids)
+            blocks.append(vectors)
+        return ids, np.concatenate(blocks)
+
+    def _rebuild_lists(self, ids: List[str], vectors: np.ndarray):
+        assignments = self._assign(vectors)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(self._centroids) + 1))
+
+        self._lists = []
+        self._locations = {}
+        for list_id in range(len(self._centroids)):
+            rows = order[bounds[list_id]:bounds[list_id + 1]]
+            list_ids = [ids[row] for row in rows]
+            self._lists.append(_InvertedList(self.dimensions, vectors[rows], list_ids))
+            for pos, doc_id in enumerate(list_ids):
+                self._locations[doc_id] = (list_id, pos)
+
+    def _compact_list(self, list_id: int):
+        list_ids, vectors = self._lists[list_id].live_items()
+        self._lists[list_id] = _InvertedList(self.dimensions, vectors, list_ids)
+        for pos, doc_id in enumerate(list_ids):
+            self._locations[doc_id] = (list_id, pos)
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return self._nearest(vectors, self._centroids)
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """Nearest centroid (by inner product) per row, chunked to bound memory."""
+        result = np.empty(vectors.shape[0], dtype=np.int64)
+        for start in range(0, vectors.shape[0], chunk_size):
+            block = vectors[start:start + chunk_size]
+            result[start:start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+        return result
+
+
+# =============================================================================
+# IVF Vector Store
+# =============================================================================
+
+class IVFVectorStore(InMemoryVectorStore):
+    """
+    In-memory store whose vector search goes through an ``IVFFlatIndex``.
+
+    Keyword and hybrid search behave exactly like ``InMemoryVectorStore``;
+    only the vector leg becomes approximate.
+    """
+
+    def __init__(
+        self,
+        index_name: str = "default",
+        dimensions: int = 1536,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        train_threshold: int = 10_000,
+        index: IVFFlatIndex = None,
+    ):
+        super().__init__(index_name, dimensions)
+        self.index = index or IVFFlatIndex(
+            dimensions,
+            nlist=nlist,
+            nprobe=nprobe,
+            train_threshold=train_threshold,
+        )
+
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filters: Dict[str, Any] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """Approximate vector similarity search."""
+        predicate = None
+        if filters:
+            def predicate(doc_id: str) -> bool:
+                return self._matches_filters(self.documents[doc_id], filters)
+
+        hits = self.index.search(query_embedding, top_k, nprobe=nprobe, predicate=predicate)
+        return [
+            SearchResult(document=self.documents[doc_id], score=score, search_type="vector")
+            for doc_id, score in hits
+        ]
+
+    def save(self, path: str):
+        """Persist the index and documents (without embeddings) to a directory."""
+        directory = Path(path)
+        self.index.save(str(directory / "index"))
+        with open(directory / "documents.jsonl", "w") as f:
+            for doc in self.documents.values():
+                f.write(doc.model_dump_json(exclude={"embedding"}) + "\n")
+
+    @classmethod
+    def load(cls, path: str, index_name: str = "default", mmap: bool = True) -> "IVFVectorStore":
+        """
+        Restore a store written by ``save``.
+
+        Restored documents carry no ``embedding``; vectors are served from
+        the (optionally memory-mapped) index.
+        """
+        directory = Path(path)
+        index = IVFFlatIndex.load(str(directory / "index"), mmap=mmap)
+        store = cls(index_name=index_name, dimensions=index.dimensions, index=index)
+        with open(directory / "documents.jsonl") as f:
+            for line in f:
+                doc = Document.model_validate_json(line)
+                store.documents[doc.id] = doc
+                store._keyword_index.add(doc.id, doc.content)
+        return store
+
+    # Route the matrix hooks used by add_documents/delete to the IVF index
+
+    def _append_row(self, doc_id: str, embedding: List[float]):
+        self.index.add(doc_id, embedding)
+
+    def _remove_row(self, doc_id: str):
+        self.index.remove(doc_id)
+
+    def _needs_compaction(self) -> bool:
+        # Inverted lists compact themselves on delete
+        return False
@@ -8,7 +8,7 @@ Split documents into chunks for embedding:
 - Sentence-based
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from abc import ABC, abstractmethod
 import re
 
@@ -55,6 +55,18 @@ class Chunk(BaseModel):
         return len(self.content.split())
 
 
+def _iter_split(content: str, separator: str) -> Iterator[str]:
+    """Lazy ``str.split``: yields segments without building the full list."""
+    start = 0
+    while True:
+        end = content.find(separator, start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + len(separator)
+
+
 # =============================================================================
 # Base Chunker
 # =============================================================================
@@ -75,6 +87,15 @@ class Chunker(ABC):
         """Split content into chunks."""
         pass
     
+    def iter_chunks(self, document_id: str, content: str, metadata: dict = None) -> Iterator[Chunk]:
+        """
+        Yield chunks one at a time.
+        
+        Chunkers that can split incrementally override this so streaming
+        ingestion never materializes the full chunk list.
+        """
+        yield from self.chunk(document_id, content, metadata)
+    
     def _generate_chunk_id(self, document_id: str, index: int) -> str:
         """Generate chunk ID."""
         return f"{document_id}_chunk_{index}"
@@ -103,11 +124,15 @@ class SlidingWindowChunker(Chunker):
     
     def chunk(self, document_id: str, content: str, metadata: dict = None) -> List[Chunk]:
         """Split content using sliding window."""
-        chunks = []
-        
+        chunks = list(self.iter_chunks(document_id, content, metadata))
+        logger.info(f"Created {len(chunks)} chunks from document {document_id}")
+        return chunks
+    
+    def iter_chunks(self, document_id: str, content: str, metadata: dict = None) -> Iterator[Chunk]:
+        """Yield sliding-window chunks."""
         # Split by separator first to respect natural boundaries
         if self.separator:
-            segments = content.split(self.separator)
+            segments = _iter_split(content, self.separator)
         else:
             segments = [content]
         
@@ -124,7 +149,7 @@ class SlidingWindowChunker(Chunker):
             else:
                 # Save current chunk
                 if current_chunk.strip():
-                    chunks.append(Chunk(
+                    yield Chunk(
                         id=self._generate_chunk_id(document_id, chunk_index),
                         content=current_chunk.strip(),
                         document_id=document_id,
@@ -132,7 +157,7 @@ class SlidingWindowChunker(Chunker):
                         start_char=current_start,
                         end_char=char_pos,
                         metadata=metadata or {},
-                    ))
+                    )
                     chunk_index += 1
                 
                 # Start new chunk with overlap
@@ -144,7 +169,7 @@ class SlidingWindowChunker(Chunker):
         
         # Don't forget the last chunk
         if current_chunk.strip():
-            chunks.append(Chunk(
+            yield Chunk(
                 id=self._generate_chunk_id(document_id, chunk_index),
                 content=current_chunk.strip(),
                 document_id=document_id,
@@ -152,10 +177,7 @@ class SlidingWindowChunker(Chunker):
                 start_char=current_start,
                 end_char=char_pos,
                 metadata=metadata or {},
-            ))
-        
-        logger.info(f"Created {len(chunks)} chunks from document {document_id}")
-        return chunks
+            )
 
 
 # =============================================================================
@@ -196,17 +218,20 @@ class SemanticChunker(Chunker):
     
     def chunk(self, document_id: str, content: str, metadata: dict = None) -> List[Chunk]:
         """Split content semantically."""
-        chunks = []
-        
-        # First, identify sections
-        sections = self._identify_sections(content)
+        chunks = list(self.iter_chunks(document_id, content, metadata))
+        logger.info(f"Created {len(chunks)} semantic chunks from document {document_id}")
+        return chunks
+    
+    def iter_chunks(self, document_id: str, content: str, metadata: dict = None) -> Iterator[Chunk]:
+        """Yield semantic chunks section by section."""
+        sections = self._iter_sections(content)
         
         chunk_index = 0
         for section in sections:
             # If section is small enough, keep as one chunk
             if len(section["content"]) <= self.chunk_size:
                 if len(section["content"]) >= self.min_chunk_size:
-                    chunks.append(Chunk(
+                    yield Chunk(
                         id=self._generate_chunk_id(document_id, chunk_index),
                         content=section["content"],
                         document_id=document_id,
@@ -217,7 +242,7 @@ class SemanticChunker(Chunker):
                             **(metadata or {}),
                             "section_title": section.get("title"),
                         },
-                    ))
+                    )
                     chunk_index += 1
             else:
                 # Split large sections by paragraphs
@@ -230,7 +255,7 @@ class SemanticChunker(Chunker):
                         current_chunk += para + "\n\n"
                     else:
                         if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size:
-                            chunks.append(Chunk(
+                            yield Chunk(
                                 id=self._generate_chunk_id(document_id, chunk_index),
                                 content=current_chunk.strip(),
                                 document_id=document_id,
@@ -241,7 +266,7 @@ class SemanticChunker(Chunker):
                                     **(metadata or {}),
                                     "section_title": section.get("title"),
                                 },
-                            ))
+                            )
                             chunk_index += 1
                         
                         current_chunk = para + "\n\n"
@@ -249,7 +274,7 @@ class SemanticChunker(Chunker):
                 
                 # Last chunk
                 if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size:
-                    chunks.append(Chunk(
+                    yield Chunk(
                         id=self._generate_chunk_id(document_id, chunk_index),
                         content=current_chunk.strip(),
                         document_id=document_id,
@@ -260,48 +285,43 @@ class SemanticChunker(Chunker):
                             **(metadata or {}),
                             "section_title": section.get("title"),
                         },
-                    ))
+                    )
                     chunk_index += 1
-        
-        logger.info(f"Created {len(chunks)} semantic chunks from document {document_id}")
-        return chunks
     
     def _identify_sections(self, content: str) -> List[dict]:
         """Identify document sections."""
-        sections = []
-        
+        return list(self._iter_sections(content))
+    
+    def _iter_sections(self, content: str) -> Iterator[dict]:
+        """Yield document sections in order, one slice at a time."""
         # Find all headers
         matches = list(self._header_pattern.finditer(content))
         
         if not matches:
             # No headers found, treat whole document as one section
-            return [{"content": content, "start": 0, "end": len(content), "title": None}]
+            yield {"content": content, "start": 0, "end": len(content), "title": None}
+            return
         
-        # Create sections between headers
-        for i, match in enumerate(matches):
-            start = match.start()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
-            
-            section_content = content[start:end]
-            section_title = match.group().strip()
-            
-            sections.append({
-                "content": section_content,
-                "start": start,
-                "end": end,
-                "title": section_title,
-            })
-        
-        # Add content before first header if any
+        # Content before first header if any
         if matches[0].start() > 0:
-            sections.insert(0, {
+            yield {
                 "content": content[:matches[0].start()],
                 "start": 0,
                 "end": matches[0].start(),
                 "title": "Introduction",
-            })
+            }
         
-        return sections
+        # Sections between headers
+        for i, match in enumerate(matches):
+            start = match.start()
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+            
+            yield {
+                "content": content[start:end],
+                "start": start,
+                "end": end,
+                "title": match.group().strip(),
+            }
 
 
 # =============================================================================
@@ -333,20 +353,31 @@ class HierarchicalChunker(Chunker):
     
     def chunk(self, document_id: str, content: str, metadata: dict = None) -> List[Chunk]:
         """Create hierarchical chunks."""
-        all_chunks = []
+        all_chunks = list(self.iter_chunks(document_id, content, metadata))
         
+        logger.info(
+            f"Created {len(all_chunks)} hierarchical chunks "
+            f"(L0: {len([c for c in all_chunks if c.level == 0])}, "
+            f"L1: {len([c for c in all_chunks if c.level == 1])}, "
+            f"L2: {len([c for c in all_chunks if c.level == 2])})"
+        )
+        
+        return all_chunks
+    
+    def iter_chunks(self, document_id: str, content: str, metadata: dict = None) -> Iterator[Chunk]:
+        """Yield each section followed by its paragraphs and sentences."""
         # Level 0: Large sections
         level_0_chunker = SlidingWindowChunker(
             chunk_size=self.level_0_size,
             chunk_overlap=200,
             separator="\n\n\n",
         )
-        level_0_chunks = level_0_chunker.chunk(document_id, content, metadata)
+        level_0_chunks = level_0_chunker.iter_chunks(document_id, content, metadata)
         
         for l0_chunk in level_0_chunks:
             l0_chunk.level = 0
             l0_chunk.id = f"{document_id}_L0_{l0_chunk.chunk_index}"
-            all_chunks.append(l0_chunk)
+            yield l0_chunk
             
             # Level 1: Medium chunks (paragraphs)
             level_1_chunker = SlidingWindowChunker(
@@ -354,7 +385,7 @@ class HierarchicalChunker(Chunker):
                 chunk_overlap=100,
                 separator="\n\n",
             )
-            level_1_chunks = level_1_chunker.chunk(
+            level_1_chunks = level_1_chunker.iter_chunks(
                 f"{document_id}_L0_{l0_chunk.chunk_index}",
                 l0_chunk.content,
                 metadata,
@@ -365,7 +396,7 @@ class HierarchicalChunker(Chunker):
                 l1_chunk.parent_id = l0_chunk.id
                 l1_chunk.id = f"{l0_chunk.id}_L1_{l1_idx}"
                 l1_chunk.document_id = document_id
-                all_chunks.append(l1_chunk)
+                yield l1_chunk
                 
                 # Level 2: Fine-grained (sentences)
                 sentences = self._split_sentences(l1_chunk.content)
@@ -388,7 +419,7 @@ class HierarchicalChunker(Chunker):
                                 level=2,
                                 metadata=metadata or {},
                             )
-                            all_chunks.append(l2_chunk)
+                            yield l2_chunk
                             l2_idx += 1
                         current_l2 = sentence + " "
                 
@@ -405,16 +436,7 @@ class HierarchicalChunker(Chunker):
                         level=2,
                         metadata=metadata or {},
                     )
-                    all_chunks.append(l2_chunk)
-        
-        logger.info(
-            f"Created {len(all_chunks)} hierarchical chunks "
-            f"(L0: {len([c for c in all_chunks if c.level == 0])}, "
-            f"L1: {len([c for c in all_chunks if c.level == 1])}, "
-            f"L2: {len([c for c in all_chunks if c.level == 2])})"
-        )
-        
-        return all_chunks
+                    yield l2_chunk
     
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
@@ -5,12 +5,24 @@ Generate embeddings for text:
 - AWS Bedrock Titan
 - OpenAI Ada
 - Local models (sentence-transformers)
+- Content-addressed caching (in-memory LRU + optional SQLite)
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
 import asyncio
+import functools
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+import unicodedata
 
+import numpy as np
 import structlog
 from pydantic import BaseModel, Field
 
@@ -27,6 +39,9 @@ class EmbeddingModel(ABC):
     def __init__(self, model_name: str, dimensions: int):
         self.model_name = model_name
         self.dimensions = dimensions
+        
+        # Incremented whenever a mock vector is returned (no client or failure)
+        self.mock_count = 0
     
     @abstractmethod
     async def embed(self, text: str) -> List[float]:
@@ -41,6 +56,249 @@ class EmbeddingModel(ABC):
     def estimate_tokens(self, text: str) -> int:
         """Estimate token count."""
         return len(text.split()) * 1.3  # Rough estimate
+    
+    def _mock_embedding(self) -> List[float]:
+        """Generate mock embedding for testing."""
+        import random
+        self.mock_count += 1
+        return [random.uniform(-1, 1) for _ in range(self.dimensions)]
+
+
+# =============================================================================
+# Embedding Request Scheduler
+# =============================================================================
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Whether an exception is a provider throttling/overload response."""
+    # Some exceptions carry response=None or a non-botocore response object
+    response = getattr(error, "response", None) or {}
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class TokenBucket:
+    """Async token bucket; ``rate`` tokens/sec up to ``capacity``."""
+    
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class EmbeddingRequestScheduler:
+    """
+    Scheduler for per-text embedding calls against a rate-limited API.
+    
+    - Dedicated bounded thread pool (does not touch the default executor),
+      or a caller-supplied executor such as the shared Bedrock bridge pool
+    - Concurrency cap and optional token-bucket rate limit
+    - Adaptive backoff on throttling: all callers pause, and the rate limit
+      is halved then recovered additively on success (AIMD)
+    - Request coalescing: concurrent callers with the same key share one
+      in-flight call
+    - Throughput (texts/sec) and queue depth reported as gauges
+    
+    The asyncio primitives are bound to the loop that first submits work
+    and rebuilt when a later call runs on a different loop, so one
+    process-wide scheduler survives ``asyncio.run`` being called again.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 8,
+        requests_per_second: Optional[float] = None,
+        max_retries: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 20.0,
+        executor: Optional[Executor] = None,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix=f"embed-{name}",
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._throttled_until = 0.0
+        
+        self.queue_depth = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self._completions: deque = deque()
+        
+        from aegis.observability.metrics import get_metrics_collector
+        metrics = get_metrics_collector()
+        self._queue_gauge = metrics.gauge(
+            "aegis_embedding_queue_depth",
+            "Embedding requests waiting or in flight",
+        ).labels(model=name)
+        self._throughput_gauge = metrics.gauge(
+            "aegis_embedding_throughput_texts_per_second",
+            "Embedded texts per second over the last 10s",
+        ).labels(model=name)
+    
+    async def submit(self, key: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the scheduler, coalescing by key."""
+        self._bind_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception never retrieved" when no caller coalesced onto it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._run(fn, *args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+    
+    def _bind_loop(self):
+        """Rebuild the loop-bound primitives if the running loop changed."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self._loop is not None:
+            # Primitives (and in-flight futures) from another loop can't be
+            # awaited here; the adapted rate limit carries over
+            logger.info("Rebinding embedding scheduler to a new event loop", model=self.name)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            if self._bucket:
+                self._bucket = TokenBucket(self._bucket.rate, self._bucket.capacity)
+            self._inflight = {}
+        self._loop = loop
+    
+    def get_stats(self) -> dict:
+        return {
+            "model": self.name,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "coalesced": self.coalesced,
+            "throttled": self.throttled,
+            "texts_per_second": self._throughput(),
+            "rate_limit": self._bucket.rate if self._bucket else None,
+        }
+    
+    async def _run(self, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        self._set_queue_depth(1)
+        try:
+            for attempt in range(self.max_retries + 1):
+                pause = self._throttled_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                
+                async with self._semaphore:
+                    if self._bucket:
+                        await self._bucket.acquire()
+                    try:
+                        result = await loop.run_in_executor(
+                            self._executor, functools.partial(fn, *args, **kwargs)
+                        )
+                    except Exception as e:
+                        if not is_throttling_error(e) or attempt == self.max_retries:
+                            raise
+                        delay = self._on_throttled(attempt)
+                    else:
+                        self._on_success()
+                        return result
+                
+                # Back off without holding a concurrency slot
+                await asyncio.sleep(delay)
+        finally:
+            self._set_queue_depth(-1)
+    
+    def _on_throttled(self, attempt: int) -> float:
+        self.throttled += 1
+        delay = min(self.max_backoff, self.base_backoff * 2 ** attempt) * (0.5 + random.random())
+        self._throttled_until = max(self._throttled_until, time.monotonic() + delay)
+        if self._bucket:
+            self._bucket.rate = max(0.1, self._bucket.rate / 2)
+        logger.warning(
+            "Embedding request throttled",
+            model=self.name,
+            backoff_s=round(delay, 2),
+            rate_limit=self._bucket.rate if self._bucket else None,
+        )
+        return delay
+    
+    def _on_success(self):
+        self.completed += 1
+        now = time.monotonic()
+        self._completions.append(now)
+        if self._bucket and self._bucket.rate < self.requests_per_second:
+            self._bucket.rate = min(
+                self.requests_per_second,
+                self._bucket.rate + 0.05 * self.requests_per_second,
+            )
+        self._throughput_gauge.set(self._throughput(now))
+    
+    def _throughput(self, now: float = None, window: float = 10.0) -> float:
+        now = now or time.monotonic()
+        while self._completions and self._completions[0] < now - window:
+            self._completions.popleft()
+        return len(self._completions) / window
+    
+    def _set_queue_depth(self, delta: int):
+        self.queue_depth += delta
+        self._queue_gauge.set(self.queue_depth)
+
+
+_schedulers: Dict[str, EmbeddingRequestScheduler] = {}
+
+
+def get_embedding_scheduler(model_name: str, **kwargs) -> EmbeddingRequestScheduler:
+    """
+    Get the shared scheduler for a model.
+    
+    Limits are per model, so every client of the same model shares them;
+    ``kwargs`` only apply when the scheduler is first created. The scheduler
+    rebinds itself to whichever event loop is running when it is used.
+    """
+    if model_name not in _schedulers:
+        _schedulers[model_name] = EmbeddingRequestScheduler(model_name, **kwargs)
+    return _schedulers[model_name]
 
 
 # =============================================================================
@@ -60,10 +318,22 @@ class BedrockEmbeddings(EmbeddingModel):
         self,
         model_name: str = "amazon.titan-embed-text-v1",
         region: str = "us-east-1",
+        max_concurrency: int = 8,
+        requests_per_second: Optional[float] = None,
     ):
+        from aegis.bedrock.bridge import get_bedrock_bridge
+        
         super().__init__(model_name, dimensions=1536)
         self.region = region
         self.client = None
+        # Calls run on the shared Bedrock bridge pool; the scheduler still
+        # caps this model's concurrency and rate
+        self.scheduler = get_embedding_scheduler(
+            f"{region}/{model_name}",
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            executor=get_bedrock_bridge().executor,
+        )
         self._init_client()
     
     def _init_client(self):
@@ -86,31 +356,26 @@ class BedrockEmbeddings(EmbeddingModel):
             return self._mock_embedding()
         
         try:
-            import json
-            
-            response = await asyncio.to_thread(
-                self.client.invoke_model,
-                modelId=self.model_name,
-                body=json.dumps({"inputText": text}),
-            )
-            
-            result = json.loads(response["body"].read())
-            return result["embedding"]
-            
+            return await self.scheduler.submit(text, self._invoke, text)
         except Exception as e:
             logger.error(f"Bedrock embedding failed: {e}")
             return self._mock_embedding()
     
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts."""
-        # Bedrock doesn't support batch, so we parallelize
+        # Bedrock doesn't support batch; the scheduler bounds the fan-out
         tasks = [self.embed(text) for text in texts]
         return await asyncio.gather(*tasks)
     
-    def _mock_embedding(self) -> List[float]:
-        """Generate mock embedding for testing."""
-        import random
-        return [random.uniform(-1, 1) for _ in range(self.dimensions)]
+    def _invoke(self, text: str) -> List[float]:
+        """Blocking invoke_model call (runs on the scheduler's executor)."""
+        import json
+        
+        response = self.client.invoke_model(
+            modelId=self.model_name,
+            body=json.dumps({"inputText": text}),
+        )
+        return json.loads(response["body"].read())["embedding"]
 
 
 # =============================================================================
@@ -177,11 +442,6 @@ class OpenAIEmbeddings(EmbeddingModel):
         except Exception as e:
             logger.error(f"OpenAI batch embedding failed: {e}")
             return [self._mock_embedding() for _ in texts]
-    
-    def _mock_embedding(self) -> List[float]:
-        """Generate mock embedding for testing."""
-        import random
-        return [random.uniform(-1, 1) for _ in range(self.dimensions)]
 
 
 # =============================================================================
@@ -261,11 +521,187 @@ class LocalEmbeddings(EmbeddingModel):
         except Exception as e:
             logger.error(f"Local batch embedding failed: {e}")
             return [self._mock_embedding() for _ in texts]
+
+
+# =============================================================================
+# Embedding Cache
+# =============================================================================
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache.
     
-    def _mock_embedding(self) -> List[float]:
-        """Generate mock embedding for testing."""
-        import random
-        return [random.uniform(-1, 1) for _ in range(self.dimensions)]
+    - In-process LRU of float32 vectors
+    - Optional SQLite tier (float32 blobs) that survives restarts and can be
+      shared by processes on the same host
+    
+    Keys are opaque content hashes; see ``CachedEmbeddings.cache_key``.
+    """
+    
+    def __init__(self, max_entries: int = 10_000, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+    
+    def get_memory(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look keys up in the LRU tier."""
+        found = {}
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = vector
+        return found
+    
+    async def get_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look keys up in the SQLite tier, promoting hits to memory."""
+        if not self._db or not keys:
+            return {}
+        found = await asyncio.to_thread(self._read_disk, keys)
+        for key, vector in found.items():
+            self._put_memory(key, vector)
+        return found
+    
+    async def put(self, items: Dict[str, np.ndarray]):
+        """Store vectors in both tiers."""
+        for key, vector in items.items():
+            self._put_memory(key, vector)
+        if self._db and items:
+            await asyncio.to_thread(self._write_disk, items)
+    
+    def close(self):
+        if self._db:
+            self._db.close()
+            self._db = None
+    
+    def _put_memory(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _read_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._db_lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def _write_disk(self, items: Dict[str, np.ndarray]):
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype(np.float32).tobytes()) for key, vector in items.items()],
+            )
+            self._db.commit()
+
+
+class CachedEmbeddings(EmbeddingModel):
+    """
+    Caching wrapper around any EmbeddingModel.
+    
+    Keyed by a hash of (model name, dimensions, normalized text), so the
+    same chunk or query is only embedded once per model. Only cache misses
+    (deduplicated) are sent to the wrapped model, in a single embed_batch.
+    Mock vectors produced when the wrapped model has no client or fails are
+    returned but never cached.
+    """
+    
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        cache: EmbeddingCache = None,
+        max_entries: int = 10_000,
+        disk_path: Optional[str] = None,
+    ):
+        super().__init__(model.model_name, model.dimensions)
+        self.model = model
+        self.cache = cache or EmbeddingCache(max_entries=max_entries, disk_path=disk_path)
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        from aegis.observability.metrics import get_metrics_collector
+        self._requests_metric = get_metrics_collector().counter(
+            "aegis_embedding_cache_requests_total",
+            "Embedding cache lookups by result",
+        )
+    
+    def cache_key(self, text: str) -> str:
+        """Hash of (model name, dimensions, normalized text)."""
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        payload = f"{self.model_name}\x00{self.dimensions}\x00{normalized}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    async def embed(self, text: str) -> List[float]:
+        """Generate embedding for single text."""
+        return (await self.embed_batch([text]))[0]
+    
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings, serving repeats from the cache."""
+        keys = [self.cache_key(text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        
+        found = self.cache.get_memory(unique_keys)
+        memory_hits = len(found)
+        
+        pending = [key for key in unique_keys if key not in found]
+        disk_found = await self.cache.get_disk(pending)
+        found.update(disk_found)
+        
+        missing = [key for key in pending if key not in disk_found]
+        if missing:
+            key_to_text: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                key_to_text.setdefault(key, text)
+            mock_count = self.model.mock_count
+            vectors = await self.model.embed_batch([key_to_text[key] for key in missing])
+            fresh = {key: np.asarray(v, dtype=np.float32) for key, v in zip(missing, vectors)}
+            found.update(fresh)
+            if self.model.mock_count == mock_count:
+                await self.cache.put(fresh)
+        
+        self._record(memory_hits, len(disk_found), len(missing))
+        return [found[key].tolist() for key in keys]
+    
+    def get_stats(self) -> dict:
+        """Cache hit/miss statistics."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.cache._memory),
+        }
+    
+    def _record(self, memory_hits: int, disk_hits: int, misses: int):
+        self.memory_hits += memory_hits
+        self.disk_hits += disk_hits
+        self.misses += misses
+        for result, count in (("memory_hit", memory_hits), ("disk_hit", disk_hits), ("miss", misses)):
+            if count:
+                self._requests_metric.inc(count, labels={"model": self.model_name, "result": result})
 
 
 # =============================================================================
@@ -0,0 +1,135 @@
+"""
+Result Fusion
+
+Combine ranked result lists from different retrieval legs:
+- Reciprocal Rank Fusion (RRF) - rank-based, scale-free
+- Weighted score fusion with min-max or z-score normalization
+
+Shared by every VectorStore so hybrid rankings are comparable across
+backends regardless of how each leg scales its raw scores.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import math
+
+from aegis.rag.vectorstore import SearchResult
+
+FUSION_METHODS = ("rrf", "minmax", "zscore")
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[List[SearchResult]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = RRF_K,
+    top_k: Optional[int] = None,
+    search_type: str = "hybrid",
+) -> List[SearchResult]:
+    """
+    Fuse ranked lists with weighted RRF: sum(w / (k + rank)).
+
+    Only ranks matter, so legs with incomparable score scales (cosine vs
+    BM25) combine cleanly.
+    """
+    weights = _resolve_weights(result_lists, weights)
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, SearchResult] = {}
+
+    for results, weight in zip(result_lists, weights):
+        for rank, result in enumerate(results, 1):
+            doc_id = result.document.id
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+            first_seen.setdefault(doc_id, result)
+
+    return _ranked(scores, first_seen, top_k, search_type)
+
+
+def weighted_score_fusion(
+    result_lists: Sequence[List[SearchResult]],
+    weights: Optional[Sequence[float]] = None,
+    normalization: str = "minmax",
+    top_k: Optional[int] = None,
+    search_type: str = "hybrid",
+) -> List[SearchResult]:
+    """
+    Fuse lists by a weighted sum of per-list normalized scores.
+
+    Args:
+        normalization: "minmax" scales each list to [0, 1]; "zscore"
+            standardizes each list to zero mean and unit variance
+    """
+    weights = _resolve_weights(result_lists, weights)
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, SearchResult] = {}
+
+    for results, weight in zip(result_lists, weights):
+        for result, normalized in zip(results, normalize_scores(results, normalization)):
+            doc_id = result.document.id
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * normalized
+            first_seen.setdefault(doc_id, result)
+
+    return _ranked(scores, first_seen, top_k, search_type)
+
+
+def fuse(
+    result_lists: Sequence[List[SearchResult]],
+    method: str = "rrf",
+    weights: Optional[Sequence[float]] = None,
+    top_k: Optional[int] = None,
+) -> List[SearchResult]:
+    """Fuse result lists with the named method ("rrf", "minmax", "zscore")."""
+    if method == "rrf":
+        return reciprocal_rank_fusion(result_lists, weights, top_k=top_k)
+    if method in ("minmax", "zscore"):
+        return weighted_score_fusion(result_lists, weights, normalization=method, top_k=top_k)
+    raise ValueError(f"Unknown fusion method: {method}. Expected one of {FUSION_METHODS}")
+
+
+def normalize_scores(results: List[SearchResult], method: str = "minmax") -> List[float]:
+    """Normalize the scores of one result list."""
+    if not results:
+        return []
+    raw = [r.score for r in results]
+
+    if method == "minmax":
+        low, high = min(raw), max(raw)
+        if high == low:
+            return [1.0] * len(raw)
+        return [(s - low) / (high - low) for s in raw]
+
+    if method == "zscore":
+        mean = sum(raw) / len(raw)
+        std = math.sqrt(sum((s - mean) ** 2 for s in raw) / len(raw))
+        if std == 0:
+            return [0.0] * len(raw)
+        return [(s - mean) / std for s in raw]
+
+    raise ValueError(f"Unknown normalization: {method}")
+
+
+def _resolve_weights(
+    result_lists: Sequence[List[SearchResult]],
+    weights: Optional[Sequence[float]],
+) -> Sequence[float]:
+    if weights is None:
+        return [1.0] * len(result_lists)
+    if len(weights) != len(result_lists):
+        raise ValueError(f"Got {len(weights)} weights for {len(result_lists)} result lists")
+    return weights
+
+
+def _ranked(
+    scores: Dict[str, float],
+    first_seen: Dict[str, SearchResult],
+    top_k: Optional[int],
+    search_type: str,
+) -> List[SearchResult]:
+    # sorted() is stable, so ties keep first-seen order
+    ordered = sorted(scores, key=scores.__getitem__, reverse=True)
+    if top_k is not None:
+        ordered = ordered[:top_k]
+    return [
+        first_seen[doc_id].model_copy(update={"score": scores[doc_id], "search_type": search_type})
+        for doc_id in ordered
+    ]
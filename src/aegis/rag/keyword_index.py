@@ -0,0 +1,361 @@
+"""
+Keyword Index
+
+In-process BM25 keyword search:
+- Analyzer mirroring the OpenSearch ``clinical_analyzer``
+  (standard tokenizer -> lowercase -> English stop words -> Snowball stemmer)
+- Inverted index maintained incrementally on add/remove
+- BM25 scoring over postings, with OR (union) or AND (intersection) matching
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import math
+import re
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+# =============================================================================
+# Analyzer
+# =============================================================================
+
+# Lucene/OpenSearch ``_english_`` stop set used by the ``stop`` filter
+ENGLISH_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "if", "in",
+    "into", "is", "it", "no", "not", "of", "on", "or", "such", "that", "the",
+    "their", "then", "there", "these", "they", "this", "to", "was", "will", "with",
+})
+
+# Approximates the Unicode standard tokenizer: keeps "3.5", "o'neil" and
+# "b12" together, splits on whitespace, hyphens and other punctuation.
+_TOKEN_PATTERN = re.compile(r"\w+(?:[.'’]\w+)*")
+
+
+class ClinicalAnalyzer:
+    """Python mirror of the ``clinical_analyzer`` defined in OpenSearch."""
+
+    def __init__(self, stop_words: Iterable[str] = ENGLISH_STOP_WORDS, stem: bool = True):
+        self.stop_words = frozenset(stop_words)
+        self.stem = stem
+        self._stem_cache: Dict[str, str] = {}
+
+    def analyze(self, text: str) -> List[str]:
+        """Tokenize text into index terms."""
+        terms = []
+        for match in _TOKEN_PATTERN.finditer(text.lower()):
+            token = match.group().replace("’", "'")
+            if token in self.stop_words:
+                continue
+            if self.stem:
+                stemmed = self._stem_cache.get(token)
+                if stemmed is None:
+                    stemmed = snowball_stem(token)
+                    if len(self._stem_cache) < 100_000:
+                        self._stem_cache[token] = stemmed
+                token = stemmed
+            terms.append(token)
+        return terms
+
+
+# =============================================================================
+# Snowball (Porter2) English Stemmer
+# =============================================================================
+
+_VOWELS = frozenset("aeiouy")
+_DOUBLES = ("bb", "dd", "ff", "gg", "mm", "nn", "pp", "rr", "tt")
+_LI_ENDINGS = frozenset("cdeghkmnrt")
+
+_EXCEPTIONS = {
+    "skis": "ski", "skies": "sky", "dying": "die", "lying": "lie", "tying": "tie",
+    "idly": "idl", "gently": "gentl", "ugly": "ugli", "early": "earli", "only": "onli",
+    "singly": "singl", "sky": "sky", "news": "news", "howe": "howe", "atlas": "atlas",
+    "cosmos": "cosmos", "bias": "bias", "andes": "andes",
+}
+_POST_STEP1A_EXCEPTIONS = frozenset({
+    "inning", "outing", "canning", "herring", "earring", "proceed", "exceed", "succeed",
+})
+
+_STEP2 = (
+    ("ization", "ize"), ("ational", "ate"), ("fulness", "ful"), ("ousness", "ous"),
+    ("iveness", "ive"), ("tional", "tion"), ("biliti", "ble"), ("lessli", "less"),
+    ("entli", "ent"), ("ation", "ate"), ("alism", "al"), ("aliti", "al"), ("ousli", "ous"),
+    ("iviti", "ive"), ("fulli", "ful"), ("enci", "ence"), ("anci", "ance"), ("abli", "able"),
+    ("izer", "ize"), ("ator", "ate"), ("alli", "al"), ("bli", "ble"), ("ogi", "og"), ("li", ""),
+)
+_STEP3 = (
+    ("ational", "ate"), ("tional", "tion"), ("alize", "al"), ("icate", "ic"), ("iciti", "ic"),
+    ("ative", ""), ("ical", "ic"), ("ness", ""), ("ful", ""),
+)
+_STEP4 = (
+    "ement", "ance", "ence", "able", "ible", "ment", "ant", "ent", "ism", "ate", "iti",
+    "ous", "ive", "ize", "ion", "al", "er", "ic",
+)
+
+
+def _is_vowel(word: str, i: int) -> bool:
+    return word[i] in _VOWELS
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    """Start offsets of R1 and R2."""
+    def next_region(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if not _is_vowel(word, i) and _is_vowel(word, i - 1):
+                return i + 1
+        return len(word)
+
+    for prefix in ("gener", "commun", "arsen"):
+        if word.startswith(prefix):
+            r1 = len(prefix)
+            break
+    else:
+        r1 = next_region(0)
+    return r1, next_region(r1) if r1 < len(word) else len(word)
+
+
+def _ends_short_syllable(word: str) -> bool:
+    n = len(word)
+    if n == 2:
+        return _is_vowel(word, 0) and not _is_vowel(word, 1)
+    if n >= 3:
+        return (
+            not _is_vowel(word, n - 3)
+            and _is_vowel(word, n - 2)
+            and not _is_vowel(word, n - 1)
+            and word[n - 1] not in "wxY"
+        )
+    return False
+
+
+def _has_vowel(text: str) -> bool:
+    return any(c in _VOWELS for c in text)
+
+
+def snowball_stem(word: str) -> str:
+    """Stem an English word with the Snowball (Porter2) algorithm."""
+    if len(word) <= 2 or not word.isalpha() and "'" not in word:
+        return word
+    if word in _EXCEPTIONS:
+        return _EXCEPTIONS[word]
+
+    if word.startswith("'"):
+        word = word[1:]
+    if word.startswith("y"):
+        word = "Y" + word[1:]
+    chars = list(word)
+    for i in range(1, len(chars)):
+        if chars[i] == "y" and chars[i - 1] in _VOWELS:
+            chars[i] = "Y"
+    word = "".join(chars)
+
+    r1, r2 = _regions(word)
+
+    # Step 0: possessives
+    for suffix in ("'s'", "'s", "'"):
+        if word.endswith(suffix):
+            word = word[:-len(suffix)]
+            break
+
+    # Step 1a: plurals
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ied") or word.endswith("ies"):
+        word = word[:-2] if len(word) > 4 else word[:-1]
+    elif word.endswith("us") or word.endswith("ss"):
+        pass
+    elif word.endswith("s") and _has_vowel(word[:-2]):
+        word = word[:-1]
+
+    if word in _POST_STEP1A_EXCEPTIONS:
+        return word
+
+    # Step 1b: -ed / -ing
+    for suffix in ("eedly", "ingly", "edly", "eed", "ing", "ed"):
+        if not word.endswith(suffix):
+            continue
+        stem = word[:-len(suffix)]
+        if suffix in ("eedly", "eed"):
+            if len(stem) >= r1:
+                word = stem + "ee"
+        elif _has_vowel(stem):
+            word = stem
+            if word.endswith(("at", "bl", "iz")):
+                word += "e"
+            elif word.endswith(_DOUBLES):
+                word = word[:-1]
+            elif _ends_short_syllable(word) and r1 >= len(word):
+                word += "e"
+        break
+
+    # Step 1c: y -> i
+    if len(word) > 2 and word[-1] in "yY" and not _is_vowel(word, len(word) - 2):
+        word = word[:-1] + "i"
+
+    # Step 2
+    for suffix, replacement in _STEP2:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) >= r1:
+                if suffix == "ogi":
+                    if word[-4:-3] == "l":
+                        word = word[:-3] + replacement
+                elif suffix == "li":
+                    if word[-3:-2] in _LI_ENDINGS and len(word) >= 3:
+                        word = word[:-2]
+                else:
+                    word = word[:-len(suffix)] + replacement
+            break
+
+    # Step 3
+    for suffix, replacement in _STEP3:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) >= r1:
+                if suffix == "ative":
+                    if len(word) - len(suffix) >= r2:
+                        word = word[:-5]
+                else:
+                    word = word[:-len(suffix)] + replacement
+            break
+
+    # Step 4
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) >= r2:
+                if suffix == "ion":
+                    if word[-4:-3] in ("s", "t"):
+                        word = word[:-3]
+                else:
+                    word = word[:-len(suffix)]
+            break
+
+    # Step 5
+    if word.endswith("e"):
+        stem = word[:-1]
+        if len(stem) >= r2 or (len(stem) >= r1 and not _ends_short_syllable(stem)):
+            word = stem
+    elif word.endswith("ll") and len(word) - 1 >= r2:
+        word = word[:-1]
+
+    return word.replace("Y", "y")
+
+
+# =============================================================================
+# BM25 Inverted Index
+# =============================================================================
+
+class BM25Index:
+    """
+    Incrementally maintained inverted index with BM25 scoring.
+
+    Query cost is proportional to the postings of the query terms, not to
+    corpus size.
+    """
+
+    def __init__(
+        self,
+        analyzer: ClinicalAnalyzer = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.analyzer = analyzer or ClinicalAnalyzer()
+        self.k1 = k1
+        self.b = b
+
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_lengths
+
+    def add(self, doc_id: str, text: str):
+        """Index (or re-index) a document."""
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+
+        terms = self.analyzer.analyze(text)
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        for term, tf in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._doc_terms[doc_id] = frequencies
+        self._doc_lengths[doc_id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document from the index."""
+        frequencies = self._doc_terms.pop(doc_id, None)
+        if frequencies is None:
+            return False
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        return True
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        operator: str = "or",
+        predicate: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 search.
+
+        Args:
+            query: Free-text query, analyzed like indexed text
+            top_k: Number of results
+            operator: "or" scores the union of postings, "and" only documents
+                containing every query term (intersection, shortest list first)
+            predicate: Optional filter applied to candidate doc IDs
+        """
+        terms = list(dict.fromkeys(self.analyzer.analyze(query)))
+        if not terms or not self._doc_lengths or top_k <= 0:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if operator == "and":
+            if any(p is None for p in postings):
+                return []
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for p in postings[1:]:
+                candidates.intersection_update(p)
+                if not candidates:
+                    return []
+        else:
+            postings = [p for p in postings if p]
+            if not postings:
+                return []
+            candidates = None
+
+        n_docs = len(self._doc_lengths)
+        avg_length = self._total_length / n_docs if n_docs else 0.0
+        k1, b = self.k1, self.b
+        doc_lengths = self._doc_lengths
+
+        scores: Dict[str, float] = {}
+        for term_postings in postings:
+            df = len(term_postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            docs = term_postings.keys() if candidates is None else candidates
+            for doc_id in docs:
+                tf = term_postings[doc_id]
+                norm = k1 * (1 - b + b * doc_lengths[doc_id] / avg_length) if avg_length else k1
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        items: Iterable[Tuple[str, float]] = scores.items()
+        if predicate is not None:
+            items = ((doc_id, score) for doc_id, score in items if predicate(doc_id))
+        return heapq.nlargest(top_k, items, key=lambda item: item[1])
@@ -0,0 +1,336 @@
+"""
+Reranking
+
+Rerank retrieved candidates:
+- LLM listwise reranking (all candidates scored in one prompt, or a bounded
+  number of concurrent batches)
+- Cross-encoder reranking on CPU (sentence-transformers, optional)
+- Lexical-overlap reranking (no model required)
+- Score cache keyed by (query hash, chunk id); scores that depend on the
+  rest of the candidate list (lexical) are keyed by the whole list
+"""
+
+from typing import Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import asyncio
+import hashlib
+import math
+import re
+
+import structlog
+
+from aegis.rag.keyword_index import ClinicalAnalyzer
+from aegis.rag.vectorstore import SearchResult
+
+logger = structlog.get_logger(__name__)
+
+
+# =============================================================================
+# Score Cache
+# =============================================================================
+
+class RerankCache:
+    """LRU cache of rerank scores keyed by (query hash, chunk id)."""
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def query_key(scope: str, query: str, candidates: List[SearchResult] = ()) -> str:
+        """
+        Hash a query, namespaced by the reranker that produced the score.
+
+        ``candidates`` (ids and retrieval scores, in order) are part of the
+        key for scores that are relative to the candidate list.
+        """
+        normalized = " ".join(query.lower().split())
+        payload = "".join(f"\x00{r.document.id}\x01{r.score!r}" for r in candidates)
+        return hashlib.sha256(f"{scope}\x00{normalized}{payload}".encode("utf-8")).hexdigest()[:32]
+
+    def get(self, query_key: str, chunk_id: str) -> Optional[float]:
+        score = self._scores.get((query_key, chunk_id))
+        if score is None:
+            self.misses += 1
+            return None
+        self._scores.move_to_end((query_key, chunk_id))
+        self.hits += 1
+        return score
+
+    def put(self, query_key: str, chunk_id: str, score: float):
+        self._scores[(query_key, chunk_id)] = score
+        self._scores.move_to_end((query_key, chunk_id))
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+    def clear(self):
+        self._scores.clear()
+
+
+# =============================================================================
+# Base Reranker
+# =============================================================================
+
+class Reranker(ABC):
+    """
+    Base reranker.
+
+    Subclasses implement ``_score`` for the candidates missing from the
+    cache; ``rerank`` handles caching, ordering and truncation.
+
+    Rerankers whose scores are relative to the candidate list (``listwise``:
+    normalization, IDF, one prompt for the list) always score the full list,
+    and their scores are cached for that exact list only.
+    """
+
+    name = "base"
+    listwise = False
+
+    def __init__(self, cache: RerankCache = None):
+        self.cache = cache if cache is not None else RerankCache()
+
+    async def rerank(
+        self,
+        query: str,
+        results: List[SearchResult],
+        top_k: int,
+    ) -> List[SearchResult]:
+        """Return the top_k results reordered by rerank score."""
+        if not results:
+            return []
+
+        query_key = RerankCache.query_key(self.name, query, results if self.listwise else ())
+        scores: Dict[str, float] = {}
+        missing: List[SearchResult] = []
+        for result in results:
+            cached = self.cache.get(query_key, result.document.id)
+            if cached is None:
+                missing.append(result)
+            else:
+                scores[result.document.id] = cached
+
+        if missing and self.listwise:
+            # A subset would be scored relative to itself
+            missing = results
+        if missing:
+            fresh = await self._score(query, missing)
+            for result in missing:
+                score = fresh.get(result.document.id)
+                if score is not None:
+                    scores[result.document.id] = score
+                    self.cache.put(query_key, result.document.id, score)
+
+        if not scores:
+            # Nothing was scored: keep the retrieval ranking
+            return results[:top_k]
+
+        # Candidates the reranker left out take the lowest rerank score (retrieval
+        # scores are on another scale) and rank after every scored candidate
+        floor = min(scores.values())
+        reranked = []
+        for result in results:
+            scored = result.document.id in scores
+            score = scores[result.document.id] if scored else floor
+            reranked.append((scored, result.model_copy(update={"score": score})))
+        # Stable sort keeps retrieval order for ties
+        reranked.sort(key=lambda item: (item[0], item[1].score), reverse=True)
+        return [result for _, result in reranked[:top_k]]
+
+    @abstractmethod
+    async def _score(self, query: str, results: List[SearchResult]) -> Dict[str, float]:
+        """Score candidates; candidates left out rank last, at the lowest score."""
+        pass
+
+
+# =============================================================================
+# LLM Listwise Reranker
+# =============================================================================
+
+class LLMListwiseReranker(Reranker):
+    """
+    Score candidates with an LLM in a single listwise prompt.
+
+    Lists longer than ``batch_size`` are split into batches that run
+    concurrently, at most ``max_concurrency`` at a time. The prompt asks for
+    an absolute 0-10 relevance, so scores are cached per (query, chunk) and
+    only uncached candidates are sent to the LLM.
+    """
+
+    name = "llm_listwise"
+
+    _SCORE_LINE = re.compile(r"\[?(\d+)\]?\s*[:=\-]\s*(\d+(?:\.\d+)?)")
+
+    def __init__(
+        self,
+        llm_client,
+        batch_size: int = 20,
+        max_concurrency: int = 4,
+        excerpt_chars: int = 500,
+        cache: RerankCache = None,
+    ):
+        super().__init__(cache)
+        self.llm_client = llm_client
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.excerpt_chars = excerpt_chars
+
+    async def _score(self, query: str, results: List[SearchResult]) -> Dict[str, float]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def score_batch(batch: List[SearchResult]) -> Dict[str, float]:
+            async with semaphore:
+                return await self._score_batch(query, batch)
+
+        batches = [
+            results[i:i + self.batch_size] for i in range(0, len(results), self.batch_size)
+        ]
+        scores: Dict[str, float] = {}
+        for batch_scores in await asyncio.gather(*[score_batch(b) for b in batches]):
+            scores.update(batch_scores)
+        return scores
+
+    async def _score_batch(self, query: str, batch: List[SearchResult]) -> Dict[str, float]:
+        documents = "\n\n".join(
+            f"[{i}] {result.document.content[:self.excerpt_chars]}"
+            for i, result in enumerate(batch, 1)
+        )
+        prompt = f"""Rate the relevance of each document excerpt to the query on a scale of 0-10.
+Respond with one line per document in the form "<number>: <score>" and nothing else.
+
+Query: {query}
+
+Documents:
+{documents}
+
+Relevance scores:"""
+
+        try:
+            # Deterministic, so the LLM response cache can serve repeated prompts
+            response = await self.llm_client.generate(
+                prompt, max_tokens=8 * len(batch) + 16, temperature=0
+            )
+        except Exception as e:
+            logger.error(f"Listwise reranking failed: {e}")
+            return {}
+
+        scores = {}
+        for match in self._SCORE_LINE.finditer(response.content):
+            position, score = int(match.group(1)), float(match.group(2))
+            if 1 <= position <= len(batch):
+                scores[batch[position - 1].document.id] = score
+        return scores
+
+
+# =============================================================================
+# Local Rerankers
+# =============================================================================
+
+class LexicalReranker(Reranker):
+    """
+    CPU-only reranker based on query-term overlap.
+
+    Blends the candidate's (min-max normalized) retrieval score with the
+    IDF-weighted share of query terms it contains, using the same analyzer
+    as the keyword index. IDF is computed over the candidate set.
+    """
+
+    name = "lexical"
+    listwise = True
+
+    def __init__(
+        self,
+        retrieval_weight: float = 0.5,
+        analyzer: ClinicalAnalyzer = None,
+        cache: RerankCache = None,
+    ):
+        super().__init__(cache)
+        self.retrieval_weight = retrieval_weight
+        self.analyzer = analyzer or ClinicalAnalyzer()
+
+    async def _score(self, query: str, results: List[SearchResult]) -> Dict[str, float]:
+        query_terms = set(self.analyzer.analyze(query))
+        if not query_terms:
+            return {}
+
+        doc_terms = [set(self.analyzer.analyze(r.document.content)) for r in results]
+        n = len(results)
+        idf = {
+            term: math.log(1 + (n + 1) / (1 + sum(term in terms for terms in doc_terms)))
+            for term in query_terms
+        }
+        total_idf = sum(idf.values())
+
+        raw = [r.score for r in results]
+        low, high = min(raw), max(raw)
+        span = high - low
+
+        scores = {}
+        for result, terms in zip(results, doc_terms):
+            overlap = sum(idf[t] for t in query_terms & terms) / total_idf
+            retrieval = (result.score - low) / span if span else 1.0
+            scores[result.document.id] = 10 * (
+                self.retrieval_weight * retrieval + (1 - self.retrieval_weight) * overlap
+            )
+        return scores
+
+
+class CrossEncoderReranker(Reranker):
+    """
+    Cross-encoder reranker (sentence-transformers) running on CPU.
+
+    Falls back to lexical overlap when the model is unavailable.
+    """
+
+    name = "cross_encoder"
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        device: str = "cpu",
+        batch_size: int = 32,
+        cache: RerankCache = None,
+    ):
+        super().__init__(cache)
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+        self.model = None
+        self._fallback = LexicalReranker(cache=self.cache)
+        self._init_model()
+
+    def _init_model(self):
+        """Initialize cross-encoder model."""
+        try:
+            from sentence_transformers import CrossEncoder
+            self.model = CrossEncoder(self.model_name, device=self.device)
+            logger.info(f"Loaded cross-encoder: {self.model_name}")
+        except ImportError:
+            logger.warning("sentence-transformers not installed, using lexical reranking")
+        except Exception as e:
+            logger.warning(f"Failed to load cross-encoder: {e}")
+
+    async def rerank(
+        self,
+        query: str,
+        results: List[SearchResult],
+        top_k: int,
+    ) -> List[SearchResult]:
+        # Lexical scores are relative to the list, so the fallback reranks it whole
+        if self.model:
+            try:
+                return await super().rerank(query, results, top_k)
+            except Exception as e:
+                logger.error(f"Cross-encoder reranking failed: {e}")
+        return await self._fallback.rerank(query, results, top_k)
+
+    async def _score(self, query: str, results: List[SearchResult]) -> Dict[str, float]:
+        pairs = [(query, r.document.content) for r in results]
+        scores = await asyncio.to_thread(
+            self.model.predict,
+            pairs,
+            batch_size=self.batch_size,
+        )
+        return {r.document.id: float(s) for r, s in zip(results, scores)}
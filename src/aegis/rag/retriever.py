@@ -17,6 +17,7 @@ from pydantic import BaseModel, Field
 
 from aegis.rag.vectorstore import VectorStore, Document, SearchResult
 from aegis.rag.embeddings import EmbeddingModel
+from aegis.rag.reranking import Reranker, RerankCache, LLMListwiseReranker, LexicalReranker
 
 logger = structlog.get_logger(__name__)
 
@@ -63,6 +64,7 @@ class RAGResponse(BaseModel):
     total_results: int = 0
     search_type: str = "hybrid"
     retrieval_time_ms: int = 0
+    rerank_time_ms: int = 0
     
     def get_context_with_citations(self) -> str:
         """Get context with inline citations."""
@@ -86,7 +88,7 @@ class RAGRetriever:
     - Multi-query expansion (generate related queries)
     - Hybrid search (vector + keyword)
     - GraphRAG (graph traversal + vector search)
-    - Reranking (cross-encoder or LLM-based)
+    - Reranking (listwise LLM, cross-encoder or lexical; see aegis.rag.reranking)
     - Parent document retrieval
     - Citation tracking
     """
@@ -97,11 +99,16 @@ class RAGRetriever:
         embedding_model: EmbeddingModel,
         llm_client=None,  # For query expansion and reranking
         graph_client=None,  # For GraphRAG - graph traversal
+        reranker: Reranker = None,  # Defaults to LLM listwise or lexical
     ):
         self.vector_store = vector_store
         self.embedding_model = embedding_model
         self.llm_client = llm_client
         self.graph_client = graph_client
+        self.reranker = reranker
+        
+        self._rerank_cache = RerankCache()
+        self._default_reranker: Optional[Reranker] = None
     
     async def retrieve(
         self,
@@ -147,38 +154,31 @@ class RAGRetriever:
         # Get embeddings for all queries
         embeddings = await self.embedding_model.embed_batch(queries)
         
-        # Search with all queries
-        all_results = []
-        for q, emb in zip(queries, embeddings):
-            if search_type == "vector":
-                results = await self.vector_store.search(emb, top_k * 2, filters)
-            elif search_type == "keyword":
-                results = await self.vector_store.keyword_search(q, top_k * 2, filters)
-            elif search_type == "graphrag":
-                # GraphRAG: Combine graph traversal results with vector search
-                graph_results = await self._graphrag_search(q, emb, graph_entity_id, top_k * 2, filters)
-                all_results.extend(graph_results)
-                continue  # Skip regular search for graphrag mode
-            else:  # hybrid
-                results = await self.vector_store.hybrid_search(q, emb, top_k * 2, 0.7, filters)
-            
-            all_results.extend(results)
+        # Search with all queries concurrently
+        per_query_results = await asyncio.gather(*[
+            self._search_one(q, emb, search_type, top_k * 2, filters, graph_entity_id)
+            for q, emb in zip(queries, embeddings)
+        ])
         
-        # Deduplicate by document ID
+        # Deduplicate by document ID (gather preserves query order)
         seen_ids = set()
         unique_results = []
-        for result in all_results:
-            if result.document.id not in seen_ids:
-                seen_ids.add(result.document.id)
-                unique_results.append(result)
+        for results in per_query_results:
+            for result in results:
+                if result.document.id not in seen_ids:
+                    seen_ids.add(result.document.id)
+                    unique_results.append(result)
         
         # Temporal RAG: Apply time-based prioritization
         if temporal_priority:
             unique_results = self._apply_temporal_priority(unique_results, time_window_days)
         
         # Rerank if enabled
+        rerank_time_ms = 0
         if rerank and len(unique_results) > top_k:
+            rerank_start = datetime.utcnow()
             unique_results = await self._rerank(query, unique_results, top_k * 2)
+            rerank_time_ms = int((datetime.utcnow() - rerank_start).total_seconds() * 1000)
         
         # Take top_k
         final_results = unique_results[:top_k]
@@ -204,8 +204,29 @@ class RAGRetriever:
             total_results=len(final_results),
             search_type=search_type,
             retrieval_time_ms=retrieval_time_ms,
+            rerank_time_ms=rerank_time_ms,
         )
     
+    async def _search_one(
+        self,
+        query: str,
+        query_embedding: List[float],
+        search_type: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        graph_entity_id: Optional[str],
+    ) -> List[SearchResult]:
+        """Run a single (possibly expanded) query against the vector store."""
+        if search_type == "vector":
+            return await self.vector_store.search(query_embedding, top_k, filters)
+        elif search_type == "keyword":
+            return await self.vector_store.keyword_search(query, top_k, filters)
+        elif search_type == "graphrag":
+            # GraphRAG: Combine graph traversal results with vector search
+            return await self._graphrag_search(query, query_embedding, graph_entity_id, top_k, filters)
+        else:  # hybrid
+            return await self.vector_store.hybrid_search(query, query_embedding, top_k, 0.7, filters)
+    
     async def _expand_query(self, query: str) -> List[str]:
         """Generate additional queries using LLM."""
         if not self.llm_client:
@@ -240,49 +261,36 @@ Alternative queries:"""
         top_k: int,
     ) -> List[SearchResult]:
         """
-        Rerank results using cross-encoder or LLM.
+        Rerank results with the configured reranker.
         
-        Falls back to score-based ranking if LLM not available.
+        Defaults to listwise LLM reranking when an LLM client is available
+        and to local lexical-overlap reranking otherwise. Falls back to
+        score-based ranking on failure.
         """
-        if not self.llm_client or len(results) <= top_k:
-            # Simple score-based ranking
+        if len(results) <= top_k:
             results.sort(key=lambda x: x.score, reverse=True)
             return results[:top_k]
         
         try:
-            # Use LLM to score relevance
-            scored_results = []
-            
-            for result in results[:top_k * 2]:
-                # Score each result
-                prompt = f"""Rate the relevance of this document excerpt to the query on a scale of 0-10.
-Only respond with a number.
-
-Query: {query}
-
-Document: {result.document.content[:500]}
-
-Relevance score (0-10):"""
-                
-                from aegis.llm.providers import Message, Role
-                response = await self.llm_client.generate(prompt, max_tokens=10)
-                
-                try:
-                    score = float(response.content.strip())
-                    result.score = score
-                except ValueError:
-                    pass
-                
-                scored_results.append(result)
-            
-            scored_results.sort(key=lambda x: x.score, reverse=True)
-            return scored_results[:top_k]
-            
+            return await self._get_reranker().rerank(query, results[:top_k * 2], top_k)
         except Exception as e:
             logger.error(f"Reranking failed: {e}")
             results.sort(key=lambda x: x.score, reverse=True)
             return results[:top_k]
     
+    def _get_reranker(self) -> Reranker:
+        """Explicit reranker, else a default matching the LLM client."""
+        if self.reranker:
+            return self.reranker
+        if self.llm_client:
+            if not isinstance(self._default_reranker, LLMListwiseReranker) or (
+                self._default_reranker.llm_client is not self.llm_client
+            ):
+                self._default_reranker = LLMListwiseReranker(self.llm_client, cache=self._rerank_cache)
+        elif not isinstance(self._default_reranker, LexicalReranker):
+            self._default_reranker = LexicalReranker(cache=self._rerank_cache)
+        return self._default_reranker
+    
     async def _include_parents(self, results: List[SearchResult]) -> List[SearchResult]:
         """Include parent documents for hierarchical chunks."""
         enhanced_results = []
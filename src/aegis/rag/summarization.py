@@ -5,16 +5,84 @@ Pre-digest patient charts into hierarchical summaries:
 - Daily summaries → Weekly summaries → Monthly summaries → Yearly summaries
 
 This reduces token usage and improves retrieval for long patient histories.
+
+Windows are calendar-aligned and every window summary is cached under
+(patient, model, level, window, hash of its inputs), so refreshing a chart
+only re-summarizes windows whose events changed. Structured fallbacks (no
+LLM, or the LLM call failed) are never cached.
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+# =============================================================================
+# Window Helpers
+# =============================================================================
+
+def _naive_utc(value: datetime) -> datetime:
+    """Normalize to naive UTC so aware and naive timestamps compare."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _window_start(value: datetime, level: str) -> datetime:
+    """Start of the calendar window containing ``value``."""
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if level == "weekly":
+        return day - timedelta(days=day.weekday())
+    if level == "monthly":
+        return day.replace(day=1)
+    if level == "yearly":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _window_end(start: datetime, level: str) -> datetime:
+    if level == "weekly":
+        return start + timedelta(days=7)
+    if level == "monthly":
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    if level == "yearly":
+        return start.replace(year=start.year + 1)
+    return start + timedelta(days=1)
+
+
+def _content_hash(items: List[Any]) -> str:
+    """Order-sensitive hash of a window's inputs (events or child summaries)."""
+    payload = json.dumps(items, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _model_key(llm_client) -> str:
+    """Name of the LLM behind a summarizer, so models never share summaries."""
+    if llm_client is None:
+        return "none"
+    config = getattr(llm_client, "config", None)
+    model = getattr(config, "model", None) or getattr(llm_client, "model", None)
+    name = type(llm_client).__name__
+    return f"{name}:{model}" if model else name
+
+
+def _response_text(response) -> Tuple[str, bool]:
+    """Text of an LLM response and whether it is a real (cacheable) answer."""
+    if hasattr(response, "content"):
+        return response.content, not getattr(response, "is_mock", False)
+    return str(response), True
+
+
 @dataclass
 class SummaryLevel:
     """Summary level configuration."""
@@ -22,6 +90,120 @@ class SummaryLevel:
     time_window_days: int
     max_tokens: int
     include_details: bool
+    child: Optional[str] = None  # Level whose summaries this one combines (None = raw events)
+
+
+# =============================================================================
+# Summary Cache
+# =============================================================================
+
+class SummaryCache:
+    """
+    Cache of window summaries.
+    
+    One entry per (patient, level, window), tagged with the hash of the
+    inputs it was built from; a lookup with a different hash is a miss, and
+    the next put replaces the stale summary. In-process LRU with an optional
+    SQLite tier that survives restarts.
+    """
+    
+    def __init__(self, max_entries: int = 100_000, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[str, str]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "patient_id TEXT, level TEXT, window TEXT, content_hash TEXT, summary TEXT, "
+                "PRIMARY KEY (patient_id, level, window))"
+            )
+            self._db.commit()
+    
+    async def get(self, patient_id: str, level: str, window: str, content_hash: str) -> Optional[str]:
+        key = (patient_id, level, window)
+        entry = self._memory.get(key)
+        if entry is None and self._db:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self._put_memory(key, entry)
+        if entry is not None and entry[0] == content_hash:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+    
+    async def put(self, patient_id: str, level: str, window: str, content_hash: str, summary: str):
+        key = (patient_id, level, window)
+        self._put_memory(key, (content_hash, summary))
+        if self._db:
+            await asyncio.to_thread(self._write_disk, key, content_hash, summary)
+    
+    def invalidate(self, patient_id: str):
+        """Drop every cached summary of a patient."""
+        for key in [k for k in self._memory if k[0] == patient_id]:
+            del self._memory[key]
+        if self._db:
+            with self._db_lock:
+                self._db.execute("DELETE FROM summaries WHERE patient_id = ?", (patient_id,))
+                self._db.commit()
+    
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+    
+    def close(self):
+        if self._db:
+            self._db.close()
+            self._db = None
+    
+    def _put_memory(self, key: Tuple[str, str, str], entry: Tuple[str, str]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _read_disk(self, key: Tuple[str, str, str]) -> Optional[Tuple[str, str]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT content_hash, summary FROM summaries "
+                "WHERE patient_id = ? AND level = ? AND window = ?",
+                key,
+            ).fetchone()
+        return tuple(row) if row else None
+    
+    def _write_disk(self, key: Tuple[str, str, str], content_hash: str, summary: str):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries "
+                "(patient_id, level, window, content_hash, summary) VALUES (?, ?, ?, ?, ?)",
+                (*key, content_hash, summary),
+            )
+            self._db.commit()
+
+
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get the process-wide summary cache."""
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SummaryCache()
+    return _summary_cache
 
 
 class RecursiveSummarizer:
@@ -30,27 +212,41 @@ class RecursiveSummarizer:
     
     Creates hierarchical summaries:
     - Level 1: Daily summaries (raw events → daily)
-    - Level 2: Weekly summaries (daily → weekly)
-    - Level 3: Monthly summaries (weekly → monthly)
-    - Level 4: Yearly summaries (monthly → yearly)
+    - Level 2: Weekly summaries (daily → weekly, Monday-aligned)
+    - Level 3: Monthly summaries (daily → calendar month; weeks straddle months)
+    - Level 4: Yearly summaries (monthly → calendar year)
+    
+    Each level above daily is built from the cached summaries of its child
+    level rather than raw events. Window summaries at one level run
+    concurrently, at most ``max_concurrency`` LLM calls at a time.
     """
     
     # Summary levels
     LEVELS = [
         SummaryLevel("daily", 1, 500, True),
-        SummaryLevel("weekly", 7, 1000, True),
-        SummaryLevel("monthly", 30, 2000, False),
-        SummaryLevel("yearly", 365, 3000, False),
+        SummaryLevel("weekly", 7, 1000, True, child="daily"),
+        SummaryLevel("monthly", 30, 2000, False, child="daily"),
+        SummaryLevel("yearly", 365, 3000, False, child="monthly"),
     ]
     
-    def __init__(self, llm_client=None):
+    def __init__(
+        self,
+        llm_client=None,
+        max_concurrency: int = 4,
+        cache: Optional[SummaryCache] = None,
+    ):
         """
         Initialize recursive summarizer.
         
         Args:
             llm_client: LLM client for generating summaries
+            max_concurrency: Maximum concurrent window summarizations
+            cache: Summary cache (the process-wide cache by default)
         """
         self.llm_client = llm_client
+        self.model_key = _model_key(llm_client)
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else get_summary_cache()
     
     async def summarize_patient_chart(
         self,
@@ -88,28 +284,30 @@ class RecursiveSummarizer:
                 "statistics": {},
             }
         
-        # Group events by time window based on level
-        level_config = next((l for l in self.LEVELS if l.name == level), self.LEVELS[2])  # Default: monthly
-        grouped_events = self._group_events_by_window(events, start_date, end_date, level_config.time_window_days)
+        level_config = self._get_level(level)
+        start_date, end_date = _naive_utc(start_date), _naive_utc(end_date)
+        in_range = [e for e in events if start_date <= self._get_event_date(e) < end_date]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        # Generate summaries for each window
-        window_summaries = []
-        for window_start, window_events in grouped_events.items():
-            window_summary = await self._summarize_window(
-                window_events,
-                window_start,
-                level_config,
-            )
-            window_summaries.append(window_summary)
+        # Summaries for each window, built bottom-up through the summary tree
+        windows = await self._summarize_level(patient_id, in_range, level_config, semaphore)
+        window_summaries = [windows[start] for start in sorted(windows)]
         
-        # Combine window summaries into final summary
-        combined_summary = await self._combine_summaries(
-            window_summaries,
+        # Combine window summaries into final summary; the range is in the prompt
+        combined_summary = await self._cached(
             patient_id,
-            start_date,
-            end_date,
-            level_config,
-        )
+            f"{level_config.name}:combined",
+            f"{start_date.isoformat()}/{end_date.isoformat()}",
+            _content_hash(window_summaries),
+            semaphore,
+            lambda: self._combine_summaries(
+                window_summaries,
+                patient_id,
+                start_date,
+                end_date,
+                level_config,
+            ),
+        ) if window_summaries else "No events in this period."
         
         # Extract key events and statistics
         key_events = self._extract_key_events(events)
@@ -125,42 +323,111 @@ class RecursiveSummarizer:
             },
             "key_events": key_events,
             "statistics": statistics,
-            "window_count": len(grouped_events),
+            "window_count": len(window_summaries),
         }
     
-    def _group_events_by_window(
+    # =========================================================================
+    # Summary Tree
+    # =========================================================================
+    
+    def _get_level(self, name: str) -> SummaryLevel:
+        return next((l for l in self.LEVELS if l.name == name), self.LEVELS[2])  # Default: monthly
+    
+    async def _summarize_level(
         self,
+        patient_id: str,
         events: List[Dict[str, Any]],
-        start_date: datetime,
-        end_date: datetime,
-        window_days: int,
-    ) -> Dict[datetime, List[Dict[str, Any]]]:
-        """Group events into time windows."""
-        grouped = {}
-        current = start_date
+        level_config: SummaryLevel,
+        semaphore: asyncio.Semaphore,
+    ) -> Dict[datetime, str]:
+        """Summaries of every non-empty window of a level, keyed by window start."""
+        if level_config.child is None:
+            inputs = self._group_events_by_window(events, level_config)
+            
+            def build(window_start, window_events):
+                return lambda: self._summarize_window(window_events, window_start, level_config)
+            
+            hashes = {start: _content_hash(window_events) for start, window_events in inputs.items()}
+        else:
+            children = await self._summarize_level(
+                patient_id, events, self._get_level(level_config.child), semaphore
+            )
+            inputs: Dict[datetime, List[str]] = {}
+            for child_start in sorted(children):
+                parent_start = _window_start(child_start, level_config.name)
+                inputs.setdefault(parent_start, []).append(children[child_start])
+            
+            def build(window_start, child_summaries):
+                return lambda: self._combine_summaries(
+                    child_summaries,
+                    patient_id,
+                    window_start,
+                    _window_end(window_start, level_config.name),
+                    level_config,
+                )
+            
+            hashes = {start: _content_hash(summaries) for start, summaries in inputs.items()}
         
-        while current < end_date:
-            window_end = current + timedelta(days=window_days)
-            window_events = [
-                e for e in events
-                if self._get_event_date(e) >= current and self._get_event_date(e) < window_end
-            ]
-            if window_events:
-                grouped[current] = window_events
-            current = window_end
+        starts = list(inputs)
+        summaries = await asyncio.gather(*[
+            self._cached(
+                patient_id,
+                level_config.name,
+                start.isoformat(),
+                hashes[start],
+                semaphore,
+                build(start, inputs[start]),
+            )
+            for start in starts
+        ])
+        return dict(zip(starts, summaries))
+    
+    async def _cached(
+        self,
+        patient_id: str,
+        level: str,
+        window: str,
+        content_hash: str,
+        semaphore: asyncio.Semaphore,
+        compute,
+    ) -> str:
+        """
+        Return the cached summary for a window, computing it on a miss.
         
-        return grouped
+        ``compute`` returns (summary, cacheable); fallback summaries are
+        returned but not cached, so the next refresh retries the LLM.
+        """
+        level = f"{self.model_key}/{level}"
+        summary = await self.cache.get(patient_id, level, window, content_hash)
+        if summary is None:
+            async with semaphore:
+                summary, cacheable = await compute()
+            if cacheable:
+                await self.cache.put(patient_id, level, window, content_hash, summary)
+        return summary
+    
+    def _group_events_by_window(
+        self,
+        events: List[Dict[str, Any]],
+        level_config: SummaryLevel,
+    ) -> Dict[datetime, List[Dict[str, Any]]]:
+        """Group events into calendar-aligned time windows in one pass."""
+        grouped: Dict[datetime, List[Dict[str, Any]]] = {}
+        for event in events:
+            window_start = _window_start(self._get_event_date(event), level_config.name)
+            grouped.setdefault(window_start, []).append(event)
+        return dict(sorted(grouped.items()))
     
     def _get_event_date(self, event: Dict[str, Any]) -> datetime:
         """Extract date from event."""
         date_str = event.get("date") or event.get("timestamp") or event.get("effective_date")
         if isinstance(date_str, str):
             try:
-                return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+                return _naive_utc(datetime.fromisoformat(date_str.replace("Z", "+00:00")))
             except Exception:
                 pass
         elif isinstance(date_str, datetime):
-            return date_str
+            return _naive_utc(date_str)
         return datetime.utcnow()
     
     async def _summarize_window(
@@ -168,15 +435,18 @@ class RecursiveSummarizer:
         events: List[Dict[str, Any]],
         window_start: datetime,
         level_config: SummaryLevel,
-    ) -> str:
+    ) -> Tuple[str, bool]:
         """
         Summarize events in a single time window.
         
         Uses LLM if available, otherwise creates structured summary.
+        
+        Returns:
+            The summary and whether it came from the LLM (and may be cached)
         """
         if not self.llm_client:
             # Fallback: structured summary
-            return self._create_structured_summary(events, window_start, level_config)
+            return self._create_structured_summary(events, window_start, level_config), False
         
         try:
             # Build prompt for LLM summarization
@@ -184,7 +454,7 @@ class RecursiveSummarizer:
             
             prompt = f"""Summarize these healthcare events for a patient in a concise, clinical format.
 
-Time Period: {window_start.strftime('%Y-%m-%d')} to {(window_start + timedelta(days=level_config.time_window_days)).strftime('%Y-%m-%d')}
+Time Period: {window_start.strftime('%Y-%m-%d')} to {_window_end(window_start, level_config.name).strftime('%Y-%m-%d')}
 
 Events:
 {events_text}
@@ -199,12 +469,15 @@ Provide a summary that includes:
 Keep it under {level_config.max_tokens} tokens and focus on clinically relevant information.
 """
             
-            response = await self.llm_client.generate(prompt, max_tokens=level_config.max_tokens)
-            return response.content if hasattr(response, 'content') else str(response)
+            # Deterministic, so the LLM response cache can serve repeated prompts
+            response = await self.llm_client.generate(
+                prompt, max_tokens=level_config.max_tokens, temperature=0
+            )
+            return _response_text(response)
             
         except Exception as e:
             logger.error("LLM summarization failed, using fallback", error=str(e))
-            return self._create_structured_summary(events, window_start, level_config)
+            return self._create_structured_summary(events, window_start, level_config), False
     
     def _format_events_for_summary(self, events: List[Dict[str, Any]]) -> str:
         """Format events as text for LLM."""
@@ -263,10 +536,10 @@ Keep it under {level_config.max_tokens} tokens and focus on clinically relevant
         start_date: datetime,
         end_date: datetime,
         level_config: SummaryLevel,
-    ) -> str:
-        """Combine multiple window summaries into one."""
+    ) -> Tuple[str, bool]:
+        """Combine multiple window summaries into one; returns (summary, cacheable)."""
         if len(window_summaries) == 1:
-            return window_summaries[0]
+            return window_summaries[0], True
         
         if self.llm_client:
             try:
@@ -286,13 +559,15 @@ Create a unified summary that highlights:
 
 Keep it concise and clinically relevant.
 """
-                response = await self.llm_client.generate(prompt, max_tokens=level_config.max_tokens)
-                return response.content if hasattr(response, 'content') else str(response)
+                response = await self.llm_client.generate(
+                    prompt, max_tokens=level_config.max_tokens, temperature=0
+                )
+                return _response_text(response)
             except Exception as e:
                 logger.error("LLM combination failed", error=str(e))
         
         # Fallback: simple concatenation
-        return "\n\n---\n\n".join(window_summaries)
+        return "\n\n---\n\n".join(window_summaries), False
     
     def _extract_key_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract key events (diagnoses, procedures, hospitalizations)."""
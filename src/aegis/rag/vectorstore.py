@@ -7,15 +7,19 @@ Store and search embeddings:
 - Hybrid search (vector + keyword)
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
+import asyncio
 import json
 import uuid
 
+import numpy as np
 import structlog
 from pydantic import BaseModel, Field
 
+from aegis.rag.keyword_index import BM25Index
+
 logger = structlog.get_logger(__name__)
 
 
@@ -107,10 +111,38 @@ class VectorStore(ABC):
         top_k: int = 10,
         vector_weight: float = 0.7,
         filters: Dict[str, Any] = None,
+        fusion: str = "rrf",
     ) -> List[SearchResult]:
         """Hybrid search combining vector and keyword."""
         pass
     
+    async def _fused_hybrid_search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        top_k: int,
+        vector_weight: float,
+        filters: Optional[Dict[str, Any]],
+        fusion: str,
+    ) -> List[SearchResult]:
+        """
+        Run both legs concurrently and fuse them (see aegis.rag.fusion).
+        
+        Each leg fetches 2x top_k candidates so every store fuses the same depth.
+        """
+        from aegis.rag.fusion import fuse
+        
+        vector_results, keyword_results = await asyncio.gather(
+            self.search(query_embedding, top_k * 2, filters),
+            self.keyword_search(query, top_k * 2, filters),
+        )
+        return fuse(
+            [vector_results, keyword_results],
+            method=fusion,
+            weights=[vector_weight, 1 - vector_weight],
+            top_k=top_k,
+        )
+    
     @abstractmethod
     async def delete(self, document_ids: List[str]) -> int:
         """Delete documents by ID."""
@@ -122,6 +154,224 @@ class VectorStore(ABC):
         pass
 
 
+# =============================================================================
+# OpenSearch Bulk Indexing
+# =============================================================================
+
+class BulkIndexResult(BaseModel):
+    """Outcome of a bulk indexing run."""
+    indexed: int = 0
+    failed: int = 0
+    retried: int = 0
+    batches: int = 0
+    
+    indexed_ids: List[str] = Field(default_factory=list)
+    errors: List[Dict[str, Any]] = Field(default_factory=list)  # {id, status, error}
+    
+    elapsed_ms: int = 0
+
+
+class OpenSearchBulkIndexer:
+    """
+    Batched ingestion through the OpenSearch ``_bulk`` API.
+    
+    - Batches are cut by serialized byte budget (and a doc-count cap)
+    - Up to ``max_concurrency`` batches are in flight at once
+    - Items and whole requests rejected with retryable statuses (429/5xx),
+      or requests that got no response, are resent with exponential
+      backoff; other failures are reported per item
+    - Index refresh can be disabled for the duration of a large load and
+      is restored to the index's own setting afterwards
+    """
+    
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    
+    def __init__(
+        self,
+        client,
+        index_name: str,
+        max_batch_bytes: int = 5 * 1024 * 1024,
+        max_batch_docs: int = 1000,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        self.client = client
+        self.index_name = index_name
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_docs = max_batch_docs
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+    
+    async def index(
+        self,
+        actions: Iterable[Tuple[str, Dict[str, Any]]],
+        disable_refresh: bool = False,
+    ) -> BulkIndexResult:
+        """
+        Index ``(doc_id, source)`` pairs.
+        
+        Batches are produced lazily, so at most ``max_concurrency`` batches
+        are held in memory regardless of input size.
+        """
+        start_time = datetime.utcnow()
+        result = BulkIndexResult()
+        
+        restore_refresh = False
+        previous_refresh = None
+        if disable_refresh:
+            try:
+                previous_refresh = await self._get_refresh_interval()
+            except Exception as e:
+                logger.warning(f"Failed to read refresh_interval, leaving refresh on: {e}")
+            else:
+                restore_refresh = await self._set_refresh_interval("-1")
+        
+        try:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            tasks = []
+            
+            async def run_batch(batch: List[Tuple[str, str]]):
+                try:
+                    await self._send_with_retries(batch, result)
+                finally:
+                    semaphore.release()
+            
+            for batch in self._batches(actions):
+                await semaphore.acquire()
+                result.batches += 1
+                tasks.append(asyncio.create_task(run_batch(batch)))
+            
+            await asyncio.gather(*tasks)
+        finally:
+            if restore_refresh:
+                # None (unset) resets the index to the cluster default
+                await self._set_refresh_interval(previous_refresh)
+            if disable_refresh:
+                try:
+                    await self.client.indices.refresh(index=self.index_name)
+                except Exception as e:
+                    logger.warning(f"Refresh after bulk load failed: {e}")
+        
+        result.elapsed_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        logger.info(
+            "Bulk indexing complete",
+            index=self.index_name,
+            indexed=result.indexed,
+            failed=result.failed,
+            retried=result.retried,
+            batches=result.batches,
+            elapsed_ms=result.elapsed_ms,
+        )
+        return result
+    
+    def _batches(
+        self,
+        actions: Iterable[Tuple[str, Dict[str, Any]]],
+    ) -> Iterator[List[Tuple[str, str]]]:
+        """Group actions into batches of serialized ``(doc_id, ndjson_lines)``."""
+        batch: List[Tuple[str, str]] = []
+        batch_bytes = 0
+        
+        for doc_id, source in actions:
+            lines = (
+                json.dumps({"index": {"_index": self.index_name, "_id": doc_id}})
+                + "\n"
+                + json.dumps(source, default=str)
+                + "\n"
+            )
+            size = len(lines.encode("utf-8"))
+            
+            if batch and (
+                batch_bytes + size > self.max_batch_bytes
+                or len(batch) >= self.max_batch_docs
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            
+            batch.append((doc_id, lines))
+            batch_bytes += size
+        
+        if batch:
+            yield batch
+    
+    async def _send_with_retries(self, batch: List[Tuple[str, str]], result: BulkIndexResult):
+        """Send one batch, resending retryable item failures with backoff."""
+        pending = batch
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                result.retried += len(pending)
+            
+            last_attempt = attempt == self.max_retries
+            
+            try:
+                response = await self.client.bulk(body="".join(lines for _, lines in pending))
+            except Exception as e:
+                status = self._request_status(e)
+                retryable = status is None or status in self.RETRYABLE_STATUSES
+                if last_attempt or not retryable:
+                    for doc_id, _ in pending:
+                        result.failed += 1
+                        result.errors.append({"id": doc_id, "status": status, "error": str(e)})
+                    return
+                logger.warning(f"Bulk request failed, retrying: {e}")
+                continue
+            
+            retry = []
+            items = response.get("items", [])
+            for i, (doc_id, lines) in enumerate(pending):
+                if i < len(items):
+                    outcome = items[i].get("index", {})
+                else:
+                    outcome = {"status": 500, "error": "missing from bulk response"}
+                status = outcome.get("status", 200)
+                
+                if "error" not in outcome and status < 300:
+                    result.indexed += 1
+                    result.indexed_ids.append(doc_id)
+                elif status in self.RETRYABLE_STATUSES and not last_attempt:
+                    retry.append((doc_id, lines))
+                else:
+                    result.failed += 1
+                    result.errors.append({"id": doc_id, "status": status, "error": outcome.get("error")})
+            
+            if not retry:
+                return
+            pending = retry
+    
+    @staticmethod
+    def _request_status(error: Exception) -> Optional[int]:
+        """HTTP status of a failed request; None if no response was received."""
+        # opensearch-py reports "N/A" for connection errors and timeouts
+        status = getattr(error, "status_code", None)
+        return status if isinstance(status, int) else None
+    
+    async def _get_refresh_interval(self) -> Optional[str]:
+        """The index's own refresh interval, or None if it is unset."""
+        settings = await self.client.indices.get_settings(index=self.index_name)
+        return (
+            settings.get(self.index_name, {})
+            .get("settings", {})
+            .get("index", {})
+            .get("refresh_interval")
+        )
+    
+    async def _set_refresh_interval(self, interval: Optional[str]) -> bool:
+        """Set the index refresh interval (None resets it); True on success."""
+        try:
+            await self.client.indices.put_settings(
+                index=self.index_name,
+                body={"index": {"refresh_interval": interval}},
+            )
+        except Exception as e:
+            logger.warning(f"Failed to set refresh_interval={interval}: {e}")
+            return False
+        return True
+
+
 # =============================================================================
 # OpenSearch Vector Store
 # =============================================================================
@@ -131,6 +381,7 @@ class OpenSearchVectorStore(VectorStore):
     OpenSearch vector store.
     
     Features:
+    - Bulk ingestion via the _bulk API
     - KNN (k-nearest neighbors) search
     - BM25 keyword search
     - Hybrid search with RRF (Reciprocal Rank Fusion)
@@ -232,33 +483,42 @@ class OpenSearchVectorStore(VectorStore):
             logger.warning("No OpenSearch client, documents not stored")
             return [d.id for d in documents]
         
-        ids = []
-        
-        for doc in documents:
-            body = {
-                "content": doc.content,
-                "embedding": doc.embedding,
-                "title": doc.title,
-                "source": doc.source,
-                "source_type": doc.source_type,
-                "chunk_index": doc.chunk_index,
-                "parent_id": doc.parent_id,
-                "metadata": doc.metadata,
-                "created_at": doc.created_at.isoformat(),
-            }
-            
-            try:
-                await self.client.index(
-                    index=self.index_name,
-                    id=doc.id,
-                    body=body,
-                )
-                ids.append(doc.id)
-            except Exception as e:
-                logger.error(f"Failed to index document {doc.id}: {e}")
+        result = await self.bulk_add_documents(documents)
+        for error in result.errors:
+            logger.error(f"Failed to index document {error['id']}: {error['error']}")
+        return result.indexed_ids
+    
+    async def bulk_add_documents(
+        self,
+        documents: Iterable[Document],
+        disable_refresh: bool = False,
+        **indexer_options,
+    ) -> BulkIndexResult:
+        """
+        Add documents through the ``_bulk`` API.
         
-        logger.info(f"Indexed {len(ids)} documents")
-        return ids
+        ``indexer_options`` are passed to ``OpenSearchBulkIndexer``
+        (batch byte budget, concurrency, retries).
+        """
+        indexer = OpenSearchBulkIndexer(self.client, self.index_name, **indexer_options)
+        return await indexer.index(
+            ((doc.id, self._to_source(doc)) for doc in documents),
+            disable_refresh=disable_refresh,
+        )
+    
+    def _to_source(self, doc: Document) -> Dict[str, Any]:
+        """Build the OpenSearch ``_source`` body for a document."""
+        return {
+            "content": doc.content,
+            "embedding": doc.embedding,
+            "title": doc.title,
+            "source": doc.source,
+            "source_type": doc.source_type,
+            "chunk_index": doc.chunk_index,
+            "parent_id": doc.parent_id,
+            "metadata": doc.metadata,
+            "created_at": doc.created_at.isoformat(),
+        }
     
     async def search(
         self,
@@ -346,46 +606,16 @@ class OpenSearchVectorStore(VectorStore):
         top_k: int = 10,
         vector_weight: float = 0.7,
         filters: Dict[str, Any] = None,
+        fusion: str = "rrf",
     ) -> List[SearchResult]:
         """
-        Hybrid search using Reciprocal Rank Fusion (RRF).
+        Hybrid search; Reciprocal Rank Fusion (RRF) by default.
         
-        Combines vector and keyword results.
+        Vector and keyword legs run concurrently.
         """
-        # Get both result sets
-        vector_results = await self.search(query_embedding, top_k * 2, filters)
-        keyword_results = await self.keyword_search(query, top_k * 2, filters)
-        
-        # RRF fusion
-        k = 60  # RRF constant
-        scores = {}
-        doc_map = {}
-        
-        for rank, result in enumerate(vector_results):
-            doc_id = result.document.id
-            rrf_score = vector_weight / (k + rank + 1)
-            scores[doc_id] = scores.get(doc_id, 0) + rrf_score
-            doc_map[doc_id] = result
-        
-        keyword_weight = 1 - vector_weight
-        for rank, result in enumerate(keyword_results):
-            doc_id = result.document.id
-            rrf_score = keyword_weight / (k + rank + 1)
-            scores[doc_id] = scores.get(doc_id, 0) + rrf_score
-            if doc_id not in doc_map:
-                doc_map[doc_id] = result
-        
-        # Sort by combined score
-        sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
-        
-        results = []
-        for doc_id in sorted_ids[:top_k]:
-            result = doc_map[doc_id]
-            result.score = scores[doc_id]
-            result.search_type = "hybrid"
-            results.append(result)
-        
-        return results
+        return await self._fused_hybrid_search(
+            query, query_embedding, top_k, vector_weight, filters, fusion
+        )
     
     async def delete(self, document_ids: List[str]) -> int:
         """Delete documents by ID."""
@@ -476,14 +706,36 @@ class OpenSearchVectorStore(VectorStore):
 
 class InMemoryVectorStore(VectorStore):
     """
-    Simple in-memory vector store for testing.
+    In-memory vector store for lite deployments and testing.
     
-    Uses cosine similarity for search.
+    Embeddings live in a contiguous, L2-normalized float32 matrix so a query
+    is a single matrix-vector product:
+    - Rows are mapped to document IDs via ``_row_ids`` / ``_id_to_row``
+    - Capacity grows geometrically (amortized O(1) appends)
+    - Deletes and re-upserts tombstone the row; the matrix is compacted
+      once more than half of the used rows are dead
+    
+    Keyword search uses an incrementally maintained BM25 inverted index.
     """
     
+    _INITIAL_CAPACITY = 1024
+    _GROWTH_FACTOR = 2
+    
     def __init__(self, index_name: str = "default", dimensions: int = 1536):
         super().__init__(index_name, dimensions)
         self.documents: Dict[str, Document] = {}
+        
+        # Embedding matrix (allocated lazily on first embedding so the width
+        # follows the embedding model rather than the configured default)
+        self._matrix: Optional[np.ndarray] = None
+        self._live: Optional[np.ndarray] = None
+        self._row_ids: List[Optional[str]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._size = 0
+        self._tombstones = 0
+        
+        # BM25 inverted index for keyword search
+        self._keyword_index = BM25Index()
     
     async def create_index(self):
         """No-op for in-memory store."""
@@ -493,8 +745,15 @@ class InMemoryVectorStore(VectorStore):
         """Add documents to memory."""
         ids = []
         for doc in documents:
+            if doc.id in self.documents:
+                self._remove_row(doc.id)
             self.documents[doc.id] = doc
+            if doc.embedding:
+                self._append_row(doc.id, doc.embedding)
+            self._keyword_index.add(doc.id, doc.content)
             ids.append(doc.id)
+        if self._needs_compaction():
+            self._compact()
         logger.info(f"Added {len(ids)} documents to in-memory store")
         return ids
     
@@ -505,30 +764,45 @@ class InMemoryVectorStore(VectorStore):
         filters: Dict[str, Any] = None,
     ) -> List[SearchResult]:
         """Vector similarity search using cosine similarity."""
-        import math
+        if self._size == 0 or top_k <= 0:
+            return []
         
-        def cosine_similarity(a: List[float], b: List[float]) -> float:
-            dot = sum(x * y for x, y in zip(a, b))
-            norm_a = math.sqrt(sum(x * x for x in a))
-            norm_b = math.sqrt(sum(y * y for y in b))
-            return dot / (norm_a * norm_b) if norm_a and norm_b else 0
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != (self._matrix.shape[1],):
+            logger.warning(
+                f"Query dimension {query.shape[0]} does not match index "
+                f"dimension {self._matrix.shape[1]}"
+            )
+            return []
         
-        results = []
-        for doc in self.documents.values():
-            if doc.embedding:
-                # Apply filters
-                if filters and not self._matches_filters(doc, filters):
-                    continue
-                
-                score = cosine_similarity(query_embedding, doc.embedding)
-                results.append(SearchResult(
-                    document=doc,
-                    score=score,
-                    search_type="vector",
-                ))
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        
+        scores = self._matrix[:self._size] @ query
+        candidates = self._live[:self._size]
+        if filters:
+            candidates = candidates & self._filter_mask(filters)
         
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:top_k]
+        rows = np.flatnonzero(candidates)
+        if rows.size == 0:
+            return []
+        
+        candidate_scores = scores[rows]
+        if rows.size > top_k:
+            part = np.argpartition(-candidate_scores, top_k - 1)[:top_k]
+            rows = rows[part]
+            candidate_scores = candidate_scores[part]
+        order = np.argsort(-candidate_scores, kind="stable")
+        
+        return [
+            SearchResult(
+                document=self.documents[self._row_ids[rows[i]]],
+                score=float(candidate_scores[i]),
+                search_type="vector",
+            )
+            for i in order
+        ]
     
     async def keyword_search(
         self,
@@ -536,26 +810,16 @@ class InMemoryVectorStore(VectorStore):
         top_k: int = 10,
         filters: Dict[str, Any] = None,
     ) -> List[SearchResult]:
-        """Simple keyword search."""
-        query_terms = query.lower().split()
-        results = []
-        
-        for doc in self.documents.values():
-            if filters and not self._matches_filters(doc, filters):
-                continue
-            
-            content_lower = doc.content.lower()
-            score = sum(1 for term in query_terms if term in content_lower)
-            
-            if score > 0:
-                results.append(SearchResult(
-                    document=doc,
-                    score=score,
-                    search_type="keyword",
-                ))
+        """BM25 keyword search over the inverted index."""
+        predicate = None
+        if filters:
+            def predicate(doc_id: str) -> bool:
+                return self._matches_filters(self.documents[doc_id], filters)
         
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:top_k]
+        return [
+            SearchResult(document=self.documents[doc_id], score=score, search_type="keyword")
+            for doc_id, score in self._keyword_index.search(query, top_k, predicate=predicate)
+        ]
     
     async def hybrid_search(
         self,
@@ -564,35 +828,12 @@ class InMemoryVectorStore(VectorStore):
         top_k: int = 10,
         vector_weight: float = 0.7,
         filters: Dict[str, Any] = None,
+        fusion: str = "rrf",
     ) -> List[SearchResult]:
-        """Combine vector and keyword search."""
-        vector_results = await self.search(query_embedding, top_k, filters)
-        keyword_results = await self.keyword_search(query, top_k, filters)
-        
-        # Simple combination
-        scores = {}
-        doc_map = {}
-        
-        for r in vector_results:
-            scores[r.document.id] = r.score * vector_weight
-            doc_map[r.document.id] = r
-        
-        for r in keyword_results:
-            keyword_score = r.score / 10  # Normalize
-            scores[r.document.id] = scores.get(r.document.id, 0) + keyword_score * (1 - vector_weight)
-            if r.document.id not in doc_map:
-                doc_map[r.document.id] = r
-        
-        sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
-        
-        return [
-            SearchResult(
-                document=doc_map[doc_id].document,
-                score=scores[doc_id],
-                search_type="hybrid",
-            )
-            for doc_id in sorted_ids[:top_k]
-        ]
+        """Combine vector and keyword search (RRF by default)."""
+        return await self._fused_hybrid_search(
+            query, query_embedding, top_k, vector_weight, filters, fusion
+        )
     
     async def delete(self, document_ids: List[str]) -> int:
         """Delete documents."""
@@ -600,7 +841,11 @@ class InMemoryVectorStore(VectorStore):
         for doc_id in document_ids:
             if doc_id in self.documents:
                 del self.documents[doc_id]
+                self._remove_row(doc_id)
+                self._keyword_index.remove(doc_id)
                 deleted += 1
+        if self._needs_compaction():
+            self._compact()
         return deleted
     
     async def get(self, document_id: str) -> Optional[Document]:
@@ -617,3 +862,79 @@ class InMemoryVectorStore(VectorStore):
             elif doc_value != value:
                 return False
         return True
+    
+    # =========================================================================
+    # Embedding Matrix
+    # =========================================================================
+    
+    def _append_row(self, doc_id: str, embedding: List[float]):
+        """Write a normalized embedding into the next free matrix row."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        
+        if self._matrix is None:
+            self._matrix = np.zeros((self._INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+            self._live = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            logger.warning(
+                f"Skipping embedding for {doc_id}: dimension {vector.shape[0]} "
+                f"does not match index dimension {self._matrix.shape[1]}"
+            )
+            return
+        
+        if self._size == self._matrix.shape[0]:
+            self._grow()
+        
+        norm = np.linalg.norm(vector)
+        row = self._size
+        self._matrix[row] = vector / norm if norm else vector
+        self._live[row] = True
+        self._row_ids.append(doc_id)
+        self._id_to_row[doc_id] = row
+        self._size += 1
+    
+    def _remove_row(self, doc_id: str):
+        """Tombstone the matrix row for a document."""
+        row = self._id_to_row.pop(doc_id, None)
+        if row is None:
+            return
+        self._live[row] = False
+        self._row_ids[row] = None
+        self._tombstones += 1
+    
+    def _grow(self):
+        """Grow matrix capacity geometrically."""
+        capacity = self._matrix.shape[0] * self._GROWTH_FACTOR
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        live = np.zeros(capacity, dtype=bool)
+        live[:self._size] = self._live[:self._size]
+        self._matrix = matrix
+        self._live = live
+    
+    def _needs_compaction(self) -> bool:
+        """Whether more than half of the used rows are tombstones."""
+        return self._tombstones > 0 and self._tombstones * 2 > self._size
+    
+    def _compact(self):
+        """Drop tombstoned rows and rebuild the id/row maps."""
+        keep = np.flatnonzero(self._live[:self._size])
+        capacity = max(self._INITIAL_CAPACITY, self._matrix.shape[0])
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:keep.size] = self._matrix[keep]
+        live = np.zeros(capacity, dtype=bool)
+        live[:keep.size] = True
+        
+        self._row_ids = [self._row_ids[row] for row in keep]
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(self._row_ids)}
+        self._matrix = matrix
+        self._live = live
+        self._size = int(keep.size)
+        self._tombstones = 0
+    
+    def _filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask over used rows for documents matching filters."""
+        mask = np.zeros(self._size, dtype=bool)
+        for row, doc_id in enumerate(self._row_ids):
+            if doc_id is not None and self._matches_filters(self.documents[doc_id], filters):
+                mask[row] = True
+        return mask
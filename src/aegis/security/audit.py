@@ -161,8 +161,8 @@ class AuditLogger:
         # PHI detector for audit data
         if detect_phi:
             try:
-                from aegis.security.phi_detection import PHIDetector
-                self._phi_detector = PHIDetector()
+                from aegis.security.phi_detection import get_phi_detector
+                self._phi_detector = get_phi_detector()
             except ImportError:
                 self._phi_detector = None
                 logger.warning("PHI detector not available")
@@ -194,12 +194,11 @@ class AuditLogger:
         if self._phi_detector and event.details:
             try:
                 details_str = json.dumps(event.details)
-                # Use detect() method to find PHI
-                detected_entities = self._phi_detector.detect(details_str)
-                if detected_entities:
+                # Types only: no entity dicts are built for audit events
+                phi_types = self._phi_detector.get_phi_types(details_str)
+                if phi_types:
                     event.contains_phi = True
-                    # Extract unique entity types
-                    event.phi_types = list(set([e.get("type", "unknown") for e in detected_entities]))
+                    event.phi_types = sorted(phi_types)
             except Exception as e:
                 logger.debug(f"PHI detection failed: {e}")
         
@@ -0,0 +1,378 @@
+"""
+Audit Chain Verification
+
+Verifies the immutable audit log's hash chain without loading it into memory:
+- Rows are streamed through a server-side cursor in sequence order and cut
+  into fixed-size segments
+- Segments are verified in a process pool. Each segment only needs the
+  stored chain hash of the row before it, which the reader already has, so
+  segments are independent and the results join at segment boundaries
+- A successful run stores a signed checkpoint (sequence number + chain
+  hash, HMAC-SHA256 with the application secret key). Later runs start
+  from the newest checkpoint whose signature checks out and only verify
+  records added since
+- Runs share one process pool (see shutdown_verification_executors)
+"""
+
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+
+import structlog
+
+from aegis.config import get_settings
+from aegis.security.immutable_audit import compute_chain_hash, compute_record_hash
+
+logger = structlog.get_logger(__name__)
+
+# Columns read per record; verify_segment() reads rows by this order
+ROW_COLUMNS = (
+    "sequence_number", "id", "timestamp", "event_type", "severity",
+    "user_id", "tenant_id", "action",
+    "resource_type", "resource_id",
+    "ip_address", "session_id",
+    "details", "success", "error_message",
+    "contains_phi", "phi_types",
+    "previous_hash", "record_hash", "chain_hash",
+)
+
+# Fields hashed into record_hash (everything between sequence_number and previous_hash)
+_HASHED_FIELDS = ROW_COLUMNS[1:-3]
+
+CHECKPOINT_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS immutable_audit_checkpoints (
+        id BIGSERIAL PRIMARY KEY,
+        sequence_number BIGINT NOT NULL,
+        chain_hash VARCHAR(64) NOT NULL,
+        records_verified BIGINT NOT NULL,
+        verified_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        signature VARCHAR(64) NOT NULL
+    );
+    
+    CREATE INDEX IF NOT EXISTS idx_immutable_audit_checkpoints_sequence
+        ON immutable_audit_checkpoints(sequence_number DESC);
+"""
+
+
+# =============================================================================
+# Segment Verification (runs in worker processes)
+# =============================================================================
+
+def _record_data(row: tuple) -> Dict[str, Any]:
+    """Rebuild the hashed fields of a stored row the way ingestion saw them."""
+    data = dict(zip(_HASHED_FIELDS, row[1:-3]))
+    data["id"] = str(data["id"])
+    data["timestamp"] = data["timestamp"].isoformat()
+    details = data["details"]
+    data["details"] = json.loads(details) if isinstance(details, str) else details or {}
+    data["phi_types"] = list(data["phi_types"] or [])
+    return data
+
+
+def verify_segment(previous_chain_hash: Optional[str], rows: List[tuple]) -> Tuple[int, List[dict]]:
+    """
+    Verify a run of consecutive rows.
+    
+    Args:
+        previous_chain_hash: Stored chain hash of the row before the segment
+        rows: Tuples in ROW_COLUMNS order
+    
+    Returns:
+        (rows verified, tampered record reports)
+    """
+    tampered = []
+    for row in rows:
+        sequence_number, record_id = row[0], str(row[1])
+        previous_hash, record_hash, chain_hash = row[-3:]
+        
+        expected_record_hash = compute_record_hash(_record_data(row), previous_hash)
+        expected_chain_hash = compute_chain_hash(expected_record_hash, previous_chain_hash)
+        
+        if expected_record_hash != record_hash:
+            tampered.append({
+                "sequence_number": sequence_number,
+                "id": record_id,
+                "issue": "record_hash_mismatch",
+                "expected": expected_record_hash,
+                "actual": record_hash,
+            })
+        
+        if expected_chain_hash != chain_hash:
+            tampered.append({
+                "sequence_number": sequence_number,
+                "id": record_id,
+                "issue": "chain_hash_mismatch",
+                "expected": expected_chain_hash,
+                "actual": chain_hash,
+            })
+        
+        previous_chain_hash = chain_hash
+    return len(rows), tampered
+
+
+# Process pools shared by verifier runs, by max_workers (created on first use)
+_executors: Dict[Optional[int], ProcessPoolExecutor] = {}
+
+
+def get_verification_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Shared process pool for segment verification."""
+    executor = _executors.get(max_workers)
+    if executor is None:
+        executor = _executors[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+    return executor
+
+
+def shutdown_verification_executors():
+    """Stop the shared verification pools (app shutdown)."""
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# =============================================================================
+# Verifier
+# =============================================================================
+
+class AuditChainVerifier:
+    """
+    Streaming, parallel, checkpointed verifier for the immutable audit log.
+    
+    Args:
+        pool: asyncpg connection pool
+        segment_size: Rows per verification segment
+        max_workers: Verification processes (None = CPU count)
+        signing_key: Checkpoint HMAC key (default: the app secret key)
+        executor: Executor for segments instead of the shared process pool
+    """
+    
+    def __init__(
+        self,
+        pool,
+        segment_size: int = 10_000,
+        max_workers: Optional[int] = None,
+        signing_key: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.pool = pool
+        self.segment_size = segment_size
+        self.max_workers = max_workers
+        self.executor = executor
+        if signing_key is None:
+            signing_key = get_settings().app.secret_key.get_secret_value()
+        self._signing_key = signing_key.encode()
+        self._schema_ensured = False
+    
+    # =========================================================================
+    # Checkpoints
+    # =========================================================================
+    
+    def sign(self, sequence_number: int, chain_hash: str) -> str:
+        message = f"{sequence_number}:{chain_hash}".encode()
+        return hmac.new(self._signing_key, message, hashlib.sha256).hexdigest()
+    
+    async def _ensure_schema(self, conn):
+        if not self._schema_ensured:
+            await conn.execute(CHECKPOINT_SCHEMA)
+            self._schema_ensured = True
+    
+    async def latest_checkpoint(self, conn) -> Tuple[Optional[dict], List[dict]]:
+        """
+        Newest checkpoint with a valid signature.
+        
+        Returns the checkpoint (or None) and reports for any newer
+        checkpoints whose signature did not match.
+        """
+        rows = await conn.fetch("""
+            SELECT sequence_number, chain_hash, records_verified, verified_at, signature
+            FROM immutable_audit_checkpoints
+            ORDER BY sequence_number DESC, id DESC
+            LIMIT 10
+        """)
+        forged = []
+        for row in rows:
+            expected = self.sign(row["sequence_number"], row["chain_hash"])
+            if hmac.compare_digest(expected, row["signature"]):
+                return dict(row), forged
+            forged.append({
+                "sequence_number": row["sequence_number"],
+                "id": None,
+                "issue": "checkpoint_signature_invalid",
+                "expected": expected,
+                "actual": row["signature"],
+            })
+        return None, forged
+    
+    async def _save_checkpoint(self, sequence_number: int, chain_hash: str, records_verified: int):
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO immutable_audit_checkpoints (
+                    sequence_number, chain_hash, records_verified, verified_at, signature
+                ) VALUES ($1, $2, $3, $4, $5)
+                """,
+                sequence_number,
+                chain_hash,
+                records_verified,
+                datetime.utcnow(),
+                self.sign(sequence_number, chain_hash),
+            )
+        logger.info("Saved audit verification checkpoint", sequence_number=sequence_number)
+    
+    # =========================================================================
+    # Verification
+    # =========================================================================
+    
+    async def verify(
+        self,
+        start_sequence: Optional[int] = None,
+        end_sequence: Optional[int] = None,
+        incremental: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Verify the chain over ``[start_sequence, end_sequence]``.
+        
+        Without ``start_sequence`` the run starts after the latest valid
+        checkpoint (``incremental``) or at the first record, and a clean
+        run saves a new checkpoint at the last record verified. A
+        checkpoint at or past ``end_sequence`` is not used: the range is
+        then read from the first record.
+        """
+        started = time.perf_counter()
+        tampered: List[dict] = []
+        checkpoint = None
+        
+        async with self.pool.acquire() as conn:
+            await self._ensure_schema(conn)
+            if start_sequence is None and incremental:
+                checkpoint, forged = await self.latest_checkpoint(conn)
+                tampered.extend(forged)
+                # A checkpoint covering the whole range would report it clean unread
+                if checkpoint is not None and end_sequence is not None:
+                    if end_sequence <= checkpoint["sequence_number"]:
+                        checkpoint = None
+                if checkpoint is not None:
+                    start_sequence = checkpoint["sequence_number"] + 1
+            
+            async with conn.transaction(readonly=True, isolation="repeatable_read"):
+                previous_chain_hash = None
+                if start_sequence is not None:
+                    previous_chain_hash = await conn.fetchval(
+                        """
+                        SELECT chain_hash FROM immutable_audit_log
+                        WHERE sequence_number < $1
+                        ORDER BY sequence_number DESC
+                        LIMIT 1
+                        """,
+                        start_sequence,
+                    )
+                if checkpoint is not None and previous_chain_hash != checkpoint["chain_hash"]:
+                    tampered.append({
+                        "sequence_number": checkpoint["sequence_number"],
+                        "id": None,
+                        "issue": "checkpoint_mismatch",
+                        "expected": checkpoint["chain_hash"],
+                        "actual": previous_chain_hash,
+                    })
+                    # Continue from the signed value, not the stored one
+                    previous_chain_hash = checkpoint["chain_hash"]
+                
+                total, segment_tampered, last = await self._verify_range(
+                    conn, start_sequence, end_sequence, previous_chain_hash
+                )
+                tampered.extend(segment_tampered)
+        
+        elapsed = time.perf_counter() - started
+        verified = not tampered
+        last_sequence, last_chain_hash = last if last else (None, previous_chain_hash)
+        
+        result = {
+            "verified": verified,
+            "total_records": total,
+            "tampered_records": sorted(tampered, key=lambda t: t["sequence_number"]),
+            "last_chain_hash": last_chain_hash,
+            "verified_from_sequence": start_sequence,
+            "checkpoint_sequence": checkpoint["sequence_number"] if checkpoint else None,
+            "elapsed_ms": int(elapsed * 1000),
+            "records_per_second": int(total / elapsed) if elapsed > 0 else 0,
+        }
+        
+        # Only a clean run that joins onto a verified prefix may advance the checkpoint
+        contiguous = start_sequence is None or checkpoint is not None
+        if verified and contiguous and last_sequence is not None:
+            previous_total = checkpoint["records_verified"] if checkpoint else 0
+            await self._save_checkpoint(last_sequence, last_chain_hash, previous_total + total)
+        
+        logger.info(
+            "Audit chain verified",
+            verified=verified,
+            records=total,
+            from_sequence=start_sequence,
+            records_per_second=result["records_per_second"],
+        )
+        return result
+    
+    async def _verify_range(
+        self,
+        conn,
+        start_sequence: Optional[int],
+        end_sequence: Optional[int],
+        previous_chain_hash: Optional[str],
+    ) -> Tuple[int, List[dict], Optional[Tuple[int, str]]]:
+        """Stream the range through a cursor and verify it segment by segment."""
+        query = f"SELECT {', '.join(ROW_COLUMNS)} FROM immutable_audit_log WHERE 1=1"
+        params = []
+        if start_sequence is not None:
+            params.append(start_sequence)
+            query += f" AND sequence_number >= ${len(params)}"
+        if end_sequence is not None:
+            params.append(end_sequence)
+            query += f" AND sequence_number <= ${len(params)}"
+        query += " ORDER BY sequence_number ASC"
+        
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_verification_executor(self.max_workers)
+        # Bound the segments held in memory while workers catch up
+        max_in_flight = 2 * (self.max_workers or os.cpu_count() or 4)
+        in_flight: deque = deque()
+        total = 0
+        tampered: List[dict] = []
+        last: Optional[Tuple[int, str]] = None
+        
+        async def collect_oldest():
+            nonlocal total
+            count, segment_tampered = await in_flight.popleft()
+            total += count
+            tampered.extend(segment_tampered)
+        
+        try:
+            segment: List[tuple] = []
+            async for record in conn.cursor(query, *params, prefetch=self.segment_size):
+                segment.append(tuple(record[column] for column in ROW_COLUMNS))
+                if len(segment) >= self.segment_size:
+                    in_flight.append(loop.run_in_executor(
+                        executor, verify_segment, previous_chain_hash, segment
+                    ))
+                    previous_chain_hash = segment[-1][-1]
+                    last = (segment[-1][0], segment[-1][-1])
+                    segment = []
+                    if len(in_flight) >= max_in_flight:
+                        await collect_oldest()
+            if segment:
+                in_flight.append(loop.run_in_executor(
+                    executor, verify_segment, previous_chain_hash, segment
+                ))
+                last = (segment[-1][0], segment[-1][-1])
+            while in_flight:
+                await collect_oldest()
+        finally:
+            for future in in_flight:
+                future.cancel()
+        
+        return total, tampered, last
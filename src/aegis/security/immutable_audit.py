@@ -9,10 +9,20 @@ Features:
 - Hash chain for integrity verification
 - Database-level immutability enforcement
 - Blockchain-style chaining for tamper detection
+
+Ingestion path:
+- ``log`` only enqueues the event; it never touches the database
+- A single writer task owns the chain head (recovered from the database
+  when the writer starts), hashes queued events in order and writes them in
+  batches: one transaction, one COPY (or executemany) per batch
+- Each batch takes a transaction-scoped advisory lock and checks the stored
+  chain head before inserting, so several processes sharing the table still
+  produce one unbroken chain
 """
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import asyncio
 import hashlib
 import json
 import structlog
@@ -21,6 +31,53 @@ from aegis.security.audit import AuditEvent, AuditEventType, AuditSeverity
 
 logger = structlog.get_logger(__name__)
 
+# pg_advisory_xact_lock key serializing chain appends across processes
+CHAIN_LOCK_ID = 0x4145474953415544
+
+# Columns written per record, in insert order
+INSERT_COLUMNS = (
+    "id", "timestamp", "event_type", "severity",
+    "user_id", "tenant_id", "action",
+    "resource_type", "resource_id",
+    "ip_address", "session_id",
+    "details", "success", "error_message",
+    "contains_phi", "phi_types",
+    "previous_hash", "record_hash", "chain_hash",
+)
+
+
+
+def compute_record_hash(record_data: Dict[str, Any], previous_hash: Optional[str] = None) -> str:
+    """
+    SHA-256 of a record's fields (JSON-serializable values) and the
+    previous hash. Shared by ingestion and verification so both serialize
+    records identically.
+    """
+    record_json = json.dumps(
+        {**record_data, "previous_hash": previous_hash or ""},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(record_json.encode()).hexdigest()
+
+
+def compute_chain_hash(record_hash: str, previous_chain_hash: Optional[str] = None) -> str:
+    """Chain hash = SHA256(record_hash + previous_chain_hash)."""
+    if previous_chain_hash:
+        chain_data = f"{record_hash}{previous_chain_hash}"
+    else:
+        chain_data = record_hash
+    return hashlib.sha256(chain_data.encode()).hexdigest()
+
+
+INSERT_SQL = """
+    INSERT INTO immutable_audit_log ({columns})
+    VALUES ({values})
+""".format(
+    columns=", ".join(INSERT_COLUMNS),
+    values=", ".join(f"${i}" for i in range(1, len(INSERT_COLUMNS) + 1)),
+)
+
 
 class ImmutableAuditLogger:
     """
@@ -30,17 +87,43 @@ class ImmutableAuditLogger:
     modified or deleted once written.
     """
     
-    def __init__(self, pool=None):
+    def __init__(
+        self,
+        pool=None,
+        batch_size: int = 1000,
+        max_queue: int = 100_000,
+        retry_interval: float = 1.0,
+        use_copy: bool = True,
+    ):
         """
         Initialize immutable audit logger.
         
         Args:
             pool: Database connection pool
+            batch_size: Maximum records per write transaction
+            max_queue: Queued events before ``log`` waits for the writer
+            retry_interval: Seconds between retries of a failed write
+            use_copy: Insert with COPY (``copy_records_to_table``) instead
+                      of ``executemany``
         """
         self.pool = pool
-        self._buffer: List[tuple] = []  # List of (event, record_hash, chain_hash, previous_hash)
-        self._max_buffer = 100
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.retry_interval = retry_interval
+        self.use_copy = use_copy
+        
+        self._buffer: List[tuple] = []  # Chained but unwritten: (event, record_hash, chain_hash, previous_hash)
+        self._chain_head: Optional[str] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
         self._schema_ensured = False
+        
+        self.events_logged = 0
+        self.records_written = 0
+        self.batches_written = 0
+        self.write_failures = 0
+        self.rechains = 0
     
     async def _ensure_schema(self):
         """Ensure immutable audit log schema exists."""
@@ -147,12 +230,9 @@ class ImmutableAuditLogger:
             "error_message": event.error_message,
             "contains_phi": event.contains_phi,
             "phi_types": event.phi_types,
-            "previous_hash": previous_hash or "",
         }
         
-        # Serialize and hash
-        record_json = json.dumps(record_data, sort_keys=True, default=str)
-        return hashlib.sha256(record_json.encode()).hexdigest()
+        return compute_record_hash(record_data, previous_hash)
     
     def _calculate_chain_hash(self, record_hash: str, previous_chain_hash: Optional[str] = None) -> str:
         """
@@ -160,113 +240,237 @@ class ImmutableAuditLogger:
         
         Chain hash = SHA256(record_hash + previous_chain_hash)
         """
-        if previous_chain_hash:
-            chain_data = f"{record_hash}{previous_chain_hash}"
-        else:
-            chain_data = record_hash
-        
-        return hashlib.sha256(chain_data.encode()).hexdigest()
+        return compute_chain_hash(record_hash, previous_chain_hash)
     
-    async def _get_last_chain_hash(self) -> Optional[str]:
+    async def _get_last_chain_hash(self, conn=None) -> Optional[str]:
         """Get the chain hash of the last record in the audit log."""
-        if not self.pool:
-            return None
+        query = """
+            SELECT chain_hash 
+            FROM immutable_audit_log 
+            ORDER BY sequence_number DESC 
+            LIMIT 1
+        """
+        if conn is not None:
+            return await conn.fetchval(query)
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(query)
+    
+    # =========================================================================
+    # Ingestion
+    # =========================================================================
+    
+    @property
+    def is_running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+    
+    async def start(self):
+        """
+        Start the writer task.
         
-        try:
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT chain_hash 
-                    FROM immutable_audit_log 
-                    ORDER BY sequence_number DESC 
-                    LIMIT 1
-                """)
-                return row["chain_hash"] if row else None
-        except Exception as e:
-            logger.error(f"Failed to get last chain hash: {e}")
-            return None
+        Ensures the schema and recovers the chain head from the last stored
+        record. Called by the first ``log``; errors propagate so events are
+        never chained from a head that could not be read.
+        """
+        if not self.pool or self.is_running:
+            return
+        
+        async with self._start_lock:
+            if self.is_running:
+                return
+            if not self._schema_ensured:
+                await self._ensure_schema()
+                self._schema_ensured = True
+            if not self._buffer:
+                self._chain_head = await self._get_last_chain_hash()
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._writer = asyncio.create_task(self._writer_loop())
+            logger.info("Immutable audit writer started", chain_head=self._chain_head)
     
     async def log(self, event: AuditEvent) -> str:
         """
         Log an audit event to immutable storage.
         
+        The event is queued for the writer task; ``flush`` waits until
+        it has been written. Waits only when the queue is full.
+        
         Returns the event ID.
         """
-        # Ensure schema exists
-        if not self._schema_ensured and self.pool:
-            await self._ensure_schema()
-            self._schema_ensured = True
-        
-        # Get previous chain hash for linking
-        previous_chain_hash = await self._get_last_chain_hash()
-        
-        # Calculate hashes
-        previous_hash = previous_chain_hash  # Use chain hash as previous hash
-        record_hash = self._calculate_record_hash(event, previous_hash)
-        chain_hash = self._calculate_chain_hash(record_hash, previous_chain_hash)
+        if not self.pool:
+            return event.id
         
-        # Buffer for batch insert
-        self._buffer.append((event, record_hash, chain_hash, previous_hash))
+        if not self.is_running:
+            await self.start()
         
-        # Flush if buffer is full
-        if len(self._buffer) >= self._max_buffer:
-            await self.flush()
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            await self._queue.put(event)
+        self.events_logged += 1
         
         return event.id
     
     async def flush(self):
-        """Flush buffer to immutable audit log."""
-        if not self._buffer or not self.pool:
-            return
-        
-        events_to_flush = self._buffer.copy()
-        self._buffer.clear()
+        """
+        Wait until every event logged so far has been handed to the database.
         
+        Events whose write failed stay chained in the buffer and are retried
+        by the writer every ``retry_interval`` seconds.
+        """
+        if self._queue is None:
+            return
+        if not self.is_running and not self._queue.empty():
+            await self.start()
+        await self._queue.join()
+    
+    async def close(self):
+        """Flush queued events and stop the writer task."""
+        if not self.is_running:
+            return
+        await self.flush()
+        self._writer.cancel()
         try:
-            async with self.pool.acquire() as conn:
-                for event, record_hash, chain_hash, previous_hash in events_to_flush:
-                    await conn.execute("""
-                        INSERT INTO immutable_audit_log (
-                            id, timestamp, event_type, severity,
-                            user_id, tenant_id, action,
-                            resource_type, resource_id,
-                            ip_address, session_id,
-                            details, success, error_message,
-                            contains_phi, phi_types,
-                            previous_hash, record_hash, chain_hash
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19)
-                    """,
-                        event.id,
-                        event.timestamp,
-                        event.event_type.value,
-                        event.severity.value,
-                        event.user_id,
-                        event.tenant_id,
-                        event.action,
-                        event.resource_type,
-                        event.resource_id,
-                        event.ip_address,
-                        event.session_id,
-                        json.dumps(event.details),
-                        event.success,
-                        event.error_message,
-                        event.contains_phi,
-                        event.phi_types,
-                        previous_hash,
-                        record_hash,
-                        chain_hash,
-                    )
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        # Last attempt at anything a failed write left behind
+        await self._write_pending()
+        if self._buffer:
+            logger.error(f"Immutable audit writer stopped with {len(self._buffer)} unwritten events")
+    
+    async def _writer_loop(self):
+        """Single writer: chain queued events in order and write them in batches."""
+        while True:
+            try:
+                if self._buffer:
+                    event = await asyncio.wait_for(self._queue.get(), self.retry_interval)
+                else:
+                    event = await self._queue.get()
+            except asyncio.TimeoutError:
+                await self._write_pending()
+                continue
             
-            logger.debug(f"Flushed {len(events_to_flush)} events to immutable audit log")
+            # Whatever queued up while the last batch was being written
+            events = [event]
+            while len(events) < self.batch_size:
+                try:
+                    events.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
             
-        except Exception as e:
-            logger.error(f"Failed to flush immutable audit events: {e}")
-            # Re-add to buffer
-            self._buffer.extend(events_to_flush)
+            try:
+                self._chain(events)
+                await self._write_pending()
+            except Exception as e:
+                logger.error(f"Immutable audit writer error: {e}")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
     
-    async def verify_integrity(self, start_sequence: Optional[int] = None, end_sequence: Optional[int] = None) -> Dict[str, Any]:
+    def _chain(self, events: List[AuditEvent]):
+        """Append events to the in-memory chain, advancing the head."""
+        head = self._chain_head
+        for event in events:
+            record_hash = self._calculate_record_hash(event, head)
+            chain_hash = self._calculate_chain_hash(record_hash, head)
+            self._buffer.append((event, record_hash, chain_hash, head))
+            head = chain_hash
+        self._chain_head = head
+    
+    def _rechain(self, head: Optional[str]):
+        """Re-link the unwritten records onto ``head`` (another process appended)."""
+        events = [record[0] for record in self._buffer]
+        self._buffer.clear()
+        self._chain_head = head
+        self._chain(events)
+        self.rechains += 1
+    
+    async def _write_pending(self):
+        """Write buffered records oldest first; stop at the first failed batch."""
+        while self._buffer:
+            batch_len = min(len(self._buffer), self.batch_size)
+            try:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.execute("SELECT pg_advisory_xact_lock($1)", CHAIN_LOCK_ID)
+                        stored_head = await self._get_last_chain_hash(conn)
+                        if stored_head != self._buffer[0][3]:
+                            logger.warning("Audit chain head moved, re-chaining unwritten events")
+                            self._rechain(stored_head)
+                        await self._insert(conn, self._buffer[:batch_len])
+            except Exception as e:
+                self.write_failures += 1
+                logger.error(f"Failed to flush immutable audit events: {e}")
+                return
+            
+            del self._buffer[:batch_len]
+            self.records_written += batch_len
+            self.batches_written += 1
+            logger.debug(f"Flushed {batch_len} events to immutable audit log")
+    
+    async def _insert(self, conn, records: List[tuple]):
+        rows = [
+            (
+                event.id,
+                event.timestamp,
+                event.event_type.value,
+                event.severity.value,
+                event.user_id,
+                event.tenant_id,
+                event.action,
+                event.resource_type,
+                event.resource_id,
+                event.ip_address,
+                event.session_id,
+                json.dumps(event.details),
+                event.success,
+                event.error_message,
+                event.contains_phi,
+                event.phi_types,
+                previous_hash,
+                record_hash,
+                chain_hash,
+            )
+            for event, record_hash, chain_hash, previous_hash in records
+        ]
+        if self.use_copy:
+            await conn.copy_records_to_table(
+                "immutable_audit_log", records=rows, columns=list(INSERT_COLUMNS)
+            )
+        else:
+            await conn.executemany(INSERT_SQL, rows)
+    
+    def get_stats(self) -> dict:
+        return {
+            "running": self.is_running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "unwritten": len(self._buffer),
+            "events_logged": self.events_logged,
+            "records_written": self.records_written,
+            "batches_written": self.batches_written,
+            "write_failures": self.write_failures,
+            "rechains": self.rechains,
+        }
+    
+    # =========================================================================
+    # Verification / Queries
+    # =========================================================================
+    
+    async def verify_integrity(
+        self,
+        start_sequence: Optional[int] = None,
+        end_sequence: Optional[int] = None,
+        incremental: bool = True,
+    ) -> Dict[str, Any]:
         """
         Verify integrity of audit log hash chain.
         
+        Rows are streamed in segments and verified in a process pool (see
+        ``AuditChainVerifier``). With ``incremental`` (and no
+        ``start_sequence``) only records after the last signed checkpoint
+        are verified.
+        
         Returns:
             Dict with verification results and any detected tampering
         """
@@ -277,87 +481,15 @@ class ImmutableAuditLogger:
                 "tampered_records": [],
             }
         
+        from aegis.security.audit_verification import AuditChainVerifier
+        
         try:
-            async with self.pool.acquire() as conn:
-                # Get records in sequence order
-                query = "SELECT * FROM immutable_audit_log WHERE 1=1"
-                params = []
-                
-                if start_sequence:
-                    query += f" AND sequence_number >= ${len(params) + 1}"
-                    params.append(start_sequence)
-                
-                if end_sequence:
-                    query += f" AND sequence_number <= ${len(params) + 1}"
-                    params.append(end_sequence)
-                
-                query += " ORDER BY sequence_number ASC"
-                
-                rows = await conn.fetch(query, *params)
-                
-                if not rows:
-                    return {
-                        "verified": True,
-                        "total_records": 0,
-                        "tampered_records": [],
-                    }
-                
-                tampered_records = []
-                previous_chain_hash = None
-                
-                for i, row in enumerate(rows):
-                    # Reconstruct event for hash calculation
-                    event = AuditEvent(
-                        id=row["id"],
-                        timestamp=row["timestamp"],
-                        event_type=AuditEventType(row["event_type"]),
-                        severity=AuditSeverity(row["severity"]),
-                        user_id=row["user_id"],
-                        tenant_id=row["tenant_id"],
-                        action=row["action"],
-                        resource_type=row["resource_type"],
-                        resource_id=row["resource_id"],
-                        ip_address=row["ip_address"],
-                        session_id=row["session_id"],
-                        details=json.loads(row["details"]) if row["details"] else {},
-                        success=row["success"],
-                        error_message=row["error_message"],
-                        contains_phi=row["contains_phi"],
-                        phi_types=row.get("phi_types", []),
-                    )
-                    
-                    # Calculate expected hashes
-                    expected_record_hash = self._calculate_record_hash(event, row["previous_hash"])
-                    expected_chain_hash = self._calculate_chain_hash(expected_record_hash, previous_chain_hash)
-                    
-                    # Verify
-                    if expected_record_hash != row["record_hash"]:
-                        tampered_records.append({
-                            "sequence_number": row["sequence_number"],
-                            "id": str(row["id"]),
-                            "issue": "record_hash_mismatch",
-                            "expected": expected_record_hash,
-                            "actual": row["record_hash"],
-                        })
-                    
-                    if expected_chain_hash != row["chain_hash"]:
-                        tampered_records.append({
-                            "sequence_number": row["sequence_number"],
-                            "id": str(row["id"]),
-                            "issue": "chain_hash_mismatch",
-                            "expected": expected_chain_hash,
-                            "actual": row["chain_hash"],
-                        })
-                    
-                    previous_chain_hash = row["chain_hash"]
-                
-                return {
-                    "verified": len(tampered_records) == 0,
-                    "total_records": len(rows),
-                    "tampered_records": tampered_records,
-                    "last_chain_hash": previous_chain_hash,
-                }
-                
+            verifier = AuditChainVerifier(self.pool)
+            return await verifier.verify(
+                start_sequence=start_sequence,
+                end_sequence=end_sequence,
+                incremental=incremental,
+            )
         except Exception as e:
             logger.error(f"Failed to verify audit log integrity: {e}")
             return {
@@ -469,3 +601,9 @@ def configure_immutable_audit_logger(pool=None) -> ImmutableAuditLogger:
     global _immutable_audit_logger
     _immutable_audit_logger = ImmutableAuditLogger(pool=pool)
     return _immutable_audit_logger
+
+
+async def close_immutable_audit_logger():
+    """Write out queued audit events and stop the global writer (app shutdown)."""
+    if _immutable_audit_logger is not None:
+        await _immutable_audit_logger.close()
@@ -2,13 +2,14 @@
 PHI Detection and Redaction
 
 HIPAA-compliant PHI detection:
-- Pattern-based detection (SSN, MRN, dates, etc.)
+- Pattern-based detection (SSN, MRN, dates, etc.), all patterns in one
+  scan of the text (PHIScanner)
 - NER-based detection (names, addresses)
 - Configurable redaction strategies
 - Logging integration
 """
 
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 import re
@@ -157,6 +158,245 @@ ACCOUNT_PATTERNS = [
     r'\b(?:Policy|Member|Subscriber)[:\s#]*[A-Z0-9]{8,16}\b',
 ]
 
+# Name heuristics (group 1 is the name)
+NAME_TITLE_PATTERN = r'\b(?:Mr\.?|Mrs\.?|Ms\.?|Dr\.?|Patient)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'  # Title + Capitalized words
+NAME_LABEL_PATTERN = r'(?:Patient\s+)?Name[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)'  # "Name:" or "Patient Name:"
+
+# Keywords that raise a pattern match's confidence when they appear anywhere in the text
+CONFIDENCE_KEYWORDS = {
+    PHIType.SSN: ("ssn", "social security", "ss#"),
+    PHIType.MRN: ("mrn", "medical record", "patient id"),
+    PHIType.PHONE: ("phone", "tel", "fax", "call"),
+    PHIType.DATE: ("dob", "birth", "admit", "discharge", "death"),
+}
+
+
+# =============================================================================
+# Scanning Engine
+# =============================================================================
+
+# Patterns that can start with more characters than this are scanned on
+# their own (e.g. the email pattern, whose local part starts with anything)
+_MAX_DISPATCH_CHARS = 32
+
+# Inline flags a pattern may carry and still be merged into a gate
+_INLINE_FLAGS = {re.ASCII: "a", re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+# Dispatch key for patterns that start with \d
+_DIGIT = "\\d"
+
+
+class _Hit(NamedTuple):
+    """A raw detection; turned into a PHIMatch only if it survives deduplication."""
+    start: int
+    end: int
+    order: int  # tie-break: pattern index, then NER/name hits
+    phi_type: PHIType
+    confidence: float
+    with_context: bool
+
+
+def _first_chars(pattern: re.Pattern) -> Optional[Set[str]]:
+    """
+    Characters a match of ``pattern`` can start with, after a leading ``\\b``.
+    
+    A leading ``\\d`` is reported as ``_DIGIT`` (any Unicode decimal digit).
+    Works on the parse tree from ``re._parser``; returns None whenever the
+    set can't be worked out, which just means the pattern is scanned on its own.
+    """
+    try:
+        from re import _constants as sre, _parser
+        
+        def first(items) -> Optional[Set[str]]:
+            chars: Set[str] = set()
+            for op, av in items:
+                if op is sre.AT:
+                    continue
+                if op is sre.LITERAL:
+                    chars.add(chr(av))
+                    return chars
+                if op is sre.IN:
+                    for item_op, item_av in av:
+                        if item_op is sre.LITERAL:
+                            chars.add(chr(item_av))
+                        elif item_op is sre.RANGE:
+                            chars.update(chr(c) for c in range(item_av[0], item_av[1] + 1))
+                        elif item_op is sre.CATEGORY and item_av is sre.CATEGORY_DIGIT:
+                            if pattern.flags & re.ASCII:
+                                chars.update("0123456789")
+                            else:
+                                chars.add(_DIGIT)
+                        else:
+                            return None
+                    return chars
+                if op is sre.BRANCH:
+                    for branch in av[1]:
+                        branch_chars = first(branch)
+                        if branch_chars is None:
+                            return None
+                        chars |= branch_chars
+                    return chars
+                if op is sre.SUBPATTERN:
+                    sub_chars = first(av[-1])
+                    return None if sub_chars is None else chars | sub_chars
+                if op in (sre.MAX_REPEAT, sre.MIN_REPEAT):
+                    low, _, sub = av
+                    sub_chars = first(sub)
+                    if sub_chars is None:
+                        return None
+                    chars |= sub_chars
+                    if low > 0:
+                        return chars
+                    continue
+                return None
+            # Everything was optional: the match could start anywhere
+            return None
+        
+        chars = first(_parser.parse(pattern.pattern, pattern.flags))
+    except Exception:
+        return None
+    if chars is not None and pattern.flags & re.IGNORECASE:
+        chars |= {c.swapcase() for c in chars if c != _DIGIT}
+    return chars
+
+
+def _required_chars(pattern: re.Pattern) -> str:
+    """Uncased literal characters every match of ``pattern`` must contain."""
+    try:
+        from re import _constants as sre, _parser
+        parsed = _parser.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return ""
+    required = []
+    for op, av in parsed:
+        if op is sre.LITERAL and chr(av).lower() == chr(av).upper() and chr(av) not in required:
+            required.append(chr(av))
+    return "".join(required)
+
+
+class PHIScanner:
+    """
+    Scan text for a set of PHI patterns in one pass.
+    
+    Running every pattern with ``finditer`` reads the text once per pattern.
+    Most built-in patterns start with ``\\b`` and one of a few characters (a
+    digit, ``(``, the first letter of a label), so the scanner instead:
+    
+    - walks the word starts whose first character some pattern can start
+      with (one regex over the text)
+    - at each one tries a gate, a single alternation of the patterns that
+      can start with that character. Most word starts fail the gate at the
+      cost of one C-level match call
+    - only when the gate matches, tries each of those patterns at that
+      position, skipping patterns whose previous hit is still open
+    
+    Patterns that can start with too many characters, or don't start with
+    ``\\b``, run with ``finditer``, and are skipped when the text lacks a
+    literal character they require (``@`` for email). The hits are the same
+    as running every pattern with ``finditer``.
+    
+    Args:
+        patterns: PHI type -> compiled patterns, in reporting order
+    """
+    
+    def __init__(self, patterns: Dict[PHIType, List[re.Pattern]]):
+        self.patterns: List[Tuple[PHIType, re.Pattern]] = [
+            (phi_type, pattern)
+            for phi_type, type_patterns in patterns.items()
+            for pattern in type_patterns
+        ]
+        
+        by_char: Dict[str, List[int]] = {}
+        self._separate: List[Tuple[int, str]] = []
+        for index, (_, pattern) in enumerate(self.patterns):
+            chars = self._dispatch_chars(pattern)
+            if chars is None:
+                self._separate.append((index, _required_chars(pattern)))
+                continue
+            for char in chars:
+                by_char.setdefault(char, []).append(index)
+        # ASCII digits also go to the patterns that start with \d
+        for digit in "0123456789" if _DIGIT in by_char else ():
+            by_char[digit] = sorted(set(by_char.get(digit, [])) | set(by_char[_DIGIT]))
+        
+        # first character -> (gate match, [(pattern index, pattern match)])
+        self._gates: Dict[str, Tuple[Callable, List[Tuple[int, Callable]]]] = {}
+        compiled: Dict[Tuple[int, ...], Tuple[Callable, List[Tuple[int, Callable]]]] = {}
+        for char, indexes in by_char.items():
+            members = tuple(indexes)
+            if members not in compiled:
+                compiled[members] = self._gate(members)
+            self._gates[char] = compiled[members]
+        # Used for the rare word start only found through Unicode case folding
+        self._any_gate = self._gate(tuple(sorted({i for ixs in by_char.values() for i in ixs})))
+        
+        self._word_starts = None
+        if by_char:
+            chars = "".join(re.escape(c) for c in sorted(by_char) if c != _DIGIT)
+            # IGNORECASE so every case variant is visited; the gate decides
+            self._word_starts = re.compile(
+                rf"\b[{chars}{_DIGIT if _DIGIT in by_char else ''}]", re.IGNORECASE
+            )
+    
+    @staticmethod
+    def _dispatch_chars(pattern: re.Pattern) -> Optional[Set[str]]:
+        if not pattern.pattern.startswith(r"\b") or pattern.groups:
+            return None
+        if pattern.flags & ~(re.UNICODE | sum(_INLINE_FLAGS)):
+            return None
+        chars = _first_chars(pattern)
+        if chars is None or len(chars) > _MAX_DISPATCH_CHARS:
+            return None
+        return chars
+    
+    def _gate(self, members: Tuple[int, ...]) -> Tuple[Callable, List[Tuple[int, Callable]]]:
+        branches = []
+        for index in members:
+            pattern = self.patterns[index][1]
+            flags = "".join(letter for flag, letter in _INLINE_FLAGS.items() if pattern.flags & flag)
+            # The leading \b was already checked by the word-start scan
+            branches.append(f"(?{flags}:{pattern.pattern[2:]})" if flags else f"(?:{pattern.pattern[2:]})")
+        return (
+            re.compile("|".join(branches)).match,
+            [(index, self.patterns[index][1].match) for index in members],
+        )
+    
+    def _fallback_gate(self, char: str) -> Tuple[Callable, List[Tuple[int, Callable]]]:
+        gate = self._gates.get(char.lower()) or self._gates.get(char.upper())
+        if gate is None and char.isdecimal():
+            gate = self._gates.get(_DIGIT)
+        return gate or self._any_gate
+    
+    def scan(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield ``(pattern index, start, end)`` for every pattern hit.
+        
+        Hits of gated patterns come in text order, followed by the hits of
+        the separately scanned patterns.
+        """
+        if self._word_starts is not None:
+            gates = self._gates
+            resume = [0] * len(self.patterns)
+            for word in self._word_starts.finditer(text):
+                position = word.start()
+                char = text[position]
+                gate, members = gates.get(char) or self._fallback_gate(char)
+                if gate(text, position) is None:
+                    continue
+                for index, match in members:
+                    if position < resume[index]:
+                        continue
+                    found = match(text, position)
+                    if found is not None:
+                        resume[index] = end = found.end()
+                        yield index, position, end
+        
+        for index, required in self._separate:
+            if required and not all(char in text for char in required):
+                continue
+            for found in self.patterns[index][1].finditer(text):
+                yield index, found.start(), found.end()
+
 
 # =============================================================================
 # PHI Detector
@@ -185,12 +425,19 @@ class PHIDetector:
         
         # Compile patterns
         self._compiled_patterns = self._compile_patterns()
+        self._scanner = PHIScanner(self._compiled_patterns)
+        
+        # Matches below this confidence are dropped
+        self.min_confidence = {"low": 0.8, "medium": 0.6, "high": 0.4}.get(sensitivity, 0.6)
         
         # Load NER model if requested
         self._ner_model = None
         if use_ner:
             self._load_ner_model()
         
+        self._name_title_pattern = re.compile(NAME_TITLE_PATTERN)
+        self._name_label_pattern = re.compile(NAME_LABEL_PATTERN, re.IGNORECASE)
+        
         # Common name prefixes/suffixes for context
         self._name_prefixes = {"mr", "mrs", "ms", "dr", "patient", "name"}
         self._name_suffixes = {"jr", "sr", "ii", "iii", "md", "rn", "np"}
@@ -235,62 +482,114 @@ class PHIDetector:
         
         Returns list of PHI matches with type, location, and confidence.
         """
-        matches = []
+        matches = self._build_matches(text, self._find(text))
+        logger.debug(f"Detected {len(matches)} PHI matches")
+        return matches
+    
+    def detect_batch(self, texts: Iterable[str], context: Optional[str] = None) -> List[List[PHIMatch]]:
+        """
+        Detect PHI in many texts, e.g. a batch of notes or the fields of a record.
         
-        # Pattern-based detection
-        for phi_type, patterns in self._compiled_patterns.items():
-            for pattern in patterns:
-                for match in pattern.finditer(text):
-                    # Get context
-                    start = max(0, match.start() - 20)
-                    end = min(len(text), match.end() + 20)
-                    
-                    phi_match = PHIMatch(
-                        phi_type=phi_type,
-                        text=match.group(),
-                        start=match.start(),
-                        end=match.end(),
-                        confidence=self._calculate_confidence(phi_type, match.group(), text),
-                        context_before=text[start:match.start()],
-                        context_after=text[match.end():end],
-                    )
-                    matches.append(phi_match)
+        Returns one match list per text, as ``detect`` would. With
+        ``context`` (see ``confidence_context``), pattern confidence comes
+        from the keywords in it instead of those in each text, e.g. to scan
+        the pieces of a larger document as the whole document would be.
+        """
+        results = [self._build_matches(text, self._find(text, context)) for text in texts]
+        logger.debug(f"Detected {sum(map(len, results))} PHI matches in {len(results)} texts")
+        return results
+    
+    # =========================================================================
+    # Hits
+    # =========================================================================
+    
+    @staticmethod
+    def confidence_context(text: Optional[str] = None) -> str:
+        """
+        The confidence keywords found in ``text`` (every keyword if None).
+        
+        Scoring matches against this gives the same confidence as scoring
+        them against ``text`` itself.
+        """
+        lowered = text.lower() if text is not None else None
+        return "\n".join(
+            keyword
+            for keywords in CONFIDENCE_KEYWORDS.values()
+            for keyword in keywords
+            if lowered is None or keyword in lowered
+        )
+    
+    def _find(self, text: str, context: Optional[str] = None) -> List[_Hit]:
+        """Deduplicated hits at or above the sensitivity threshold."""
+        hits = list(self._pattern_hits(text, context))
+        hits.extend(self._extra_hits(text))
+        hits = self._deduplicate(hits)
+        return [hit for hit in hits if hit.confidence >= self.min_confidence]
+    
+    def _pattern_hits(self, text: str, context: Optional[str] = None) -> Iterator[_Hit]:
+        """Pattern hits; confidence only depends on type and text, so it's computed once per type."""
+        confidences: Dict[PHIType, float] = {}
+        lowered = context
+        for index, start, end in self._scanner.scan(text):
+            phi_type = self._scanner.patterns[index][0]
+            confidence = confidences.get(phi_type)
+            if confidence is None:
+                if lowered is None:
+                    lowered = text.lower()
+                confidence = confidences[phi_type] = self._calculate_confidence(phi_type, lowered)
+            yield _Hit(start, end, index, phi_type, confidence, True)
+    
+    def _extra_hits(self, text: str) -> List[_Hit]:
+        """NER and name heuristic hits, ordered after every pattern hit."""
+        matches = []
         
         # NER-based detection for names and locations
         if self._ner_model:
-            ner_matches = self._detect_with_ner(text)
-            matches.extend(ner_matches)
+            matches.extend(self._detect_with_ner(text))
         
         # Name detection (heuristic)
         if self.sensitivity in ["medium", "high"]:
-            name_matches = self._detect_names_heuristic(text)
-            matches.extend(name_matches)
-        
-        # Deduplicate overlapping matches
-        matches = self._deduplicate_matches(matches)
+            matches.extend(self._detect_names_heuristic(text))
         
-        # Filter by confidence based on sensitivity
-        min_confidence = {"low": 0.8, "medium": 0.6, "high": 0.4}.get(self.sensitivity, 0.6)
-        matches = [m for m in matches if m.confidence >= min_confidence]
-        
-        logger.debug(f"Detected {len(matches)} PHI matches")
+        order = len(self._scanner.patterns)
+        return [
+            _Hit(m.start, m.end, order + i, m.phi_type, m.confidence, False)
+            for i, m in enumerate(matches)
+        ]
+    
+    @staticmethod
+    def _build_matches(text: str, hits: List[_Hit]) -> List[PHIMatch]:
+        matches = []
+        for hit in hits:
+            context = {}
+            if hit.with_context:
+                context["context_before"] = text[max(0, hit.start - 20):hit.start]
+                context["context_after"] = text[hit.end:hit.end + 20]
+            matches.append(PHIMatch(
+                phi_type=hit.phi_type,
+                text=text[hit.start:hit.end],
+                start=hit.start,
+                end=hit.end,
+                confidence=hit.confidence,
+                **context,
+            ))
         return matches
     
-    def _calculate_confidence(self, phi_type: PHIType, text: str, full_text: str) -> float:
-        """Calculate confidence score for a match."""
+    def _calculate_confidence(self, phi_type: PHIType, lowered_text: str) -> float:
+        """Calculate confidence score for a match of ``phi_type`` in a (lowercased) text."""
         confidence = 0.7  # Base confidence
         
         # SSN is high confidence if it matches format
         if phi_type == PHIType.SSN:
             # Check for context clues
-            if any(kw in full_text.lower() for kw in ["ssn", "social security", "ss#"]):
+            if any(kw in lowered_text for kw in CONFIDENCE_KEYWORDS[PHIType.SSN]):
                 confidence = 0.95
             else:
                 confidence = 0.8
         
         # MRN with label is high confidence
         elif phi_type == PHIType.MRN:
-            if any(kw in full_text.lower() for kw in ["mrn", "medical record", "patient id"]):
+            if any(kw in lowered_text for kw in CONFIDENCE_KEYWORDS[PHIType.MRN]):
                 confidence = 0.9
             else:
                 confidence = 0.6
@@ -301,14 +600,14 @@ class PHIDetector:
         
         # Phone with context
         elif phi_type == PHIType.PHONE:
-            if any(kw in full_text.lower() for kw in ["phone", "tel", "fax", "call"]):
+            if any(kw in lowered_text for kw in CONFIDENCE_KEYWORDS[PHIType.PHONE]):
                 confidence = 0.9
             else:
                 confidence = 0.7
         
         # Dates need context to be PHI
         elif phi_type == PHIType.DATE:
-            if any(kw in full_text.lower() for kw in ["dob", "birth", "admit", "discharge", "death"]):
+            if any(kw in lowered_text for kw in CONFIDENCE_KEYWORDS[PHIType.DATE]):
                 confidence = 0.85
             else:
                 confidence = 0.5  # Many dates are not PHI
@@ -353,8 +652,7 @@ class PHIDetector:
         matches = []
         
         # Pattern: Title + Capitalized words
-        name_pattern = r'\b(?:Mr\.?|Mrs\.?|Ms\.?|Dr\.?|Patient)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
-        for match in re.finditer(name_pattern, text):
+        for match in self._name_title_pattern.finditer(text):
             matches.append(PHIMatch(
                 phi_type=PHIType.NAME,
                 text=match.group(1),
@@ -364,8 +662,9 @@ class PHIDetector:
             ))
         
         # Pattern: "Name:" or "Patient Name:" followed by text
-        label_pattern = r'(?:Patient\s+)?Name[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)'
-        for match in re.finditer(label_pattern, text, re.IGNORECASE):
+        # (no case folding maps other characters onto "name", so the check is exact)
+        label_matches = self._name_label_pattern.finditer(text) if "name" in text.lower() else ()
+        for match in label_matches:
             matches.append(PHIMatch(
                 phi_type=PHIType.NAME,
                 text=match.group(1),
@@ -376,37 +675,40 @@ class PHIDetector:
         
         return matches
     
-    def _deduplicate_matches(self, matches: List[PHIMatch]) -> List[PHIMatch]:
-        """Remove overlapping matches, keeping highest confidence."""
-        if not matches:
+    @staticmethod
+    def _deduplicate(hits: List[_Hit]) -> List[_Hit]:
+        """Remove overlapping hits, keeping highest confidence."""
+        if not hits:
             return []
         
-        # Sort by start position, then by confidence (descending)
-        matches.sort(key=lambda m: (m.start, -m.confidence))
+        # Sort by start position, then by confidence (descending), then detection order
+        hits.sort(key=lambda h: (h.start, -h.confidence, h.order))
         
         deduplicated = []
         last_end = -1
         
-        for match in matches:
-            if match.start >= last_end:
-                deduplicated.append(match)
-                last_end = match.end
-            elif match.confidence > deduplicated[-1].confidence:
+        for hit in hits:
+            if hit.start >= last_end:
+                deduplicated.append(hit)
+                last_end = hit.end
+            elif hit.confidence > deduplicated[-1].confidence:
                 # Higher confidence match overlaps - replace
-                deduplicated[-1] = match
-                last_end = match.end
+                deduplicated[-1] = hit
+                last_end = hit.end
         
         return deduplicated
     
     def contains_phi(self, text: str) -> bool:
         """Quick check if text contains any PHI."""
-        matches = self.detect(text)
-        return len(matches) > 0
+        # Deduplication always keeps the most confident of overlapping hits,
+        # so the first hit above the threshold settles it
+        if any(hit.confidence >= self.min_confidence for hit in self._pattern_hits(text)):
+            return True
+        return any(hit.confidence >= self.min_confidence for hit in self._extra_hits(text))
     
     def get_phi_types(self, text: str) -> Set[PHIType]:
         """Get set of PHI types found in text."""
-        matches = self.detect(text)
-        return {m.phi_type for m in matches}
+        return {hit.phi_type for hit in self._find(text)}
 
 
 # =============================================================================
@@ -458,16 +760,27 @@ class PHIRedactor:
         # Sort by position (reverse order for replacement)
         matches.sort(key=lambda m: m.start, reverse=True)
         
-        redacted = text
+        # Collect pieces back to front and join once (no copy of the text per match)
+        parts = []
+        end = len(text)
         for match in matches:
-            replacement = self._get_replacement(match)
-            redacted = redacted[:match.start] + replacement + redacted[match.end:]
-            
-            # Store for reversibility
-            self._redaction_key[replacement] = match.text
+            parts.append(text[match.end:end])
+            parts.append(self.replacement_for(match))
+            end = match.start
+        parts.append(text[:end])
+        redacted = "".join(reversed(parts))
         
         return (redacted, matches) if return_matches else redacted
     
+    def replacement_for(self, match: PHIMatch) -> str:
+        """Replacement text for a match, recorded in the redaction map."""
+        replacement = self._get_replacement(match)
+        
+        # Store for reversibility
+        self._redaction_key[replacement] = match.text
+        
+        return replacement
+    
     def _get_replacement(self, match: PHIMatch) -> str:
         """Get replacement text for a PHI match."""
         strategy = self.type_strategies.get(match.phi_type, self.default_strategy)
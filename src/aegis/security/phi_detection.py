@@ -120,6 +120,23 @@ class PHIDetector:
         
         return entities
     
+    def get_phi_types(self, text: str) -> set:
+        """
+        Entity types found in text, as ``detect`` would report them.
+        
+        Skips building per-entity dicts where the engine allows it.
+        """
+        if not text:
+            return set()
+        
+        if self.analyzer:
+            try:
+                return {result.entity_type for result in self.analyzer.analyze(text=text, language="en")}
+            except Exception as e:
+                logger.warning("Presidio detection failed, using fallback", error=str(e))
+        
+        return {entity["type"] for entity in self.detect(text)}
+    
     def redact(self, text: str, replacement: str = "[REDACTED]") -> str:
         """
         Redact PHI from text.
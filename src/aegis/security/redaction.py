@@ -0,0 +1,419 @@
+"""
+PHI Redaction Pipeline
+
+Redacts inputs too large for a single PHIRedactor.redact call on the
+event loop (multi-megabyte clinical documents, whole export datasets):
+
+- Input is read incrementally and cut into chunks at line (or word)
+  boundaries. Each chunk is scanned together with ``overlap`` characters of
+  context on both sides and keeps the matches that start inside it, so a
+  match straddling a cut is found whole by the chunk it starts in
+- Detection runs in a shared process pool (see shutdown_redaction_executors)
+  and only match positions come back
+- Replacements are applied on the calling side, in document order, by one
+  PHIRedactor, so consistent replacement, fake values and
+  ``get_redaction_map`` span every chunk and worker
+- Redacted text is streamed out chunk by chunk, to an async iterator or a
+  file; only the chunks in flight are held in memory
+
+Context keywords that raise a match's confidence ("ssn", "dob", ...) count
+wherever they appear in the document, as in PHIRedactor.redact: a str or
+Path source is pre-scanned for them. Other sources can't be read twice,
+so every keyword is assumed present, which only redacts more.
+"""
+
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import os
+import time
+
+import structlog
+
+from aegis.security.phi import PHIDetector, PHIMatch, PHIRedactor, PHIType
+
+logger = structlog.get_logger(__name__)
+
+# str is the document itself; pass a Path (or an open text file) to read from disk
+RedactionSource = Union[str, os.PathLike, Any, Iterable[str], AsyncIterable[str]]
+
+# (start, end, PHI type value, confidence), relative to the chunk text
+Span = Tuple[int, int, str, float]
+
+
+# =============================================================================
+# Chunk Detection (runs in worker processes)
+# =============================================================================
+
+# Detectors built in this process, by detector_config()
+_worker_detectors: Dict[tuple, PHIDetector] = {}
+
+
+def detector_config(detector: PHIDetector) -> tuple:
+    """Picklable description a worker rebuilds the detector from."""
+    custom = tuple(
+        (phi_type.value, tuple(patterns))
+        for phi_type, patterns in detector.custom_patterns.items()
+    )
+    return detector.sensitivity, custom, detector.use_ner
+
+
+def detect_chunks(
+    config: tuple,
+    chunks: List[Tuple[str, int, int]],
+    context: Optional[str] = None,
+) -> List[List[Span]]:
+    """
+    Detect PHI in ``(text, own_start, own_end)`` chunks.
+    
+    ``context`` is the document's ``PHIDetector.confidence_context`` (None
+    scores each chunk on its own keywords). Returns, per chunk, the
+    matches starting in ``[own_start, own_end)``.
+    """
+    detector = _worker_detectors.get(config)
+    if detector is None:
+        sensitivity, custom, use_ner = config
+        detector = _worker_detectors[config] = PHIDetector(
+            sensitivity=sensitivity,
+            custom_patterns={PHIType(t): list(patterns) for t, patterns in custom},
+            use_ner=use_ner,
+        )
+    
+    results = []
+    matches_per_chunk = detector.detect_batch((text for text, _, _ in chunks), context)
+    for (_, own_start, own_end), matches in zip(chunks, matches_per_chunk):
+        results.append([
+            (m.start, m.end, m.phi_type.value, m.confidence)
+            for m in matches
+            if own_start <= m.start < own_end
+        ])
+    return results
+
+
+_executors: Dict[Optional[int], ProcessPoolExecutor] = {}
+
+
+def get_redaction_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Shared process pool for chunk detection."""
+    executor = _executors.get(max_workers)
+    if executor is None:
+        executor = _executors[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+    return executor
+
+
+def shutdown_redaction_executors():
+    """Stop the shared detection pools (app shutdown)."""
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+class RedactionPipeline:
+    """
+    Chunked, parallel, streaming PHI redaction.
+    
+    Args:
+        redactor: Redactor whose detector, strategies and maps are used
+        chunk_size: Characters per chunk (records per job add up to this)
+        overlap: Context characters scanned on each side of a chunk; the
+            longest match guaranteed to be found whole across a cut
+        max_workers: Detection processes (None = CPU count)
+        executor: Executor for detection instead of the shared process pool
+    """
+    
+    def __init__(
+        self,
+        redactor: PHIRedactor = None,
+        chunk_size: int = 65_536,
+        overlap: int = 512,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        if not 0 < overlap < chunk_size // 2:
+            raise ValueError("overlap must be positive and under half the chunk size")
+        self.redactor = redactor or PHIRedactor()
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.max_workers = max_workers
+        self.executor = executor
+        
+        self.characters = 0
+        self.chunks = 0
+        self.redactions = 0
+    
+    # =========================================================================
+    # Documents
+    # =========================================================================
+    
+    async def stream(self, source: RedactionSource) -> AsyncIterator[str]:
+        """
+        Redact one document, yielding the redacted text a chunk at a time.
+        
+        ``source`` is the text, a Path or open text file, or an (async)
+        iterable of text pieces that together make up the document.
+        """
+        config = detector_config(self.redactor.detector)
+        context = await self._confidence_context(source)
+        cursor = 0  # Document position the output has reached
+        
+        submit = self._submitter()
+        in_flight: deque = deque()
+        
+        async def finish_oldest() -> str:
+            nonlocal cursor
+            chunk, future = in_flight.popleft()
+            spans = (await future)[0]
+            piece, cursor = self._assemble(chunk, spans, cursor)
+            return piece
+        
+        try:
+            async for chunk in self._chunks(source):
+                window, window_start, own_start, own_end = chunk
+                in_flight.append((chunk, submit(
+                    config, [(window, own_start - window_start, own_end - window_start)], context
+                )))
+                self.chunks += 1
+                self.characters += own_end - own_start
+                # Hand out finished chunks as soon as they're next in order
+                while in_flight and (len(in_flight) >= self._max_in_flight or in_flight[0][1].done()):
+                    yield await finish_oldest()
+            while in_flight:
+                yield await finish_oldest()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+    
+    async def redact_to_file(self, source: RedactionSource, path: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """Redact one document into ``path`` (UTF-8)."""
+        started = time.perf_counter()
+        characters, redactions = self.characters, self.redactions
+        
+        out = await asyncio.to_thread(open, path, "w", encoding="utf-8")
+        try:
+            async for piece in self.stream(source):
+                await asyncio.to_thread(out.write, piece)
+        finally:
+            await asyncio.to_thread(out.close)
+        
+        elapsed = time.perf_counter() - started
+        characters = self.characters - characters
+        result = {
+            "path": str(path),
+            "characters": characters,
+            "redactions": self.redactions - redactions,
+            "elapsed_ms": int(elapsed * 1000),
+            "characters_per_second": int(characters / elapsed) if elapsed > 0 else 0,
+        }
+        logger.info("Redacted document", **result)
+        return result
+    
+    # =========================================================================
+    # Records
+    # =========================================================================
+    
+    async def redact_records(self, records: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+        """
+        Redact independent texts (e.g. the rows of an export), yielding them in order.
+        
+        Records are sent to workers in jobs of about ``chunk_size``
+        characters; each record is scanned whole.
+        """
+        config = detector_config(self.redactor.detector)
+        
+        submit = self._submitter()
+        in_flight: deque = deque()
+        
+        async def finish_oldest() -> List[str]:
+            batch, future = in_flight.popleft()
+            redacted = []
+            for text, spans in zip(batch, await future):
+                redacted.append(self._assemble((text, 0, 0, len(text)), spans, 0)[0])
+            return redacted
+        
+        def send(batch: List[str]):
+            in_flight.append((batch, submit(config, [(text, 0, len(text)) for text in batch])))
+            self.chunks += 1
+            self.characters += sum(map(len, batch))
+        
+        try:
+            batch: List[str] = []
+            size = 0
+            async for record in self._iterate(records):
+                batch.append(record)
+                size += len(record)
+                if size >= self.chunk_size:
+                    send(batch)
+                    batch, size = [], 0
+                    while in_flight and (len(in_flight) >= self._max_in_flight or in_flight[0][1].done()):
+                        for text in await finish_oldest():
+                            yield text
+            if batch:
+                send(batch)
+            while in_flight:
+                for text in await finish_oldest():
+                    yield text
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+    
+    # =========================================================================
+    # Internals
+    # =========================================================================
+    
+    @property
+    def _max_in_flight(self) -> int:
+        # Bound the chunks held in memory while workers catch up
+        return 2 * (self.max_workers or os.cpu_count() or 4)
+    
+    async def _confidence_context(self, source: RedactionSource) -> str:
+        """Confidence keywords of the whole document (all of them if it can't be pre-read)."""
+        detector = self.redactor.detector
+        if isinstance(source, str):
+            return detector.confidence_context(source)
+        if isinstance(source, os.PathLike):
+            return await asyncio.to_thread(self._scan_keywords, source)
+        return detector.confidence_context(None)
+    
+    def _scan_keywords(self, path: os.PathLike) -> str:
+        """confidence_context of a file, read a chunk at a time."""
+        detector = self.redactor.detector
+        # Keep enough of the previous piece to catch keywords spanning reads
+        carry = max(len(k) for k in detector.confidence_context(None).split("\n")) - 1
+        found = set()
+        tail = ""
+        with open(path, encoding="utf-8") as file:
+            while piece := file.read(self.chunk_size):
+                text = tail + piece
+                found.update(detector.confidence_context(text).split("\n"))
+                tail = text[-carry:]
+        return "\n".join(sorted(found - {""}))
+    
+    def _submitter(self):
+        """``submit(config, chunks)`` running detect_chunks on the executor."""
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_redaction_executor(self.max_workers)
+        return lambda *args: loop.run_in_executor(executor, detect_chunks, *args)
+    
+    def _assemble(self, chunk: Tuple[str, int, int, int], spans: List[Span], cursor: int) -> Tuple[str, int]:
+        """
+        Redacted text of a chunk's own range, starting at ``cursor``.
+        
+        Returns the text and the new cursor, which is past ``own_end`` when
+        the last match runs into the next chunk.
+        """
+        window, window_start, own_start, own_end = chunk
+        parts = []
+        position = max(cursor, own_start)
+        for start, end, phi_type, confidence in spans:
+            start += window_start
+            end += window_start
+            if start < position:
+                # Overlaps a match carried over from the previous chunk
+                continue
+            match = PHIMatch(
+                phi_type=PHIType(phi_type),
+                text=window[start - window_start:end - window_start],
+                start=start,
+                end=end,
+                confidence=confidence,
+            )
+            parts.append(window[position - window_start:start - window_start])
+            parts.append(self.redactor.replacement_for(match))
+            position = end
+            self.redactions += 1
+        if position < own_end:
+            parts.append(window[position - window_start:own_end - window_start])
+            position = own_end
+        return "".join(parts), position
+    
+    async def _chunks(self, source: RedactionSource) -> AsyncIterator[Tuple[str, int, int, int]]:
+        """
+        Cut a document into ``(window, window_start, own_start, own_end)`` chunks.
+        
+        Offsets are document positions; the window runs from ``overlap``
+        before ``own_start`` to ``overlap`` after ``own_end``.
+        """
+        buffer = ""  # Document text from buffer_start on
+        buffer_start = 0
+        own_start = 0
+        eof = False
+        pieces = self._read(source).__aiter__()
+        
+        while True:
+            # Buffer the next chunk and the context after it
+            while not eof and buffer_start + len(buffer) < own_start + self.chunk_size + self.overlap:
+                try:
+                    buffer += await pieces.__anext__()
+                except StopAsyncIteration:
+                    eof = True
+            
+            end = buffer_start + len(buffer)
+            if own_start >= end:
+                return
+            if eof and end - own_start <= self.chunk_size:
+                own_end = end
+            else:
+                own_end = self._cut(buffer, buffer_start, own_start)
+            
+            window_start = max(0, own_start - self.overlap)
+            window = buffer[window_start - buffer_start:own_end + self.overlap - buffer_start]
+            yield window, window_start, own_start, own_end
+            
+            own_start = own_end
+            # Keep only what the next window reaches back to
+            drop = own_start - self.overlap - buffer_start
+            if drop > 0:
+                buffer = buffer[drop:]
+                buffer_start += drop
+    
+    def _cut(self, buffer: str, buffer_start: int, own_start: int) -> int:
+        """Chunk end: after the last newline (else space) in the chunk's final eighth."""
+        limit = own_start + self.chunk_size - buffer_start
+        floor = limit - self.chunk_size // 8
+        for separator in ("\n", " "):
+            index = buffer.rfind(separator, floor, limit)
+            if index >= 0:
+                return buffer_start + index + 1
+        return buffer_start + limit
+    
+    async def _read(self, source: RedactionSource) -> AsyncIterator[str]:
+        if isinstance(source, str):
+            for start in range(0, len(source), self.chunk_size):
+                yield source[start:start + self.chunk_size]
+        elif isinstance(source, os.PathLike):
+            file = await asyncio.to_thread(open, source, encoding="utf-8")
+            try:
+                while piece := await asyncio.to_thread(file.read, self.chunk_size):
+                    yield piece
+            finally:
+                file.close()
+        elif hasattr(source, "read"):
+            while piece := await asyncio.to_thread(source.read, self.chunk_size):
+                yield piece
+        else:
+            async for piece in self._iterate(source):
+                yield piece
+    
+    @staticmethod
+    async def _iterate(items: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+        if hasattr(items, "__aiter__"):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+    
+    def get_stats(self) -> dict:
+        return {
+            "characters": self.characters,
+            "chunks": self.chunks,
+            "redactions": self.redactions,
+            "chunk_size": self.chunk_size,
+            "overlap": self.overlap,
+            "redaction_map_size": len(self.redactor.get_redaction_map()),
+        }
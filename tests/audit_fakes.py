@@ -0,0 +1,51 @@
+"""Audit log test doubles shared by the immutable audit and verification tests."""
+
+from contextlib import asynccontextmanager
+
+from aegis.security.audit import AuditEvent, AuditEventType
+from aegis.security.immutable_audit import INSERT_COLUMNS
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query, *args):
+        self.db.executes += 1
+
+    async def fetchval(self, query, *args):
+        self.db.head_reads += 1
+        return self.db.rows[-1]["chain_hash"] if self.db.rows else None
+
+    async def copy_records_to_table(self, table, records, columns):
+        if self.db.fail_writes:
+            self.db.fail_writes -= 1
+            raise ConnectionError("connection reset")
+        self.db.copies += 1
+        self.db.rows.extend(dict(zip(columns, record)) for record in records)
+
+    async def executemany(self, query, rows):
+        self.db.rows.extend(dict(zip(INSERT_COLUMNS, row)) for row in rows)
+
+
+class FakePool:
+    """Records what the audit writer sends to the immutable_audit_log table."""
+
+    def __init__(self, fail_writes=0):
+        self.rows = []
+        self.copies = 0
+        self.executes = 0
+        self.head_reads = 0
+        self.fail_writes = fail_writes
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+def event(i):
+    return AuditEvent(event_type=AuditEventType.DATA_READ, action="data.read", resource_id=str(i))
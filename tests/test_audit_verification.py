@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from audit_fakes import FakeConnection, FakePool, event
+
+from aegis.security import audit_verification
+from aegis.security.audit_verification import ROW_COLUMNS, AuditChainVerifier
+from aegis.security.immutable_audit import ImmutableAuditLogger
+
+
+class VerifyConnection(FakeConnection):
+    """Serves the audit rows and checkpoints of a FakePool like asyncpg would."""
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        yield
+
+    def _rows(self):
+        return [{"sequence_number": i + 1, **row} for i, row in enumerate(self.db.rows)]
+
+    async def execute(self, query, *args):
+        await super().execute(query, *args)
+        if "INSERT INTO immutable_audit_checkpoints" in query:
+            names = ("sequence_number", "chain_hash", "records_verified", "verified_at", "signature")
+            self.db.checkpoints.append({"id": len(self.db.checkpoints) + 1, **dict(zip(names, args))})
+
+    async def fetch(self, query, *args):
+        return sorted(self.db.checkpoints, key=lambda c: (c["sequence_number"], c["id"]), reverse=True)
+
+    async def fetchval(self, query, *args):
+        if not args:
+            return await super().fetchval(query)
+        before = args[0]
+        rows = [r for r in self._rows() if r["sequence_number"] < before]
+        return rows[-1]["chain_hash"] if rows else None
+
+    async def cursor(self, query, *args, prefetch=None):
+        self.db.cursor_queries.append((query, args))
+        start = args[0] if "sequence_number >=" in query else 1
+        for row in self._rows():
+            if row["sequence_number"] >= start:
+                self.db.rows_read += 1
+                yield row
+
+
+class VerifyPool(FakePool):
+    def __init__(self):
+        super().__init__()
+        self.checkpoints = []
+        self.cursor_queries = []
+        self.rows_read = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield VerifyConnection(self)
+
+
+async def write_events(pool, count, start=0):
+    audit = ImmutableAuditLogger(pool=pool)
+    for i in range(start, start + count):
+        e = event(i)
+        e.timestamp = datetime(2026, 1, 1) + timedelta(seconds=i)
+        e.details = {"path": f"/patients/{i}"}
+        await audit.log(e)
+    await audit.close()
+
+
+def verifier(pool, **kwargs):
+    return AuditChainVerifier(pool, segment_size=50, max_workers=2, signing_key="test-key", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_parallel_segments_verify_clean_chain():
+    pool = VerifyPool()
+    await write_events(pool, 480)
+
+    result = await verifier(pool).verify()
+
+    assert result["verified"], result["tampered_records"][:3]
+    assert result["total_records"] == 480
+    assert result["last_chain_hash"] == pool.rows[-1]["chain_hash"]
+    assert pool.checkpoints[-1]["sequence_number"] == 480
+
+
+@pytest.mark.asyncio
+async def test_tampered_record_is_reported():
+    pool = VerifyPool()
+    await write_events(pool, 200)
+    pool.rows[123]["action"] = "data.export"
+
+    result = await verifier(pool).verify()
+
+    assert not result["verified"]
+    assert [(t["sequence_number"], t["issue"]) for t in result["tampered_records"]] == [
+        (124, "record_hash_mismatch"), (124, "chain_hash_mismatch"),
+    ]
+    assert pool.checkpoints == []
+
+
+@pytest.mark.asyncio
+async def test_later_runs_only_verify_records_after_checkpoint():
+    pool = VerifyPool()
+    await write_events(pool, 300)
+    await verifier(pool).verify()
+
+    await write_events(pool, 40, start=300)
+    pool.rows_read = 0
+    result = await verifier(pool).verify()
+
+    assert result["verified"], result["tampered_records"][:3]
+    assert result["total_records"] == 40
+    assert result["checkpoint_sequence"] == 300
+    assert pool.rows_read == 40
+    assert pool.checkpoints[-1]["sequence_number"] == 340
+    assert pool.checkpoints[-1]["records_verified"] == 340
+
+
+@pytest.mark.asyncio
+async def test_range_ending_before_checkpoint_is_read_from_the_start():
+    pool = VerifyPool()
+    await write_events(pool, 300)
+    await verifier(pool).verify()
+    pool.rows[49]["action"] = "data.export"
+
+    result = await verifier(pool).verify(end_sequence=100)
+
+    assert not result["verified"]
+    assert result["checkpoint_sequence"] is None
+    assert {t["sequence_number"] for t in result["tampered_records"]} == {50}
+
+
+@pytest.mark.asyncio
+async def test_runs_share_one_process_pool(monkeypatch):
+    created = []
+    monkeypatch.setattr(audit_verification, "_executors", {})
+    monkeypatch.setattr(
+        audit_verification, "ProcessPoolExecutor",
+        lambda max_workers=None: created.append(max_workers) or ThreadPoolExecutor(max_workers),
+    )
+    pool = VerifyPool()
+    await write_events(pool, 120)
+
+    for _ in range(3):
+        assert (await verifier(pool).verify(incremental=False))["verified"]
+
+    assert created == [2]
+    audit_verification.shutdown_verification_executors()
+    assert audit_verification._executors == {}
+
+
+@pytest.mark.asyncio
+async def test_forged_checkpoint_is_ignored_and_reported():
+    pool = VerifyPool()
+    await write_events(pool, 100)
+    pool.checkpoints.append({
+        "id": 1, "sequence_number": 100, "chain_hash": pool.rows[-1]["chain_hash"],
+        "records_verified": 100, "verified_at": datetime(2026, 1, 1), "signature": "0" * 64,
+    })
+
+    result = await verifier(pool).verify()
+
+    assert result["total_records"] == 100
+    assert result["checkpoint_sequence"] is None
+    assert [t["issue"] for t in result["tampered_records"]] == ["checkpoint_signature_invalid"]
+
+
+@pytest.mark.asyncio
+async def test_logger_verify_integrity_uses_verifier():
+    pool = VerifyPool()
+    await write_events(pool, 20)
+
+    result = await ImmutableAuditLogger(pool=pool).verify_integrity(incremental=False)
+
+    assert result["verified"]
+    assert result["total_records"] == 20
+
+
+def test_row_columns_match_insert_columns():
+    from aegis.security.immutable_audit import INSERT_COLUMNS
+
+    assert ROW_COLUMNS[1:] == INSERT_COLUMNS
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from aegis.bedrock.bridge import BedrockBridge
+from aegis.llm.bedrock import BedrockProvider
+from aegis.llm.providers import LLMConfig, Message, Role
+
+
+class SlowEventStream:
+    """Blocking iterable shaped like a botocore EventStream."""
+
+    def __init__(self, texts, delay=0.02):
+        self.texts = texts
+        self.delay = delay
+        self.closed = threading.Event()
+        self.produced = 0
+
+    def __iter__(self):
+        for text in self.texts:
+            if self.closed.is_set():
+                return
+            time.sleep(self.delay)
+            self.produced += 1
+            chunk = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+            yield {"chunk": {"bytes": json.dumps(chunk).encode()}}
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeBedrockClient:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def invoke_model_with_response_stream(self, modelId, body):
+        return {"body": self.stream}
+
+
+@pytest.mark.asyncio
+async def test_stream_does_not_block_event_loop():
+    bridge = BedrockBridge(max_workers=2)
+    stream = SlowEventStream([str(i) for i in range(10)])
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    events = [event async for event in bridge.stream(lambda: iter(stream))]
+    task.cancel()
+
+    assert len(events) == 10
+    # ~200ms of blocking reads happened while the loop kept ticking
+    assert ticks > 10
+
+
+@pytest.mark.asyncio
+async def test_stream_consumer_close_stops_worker():
+    bridge = BedrockBridge(max_workers=2, queue_size=1)
+    stream = SlowEventStream([str(i) for i in range(1000)], delay=0.001)
+
+    events = bridge.stream(lambda: stream)
+    await events.__anext__()
+    await events.aclose()
+
+    assert stream.closed.is_set()
+    assert bridge.active_streams == 0
+    await asyncio.sleep(0.3)
+    # Bounded queue: the worker never ran far ahead and stopped after close
+    assert stream.produced < 10
+
+
+@pytest.mark.asyncio
+async def test_stream_propagates_worker_errors():
+    bridge = BedrockBridge(max_workers=1)
+
+    def open_stream():
+        yield 1
+        raise RuntimeError("throttled")
+
+    received = []
+    with pytest.raises(RuntimeError, match="throttled"):
+        async for event in bridge.stream(open_stream):
+            received.append(event)
+    assert received == [1]
+
+
+@pytest.mark.asyncio
+async def test_provider_streams_text_and_records_token_latency():
+    provider = BedrockProvider(LLMConfig(provider="bedrock", model="test-model", region="us-east-1"))
+    provider.client = FakeBedrockClient(SlowEventStream(["Hel", "lo", "!"], delay=0.01))
+
+    messages = [Message(role=Role.USER, content="hi")]
+    text = "".join([token async for token in provider.stream(messages)])
+
+    assert text == "Hello!"
+    labels = {"provider": "bedrock", "model": "test-model"}
+    assert provider._first_token_histogram.labels(**labels).count >= 1
+    assert provider._inter_token_histogram.labels(**labels).count >= 2
@@ -0,0 +1,18 @@
+import pytest
+
+from aegis import cli
+from aegis.db import clients
+
+
+@pytest.mark.parametrize("mock_mode", [True, False])
+def test_ingest_refuses_to_run_without_a_persistent_store(monkeypatch, tmp_path, capsys, mock_mode):
+    async def unavailable(settings):
+        if mock_mode:
+            return clients.MockOpenSearch()
+        raise RuntimeError("OpenSearch connection failed: refused")
+
+    monkeypatch.setattr(clients, "init_opensearch", unavailable)
+    (tmp_path / "a.txt").write_text("note")
+
+    assert cli.main(["ingest", str(tmp_path)]) == 2
+    assert "no persistent vector store" in capsys.readouterr().err
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from aegis.graph.client import GraphClient
+
+
+class FakeResultSet:
+    def __init__(self, delay, result):
+        self.delay = delay
+        self.result = result
+
+    def all(self):
+        future = Future()
+
+        def finish():
+            time.sleep(self.delay)
+            future.set_result(self.result)
+
+        threading.Thread(target=finish, daemon=True).start()
+        return future
+
+
+class FakeGremlinClient:
+    """Mimics gremlinpython's Client.submit_async futures, with a server delay."""
+
+    def __init__(self, delay=0.05, fail_times=0):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.submitted = []
+
+    def submit_async(self, query, bindings=None, request_options=None):
+        self.submitted.append((query, request_options))
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("connection reset")
+        future = Future()
+        future.set_result(FakeResultSet(self.delay, [query]))
+        return future
+
+    def close(self):
+        pass
+
+
+def connected_client(fake, pool_size=2, query_timeout=5.0):
+    client = GraphClient(pool_size=pool_size, query_timeout=query_timeout)
+    client._client = fake
+    client._init_pool()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_execute_does_not_block_the_event_loop():
+    client = connected_client(FakeGremlinClient(delay=0.2))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    assert await client.execute("g.V().count()") == ["g.V().count()"]
+    task.cancel()
+
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_queries_in_flight():
+    client = connected_client(FakeGremlinClient(delay=0.1), pool_size=2)
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while True:
+            peak = max(peak, client.in_flight)
+            await asyncio.sleep(0.005)
+
+    watcher = asyncio.create_task(watch())
+    start = time.perf_counter()
+    await asyncio.gather(*[client.execute(f"q{i}") for i in range(4)])
+    elapsed = time.perf_counter() - start
+    watcher.cancel()
+
+    assert peak == 2
+    assert elapsed >= 0.2
+    assert client.get_pool_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_gauge_sums_over_clients():
+    first = connected_client(FakeGremlinClient(delay=0.1))
+    second = connected_client(FakeGremlinClient(delay=0.01))
+    baseline = first._in_flight_gauge.get()
+
+    slow = asyncio.create_task(first.execute("slow"))
+    await asyncio.sleep(0.02)
+    await second.execute("fast")
+
+    # The second client finishing doesn't reset the first one's query
+    assert first._in_flight_gauge.get() == baseline + 1
+    await slow
+    assert first._in_flight_gauge.get() == baseline
+
+
+@pytest.mark.asyncio
+async def test_query_timeout_is_enforced_and_sent_to_server():
+    fake = FakeGremlinClient(delay=1.0)
+    client = connected_client(fake)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client._submit("slow", {}, timeout=0.05)
+
+    assert fake.submitted[0][1] == {"evaluationTimeout": 50}
+    assert client.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_backoff_does_not_hold_a_pool_slot(monkeypatch):
+    fake = FakeGremlinClient(delay=0.0, fail_times=1)
+    client = connected_client(fake, pool_size=1)
+    slot_free_during_backoff = []
+
+    real_sleep = asyncio.sleep
+
+    async def observing_sleep(seconds, *args, **kwargs):
+        if seconds >= 1:
+            slot_free_during_backoff.append(not client._slots.locked())
+            seconds = 0
+        return await real_sleep(seconds, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "sleep", observing_sleep)
+
+    assert await client.execute("g.V()") == ["g.V()"]
+    assert slot_free_during_backoff == [True]
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from aegis.graph.cache import GraphReadCache
+from aegis.graph.client import MockGraphData
+from aegis.graph.queries import PATIENT_360_QUERY, GraphQueries
+from aegis.ingestion.graph_writer import GraphWriter
+
+
+class CountingGraphClient:
+    """Mock graph data behind a round-trip counter and a server delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.data = MockGraphData()
+        self.queries = []
+
+    async def execute(self, query, bindings=None):
+        self.queries.append(query)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.data.execute_mock(query, bindings or {})
+
+
+@pytest.mark.asyncio
+async def test_patient_360_is_one_round_trip_then_cached():
+    client = CountingGraphClient()
+    queries = GraphQueries(client, cache=GraphReadCache(ttl_seconds=60))
+
+    view = await queries.get_patient_360_view("patient-003")
+    again = await queries.get_patient_360_view("patient-003")
+
+    assert client.queries == [PATIENT_360_QUERY]
+    assert view["patient"]["id"] == ["patient-003"]
+    assert view["encounters"] and view["claims"] and view["medications"]
+    assert again is view
+    assert queries.cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_patient_is_not_cached():
+    client = CountingGraphClient()
+    queries = GraphQueries(client, cache=GraphReadCache())
+
+    assert await queries.get_patient_360_view("patient-999") == {}
+    assert await queries.get_patient_360_view("patient-999") == {}
+    assert len(client.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_query():
+    client = CountingGraphClient(delay=0.05)
+    queries = GraphQueries(client, cache=GraphReadCache())
+
+    views = await asyncio.gather(*[queries.get_patient_360_view("patient-001") for _ in range(10)])
+
+    assert len(client.queries) == 1
+    assert all(v is views[0] for v in views)
+    assert queries.cache.get_stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_writes_to_patient_subgraph_invalidate_view():
+    client = CountingGraphClient()
+    cache = GraphReadCache()
+    queries = GraphQueries(client, cache=cache)
+    writer = GraphWriter(client, read_cache=cache)
+
+    def reads():
+        return client.queries.count(PATIENT_360_QUERY)
+
+    view = await queries.get_patient_360_view("patient-002")
+    encounter_id = view["encounters"][0]["encounter"]["id"]
+
+    # New diagnosis attached to one of the patient's encounters
+    await writer.create_edge(encounter_id, "HAS_DIAGNOSIS", "diag-new")
+    await queries.get_patient_360_view("patient-002")
+    assert reads() == 2
+
+    # Writes elsewhere in the graph leave the view cached
+    await writer.create_edge("enc-unrelated", "HAS_DIAGNOSIS", "diag-other")
+    await queries.get_patient_360_view("patient-002")
+    assert reads() == 2
+
+    # Bulk edge batches touching the patient vertex
+    await writer.create_edges_batch("HAS_ENCOUNTER", [("patient-002", "enc-new")])
+    await queries.get_patient_360_view("patient-002")
+    assert reads() == 3
+
+
+@pytest.mark.asyncio
+async def test_view_invalidated_while_loading_is_not_stored():
+    client = CountingGraphClient(delay=0.05)
+    cache = GraphReadCache()
+    queries = GraphQueries(client, cache=cache)
+
+    load = asyncio.create_task(queries.get_patient_360_view("patient-004"))
+    await asyncio.sleep(0.01)
+    cache.invalidate_vertices(["patient-004"])
+    assert (await load)["patient"]["id"] == ["patient-004"]
+
+    await queries.get_patient_360_view("patient-004")
+    assert len(client.queries) == 2
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from audit_fakes import FakePool, event
+
+from aegis.security.audit import AuditEvent, AuditEventType
+from aegis.security.immutable_audit import ImmutableAuditLogger
+
+
+def assert_chain_valid(audit, rows, head=None):
+    for row in rows:
+        e = AuditEvent(
+            id=row["id"], timestamp=row["timestamp"], event_type=AuditEventType(row["event_type"]),
+            action=row["action"], resource_id=row["resource_id"],
+        )
+        assert row["previous_hash"] == head
+        assert row["record_hash"] == audit._calculate_record_hash(e, head)
+        assert row["chain_hash"] == audit._calculate_chain_hash(row["record_hash"], head)
+        head = row["chain_hash"]
+
+
+@pytest.mark.asyncio
+async def test_events_are_chained_and_copied_in_batches():
+    pool = FakePool()
+    audit = ImmutableAuditLogger(pool=pool, batch_size=500)
+
+    for i in range(5000):
+        await audit.log(event(i))
+    await audit.flush()
+    await audit.close()
+
+    assert [r["resource_id"] for r in pool.rows] == [str(i) for i in range(5000)]
+    assert_chain_valid(audit, pool.rows)
+    # One head read at startup plus one per batch, never one per event
+    assert pool.copies <= 10
+    assert pool.head_reads == pool.copies + 1
+
+
+@pytest.mark.asyncio
+async def test_chain_head_is_recovered_on_start():
+    pool = FakePool()
+    first = ImmutableAuditLogger(pool=pool)
+    for i in range(3):
+        await first.log(event(i))
+    await first.close()
+
+    second = ImmutableAuditLogger(pool=pool)
+    await second.log(event(3))
+    await second.close()
+
+    assert len(pool.rows) == 4
+    assert_chain_valid(first, pool.rows)
+
+
+@pytest.mark.asyncio
+async def test_unwritten_events_are_rechained_when_another_writer_appends():
+    pool = FakePool()
+    ours = ImmutableAuditLogger(pool=pool)
+    theirs = ImmutableAuditLogger(pool=pool)
+
+    await ours.log(event(0))
+    await ours.flush()
+    await theirs.log(event(1))
+    await theirs.flush()
+    # Our in-memory head is now stale
+    await ours.log(event(2))
+    await ours.close()
+    await theirs.close()
+
+    assert [r["resource_id"] for r in pool.rows] == ["0", "1", "2"]
+    assert_chain_valid(ours, pool.rows)
+    assert ours.rechains == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_retried_without_losing_events():
+    pool = FakePool(fail_writes=1)
+    audit = ImmutableAuditLogger(pool=pool, retry_interval=0.01)
+
+    for i in range(10):
+        await audit.log(event(i))
+    await audit.flush()
+    assert audit.get_stats()["unwritten"] == 10
+
+    await asyncio.sleep(0.05)
+    assert len(pool.rows) == 10
+    assert_chain_valid(audit, pool.rows)
+    assert audit.get_stats()["write_failures"] == 1
+    await audit.close()
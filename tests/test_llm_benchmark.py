@@ -0,0 +1,136 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from aegis.llm.benchmark import BenchmarkCategory, BenchmarkTask, LLMBenchmark
+from aegis.llm.providers import LLMConfig, LLMProvider, LLMResponse
+from aegis.llm.registry import LLMRegistry
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_runs_tasks_concurrently_and_reports_percentiles():
+    in_flight = 0
+    peak = 0
+
+    async def executor(model_id, prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"response": "ok", "usage": {"input_tokens": 1, "output_tokens": 1}}
+
+    summary = await LLMBenchmark(executor).run_benchmark("m", concurrency=4)
+
+    assert peak == 4
+    assert summary.completed_tasks == summary.total_tasks
+    assert 0 < summary.p50_latency_ms <= summary.p95_latency_ms <= summary.p99_latency_ms
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_accepts_custom_tasks_outside_the_suite():
+    task = BenchmarkTask(id="custom-1", category=BenchmarkCategory.GENERAL_QA, prompt="q")
+
+    summary = await LLMBenchmark().run_benchmark("m", tasks=[task])
+
+    assert summary.by_category["general_qa"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_load_test_records_ttft_tokens_and_errors():
+    benchmark = LLMBenchmark.with_stub(latency_s=0.01, ttft_s=0.002, output_tokens=5, error_rate=0.5)
+
+    report = await benchmark.run_load_test(
+        "stub", concurrency_levels=[1, 4], requests_per_level=20, stream=True
+    )
+
+    assert [level.concurrency for level in report.levels] == [1, 4]
+    for level in report.levels:
+        assert level.requests == 20
+        assert 0 < level.errors < 20
+        assert level.output_tokens == 5 * (20 - level.errors)
+        assert level.ttft_p50_ms is not None and level.ttft_p50_ms <= level.latency_p50_ms
+        assert level.tokens_per_second > 0
+
+
+class DownProvider(LLMProvider):
+    """A backend that is down: mock fallbacks and error chunks, never exceptions."""
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        return await self.chat([], **kwargs)
+
+    async def chat(self, messages, tools=None, **kwargs):
+        return LLMResponse(content="mock", model="m", provider="ollama", is_mock=True)
+
+    async def stream(self, messages, **kwargs):
+        yield "Error: Ollama not available"
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.asyncio
+async def test_registry_benchmark_counts_a_down_provider_as_errors(stream):
+    registry = LLMRegistry()
+    registry._providers["down"] = DownProvider(LLMConfig(provider="ollama", model="m"))
+
+    report = await LLMBenchmark.for_registry(registry).run_load_test(
+        "down", concurrency_levels=[2], requests_per_level=4, stream=stream
+    )
+
+    assert report.levels[0].error_rate == 1.0
+    assert report.levels[0].ttft_p50_ms is None
+
+
+@pytest.mark.asyncio
+async def test_request_rate_paces_arrivals():
+    benchmark = LLMBenchmark.with_stub(latency_s=0.001)
+
+    report = await benchmark.run_load_test(
+        "stub", concurrency_levels=[8], requests_per_level=10, request_rate=100
+    )
+
+    # 10 arrivals at 100/s span at least 90ms
+    assert report.levels[0].duration_s >= 0.09
+    assert report.levels[0].ttft_p50_ms is None
+
+
+@pytest.mark.asyncio
+async def test_open_loop_latency_includes_queueing_for_a_slot():
+    in_flight = 0
+    peak = 0
+
+    async def executor(model_id, prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return {"usage": {"output_tokens": 1}}
+
+    # 8 arrivals 10ms apart, served one at a time for 50ms each
+    report = await LLMBenchmark(executor).run_load_test(
+        "m", concurrency_levels=[1], requests_per_level=8, request_rate=100
+    )
+
+    level = report.levels[0]
+    assert peak == 1
+    # The last arrival (70ms) waits for 7 earlier requests: done near 400ms
+    assert level.latency_p99_ms >= 300
+    assert level.latency_p50_ms > 100
+
+
+@pytest.mark.asyncio
+async def test_report_exports_json_and_csv(tmp_path):
+    report = await LLMBenchmark.with_stub(latency_s=0.001).run_load_test(
+        "stub", concurrency_levels=[1, 2], requests_per_level=4
+    )
+
+    data = json.loads(report.to_json(tmp_path / "run.json"))
+    assert [level["concurrency"] for level in data["levels"]] == [1, 2]
+    assert (tmp_path / "run.json").exists()
+
+    rows = list(csv.DictReader(io.StringIO(report.to_csv(tmp_path / "run.csv"))))
+    assert len(rows) == 2
+    assert rows[0]["model_id"] == "stub" and "latency_p99_ms" in rows[0]
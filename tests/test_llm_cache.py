@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+
+from aegis.llm.cache import LLMResponseCache
+from aegis.llm.optimizer import LLMOptimizer
+from aegis.llm.providers import LLMConfig, LLMProvider, LLMResponse, Message, Role, TokenUsage
+from aegis.llm.registry import LLMRegistry
+from aegis.rag.reranking import LLMListwiseReranker
+from aegis.rag.vectorstore import Document, SearchResult
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        return await self.chat([Message(role=Role.USER, content=prompt)], **kwargs)
+
+    async def chat(self, messages, tools=None, **kwargs):
+        self.calls += 1
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            model=self.config.model,
+            provider="counting",
+            usage=TokenUsage(input_tokens=10, output_tokens=5, total_tokens=15, total_cost=0.01),
+            latency_ms=250,
+        )
+
+    async def stream(self, messages, **kwargs):
+        yield "x"
+
+
+class KeywordEmbeddings:
+    """Embeds text by which keywords it mentions."""
+
+    VOCAB = ("sepsis", "pneumonia", "fracture")
+
+    async def embed(self, text):
+        return [float(word in text.lower()) for word in self.VOCAB] + [0.1]
+
+
+def make_registry(cache=None):
+    registry = LLMRegistry(response_cache=cache)
+    provider = CountingProvider(LLMConfig(provider="counting", model="m", temperature=0.0))
+    registry._providers["counting"] = provider
+    registry._default_provider = "counting"
+    return registry, provider
+
+
+@pytest.mark.asyncio
+async def test_exact_hits_ignore_whitespace_and_report_savings():
+    registry, provider = make_registry()
+
+    first = await registry.generate("Classify:  chest pain")
+    second = await registry.generate("Classify: chest pain\n")
+
+    assert provider.calls == 1
+    assert second.content == first.content
+    stats = registry.get_usage_stats()["cache"]
+    assert stats["exact_hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["saved_cost"] == 0.01
+    assert stats["saved_latency_ms"] == 250
+
+
+@pytest.mark.asyncio
+async def test_sampled_calls_and_different_params_are_not_shared():
+    registry, provider = make_registry()
+
+    await registry.generate("q", temperature=0.7)
+    await registry.generate("q", temperature=0.7)
+    await registry.generate("q", max_tokens=10)
+    await registry.generate("q", max_tokens=20)
+
+    assert provider.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_isolated_and_invalidated_separately():
+    cache = LLMResponseCache()
+    registry, provider = make_registry(cache)
+
+    await registry.generate("q", tenant_id="a")
+    await registry.generate("q", tenant_id="b")
+    assert provider.calls == 2
+
+    cache.invalidate("a")
+    await registry.generate("q", tenant_id="a")
+    await registry.generate("q", tenant_id="b")
+    assert provider.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_size_eviction():
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=0.0)
+    registry, provider = make_registry(cache)
+
+    await registry.generate("q")
+    await registry.generate("q")
+    assert provider.calls == 2
+
+    cache.ttl_seconds = 60
+    for prompt in ("a", "b", "c"):
+        await registry.generate(prompt)
+    assert cache.get_stats()["entries"] == 2
+    assert cache.evictions >= 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_layer_serves_near_duplicates():
+    cache = LLMResponseCache(embedding_model=KeywordEmbeddings(), similarity_threshold=0.95)
+    registry, provider = make_registry(cache)
+
+    await registry.chat([Message(role=Role.USER, content="Is this sepsis?")])
+    hit = await registry.chat([Message(role=Role.USER, content="Could this be sepsis")])
+    await registry.chat([Message(role=Role.USER, content="Is this a fracture?")])
+
+    assert provider.calls == 2
+    assert hit.content == "answer 1"
+    assert cache.get_stats()["semantic_hits"] == 1
+
+
+class FailingProvider(CountingProvider):
+    """Answers with the fallback placeholder, as providers do when the call fails."""
+
+    async def chat(self, messages, tools=None, **kwargs):
+        response = await super().chat(messages, tools, **kwargs)
+        response.is_mock = True
+        return response
+
+
+class SlowProvider(CountingProvider):
+    async def chat(self, messages, tools=None, **kwargs):
+        await asyncio.sleep(5.0)
+        return await super().chat(messages, tools, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_mock_responses_are_not_cached():
+    registry = LLMRegistry()
+    provider = FailingProvider(LLMConfig(provider="counting", model="m", temperature=0.0))
+    registry._providers["down"] = provider
+    registry._default_provider = "down"
+
+    for _ in range(3):
+        await registry.generate("q")
+
+    assert provider.calls == 3
+    assert registry.response_cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedged_answer_is_cached_under_the_provider_that_answered():
+    registry = LLMRegistry(optimizer=LLMOptimizer())
+    primary = SlowProvider(LLMConfig(provider="openai", model="gpt-4o-mini", temperature=0.0))
+    backup = CountingProvider(LLMConfig(provider="ollama", model="llama3", temperature=0.0))
+    registry._providers.update(primary=primary, backup=backup)
+    registry._default_provider = "primary"
+    for _ in range(5):
+        registry.optimizer.latency.record("openai/gpt-4o-mini", 0.01)
+
+    await registry.generate("q", provider="primary", hedge=True)
+    await registry.generate("q", provider="backup")
+
+    assert backup.calls == 1
+    assert registry.response_cache.get_stats()["exact_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reranker_prompts_are_cached_at_the_default_temperature():
+    registry = LLMRegistry()
+    provider = CountingProvider(LLMConfig(provider="counting", model="m"))  # temperature 0.7
+    registry._providers["counting"] = provider
+    registry._default_provider = "counting"
+    candidates = [
+        SearchResult(document=Document(id=f"c{i}", content=text), score=1.0)
+        for i, text in enumerate(["warfarin dosing", "INR monitoring"])
+    ]
+
+    # Fresh rerankers (empty score caches), so both calls reach the registry
+    for _ in range(2):
+        await LLMListwiseReranker(registry).rerank("warfarin", candidates, top_k=2)
+
+    assert provider.calls == 1
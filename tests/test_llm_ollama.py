@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from aegis.llm.ollama import OllamaProvider
+from aegis.llm.providers import LLMConfig
+from aegis.llm.registry import LLMRegistry
+
+
+@pytest.fixture
+async def stub_ollama():
+    peers = []
+
+    async def generate(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        await request.json()
+        return web.json_response({"response": "ok", "done": True, "eval_count": 1})
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", peers
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_ollama_reuses_one_keepalive_connection(stub_ollama):
+    base_url, peers = stub_ollama
+    registry = LLMRegistry()
+    registry.register_provider(
+        "local", LLMConfig(provider="ollama", model="stub", api_base=base_url)
+    )
+    provider = registry.get_provider("local")
+
+    for _ in range(5):
+        response = await provider.generate("hi")
+        assert response.content == "ok"
+
+    assert len(peers) == 5
+    assert len(set(peers)) == 1  # Same client socket for every call
+
+    await registry.close()
+    assert provider._session is None
+
+
+def test_session_from_another_loop_is_detached_not_leaked():
+    provider = OllamaProvider(LLMConfig(provider="ollama", model="stub"))
+
+    async def session():
+        return provider._get_session()
+
+    first = asyncio.run(session())
+    second = asyncio.run(session())
+    assert second is not first
+    assert first.closed
+
+    asyncio.run(provider.close())
+    assert second.closed and provider._session is None
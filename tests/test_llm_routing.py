@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from aegis.llm.optimizer import LLMOptimizer, TaskComplexity
+from aegis.llm.providers import LLMConfig, LLMProvider, LLMResponse
+from aegis.llm.registry import LLMRegistry
+
+
+class DelayedProvider(LLMProvider):
+    def __init__(self, config, delay=0.0, fail=False):
+        super().__init__(config)
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        return await self.chat([], **kwargs)
+
+    async def chat(self, messages, tools=None, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError("backend down")
+        return LLMResponse(content=self.config.model, model=self.config.model, provider=self.config.provider)
+
+    async def stream(self, messages, **kwargs):
+        yield ""
+
+
+def make_registry(**providers):
+    registry = LLMRegistry(optimizer=LLMOptimizer())
+    for name, provider in providers.items():
+        registry._providers[name] = provider
+        registry._default_provider = registry._default_provider or name
+    return registry
+
+
+def provider(kind, model, **kwargs):
+    return DelayedProvider(LLMConfig(provider=kind, model=model), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_auto_routes_to_fastest_after_measuring():
+    slow = provider("ollama", "llama3", delay=0.05)
+    fast = provider("openai", "gpt-4o-mini", delay=0.0)
+    registry = make_registry(slow=slow, fast=fast)
+
+    for name in ("slow", "fast"):
+        await registry.generate("list codes", provider=name, use_cache=False)
+
+    response = await registry.generate("list codes", provider="auto", use_cache=False)
+    assert response.content == "gpt-4o-mini"
+    assert set(registry.get_usage_stats()["routing"]) == {"ollama/llama3", "openai/gpt-4o-mini"}
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_provider_is_routed_around():
+    broken = provider("openai", "gpt-4o-mini", fail=True)
+    working = provider("ollama", "llama3", delay=0.01)
+    registry = make_registry(broken=broken, working=working)
+
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            await registry.generate("q", provider="broken", use_cache=False)
+
+    assert registry.route("q")[0] == "working"
+
+
+@pytest.mark.asyncio
+async def test_route_respects_complexity_and_budget():
+    registry = make_registry(
+        local=provider("ollama", "llama3"),
+        premium=provider("openai", "gpt-4o"),
+    )
+
+    assert registry.route(complexity=TaskComplexity.EXPERT) == ["premium"]
+    assert registry.route("x" * 4000, max_budget=0.001) == ["local"]
+    with pytest.raises(ValueError):
+        registry.route(complexity=TaskComplexity.EXPERT, max_budget=0.0001)
+
+
+@pytest.mark.asyncio
+async def test_hedge_returns_backup_and_cancels_slow_primary():
+    primary = provider("openai", "gpt-4o-mini", delay=5.0)
+    backup = provider("ollama", "llama3", delay=0.0)
+    registry = make_registry(primary=primary, backup=backup)
+    key = "openai/gpt-4o-mini"
+    for _ in range(5):
+        registry.optimizer.latency.record(key, 0.05)
+
+    start = asyncio.get_running_loop().time()
+    response = await registry.generate("q", provider="primary", hedge=True, use_cache=False)
+    elapsed = asyncio.get_running_loop().time() - start
+    await asyncio.sleep(0)
+
+    assert response.content == "llama3"
+    assert elapsed < 1.0
+    assert primary.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_not_started_when_primary_is_fast():
+    primary = provider("openai", "gpt-4o-mini", delay=0.0)
+    backup = provider("ollama", "llama3", delay=0.0)
+    registry = make_registry(primary=primary, backup=backup)
+
+    response = await registry.generate("q", provider="primary", hedge=True, use_cache=False)
+
+    assert response.content == "gpt-4o-mini"
+    assert backup.calls == 0
+
+
+class MockingProvider(DelayedProvider):
+    """Catches its own failure and answers with a mock, like the real providers."""
+
+    async def chat(self, messages, tools=None, **kwargs):
+        self.calls += 1
+        return LLMResponse(content="[Mock]", model=self.config.model, provider=self.config.provider, is_mock=True)
+
+
+@pytest.mark.asyncio
+async def test_mock_responses_count_as_failures_and_are_demoted():
+    dead = MockingProvider(LLMConfig(provider="ollama", model="llama3"))
+    working = provider("openai", "gpt-4o-mini", delay=0.02)
+    registry = make_registry(dead=dead, working=working)
+
+    await registry.generate("q", provider="working", use_cache=False)
+    response = await registry.generate("q", provider="dead", use_cache=False)
+    assert response.is_mock
+
+    stats = registry.get_usage_stats()["routing"]["ollama/llama3"]
+    assert stats["error_rate"] == 1.0
+    for _ in range(3):
+        assert (await registry.generate("q", provider="auto", use_cache=False)).content == "gpt-4o-mini"
+    assert dead.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_prefers_real_answer_over_fast_mock():
+    primary = MockingProvider(LLMConfig(provider="ollama", model="llama3"))
+    backup = provider("openai", "gpt-4o-mini", delay=0.01)
+    registry = make_registry(primary=primary, backup=backup)
+
+    response = await registry.generate("q", provider="primary", hedge=True, use_cache=False)
+
+    assert response.content == "gpt-4o-mini"
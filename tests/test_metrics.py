@@ -0,0 +1,85 @@
+import threading
+
+from aegis.observability.metrics import Counter, Gauge, Histogram, MetricsCollector
+
+
+def test_labels_returns_cached_child_sharing_series():
+    counter = Counter("requests_total", "Requests")
+    child = counter.labels(method="GET", status="200")
+
+    assert counter.labels(status="200", method="GET") is child
+    child.inc()
+    counter.inc(2, labels={"status": "200", "method": "GET"})
+    counter.inc()
+
+    assert counter.get({"method": "GET", "status": "200"}) == 3.0
+    assert counter.get() == 1.0
+    assert counter.get({"method": "POST"}) == 0.0
+    assert len(counter.collect()) == 2
+
+
+def test_histogram_buckets_are_upper_bound_inclusive_and_cumulative():
+    histogram = Histogram("latency_seconds", buckets=[1.0, 0.1, 0.5])
+    for value in (0.05, 0.1, 0.3, 0.5, 0.7, 2.0):
+        histogram.observe(value, labels={"route": "/a"})
+
+    child = histogram.labels(route="/a")
+    assert child.count == 6
+    assert abs(child.sum - 3.65) < 1e-9
+    buckets = {
+        v.labels["le"]: v.value
+        for v in histogram.collect()
+        if v.name == "latency_seconds_bucket"
+    }
+    assert buckets == {"0.1": 2, "0.5": 4, "1.0": 5, "+Inf": 6}
+    assert histogram.get_percentile(50, {"route": "/a"}) == 0.5
+    assert histogram.get_percentile(99, {"route": "/a"}) == 1.0
+    assert histogram.get_percentile(50) == 0.0
+
+
+def test_per_thread_accumulation_is_exact_across_threads():
+    counter = Counter("events_total")
+    histogram = Histogram("sizes", buckets=[10, 100])
+    gauge = Gauge("level")
+    child = counter.labels(kind="x")
+
+    def work():
+        for i in range(20_000):
+            child.inc()
+            histogram.observe(i % 200)
+            gauge.inc()
+            gauge.dec(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Exited threads' cells are folded in once, not counted twice
+    for _ in range(2):
+        assert child.get() == 160_000
+        assert histogram.labels().count == 160_000
+    assert child._cells == []
+    assert gauge.get() == 80_000
+    bucket_10 = next(v for v in histogram.collect() if v.labels.get("le") == "10")
+    assert bucket_10.value == 8 * 100 * 11
+
+
+def test_prometheus_output_streams_per_metric():
+    collector = MetricsCollector()
+    collector.api_requests.labels(method="GET", path='/a"b').inc(3)
+    collector.active_agents.set(2)
+    collector.api_latency.observe(0.2)
+
+    chunks = list(collector.iter_prometheus())
+    text = collector.to_prometheus()
+
+    assert len(chunks) == len(collector._metrics)
+    assert text == "".join(chunks)
+    assert 'aegis_api_requests_total{method="GET",path="/a\\"b"} 3.0\n' in text
+    assert "aegis_active_agents 2\n" in text
+    assert 'aegis_api_latency_seconds_bucket{le="0.25"} 1\n' in text
+    assert 'aegis_api_latency_seconds_bucket{le="+Inf"} 1\n' in text
+    assert "aegis_api_latency_seconds_count 1\n" in text
+    assert "# TYPE aegis_api_latency_seconds histogram\n" in text
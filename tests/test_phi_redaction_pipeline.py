@@ -0,0 +1,162 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from aegis.security import redaction
+from aegis.security.phi import PHIDetector, PHIRedactor, RedactionStrategy
+from aegis.security.redaction import RedactionPipeline
+
+NOTE = (
+    "DISCHARGE SUMMARY\nPatient Name: Mary Johnson\nMRN: AB1234567\nDOB: 3/14/1962\n"
+    "Mr. Johnson is a 61 year old with chest pain. BP 142/88, HR 92. SSN: 123-45-6789.\n"
+    "Contact phone (617) 555-0199; email mary.johnson@example.org. Lives at 42 Beacon Street.\n"
+    "Follow up with cardiology in 2 weeks. Labs: Na 138, K 4.1, Cr 1.0, glucose 156.\n"
+)
+
+
+def document(count=60):
+    return "".join(NOTE.replace("0199", f"{1000 + i}") for i in range(count))
+
+
+async def collect(stream):
+    return "".join([piece async for piece in stream])
+
+
+@pytest.fixture
+def threads():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.mark.asyncio
+async def test_stream_matches_serial_redaction_in_process_pool():
+    text = document()
+    serial = PHIRedactor(default_strategy=RedactionStrategy.HASH)
+    pipeline = RedactionPipeline(
+        PHIRedactor(default_strategy=RedactionStrategy.HASH),
+        chunk_size=1024, overlap=128, max_workers=2,
+    )
+
+    redacted = await collect(pipeline.stream(text))
+
+    assert redacted == serial.redact(text)
+    assert pipeline.redactor.get_redaction_map() == serial.get_redaction_map()
+    assert pipeline.chunks > 10
+
+
+@pytest.mark.asyncio
+async def test_documents_and_record_sets_share_one_process_pool(monkeypatch):
+    created = []
+    monkeypatch.setattr(redaction, "_executors", {})
+    monkeypatch.setattr(
+        redaction, "ProcessPoolExecutor",
+        lambda max_workers=None: created.append(max_workers) or ThreadPoolExecutor(max_workers),
+    )
+    pipeline = RedactionPipeline(chunk_size=1024, overlap=128, max_workers=2)
+
+    for _ in range(3):
+        await collect(pipeline.stream(NOTE))
+        [text async for text in pipeline.redact_records([NOTE, NOTE])]
+
+    assert created == [2]
+    redaction.shutdown_redaction_executors()
+    assert redaction._executors == {}
+
+
+@pytest.mark.asyncio
+async def test_matches_straddling_chunk_cuts_are_redacted_whole(threads):
+    for offset in range(0, 48, 3):
+        text = "x" * offset + " call (617) 555-0199 now" * 20
+        pipeline = RedactionPipeline(chunk_size=64, overlap=24, executor=threads)
+        redacted = await collect(pipeline.stream(text))
+        assert redacted == PHIRedactor().redact(text)
+        assert "555" not in redacted
+
+
+@pytest.mark.asyncio
+async def test_fake_values_consistent_across_chunks(threads):
+    text = "".join(f"Seen by Dr. Alice Walker on visit {i}.\n" for i in range(300))
+    pipeline = RedactionPipeline(
+        PHIRedactor(default_strategy=RedactionStrategy.FAKE),
+        chunk_size=512, overlap=64, executor=threads,
+    )
+
+    redacted = await collect(pipeline.stream(text))
+
+    fakes = {line.split("Dr. ")[1].split(" on visit")[0] for line in redacted.splitlines()}
+    assert len(fakes) == 1 and "Alice" not in redacted
+    assert pipeline.redactor.get_redaction_map()[fakes.pop()] == "Alice Walker"
+
+
+@pytest.mark.asyncio
+async def test_file_and_async_iterable_sources(tmp_path, threads):
+    text = document(30)
+    source = tmp_path / "note.txt"
+    source.write_text(text, encoding="utf-8")
+    expected = PHIRedactor().redact(text)
+
+    pipeline = RedactionPipeline(chunk_size=1024, overlap=128, executor=threads)
+    result = await pipeline.redact_to_file(source, tmp_path / "redacted.txt")
+    assert (tmp_path / "redacted.txt").read_text(encoding="utf-8") == expected
+    assert result["characters"] == len(text)
+
+    async def pieces():
+        for start in range(0, len(text), 333):
+            yield text[start:start + 333]
+
+    assert await collect(pipeline.stream(pieces())) == expected
+
+
+@pytest.mark.asyncio
+async def test_records_are_redacted_in_order(threads):
+    records = [f"row {i}: SSN 123-45-{6000 + i}" if i % 3 else f"row {i}: no identifiers" for i in range(200)]
+    pipeline = RedactionPipeline(chunk_size=1024, overlap=128, executor=threads)
+
+    redacted = [text async for text in pipeline.redact_records(records)]
+
+    assert redacted == [PHIRedactor().redact(record) for record in records]
+
+
+@pytest.mark.asyncio
+async def test_stream_does_not_block_event_loop():
+    text = document(1000)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        pipeline = RedactionPipeline(chunk_size=4096, overlap=256, executor=executor)
+        redacted = await collect(pipeline.stream(text))
+    task.cancel()
+
+    assert "123-45-6789" not in redacted
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_document_wide_keywords_set_confidence_in_every_chunk(tmp_path, threads):
+    text = "DOB: 3/14/1962\n" + "Vitals stable, no acute distress.\n" * 2800 + "Seen again 4/2/2024.\n"
+    source = tmp_path / "note.txt"
+    source.write_text(text, encoding="utf-8")
+    expected = PHIRedactor(PHIDetector(sensitivity="medium")).redact(text)
+    assert "4/2/2024" not in expected
+
+    def pipeline():
+        return RedactionPipeline(
+            PHIRedactor(PHIDetector(sensitivity="medium")), chunk_size=4096, overlap=256, executor=threads,
+        )
+
+    assert await collect(pipeline().stream(text)) == expected
+    assert await collect(pipeline().stream(source)) == expected
+
+    async def pieces():
+        yield text
+
+    # A stream can't be pre-read: it is redacted as if every keyword were present
+    assert "4/2/2024" not in await collect(pipeline().stream(pieces()))
@@ -0,0 +1,139 @@
+import json
+import random
+
+import pytest
+
+from aegis.security.audit import AuditEvent, AuditEventType, AuditLogger
+from aegis.security.phi import PHIDetector, PHIScanner, PHIType
+from aegis.security.phi_detection import detect_phi
+
+NOTE = (
+    "DISCHARGE SUMMARY\nPatient Name: Mary Johnson\nMRN: AB1234567\nDOB: 3/14/1962\n"
+    "Admit date 2024-02-11. Mr. Johnson is a 61 year old with chest pain. BP 142/88, HR 92.\n"
+    "SSN: 123-45-6789. Contact phone (617) 555-0199; email mary.johnson@example.org.\n"
+    "Lives at 42 Beacon Street, Boston MA 02108. Seen March 5, 2024 and 5 May 2024.\n"
+    "Policy: ABCD12345678, P.O. Box 77, server 10.0.0.12, https://portal.example.org/p/1\n"
+)
+
+TRICKY = [
+    "",
+    "no identifiers here at all",
+    "ſsn: 123456789 and İd AB1234567",  # characters that only match through case folding
+    "٣٣٣-٤٤-٥٥٥٥ ssn",  # Unicode decimal digits match \d
+    "(617)555-0199 617-555-0199 6175550199",
+    "x123-45-6789 123-45-67890 12345-6789",
+    "a@b MRN:AB12 mrn: ab123456 tel:617.555.0199",
+]
+
+
+def reference_detect(detector: PHIDetector, text: str):
+    """Every pattern with finditer, then dedup and filter (the scanner must match this)."""
+    hits = []
+    order = 0
+    for phi_type, patterns in detector._compiled_patterns.items():
+        for pattern in patterns:
+            for m in pattern.finditer(text):
+                confidence = detector._calculate_confidence(phi_type, text.lower())
+                context = (text[max(0, m.start() - 20):m.start()], text[m.end():m.end() + 20])
+                hits.append((m.start(), m.end(), order, phi_type, confidence, context))
+            order += 1
+    for m in detector._detect_names_heuristic(text):
+        hits.append((m.start, m.end, order, m.phi_type, m.confidence, ("", "")))
+        order += 1
+    hits.sort(key=lambda h: (h[0], -h[4], h[2]))
+    kept, last_end = [], -1
+    for hit in hits:
+        if hit[0] >= last_end:
+            kept.append(hit)
+            last_end = hit[1]
+        elif hit[4] > kept[-1][4]:
+            kept[-1] = hit
+            last_end = hit[1]
+    return [
+        (h[3], text[h[0]:h[1]], h[0], h[1], h[4]) + h[5]
+        for h in kept
+        if h[4] >= detector.min_confidence
+    ]
+
+
+def as_tuples(matches):
+    return [
+        (m.phi_type, m.text, m.start, m.end, m.confidence, m.context_before, m.context_after)
+        for m in matches
+    ]
+
+
+def fuzz_texts(count=3000, seed=7):
+    rng = random.Random(seed)
+    alphabet = "0123456789 ()-./:#@\nabcMRNSSNDOBPhoneFaxJanMayDecİſK٣ Account Policy PO Box Street Mr. Patient Name: http://x.y"
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 160)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("sensitivity", ["low", "medium", "high"])
+def test_detect_matches_per_pattern_reference(sensitivity):
+    detector = PHIDetector(sensitivity=sensitivity)
+    for text in [NOTE] + TRICKY + fuzz_texts():
+        assert as_tuples(detector.detect(text)) == reference_detect(detector, text), text
+
+
+def test_scanner_hits_equal_finditer_with_custom_patterns():
+    detector = PHIDetector(custom_patterns={
+        PHIType.LICENSE_NUMBER: [r"\bDL\d{7}\b", r"(lic)[-#](\d+)"],
+        PHIType.DEVICE_ID: [r"\bSN-?[0-9A-F]{8}\b"],
+    })
+    scanner = detector._scanner
+    for text in [NOTE + " DL1234567 lic#99 SN-0BADCAFE"] + TRICKY + fuzz_texts(1000):
+        expected = sorted(
+            (i, m.start(), m.end())
+            for i, (_, pattern) in enumerate(scanner.patterns)
+            for m in pattern.finditer(text)
+        )
+        assert sorted(scanner.scan(text)) == expected, text
+
+
+def test_scanner_gates_most_builtin_patterns():
+    scanner = PHIScanner(PHIDetector()._compiled_patterns)
+    separate = {scanner.patterns[i][0]: required for i, required in scanner._separate}
+    # Only patterns that can start with almost anything are scanned on their own
+    assert set(separate) == {PHIType.MRN, PHIType.EMAIL, PHIType.URL}
+    assert separate[PHIType.EMAIL] == "@."
+    assert list(scanner.scan("plain prose without identifiers")) == []
+
+
+def test_detect_batch_and_fast_paths_agree_with_detect():
+    detector = PHIDetector()
+    texts = [NOTE] + TRICKY + fuzz_texts(500)
+    batch = detector.detect_batch(texts)
+    for text, matches in zip(texts, batch):
+        assert as_tuples(matches) == as_tuples(detector.detect(text))
+        assert detector.contains_phi(text) == bool(matches)
+        assert detector.get_phi_types(text) == {m.phi_type for m in matches}
+
+
+def test_note_types():
+    types = PHIDetector().get_phi_types(NOTE)
+    assert {
+        PHIType.NAME, PHIType.MRN, PHIType.SSN, PHIType.PHONE, PHIType.EMAIL,
+        PHIType.DATE, PHIType.ADDRESS, PHIType.ACCOUNT_NUMBER, PHIType.URL,
+    } <= types
+
+
+@pytest.mark.asyncio
+async def test_audit_logger_flags_phi_types():
+    audit = AuditLogger(use_immutable=False)
+    event = AuditEvent(
+        event_type=AuditEventType.DATA_READ,
+        action="patient.read",
+        details={"note": "SSN: 123-45-6789", "email": "a.b@example.org"},
+    )
+    await audit.log(event)
+    assert event.contains_phi
+    # Types come from the configured (Presidio/NER-backed) detector
+    assert event.phi_types == sorted({e["type"] for e in detect_phi(json.dumps(event.details))})
+
+    clean = AuditEvent(event_type=AuditEventType.DATA_READ, action="search", details={"q": "diabetes"})
+    await audit.log(clean)
+    assert not clean.contains_phi
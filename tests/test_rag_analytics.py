@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from aegis.rag.analytics import DDSketch, RAGAnalytics, SpaceSaving
+
+
+def test_ddsketch_quantiles_within_relative_accuracy_and_merge():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(4, 1) for _ in range(20_000)]
+    left, right = DDSketch(), DDSketch()
+    for i, value in enumerate(values):
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+
+    values.sort()
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert left.quantile(q) == pytest.approx(exact, rel=0.02)
+    assert left.count == len(values)
+    assert left.max == values[-1]
+
+
+def test_space_saving_keeps_heavy_hitters():
+    sketch = SpaceSaving(capacity=10)
+    for i in range(1000):
+        key = "frequent" if i % 3 == 0 else f"rare {i}"
+        sketch.add(key, key, 1.0, 1, None)
+    assert len(sketch.entries) == 10
+    top = max(sketch.entries.values(), key=lambda e: e.count)
+    assert top.query == "frequent"
+    assert top.count - top.error <= 334 <= top.count
+
+
+def test_analytics_reads_come_from_aggregates():
+    analytics = RAGAnalytics(max_history=5)
+    ids = [
+        analytics.log_query("Chest Pain", "tenant-a", user_id="u1", latency_ms=100, results_count=4),
+        analytics.log_query("chest pain ", "tenant-a", user_id="u2", latency_ms=300, results_count=2),
+        analytics.log_query("sepsis criteria", "tenant-b", user_id="u1", latency_ms=50),
+    ]
+    assert analytics.record_feedback(ids[0], 2)
+    assert analytics.record_feedback(ids[0], 4)  # Re-rating replaces the old score
+
+    popular = analytics.get_popular_queries("tenant-a")
+    assert [(q.query_pattern, q.count) for q in popular] == [("chest pain", 2)]
+    assert popular[0].avg_latency_ms == 200
+    assert popular[0].avg_feedback == 4
+
+    summary = analytics.get_summary()
+    assert summary.total_queries == 3
+    assert summary.unique_users == 2
+    assert summary.feedback_count == 1
+    assert analytics.get_latency_percentiles("tenant-b").p50_ms == pytest.approx(50, rel=0.01)
+    assert analytics.get_query_suggestions("ches") == ["Chest Pain"]
+
+    # The raw log ring buffer is bounded; aggregates keep counting
+    for _ in range(10):
+        analytics.log_query("fever", "tenant-a")
+    assert len(analytics.export_logs()) == 5
+    assert not analytics.record_feedback(ids[0], 5)
+    assert analytics.get_summary("tenant-a").total_queries == 12
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aegis.rag.embeddings import (
+    CachedEmbeddings,
+    EmbeddingModel,
+    EmbeddingRequestScheduler,
+    get_embedding_scheduler,
+    is_throttling_error,
+)
+
+
+class CountingEmbeddings(EmbeddingModel):
+    def __init__(self):
+        super().__init__("counting", dimensions=2)
+        self.calls = []
+
+    async def embed(self, text):
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_cached_embeddings_only_sends_misses(tmp_path):
+    model = CountingEmbeddings()
+    cached = CachedEmbeddings(model, disk_path=str(tmp_path / "emb.sqlite"))
+
+    first = await cached.embed_batch(["chest pain", "chest  pain", "fever"])
+    assert model.calls == [["chest pain", "fever"]]
+    assert first[0] == first[1] == [10.0, 1.0]
+
+    await cached.embed_batch(["fever", "cough"])
+    assert model.calls[-1] == ["cough"]
+    assert cached.get_stats()["memory_hits"] == 1
+
+    # A fresh process-level cache is served from the SQLite tier
+    restarted = CachedEmbeddings(CountingEmbeddings(), disk_path=str(tmp_path / "emb.sqlite"))
+    assert await restarted.embed("chest pain") == [10.0, 1.0]
+    assert restarted.model.calls == []
+    assert restarted.get_stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_embeddings_never_caches_mock_vectors():
+    model = CountingEmbeddings()
+
+    async def failing_batch(texts):
+        return [model._mock_embedding() for _ in texts]
+
+    model.embed_batch = failing_batch
+    cached = CachedEmbeddings(model)
+    await cached.embed("x")
+    await cached.embed("x")
+    assert cached.get_stats()["misses"] == 2
+
+
+class _Throttled(Exception):
+    response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class _NoResponse(Exception):
+    response = None
+
+
+def test_throttling_check_tolerates_missing_response():
+    assert is_throttling_error(_Throttled())
+    assert not is_throttling_error(_NoResponse())
+    assert not is_throttling_error(ValueError("boom"))
+
+
+@pytest.mark.asyncio
+async def test_scheduler_coalesces_and_caps_concurrency():
+    scheduler = EmbeddingRequestScheduler("test-coalesce", max_concurrency=2)
+    active, peak, calls = 0, 0, []
+    lock = threading.Lock()
+
+    def invoke(text):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+            calls.append(text)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return [float(len(text))]
+
+    texts = ["a", "bb", "a", "ccc", "dddd", "a"]
+    results = await asyncio.gather(*[scheduler.submit(t, invoke, t) for t in texts])
+
+    assert results == [[1.0], [2.0], [1.0], [3.0], [4.0], [1.0]]
+    assert sorted(calls) == ["a", "bb", "ccc", "dddd"]
+    assert peak <= 2
+    assert scheduler.get_stats()["coalesced"] == 2
+    assert scheduler.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_backs_off_on_throttling():
+    scheduler = EmbeddingRequestScheduler(
+        "test-throttle", requests_per_second=100, base_backoff=0.01
+    )
+    attempts = []
+
+    def invoke():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise _Throttled()
+        return [1.0]
+
+    assert await scheduler.submit("x", invoke) == [1.0]
+    stats = scheduler.get_stats()
+    assert stats["throttled"] == 2
+    # Rate was halved twice, then recovered a step on success
+    assert stats["rate_limit"] == pytest.approx(30.0)
+
+    def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await scheduler.submit("y", broken)
+    assert scheduler.get_stats()["throttled"] == 2
+
+
+def test_shared_scheduler_survives_a_new_event_loop():
+    scheduler = get_embedding_scheduler(
+        "test-loops", max_concurrency=1, requests_per_second=1000
+    )
+
+    def invoke(text):
+        time.sleep(0.01)
+        return [float(len(text))]
+
+    async def contended():
+        # Two callers on one slot make the semaphore and bucket lock wait
+        return await asyncio.gather(
+            scheduler.submit("a", invoke, "a"),
+            scheduler.submit("bb", invoke, "bb"),
+        )
+
+    assert asyncio.run(contended()) == [[1.0], [2.0]]
+    assert get_embedding_scheduler("test-loops") is scheduler
+    assert asyncio.run(contended()) == [[1.0], [2.0]]
+    assert scheduler.get_stats()["completed"] == 4
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from aegis.rag.fusion import fuse, normalize_scores, reciprocal_rank_fusion
+from aegis.rag.vectorstore import Document, InMemoryVectorStore, SearchResult
+
+
+def _results(*pairs):
+    return [SearchResult(document=Document(id=i, content=i), score=s) for i, s in pairs]
+
+
+def test_reciprocal_rank_fusion_is_rank_based_and_weighted():
+    vector = _results(("a", 0.99), ("b", 0.98))
+    keyword = _results(("b", 42.0), ("c", 7.0))
+
+    fused = reciprocal_rank_fusion([vector, keyword], weights=[0.5, 0.5])
+    assert [r.document.id for r in fused] == ["b", "a", "c"]
+    assert fused[0].score == pytest.approx(0.5 / 62 + 0.5 / 61)
+    assert all(r.search_type == "hybrid" for r in fused)
+    # Inputs are not mutated
+    assert keyword[0].score == 42.0
+
+
+def test_normalized_weighted_fusion():
+    assert normalize_scores(_results(("a", 2.0), ("b", 4.0)), "minmax") == [0.0, 1.0]
+    assert normalize_scores(_results(("a", 2.0), ("b", 4.0)), "zscore") == [-1.0, 1.0]
+
+    fused = fuse(
+        [_results(("a", 0.9), ("b", 0.1)), _results(("b", 10.0), ("a", 9.0))],
+        method="minmax",
+        weights=[0.3, 0.7],
+    )
+    assert [r.document.id for r in fused] == ["b", "a"]
+
+    with pytest.raises(ValueError):
+        fuse([[]], method="bogus")
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_runs_legs_concurrently():
+    store = InMemoryVectorStore(dimensions=2)
+    await store.add_documents([
+        Document(id="a", content="chest pain", embedding=[1.0, 0.0]),
+        Document(id="b", content="shortness of breath", embedding=[0.0, 1.0]),
+    ])
+
+    running = 0
+    overlapped = False
+    original_search, original_keyword = store.search, store.keyword_search
+
+    async def track(coro):
+        nonlocal running, overlapped
+        running += 1
+        await asyncio.sleep(0)
+        overlapped = overlapped or running == 2
+        try:
+            return await coro
+        finally:
+            running -= 1
+
+    store.search = lambda *a, **kw: track(original_search(*a, **kw))
+    store.keyword_search = lambda *a, **kw: track(original_keyword(*a, **kw))
+
+    results = await store.hybrid_search("breath", [0.0, 1.0], top_k=2)
+    assert overlapped
+    assert results[0].document.id == "b"
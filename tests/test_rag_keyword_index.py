@@ -0,0 +1,27 @@
+from aegis.rag.keyword_index import BM25Index, ClinicalAnalyzer, snowball_stem
+
+
+def test_clinical_analyzer_mirrors_opensearch_chain():
+    analyzer = ClinicalAnalyzer()
+    assert analyzer.analyze("The patient's medications were adjusted for Hypertension") == [
+        "patient", "medic", "were", "adjust", "hypertens",
+    ]
+    assert snowball_stem("generously") == "generous"
+    assert snowball_stem("running") == "run"
+
+
+def test_bm25_index_ranks_and_updates_incrementally():
+    index = BM25Index()
+    index.add("a", "Metformin for type 2 diabetes")
+    index.add("b", "Diabetes diabetes follow-up, insulin titration")
+    index.add("c", "Hypertension managed with lisinopril")
+
+    ranked = [doc_id for doc_id, _ in index.search("diabetic diabetes insulin")]
+    assert ranked == ["b", "a"]
+    assert [doc_id for doc_id, _ in index.search("diabetes insulin", operator="and")] == ["b"]
+
+    index.remove("b")
+    assert [doc_id for doc_id, _ in index.search("insulin")] == []
+    index.add("a", "lisinopril refill")
+    assert {doc_id for doc_id, _ in index.search("lisinopril")} == {"a", "c"}
+    assert index.search("diabetes") == []
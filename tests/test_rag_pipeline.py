@@ -0,0 +1,146 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from aegis.rag import pipeline as pipeline_module
+from aegis.rag.chunkers import SlidingWindowChunker
+from aegis.rag.embeddings import EmbeddingModel
+from aegis.rag.pipeline import RAGConfig, RAGPipeline
+from aegis.rag.vectorstore import InMemoryVectorStore
+
+
+class LengthEmbeddings(EmbeddingModel):
+    def __init__(self):
+        super().__init__("length", dimensions=2)
+        self.batches = []
+
+    async def embed(self, text):
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts):
+        self.batches.append(len(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class FlakyStore(InMemoryVectorStore):
+    def __init__(self, fail_on_call):
+        super().__init__()
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    async def add_documents(self, documents):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("store unavailable")
+        return await super().add_documents(documents)
+
+
+NOTE = "\n".join(f"Line {i}: patient reports stable vitals and no new complaints." for i in range(200))
+
+
+def test_streaming_chunkers_match_list_output():
+    chunker = SlidingWindowChunker(chunk_size=300, chunk_overlap=50)
+    assert list(chunker.iter_chunks("doc", NOTE)) == chunker.chunk("doc", NOTE)
+
+
+@pytest.mark.asyncio
+async def test_ingestion_streams_windows_and_resumes_after_failure():
+    config = RAGConfig(
+        chunker_type="sliding",
+        chunk_size=300,
+        chunk_overlap=50,
+        embedding_cache=False,
+        ingest_window_size=4,
+        ingest_queue_size=1,
+    )
+    store = FlakyStore(fail_on_call=3)
+    embeddings = LengthEmbeddings()
+    pipeline = RAGPipeline(config, vector_store=store, embedding_model=embeddings)
+    expected = len(pipeline.chunker.chunk("note-1", NOTE))
+
+    progress = []
+    failed = await pipeline.ingest_text(
+        NOTE, document_id="note-1", progress_callback=progress.append
+    )
+    assert not failed.success
+    assert [p.chunks_stored for p in progress] == [4, 8]
+    assert len(store.documents) == 8
+
+    progress.clear()
+    resumed = await pipeline.ingest_text(
+        NOTE, document_id="note-1", progress_callback=progress.append
+    )
+    assert resumed.success
+    assert resumed.resumed_chunks == 8
+    assert resumed.chunk_count == expected
+    assert len(store.documents) == expected
+    assert progress[-1].done and progress[-1].chunks_stored == expected
+    assert max(embeddings.batches) == 4
+    # Checkpoint is dropped once the document is fully stored
+    assert pipeline.checkpoints._stored == {}
+
+
+@pytest.mark.asyncio
+async def test_batch_ingestion_reports_per_file_results(tmp_path):
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "a.txt").write_text(NOTE)
+    (tmp_path / "nested" / "b.md").write_text(NOTE[:2000])
+    (tmp_path / "skip.bin").write_bytes(b"\x00\x01")
+    missing = str(tmp_path / "missing.txt")
+
+    config = RAGConfig(chunker_type="sliding", chunk_size=300, embedding_cache=False)
+    pipeline = RAGPipeline(config, embedding_model=LengthEmbeddings())
+    result = await pipeline.ingest_batch([str(tmp_path), missing], max_workers=2)
+
+    assert [Path(r.filename).name for r in result.files] == ["a.txt", "b.md", "missing.txt"]
+    assert result.succeeded == 2 and result.failed == 1
+    assert "not found" in result.files[2].error
+    assert result.total_chunks == len(pipeline.vector_store.documents) > 0
+    assert result.docs_per_second > 0
+
+    uploaded = await pipeline.ingest_bytes_batch([("upload.txt", NOTE.encode())], max_workers=2)
+    assert uploaded.succeeded == 1
+    assert uploaded.files[0].chunk_count == result.files[0].chunk_count
+
+    # Both batches ran on the same long-lived pool
+    assert list(pipeline._executors) == [2]
+    pipeline.shutdown()
+    assert pipeline._executors == {}
+
+
+@pytest.mark.asyncio
+async def test_batch_ingestion_bounds_loaded_documents(monkeypatch):
+    loaded = 0
+    peak = 0
+    load_and_chunk = pipeline_module._load_and_chunk
+
+    def counting_load(*args):
+        nonlocal loaded, peak
+        result = load_and_chunk(*args)
+        loaded += 1
+        peak = max(peak, loaded)
+        return result
+
+    config = RAGConfig(chunker_type="sliding", chunk_size=300, embedding_cache=False, ingest_concurrency=1)
+    pipeline = RAGPipeline(config, embedding_model=LengthEmbeddings())
+    process_document = pipeline._process_document
+
+    async def slow_process(*args, **kwargs):
+        nonlocal loaded
+        await asyncio.sleep(0.01)
+        result = await process_document(*args, **kwargs)
+        loaded -= 1
+        return result
+
+    monkeypatch.setattr(pipeline_module, "_load_and_chunk", counting_load)
+    monkeypatch.setattr(pipeline, "_process_document", slow_process)
+    pipeline._executors[2] = ThreadPoolExecutor(max_workers=2)
+
+    files = [(f"note{i}.txt", NOTE.encode()) for i in range(20)]
+    result = await pipeline.ingest_bytes_batch(files, max_workers=2)
+    pipeline._executors.pop(2).shutdown()
+
+    assert result.succeeded == 20
+    assert peak <= 4  # 2 x workers
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from aegis.rag.reranking import LexicalReranker, LLMListwiseReranker
+from aegis.rag.vectorstore import Document, SearchResult
+
+
+def _candidates(*contents):
+    return [
+        SearchResult(document=Document(id=f"c{i}", content=text), score=1.0 - i * 0.01)
+        for i, text in enumerate(contents)
+    ]
+
+
+class FakeLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=self.reply)
+
+
+@pytest.mark.asyncio
+async def test_listwise_reranker_scores_all_candidates_in_one_call_and_caches():
+    llm = FakeLLM("1: 2\n2: 9\n[3]: 5")
+    reranker = LLMListwiseReranker(llm)
+    candidates = _candidates("aspirin dosing", "warfarin interactions", "INR monitoring")
+
+    reranked = await reranker.rerank("warfarin", candidates, top_k=2)
+    assert [r.document.id for r in reranked] == ["c1", "c2"]
+    assert len(llm.prompts) == 1
+
+    await reranker.rerank("  Warfarin ", candidates, top_k=2)
+    assert len(llm.prompts) == 1
+    assert reranker.cache.hits == 3
+
+
+@pytest.mark.asyncio
+async def test_lexical_reranker_promotes_term_overlap():
+    candidates = _candidates(
+        "annual wellness visit",
+        "metformin dose adjustment in renal impairment",
+        "renal function",
+    )
+    reranked = await LexicalReranker().rerank("metformin renal dosing", candidates, top_k=3)
+    assert reranked[0].document.id == "c1"
+
+
+@pytest.mark.asyncio
+async def test_list_relative_scores_are_not_reused_for_a_different_list():
+    reranker = LexicalReranker()
+    a = SearchResult(document=Document(id="a", content="metformin renal dosing"), score=0.9)
+    b = SearchResult(document=Document(id="b", content="metformin"), score=0.1)
+    noise = SearchResult(document=Document(id="n", content="annual wellness visit"), score=0.05)
+
+    await reranker.rerank("metformin renal dosing", [a, b], top_k=2)
+    cached = await reranker.rerank("metformin renal dosing", [a, b, noise], top_k=3)
+    fresh = await LexicalReranker().rerank("metformin renal dosing", [a, b, noise], top_k=3)
+
+    assert [(r.document.id, r.score) for r in cached] == [(r.document.id, r.score) for r in fresh]
+    assert cached[-1].document.id == "n"
+
+
+@pytest.mark.asyncio
+async def test_llm_scores_survive_retrieval_score_changes_and_omissions():
+    llm = FakeLLM("1: 2\n2: 9")
+    reranker = LLMListwiseReranker(llm)
+    candidates = _candidates("aspirin dosing", "warfarin interactions", "INR monitoring")
+
+    reranked = await reranker.rerank("warfarin", candidates, top_k=3)
+    # c2 was left out of the reply: lowest score, ranked after every scored candidate
+    assert [(r.document.id, r.score) for r in reranked] == [("c1", 9.0), ("c0", 2.0), ("c2", 2.0)]
+
+    # New retrieval scores and order: cached scores are reused, only c2 is re-asked
+    llm.reply = "1: 6"
+    shuffled = [c.model_copy(update={"score": c.score / 2}) for c in reversed(candidates)]
+    reranked = await reranker.rerank("warfarin", shuffled, top_k=3)
+    assert [r.document.id for r in reranked] == ["c1", "c2", "c0"]
+    assert len(llm.prompts) == 2 and "INR monitoring" in llm.prompts[1]
+    assert "aspirin" not in llm.prompts[1]
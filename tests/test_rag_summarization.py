@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from aegis.rag.summarization import RecursiveSummarizer, SummaryCache
+
+
+class CountingLLM:
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, prompt, max_tokens=None, **kwargs):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return f"summary #{len(self.prompts)}"
+
+
+def make_events():
+    return [
+        {"id": f"e{i}", "type": "encounter", "date": f"2025-{month:02d}-{day:02d}T10:00:00Z",
+         "description": f"visit {i}"}
+        for i, (month, day) in enumerate([(1, 5), (1, 20), (2, 3), (3, 14), (3, 15), (3, 28)])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_only_resummarizes_changed_windows(tmp_path):
+    llm = CountingLLM()
+    cache = SummaryCache(disk_path=str(tmp_path / "summaries.sqlite"))
+    summarizer = RecursiveSummarizer(llm_client=llm, max_concurrency=2, cache=cache)
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+
+    first = await summarizer.summarize_patient_chart("p1", make_events(), start, end, "monthly")
+    # 6 days + 2 multi-day months (February reuses its single day) + final combine
+    assert len(llm.prompts) == 9
+    assert first["window_count"] == 3
+    assert llm.peak == 2
+
+    again = await summarizer.summarize_patient_chart("p1", make_events(), start, end, "monthly")
+    assert len(llm.prompts) == 9
+    assert again["summary_text"] == first["summary_text"]
+
+    # A new event in February: that day, February and the combine are redone
+    events = make_events() + [
+        {"id": "e9", "type": "lab", "date": "2025-02-10T08:00:00Z", "description": "A1c 7.9"}
+    ]
+    await summarizer.summarize_patient_chart("p1", events, start, end, "monthly")
+    assert len(llm.prompts) == 12
+
+    # The SQLite tier survives a new summarizer
+    restarted = RecursiveSummarizer(
+        llm_client=CountingLLM(), cache=SummaryCache(disk_path=str(tmp_path / "summaries.sqlite"))
+    )
+    await restarted.summarize_patient_chart("p1", events, start, end, "monthly")
+    assert restarted.llm_client.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_yearly_level_builds_on_monthly_summaries():
+    llm = CountingLLM()
+    summarizer = RecursiveSummarizer(llm_client=llm)
+    await summarizer.summarize_patient_chart(
+        "p2", make_events(), datetime(2025, 1, 1), datetime(2026, 1, 1), "monthly"
+    )
+    calls = len(llm.prompts)
+
+    result = await summarizer.summarize_patient_chart(
+        "p2", make_events(), datetime(2025, 1, 1), datetime(2026, 1, 1), "yearly"
+    )
+    # Daily and monthly summaries are reused; only the year is new
+    assert len(llm.prompts) == calls + 1
+    assert result["window_count"] == 1
+
+
+class FailingLLM(CountingLLM):
+    async def generate(self, prompt, max_tokens=None, **kwargs):
+        self.prompts.append(prompt)
+        raise RuntimeError("model unavailable")
+
+
+@pytest.mark.asyncio
+async def test_fallback_summaries_are_not_cached():
+    cache = SummaryCache()
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+
+    await RecursiveSummarizer(cache=cache).summarize_patient_chart("p3", make_events(), start, end)
+    failing = RecursiveSummarizer(llm_client=FailingLLM(), cache=cache)
+    await failing.summarize_patient_chart("p3", make_events(), start, end)
+    tried = len(failing.llm_client.prompts)
+    await failing.summarize_patient_chart("p3", make_events(), start, end)
+    assert len(failing.llm_client.prompts) == 2 * tried
+
+    # A working LLM summarizes everything instead of reusing the fallbacks
+    llm = CountingLLM()
+    result = await RecursiveSummarizer(llm_client=llm, cache=cache).summarize_patient_chart(
+        "p3", make_events(), start, end
+    )
+    assert len(llm.prompts) == 9
+    assert result["summary_text"] == "summary #9"
+
+
+@pytest.mark.asyncio
+async def test_combined_summary_is_keyed_by_date_range():
+    llm = CountingLLM()
+    summarizer = RecursiveSummarizer(llm_client=llm, cache=SummaryCache())
+    await summarizer.summarize_patient_chart(
+        "p4", make_events(), datetime(2025, 1, 1), datetime(2026, 1, 1)
+    )
+    calls = len(llm.prompts)
+
+    # Same windows, but the range in the combine prompt differs
+    await summarizer.summarize_patient_chart(
+        "p4", make_events(), datetime(2024, 12, 1), datetime(2026, 1, 1)
+    )
+    assert len(llm.prompts) == calls + 1
+    assert "Time Period: 2024-12-01" in llm.prompts[-1]
@@ -0,0 +1,161 @@
+import json
+
+import pytest
+
+from aegis.rag.vectorstore import Document, InMemoryVectorStore
+
+
+@pytest.mark.asyncio
+async def test_in_memory_search_ranks_by_cosine_similarity():
+    store = InMemoryVectorStore(dimensions=3)
+    await store.add_documents([
+        Document(id="a", content="alpha", embedding=[1.0, 0.0, 0.0]),
+        Document(id="b", content="beta", embedding=[0.7, 0.7, 0.0]),
+        Document(id="c", content="gamma", embedding=[0.0, 0.0, 5.0]),
+    ])
+
+    results = await store.search([2.0, 0.0, 0.0], top_k=2)
+    assert [r.document.id for r in results] == ["a", "b"]
+    assert results[0].score == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_delete_and_filters():
+    store = InMemoryVectorStore(dimensions=2)
+    await store.add_documents([
+        Document(id=f"d{i}", content=str(i), embedding=[1.0, i / 10], metadata={"kind": i % 2})
+        for i in range(10)
+    ])
+
+    assert await store.delete(["d0", "d1", "d2", "d3", "d4", "d5"]) == 6
+    results = await store.search([1.0, 0.0], top_k=10)
+    assert {r.document.id for r in results} == {"d6", "d7", "d8", "d9"}
+
+    results = await store.search([1.0, 0.0], top_k=10, filters={"kind": 1})
+    assert [r.document.id for r in results] == ["d7", "d9"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_reupserts_compact_the_matrix():
+    store = InMemoryVectorStore(dimensions=2)
+    docs = [Document(id=f"d{i}", content=str(i), embedding=[1.0, i / 10]) for i in range(4)]
+    for _ in range(5):
+        await store.add_documents(docs)
+
+    # Each re-upsert tombstones a row; the dead rows never outnumber the live ones
+    assert store._tombstones * 2 <= store._size <= 8
+    results = await store.search([1.0, 0.0], top_k=10)
+    assert sorted(r.document.id for r in results) == ["d0", "d1", "d2", "d3"]
+
+
+@pytest.mark.asyncio
+async def test_ivf_store_matches_exact_search_and_round_trips(tmp_path):
+    import numpy as np
+
+    from aegis.rag.ann import IVFVectorStore
+
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((400, 8)).astype(np.float32)
+    docs = [
+        Document(id=f"d{i}", content=f"doc {i}", embedding=v.tolist())
+        for i, v in enumerate(vectors)
+    ]
+
+    store = IVFVectorStore(dimensions=8, nlist=8, nprobe=8, train_threshold=200)
+    await store.add_documents(docs)
+    assert store.index.is_trained
+
+    exact = InMemoryVectorStore(dimensions=8)
+    await exact.add_documents(docs)
+
+    query = vectors[3].tolist()
+    expected = [r.document.id for r in await exact.search(query, top_k=5)]
+    assert [r.document.id for r in await store.search(query, top_k=5)] == expected
+
+    await store.delete(["d3"])
+    after_delete = [r.document.id for r in await store.search(query, top_k=5)]
+    assert "d3" not in after_delete
+
+    store.save(str(tmp_path))
+    restored = IVFVectorStore.load(str(tmp_path))
+    assert [r.document.id for r in await restored.search(query, top_k=5)] == after_delete
+    await restored.add_documents([Document(id="new", content="new", embedding=vectors[3].tolist())])
+    assert (await restored.search(query, top_k=1))[0].document.id == "new"
+
+
+@pytest.mark.asyncio
+async def test_opensearch_bulk_indexer_batches_and_retries():
+    from unittest.mock import AsyncMock, MagicMock
+
+    from aegis.rag.vectorstore import OpenSearchBulkIndexer
+
+    calls = []
+
+    async def bulk(body):
+        lines = body.strip().split("\n")
+        ids = [json.loads(line)["index"]["_id"] for line in lines[::2]]
+        calls.append(ids)
+        items = []
+        for doc_id in ids:
+            if doc_id == "busy" and len(calls) == 1:
+                items.append({"index": {"_id": doc_id, "status": 429, "error": "rejected"}})
+            elif doc_id == "bad":
+                items.append({"index": {"_id": doc_id, "status": 400, "error": "mapper"}})
+            else:
+                items.append({"index": {"_id": doc_id, "status": 201}})
+        return {"errors": True, "items": items}
+
+    client = MagicMock()
+    client.bulk = bulk
+    client.indices.get_settings = AsyncMock(return_value={})
+    client.indices.put_settings = AsyncMock()
+    client.indices.refresh = AsyncMock()
+
+    indexer = OpenSearchBulkIndexer(
+        client, "docs", max_batch_docs=10, max_concurrency=1, retry_backoff=0
+    )
+    actions = [("busy", {"n": 0}), ("bad", {"n": 1})] + [(f"d{i}", {"n": i}) for i in range(8)]
+    result = await indexer.index(actions, disable_refresh=True)
+
+    assert calls[1] == ["busy"]
+    assert result.indexed == 9
+    assert result.failed == 1 and result.errors[0]["id"] == "bad"
+    assert result.retried == 1
+    # An unset interval is restored as null, not a hard-coded default
+    intervals = [
+        c.kwargs["body"]["index"]["refresh_interval"]
+        for c in client.indices.put_settings.await_args_list
+    ]
+    assert intervals == ["-1", None]
+    client.indices.refresh.assert_awaited_once()
+
+
+class _RequestError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code, attempts", [(400, 1), (429, 3), (503, 3), ("N/A", 3)])
+async def test_opensearch_bulk_indexer_retries_only_transient_request_errors(status_code, attempts):
+    from unittest.mock import AsyncMock, MagicMock
+
+    from aegis.rag.vectorstore import OpenSearchBulkIndexer
+
+    client = MagicMock()
+    client.bulk = AsyncMock(side_effect=_RequestError(status_code))
+    client.indices.get_settings = AsyncMock(
+        return_value={"docs": {"settings": {"index": {"refresh_interval": "30s"}}}}
+    )
+    client.indices.put_settings = AsyncMock()
+    client.indices.refresh = AsyncMock()
+
+    indexer = OpenSearchBulkIndexer(client, "docs", max_retries=2, retry_backoff=0)
+    result = await indexer.index([("a", {"n": 0})], disable_refresh=True)
+
+    assert client.bulk.await_count == attempts
+    assert result.failed == 1 and result.indexed == 0
+    # The operator's interval is put back after the load
+    restored = client.indices.put_settings.await_args.kwargs["body"]
+    assert restored == {"index": {"refresh_interval": "30s"}}